@@ -1,10 +1,13 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import shutil
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pathlib import Path
 import os
 import json
+import sqlite3
 import time
+import uuid
+from contextlib import nullcontext
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -18,6 +21,10 @@ from reference_builder import build_reference_docx
 from pandoc_runner import markdown_to_docx
 from pydantic import BaseModel
 from text_normalizer import normalize_txt_to_markdown
+from job_queue import JobQueue, JobQueueFull
+from blob_store import BlobStore
+from output_manifest import OutputManifest
+from upload_ingest import DOCX, TEXT, UploadRejected, ingest_upload, safe_filename, upload_kind
 
 # Import AI modules
 from engine.ai.semantic_parser import SemanticParser
@@ -28,6 +35,11 @@ from engine.ai.text_generation import AbstractGenerator, PrefaceGenerator
 # Import analyzer modules for universal formatter
 from engine.analyzer import TemplateAnalyzer, ContentExtractor, ContentMapper, DocumentMerger
 from engine.analyzer.complete_thesis_builder import CompleteThesisBuilder
+from engine.analyzer.compiled_template import COMPILED_TEMPLATES
+from engine.analyzer.preview_cache import PREVIEW_CACHE, etag_matches
+from engine.analyzer.template_cache import TEMPLATE_STORE
+from engine.metrics import REGISTRY as METRICS, MetricFamily
+from engine.tracing import TraceCapture, capture_trace
 
 # ============================================================================
 # Environment Configuration
@@ -36,6 +48,8 @@ OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 AI_MODEL = os.getenv('AI_MODEL', 'openai/gpt-oss-20b:free')
 BACKEND_PORT = int(os.getenv('BACKEND_PORT', 8000))
 BACKEND_DEBUG = os.getenv('BACKEND_DEBUG', 'false').lower() == 'true'
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', 32))
 
 # Verify AI configuration on startup
 if not OPENROUTER_API_KEY:
@@ -101,12 +115,118 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    "folio_http_request_duration_seconds", "HTTP request latency by method, route and status",
+    ["method", "route", "status"],
+)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Time every request, labelled by route template so IDs and filenames don't split series."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route,
+                                     status=str(status))
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 UPLOAD_DIR = BASE_DIR / "storage" / "uploads"
 REF_DIR = BASE_DIR / "storage" / "references"
+OUTPUT_DIR = BASE_DIR / "storage" / "outputs"
 
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 REF_DIR.mkdir(parents=True, exist_ok=True)
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Uploads and outputs are stored once by content hash; the directories above hold named aliases.
+# References are never evicted by the collector.
+blob_store = BlobStore(BASE_DIR / "storage" / "blobs", evictable=(UPLOAD_DIR, OUTPUT_DIR))
+blob_store.start_collector()
+
+# Finished builds by job ID and filename, for O(1) download lookup
+output_manifest = OutputManifest(BASE_DIR / "storage" / "cache" / "outputs.sqlite3")
+
+# Thesis builds run here instead of on the event loop
+job_queue = JobQueue(max_workers=JOB_WORKERS, max_pending=JOB_QUEUE_LIMIT)
+
+
+def submit_job(kind: str, fn, *args, **kwargs):
+    """Queue a build job, mapping a full queue to HTTP 503."""
+    try:
+        return job_queue.submit(kind, fn, *args, **kwargs)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def queued_response(job, trace: bool = False) -> dict:
+    """Response body for a job submitted in async mode."""
+    response = {
+        "status": "queued",
+        "message": "Thesis generation queued",
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+    }
+    if trace:
+        response["trace_url"] = f"/jobs/{job.id}/trace"
+    return response
+
+
+async def receive_upload(upload: UploadFile, destination: Path, kind: Optional[str] = None, **limits):
+    """
+    Stream an upload into the blob store and alias it as `destination`.
+
+    Content already in the store is not written again: the staged copy is
+    dropped and `destination` becomes another link to the existing blob.
+    """
+    try:
+        stored = await ingest_upload(upload, blob_store.staging_path(), kind=kind, **limits)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    blob_store.commit(stored.path, stored.sha256)
+    stored.path = blob_store.link(stored.sha256, destination)
+    return stored
+
+
+async def receive_template(upload: UploadFile, destination: Path, **limits):
+    """Stream a template upload and key the template caches by its hash without re-reading it."""
+    stored = await receive_upload(upload, destination, kind=DOCX, **limits)
+    TEMPLATE_STORE.remember_digest(stored.path, stored.sha256)
+    return stored
+
+
+def store_output(output_path: Path, job=None) -> None:
+    """Move a finished output into the blob store, keeping its name as an alias, and record it."""
+    PREVIEW_CACHE.forget(output_path)
+    try:
+        if output_path.exists():
+            digest = blob_store.put_file(output_path)
+            if job is not None:
+                output_manifest.record(job.id, output_path, digest)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] Could not store output {output_path.name}: {e}")
+
+
+def compile_uploaded_template(template_path: Path) -> Optional[dict]:
+    """Compile an uploaded template so builds load it instead of re-analyzing."""
+    try:
+        compiled = COMPILED_TEMPLATES.get(template_path)
+        return {
+            "template_hash": compiled.template_hash,
+            "analyzer_version": compiled.analyzer_version,
+            "compile_seconds": compiled.compile_seconds,
+            "chapters": len(compiled.chapters),
+            "subsections": len(compiled.subsections),
+            "main_content_start": compiled.main_content_start,
+        }
+    except Exception as e:
+        print(f"[WARNING] Template compilation failed for {Path(template_path).name}: {e}")
+        return None
 
 
 def resolve_style(style_id, styles):
@@ -273,23 +393,12 @@ async def validate_template(file: UploadFile = File(...)):
     try:
         print(f"Starting template validation for: {file.filename}")
 
-        # Check file size first
-        template_data = await file.read()
-        file_size = len(template_data)
-
-        if file_size > 50 * 1024 * 1024:  # 50MB limit
-            raise HTTPException(status_code=400, detail="File too large (max 50MB)")
-
-        if file_size < 1000:  # Minimum reasonable DOCX size
-            raise HTTPException(status_code=400, detail="File too small - not a valid DOCX")
+        # Size limits are enforced while streaming; nothing is held in memory
+        template_path = UPLOAD_DIR / safe_filename(file.filename)
+        stored = await receive_template(file, template_path, min_bytes=1000)  # Minimum reasonable DOCX size
+        file_size = stored.size
 
         print(f"File size: {file_size} bytes")
-
-        template_path = UPLOAD_DIR / file.filename
-
-        with template_path.open("wb") as buffer:
-            buffer.write(template_data)
-
         print("File saved, starting style extraction...")
 
         # Extract and validate styles with timeout and fallback
@@ -308,14 +417,19 @@ async def validate_template(file: UploadFile = File(...)):
 
         print("Style extraction completed successfully")
 
+        # Compile once on upload; every build of this template reuses the artifact
+        compiled = await asyncio.get_event_loop().run_in_executor(None, compile_uploaded_template, template_path)
+
         return {
             "status": "valid",
             "message": "Template validated successfully",
             "filename": file.filename,
             "file_size": file_size,
+            "sha256": stored.sha256,
             "styles_count": len(extracted.get("styles", {})),
             "styles": extracted.get("styles", {}),
-            "margins": extracted.get("margins", {})
+            "margins": extracted.get("margins", {}),
+            "compiled_template": compiled
         }
 
     except HTTPException:
@@ -326,7 +440,7 @@ async def validate_template(file: UploadFile = File(...)):
         print(error_msg)
 
         # Clean up file on error
-        template_path = UPLOAD_DIR / file.filename
+        template_path = UPLOAD_DIR / safe_filename(file.filename)
         if template_path.exists():
             try:
                 template_path.unlink()
@@ -373,7 +487,9 @@ async def generate_document(
     abstract_id: Optional[str] = Form(None),
     abstract_en: Optional[str] = Form(None),
     keywords: Optional[str] = Form(None),
-    simple_builder: str = Form("false", description="Use simple, reliable builder instead of complex template system")
+    simple_builder: str = Form("false", description="Use simple, reliable builder instead of complex template system"),
+    async_job: str = Form("false", description="Return a job ID immediately instead of waiting for the build"),
+    trace: str = Form("false", description="Record the build's debug trace for download from /jobs/{job_id}/trace")
 ):
     """
     Unified document generation endpoint - NOW CREATES COMPLETE THESIS with AI!
@@ -395,20 +511,16 @@ async def generate_document(
     - use_ai_analysis: Whether to use AI semantic analysis (true/false)
     - [frontmatter fields]: Front matter data
     - output_format: 'docx' or 'doc'
+    - async_job: Return a job ID immediately; poll /jobs/{job_id} for the result
+    - trace: Record debug-level trace events of this build only (NDJSON at /jobs/{job_id}/trace)
     """
     
     # folders
     md_dir = BASE_DIR / "storage" / "markdown"
-    out_dir = BASE_DIR / "storage" / "outputs"
+    out_dir = OUTPUT_DIR
     md_dir.mkdir(parents=True, exist_ok=True)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Initialize content_path to None for cleanup
-    content_path = None
     
     try:
-        from engine.analyzer.complete_thesis_builder import create_complete_thesis
-        
         include_fm = include_frontmatter.lower() in ('true', '1', 'yes')
         use_ai = use_ai_analysis.lower() in ('true', '1', 'yes')
         
@@ -416,13 +528,12 @@ async def generate_document(
         if (template_file or reference_name) and content_file:
             # Handle template upload
             if template_file:
-                template_data = await template_file.read()
-                template_path = UPLOAD_DIR / template_file.filename
-                with template_path.open("wb") as buffer:
-                    buffer.write(template_data)
-                ref_path = REF_DIR / template_file.filename
-                shutil.copy(template_path, ref_path)
-                ref_name = template_file.filename
+                ref_name = safe_filename(template_file.filename)
+                ref_path = REF_DIR / ref_name
+                await receive_template(template_file, ref_path)
+                # Compile in the background; the build waits on the same compile if it gets there first
+                import asyncio
+                asyncio.get_event_loop().run_in_executor(None, compile_uploaded_template, ref_path)
             else:
                 ref_name = reference_name
                 ref_path = REF_DIR / ref_name
@@ -430,10 +541,9 @@ async def generate_document(
             if not ref_path.exists():
                 raise HTTPException(status_code=404, detail="Template not found")
             
-            # Read text content
-            raw_text = (await content_file.read()).decode("utf-8")
-            print(f"[DEBUG] Raw text length: {len(raw_text)}")
-            print(f"[DEBUG] Raw text preview: {raw_text[:200]}...")
+            # Stream text content to a unique file; it is UTF-8 checked as it arrives
+            content = await receive_upload(content_file, UPLOAD_DIR / f"thesis_content_{uuid.uuid4().hex}.txt", kind=TEXT)
+            print(f"[DEBUG] Content size: {content.size} bytes (sha256 {content.sha256[:12]})")
 
             # Prepare output path
             student_name = penulis or "Student"
@@ -472,52 +582,33 @@ async def generate_document(
                 "keywords": keywords or kata_kunci or "",
             }
             
-            # Create unique content file for thesis builder
-            import time
-            timestamp = int(time.time())
-            content_path = UPLOAD_DIR / f"thesis_content_{timestamp}.txt"
-            content_path.write_text(raw_text, encoding="utf-8")
-            
-            # Build COMPLETE thesis document with AI enhancement
+            # Build COMPLETE thesis document with AI enhancement on the job queue
             use_simple = simple_builder.lower() in ('true', '1', 'yes')
-            result = create_complete_thesis(
-                str(ref_path),
-                str(content_path),
-                str(output_path),
-                user_data,
-                use_ai=use_ai,
-                include_frontmatter=include_fm,
-                api_key=OPENROUTER_API_KEY,
-                use_simple_builder=use_simple
-            )
-            
-            if not isinstance(result, dict):
-                raise Exception(f"Expected dict result from create_complete_thesis, got {type(result).__name__}: {result}")
-            
-            if result.get("status") == "error":
-                error_msg = result.get("message", "Failed to create thesis")
-                error_details = result.get("error_details", "")
-                raise Exception(f"{error_msg}\n{error_details}" if error_details else error_msg)
+            use_trace = trace.lower() in ('true', '1', 'yes')
+            try:
+                job = submit_job(
+                    "generate",
+                    _run_generate_job,
+                    ref_path=ref_path,
+                    content_path=content.path,
+                    output_path=output_path,
+                    user_data=user_data,
+                    use_ai=use_ai,
+                    include_frontmatter=include_fm,
+                    use_simple=use_simple,
+                    trace=use_trace,
+                )
+            except HTTPException:
+                # The job owns the content file; without a job nobody would remove it
+                content.path.unlink(missing_ok=True)
+                raise
             
-            if result.get("status") != "success":
-                raise Exception(f"Unexpected status: {result.get('status')}, message: {result.get('message', 'Unknown error')}")
+            if async_job.lower() in ('true', '1', 'yes'):
+                return queued_response(job, trace=use_trace)
             
-            # Clean up temporary content file
-            if content_path is not None and content_path.exists():
-                content_path.unlink()
-
-            # Return JSON response with filename for frontend to use
-            # Use the actual output path returned by the builder (not our initial path)
-            actual_output_path = Path(result.get("output_file", str(output_path)))
-            actual_filename = actual_output_path.name
-
-            return {
-                "status": "success",
-                "message": "Thesis document generated successfully",
-                "filename": actual_filename,
-                "file_path": str(actual_output_path),
-                "file_size": result.get("file_size", 0)
-            }
+            # Wait without blocking the event loop
+            result = await job_queue.wait(job)
+            return {**result, "job_id": job.id}
         
         else:
             raise HTTPException(
@@ -529,17 +620,100 @@ async def generate_document(
         raise
     except Exception as e:
         import traceback
-        # Clean up temporary content file on error
-        if content_path is not None and content_path.exists():
-            try:
-                content_path.unlink()
-            except:
-                pass
         error_msg = f"Generation failed: {str(e)}\n{traceback.format_exc()}"
         print(error_msg)
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
 
+def _run_generate_job(job, ref_path: Path, content_path: Path, output_path: Path, user_data: dict,
+                      use_ai: bool, include_frontmatter: bool, use_simple: bool, trace: bool = False) -> dict:
+    """Worker body for /generate: build the thesis and shape the response."""
+    from engine.analyzer.complete_thesis_builder import create_complete_thesis
+
+    # Never write through an alias of a stored blob
+    blob_store.release(output_path)
+    if trace:
+        job.trace = TraceCapture()
+    try:
+        job.set_stage("building")
+        with capture_trace(job.trace) if trace else nullcontext():
+            result = create_complete_thesis(
+                str(ref_path),
+                str(content_path),
+                str(output_path),
+                user_data,
+                use_ai=use_ai,
+                include_frontmatter=include_frontmatter,
+                api_key=OPENROUTER_API_KEY,
+                use_simple_builder=use_simple,
+                progress_callback=job.set_stage
+            )
+        
+        if not isinstance(result, dict):
+            raise Exception(f"Expected dict result from create_complete_thesis, got {type(result).__name__}: {result}")
+        
+        if result.get("status") == "error":
+            error_msg = result.get("message", "Failed to create thesis")
+            error_details = result.get("error_details", "")
+            raise Exception(f"{error_msg}\n{error_details}" if error_details else error_msg)
+        
+        if result.get("status") != "success":
+            raise Exception(f"Unexpected status: {result.get('status')}, message: {result.get('message', 'Unknown error')}")
+    finally:
+        # Clean up temporary content file
+        if content_path.exists():
+            try:
+                content_path.unlink()
+            except OSError:
+                pass
+
+    # Return JSON response with filename for frontend to use
+    # Use the actual output path returned by the builder (not our initial path)
+    actual_output_path = Path(result.get("output_file", str(output_path)))
+    actual_filename = actual_output_path.name
+    store_output(actual_output_path, job)
+
+    response = {
+        "status": "success",
+        "message": "Thesis document generated successfully",
+        "filename": actual_filename,
+        "file_path": str(actual_output_path),
+        "file_size": result.get("file_size", 0),
+        "download_url": f"/jobs/{job.id}/download"
+    }
+    if trace:
+        response["trace_url"] = f"/jobs/{job.id}/trace"
+    return response
+
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Poll the status, stage and result of a queued thesis build."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/trace")
+async def get_job_trace(job_id: str):
+    """Download the trace events of a build submitted with trace=true, as NDJSON."""
+    job = job_queue.get(job_id)
+    if job is None or job.trace is None:
+        raise HTTPException(status_code=404, detail="No trace recorded for this job")
+    return StreamingResponse(
+        job.trace.iter_ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="trace_{job.id}.ndjson"'},
+    )
+
+
+@app.get("/jobs")
+async def get_job_queue_status():
+    """Summary of the job queue: worker count and jobs by status."""
+    return job_queue.stats()
+
+
 @app.post("/validate-semantic-structure")
 async def validate_semantic_structure(
     content_file: UploadFile = File(...),
@@ -561,10 +735,8 @@ async def validate_semantic_structure(
         from engine.analyzer.ai_enhanced_extractor import AIEnhancedContentExtractor
         
         # Save content file temporarily
-        content_data = await content_file.read()
-        content_path = UPLOAD_DIR / content_file.filename
-        with content_path.open("wb") as buffer:
-            buffer.write(content_data)
+        content_path = UPLOAD_DIR / safe_filename(content_file.filename)
+        await receive_upload(content_file, content_path, kind=upload_kind(content_file.filename))
         
         # Extract and validate
         use_ai_flag = use_ai.lower() in ('true', '1', 'yes')
@@ -590,6 +762,8 @@ async def validate_semantic_structure(
             ]
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -603,6 +777,8 @@ async def ai_analysis_status():
     try:
         from engine.analyzer.ai_enhanced_extractor import AI_AVAILABLE
         from engine.ai.semantic_parser import SemanticParser
+        from engine.ai.llm_cache import get_llm_cache
+        from engine.ai.llm_gateway import get_llm_gateway
         
         return {
             "ai_available": AI_AVAILABLE,
@@ -613,7 +789,9 @@ async def ai_analysis_status():
                 "Semantic type inference",
                 "Document structure validation",
                 "Confidence scoring"
-            ] if AI_AVAILABLE else []
+            ] if AI_AVAILABLE else [],
+            "llm_cache": get_llm_cache().stats(),
+            "llm_gateway": get_llm_gateway().stats()
         }
     except Exception as e:
         return {
@@ -632,11 +810,8 @@ async def analyze_template_endpoint(file: UploadFile = File(...)):
     """Analyze a DOCX template to detect structure and formatting rules."""
     try:
         # Save uploaded file
-        template_data = await file.read()
-        template_path = UPLOAD_DIR / file.filename
-        
-        with template_path.open("wb") as buffer:
-            buffer.write(template_data)
+        template_path = UPLOAD_DIR / safe_filename(file.filename)
+        await receive_template(file, template_path)
         
         # Analyze template
         analyzer = TemplateAnalyzer(str(template_path))
@@ -656,6 +831,8 @@ async def analyze_template_endpoint(file: UploadFile = File(...)):
             },
             "summary": analyzer.get_summary()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_msg = f"Template analysis failed: {str(e)}\n{traceback.format_exc()}"
@@ -668,14 +845,8 @@ async def extract_content_endpoint(file: UploadFile = File(...)):
     """Extract sections and content from a DOCX or TXT file."""
     try:
         # Save uploaded file
-        content_data = await file.read()
-        content_path = UPLOAD_DIR / file.filename
-        
-        with content_path.open("wb" if file.filename.endswith('.docx') else "w") as buffer:
-            if file.filename.endswith('.docx'):
-                buffer.write(content_data)
-            else:
-                buffer.write(content_data.decode('utf-8'))
+        content_path = UPLOAD_DIR / safe_filename(file.filename)
+        await receive_upload(file, content_path, kind=upload_kind(file.filename))
         
         # Extract content
         extractor = ContentExtractor(str(content_path))
@@ -688,6 +859,8 @@ async def extract_content_endpoint(file: UploadFile = File(...)):
             "section_count": len(sections),
             "summary": extractor.get_summary()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_msg = f"Content extraction failed: {str(e)}\n{traceback.format_exc()}"
@@ -704,7 +877,8 @@ async def format_thesis_endpoint(
     nim: str = Form(...),
     advisor: str = Form(...),
     institution: str = Form(...),
-    date: str = Form(...)
+    date: str = Form(...),
+    async_job: str = Form("false")
 ):
     """
     Universal thesis formatter endpoint - creates COMPLETE thesis documents.
@@ -723,31 +897,19 @@ async def format_thesis_endpoint(
     - advisor: Advisor name
     - institution: University name
     - date: Current date
+    - async_job: Return a job ID immediately; poll /jobs/{job_id} for the result
     """
     try:
-        from engine.analyzer.complete_thesis_builder import create_complete_thesis
-        
         # Save files
-        template_data = await template_file.read()
-        content_data = await content_file.read()
-        
-        template_path = UPLOAD_DIR / template_file.filename
-        content_path = UPLOAD_DIR / content_file.filename
+        template_path = UPLOAD_DIR / safe_filename(template_file.filename)
+        content_path = UPLOAD_DIR / safe_filename(content_file.filename)
         
-        with template_path.open("wb") as f:
-            f.write(template_data)
-        
-        is_content_docx = content_file.filename.endswith('.docx')
-        with content_path.open("wb" if is_content_docx else "w") as f:
-            if is_content_docx:
-                f.write(content_data)
-            else:
-                f.write(content_data.decode('utf-8'))
+        await receive_template(template_file, template_path)
+        await receive_upload(content_file, content_path, kind=upload_kind(content_file.filename))
         
         # Prepare output path
         output_filename = f"Skripsi_{author.replace(' ', '_')}_{date.replace('/', '-')}.docx"
-        output_path = BASE_DIR / "storage" / "outputs" / output_filename
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = OUTPUT_DIR / output_filename
         
         # Build complete thesis
         user_data = {
@@ -759,25 +921,16 @@ async def format_thesis_endpoint(
             "date": date,
         }
         
-        result = create_complete_thesis(
-            str(template_path),
-            str(content_path),
-            str(output_path),
-            user_data
-        )
+        job = submit_job("format-thesis", _run_format_thesis_job, template_path, content_path, output_path, user_data)
         
-        if result["status"] != "success":
-            raise Exception(result.get("message", "Failed to create thesis"))
-
-        # Return JSON response with filename
-        return {
-            "status": "success",
-            "message": "Thesis document generated successfully",
-            "filename": output_filename,
-            "file_path": str(output_path),
-            "file_size": output_path.stat().st_size if output_path.exists() else 0
-        }
+        if async_job.lower() in ('true', '1', 'yes'):
+            return queued_response(job)
+        
+        result = await job_queue.wait(job)
+        return {**result, "job_id": job.id}
         
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_msg = f"Thesis formatting failed: {str(e)}\n{traceback.format_exc()}"
@@ -785,6 +938,35 @@ async def format_thesis_endpoint(
         raise HTTPException(status_code=500, detail=f"Thesis formatting failed: {str(e)}")
 
 
+def _run_format_thesis_job(job, template_path: Path, content_path: Path, output_path: Path, user_data: dict) -> dict:
+    """Worker body for /universal-formatter/format-thesis."""
+    from engine.analyzer.complete_thesis_builder import create_complete_thesis
+
+    blob_store.release(output_path)
+    job.set_stage("building")
+    result = create_complete_thesis(
+        str(template_path),
+        str(content_path),
+        str(output_path),
+        user_data,
+        progress_callback=job.set_stage
+    )
+    
+    if result["status"] != "success":
+        raise Exception(result.get("message", "Failed to create thesis"))
+    store_output(output_path, job)
+
+    # Return JSON response with filename
+    return {
+        "status": "success",
+        "message": "Thesis document generated successfully",
+        "filename": output_path.name,
+        "file_path": str(output_path),
+        "file_size": output_path.stat().st_size if output_path.exists() else 0,
+        "download_url": f"/jobs/{job.id}/download"
+    }
+
+
 @app.get("/universal-formatter/info")
 async def universal_formatter_info():
     """Get information about the universal formatter."""
@@ -813,6 +995,56 @@ async def universal_formatter_info():
     }
 
 
+def _collect_runtime_metrics():
+    """Queue depth, cache and LLM counters owned by other components, read at scrape time."""
+    from engine.ai.llm_cache import get_llm_cache
+    from engine.ai.llm_gateway import get_llm_gateway
+
+    queue = job_queue.stats()
+    jobs = MetricFamily("folio_job_queue_jobs", "gauge", "Build jobs by status", ["status"])
+    for status in ("queued", "running", "succeeded", "failed"):
+        jobs.add(queue[status], status)
+    yield jobs
+    yield MetricFamily("folio_job_queue_workers", "gauge", "Build worker threads").add(queue["workers"])
+
+    lookups = MetricFamily("folio_cache_lookups_total", "counter",
+                           "Cache lookups by cache and result (hit, disk, miss)", ["cache", "result"])
+    template = TEMPLATE_STORE.stats()
+    lookups.add(template["hits"], "template", "hit").add(template["misses"], "template", "miss")
+    compiled = COMPILED_TEMPLATES.stats()
+    lookups.add(compiled["hits"], "compiled_template", "hit")
+    lookups.add(compiled["disk_loads"], "compiled_template", "disk")
+    lookups.add(compiled["compiles"], "compiled_template", "miss")
+    preview = PREVIEW_CACHE.stats()
+    lookups.add(preview["hits"], "preview", "hit")
+    lookups.add(preview["disk_loads"], "preview", "disk")
+    lookups.add(preview["renders"], "preview", "miss")
+    yield lookups
+    yield MetricFamily("folio_template_cache_bytes", "gauge", "Memory held by parsed templates").add(template["bytes"])
+
+    llm_lookups = MetricFamily("folio_llm_cache_lookups_total", "counter",
+                               "LLM response cache lookups by call site and result", ["call_site", "result"])
+    for call_site, counts in get_llm_cache().stats().get("call_sites", {}).items():
+        llm_lookups.add(counts.get("hits", 0), call_site, "hit").add(counts.get("misses", 0), call_site, "miss")
+    yield llm_lookups
+
+    llm_events = MetricFamily("folio_llm_events_total", "counter",
+                              "LLM calls, errors, retries and hedges by call site", ["call_site", "event"])
+    for call_site, counts in get_llm_gateway().stats()["call_sites"].items():
+        for event in ("calls", "errors", "retries", "hedges"):
+            llm_events.add(counts[event], call_site, event)
+    yield llm_events
+
+
+METRICS.register_collector(_collect_runtime_metrics)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Stage timings, request latency, queue depth, cache and LLM counters in Prometheus text format."""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/test-connection")
 async def test_connection():
     """Simple endpoint to test frontend-backend connection"""
@@ -820,67 +1052,66 @@ async def test_connection():
 
 # Note: The /api/download endpoint is handled by Vite proxy rewriting /api/download to /download
 
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def _download_response(request: Request, path: Path, stat: os.stat_result, filename: str,
+                       etag: Optional[str] = None) -> Response:
+    """
+    Serve an output file for download.
+
+    FileResponse streams from the file (zero-copy where the server supports
+    it) and answers Range requests; the content hash, when known, is the ETag
+    so repeat downloads of an unchanged output get 304.
+    """
+    from fastapi.responses import FileResponse
+
+    headers = {
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+        # Add CORS headers explicitly
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+        "Access-Control-Allow-Headers": "*",
+    }
+    if etag:
+        headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+    return FileResponse(path, filename=filename, media_type=DOCX_MEDIA_TYPE, stat_result=stat, headers=headers)
+
+
 @app.get("/download/{filename}")
-async def download_generated_document(filename: str):
+async def download_generated_document(filename: str, request: Request):
     """
     Download a generated document by filename.
+
+    Resolved through the output manifest; outputs written before the manifest
+    existed are still served if the exact name is present in storage/outputs.
     """
-    try:
-        print(f"DOWNLOAD REQUEST: '{filename}'")
-
-        # Find the generated file
-        output_dir = BASE_DIR / "storage" / "outputs"
-        docx_file = output_dir / filename
-
-        print(f"Looking in: {output_dir}")
-        print(f"File exists: {docx_file.exists()}")
-
-        # If exact filename doesn't exist, try to find a similar recent file
-        if not docx_file.exists():
-            print("Exact file not found, looking for alternatives...")
-            all_docx = list(output_dir.glob("*.docx"))
-            recent_files = sorted(all_docx, key=lambda x: x.stat().st_mtime, reverse=True)
-
-            print(f"Found {len(recent_files)} total .docx files")
-            print(f"Most recent: {[f.name for f in recent_files[:3]]}")
-
-            # Check if any recent file matches the pattern
-            base_name = filename.replace('.docx', '').rsplit('_', 1)[0] if '_' in filename else filename.replace('.docx', '')
-            print(f"Looking for base name: '{base_name}'")
-
-            for recent_file in recent_files[:10]:  # Check last 10 files
-                file_size = recent_file.stat().st_size
-                if base_name in recent_file.name and file_size > 1000000:  # >1MB
-                    print(f"Found matching file: {recent_file.name} ({file_size} bytes)")
-                    docx_file = recent_file
-                    break
-
-        if not docx_file.exists():
-            print(f"File still not found: {docx_file}")
-            all_files = list(output_dir.glob("*"))
-            print(f"All files in output dir: {[f.name for f in all_files]}")
-            raise HTTPException(status_code=404, detail="Generated document not found")
-
-        # Return file for download
-        from fastapi.responses import FileResponse
-        response = FileResponse(
-            docx_file,
-            filename=filename,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        )
+    filename = safe_filename(filename)
+    record = output_manifest.by_filename(filename)
+    if record is not None:
+        stat = record.current_stat()
+        if stat is not None:
+            return _download_response(request, record.path, stat, filename, record.etag)
 
-        # Add CORS headers explicitly
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "*"
+    try:
+        stat = (OUTPUT_DIR / filename).stat()
+    except OSError:
+        raise HTTPException(status_code=404, detail="Generated document not found")
+    return _download_response(request, OUTPUT_DIR / filename, stat, filename)
 
-        return response
 
-    except Exception as e:
-        import traceback
-        error_msg = f"Document download failed: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
-        raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
+@app.get("/jobs/{job_id}/download")
+async def download_job_output(job_id: str, request: Request):
+    """Download the output of a finished build by its job ID."""
+    record = output_manifest.by_job(job_id)
+    stat = record.current_stat() if record is not None else None
+    if stat is None:
+        raise HTTPException(status_code=404, detail="No output recorded for this job")
+    return _download_response(request, record.path, stat, record.filename, record.etag)
 
 
 @app.post("/save-edited-content")
@@ -912,29 +1143,17 @@ async def save_edited_content(content: str = Form(...)):
         raise HTTPException(status_code=500, detail=f"Save failed: {str(e)}")
 
 
-@app.get("/preview-generated/{filename}")
-async def preview_generated_document(filename: str):
-    """
-    Generate enhanced HTML preview of a generated document.
-    """
-    try:
-        # Find the generated file
-        output_dir = BASE_DIR / "storage" / "outputs"
-        docx_file = output_dir / filename
-
-        if not docx_file.exists():
-            raise HTTPException(status_code=404, detail="Generated document not found")
-
-        # Use enhanced preview service
-        from engine.analyzer.enhanced_preview_service import generate_enhanced_preview
+def _render_preview(docx_file: Path, filename: str) -> dict:
+    """Render the preview payload for an output; raises so failures are never cached."""
+    from engine.analyzer.enhanced_preview_service import generate_enhanced_preview
 
-        result = generate_enhanced_preview(str(docx_file))
+    result = generate_enhanced_preview(str(docx_file))
 
-        if result["status"] == "error":
-            raise HTTPException(status_code=500, detail=result["message"])
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=result["message"])
 
-        # Combine CSS and HTML
-        full_html = f"""<!DOCTYPE html>
+    # Combine CSS and HTML
+    full_html = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -948,13 +1167,76 @@ async def preview_generated_document(filename: str):
 </body>
 </html>"""
 
-        return {
-            "status": "success",
-            "html_content": full_html,
-            "metadata": result.get("metadata", {}),
-            "filename": filename
-        }
+    return {
+        "status": "success",
+        "html_content": full_html,
+        "metadata": result.get("metadata", {}),
+        "filename": filename
+    }
+
+
+PREVIEW_SECTIONS = "sections"
+
+
+def _generated_file(filename: str) -> Path:
+    """Resolve an output filename, raising 404 if it does not exist."""
+    docx_file = OUTPUT_DIR / safe_filename(filename)
+    if not docx_file.exists():
+        raise HTTPException(status_code=404, detail="Generated document not found")
+    return docx_file
+
+
+def _render_section_previews(docx_file: Path):
+    """Outline and per-section preview payloads for the chunked preview API."""
+    from engine.analyzer.enhanced_preview_service import iter_section_previews
+
+    return iter_section_previews(str(docx_file))
 
+
+def _preview_response(request: Request, entry) -> Response:
+    """Serve a cached preview entry in the best encoding the client accepts."""
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding", "ETag": entry.etag}
+    encoding = entry.choose_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=entry.body(encoding), media_type="application/json", headers=headers)
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds this ETag."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"Cache-Control": "no-cache", "Vary": "Accept-Encoding", "ETag": etag})
+    return None
+
+
+@app.get("/preview-generated/{filename}")
+async def preview_generated_document(filename: str, request: Request):
+    """
+    Generate enhanced HTML preview of a generated document.
+
+    Previews are cached per output hash and served pre-compressed; clients
+    revalidate with If-None-Match and get 304 until the output is regenerated.
+    For long documents prefer the chunked /outline and /sections endpoints.
+    """
+    try:
+        docx_file = _generated_file(filename)
+
+        import asyncio
+        loop = asyncio.get_event_loop()
+
+        # Hashing only happens when the output changed since the last request
+        etag = await loop.run_in_executor(None, PREVIEW_CACHE.etag_for, docx_file, filename)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+
+        entry = await loop.run_in_executor(
+            None, PREVIEW_CACHE.get, docx_file, lambda path: _render_preview(path, filename), filename
+        )
+        return _preview_response(request, entry)
+
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_msg = f"Document preview failed: {str(e)}\n{traceback.format_exc()}"
@@ -962,6 +1244,84 @@ async def preview_generated_document(filename: str):
         raise HTTPException(status_code=500, detail=f"Preview generation failed: {str(e)}")
 
 
+@app.get("/preview-generated/{filename}/outline")
+async def preview_generated_outline(filename: str, request: Request):
+    """
+    Table of contents for the chunked preview of a generated document.
+
+    Lists the sections (front matter, one per chapter, back matter) with
+    their ids, titles and sizes, plus the shared CSS and metadata. Section
+    HTML is fetched separately from /preview-generated/{filename}/sections/{id}.
+    """
+    return await _serve_preview_part(filename, "outline", request)
+
+
+@app.get("/preview-generated/{filename}/sections/{section_id}")
+async def preview_generated_section(filename: str, section_id: str, request: Request):
+    """HTML fragment of one section of a generated document's chunked preview."""
+    return await _serve_preview_part(filename, section_id, request)
+
+
+async def _serve_preview_part(filename: str, part: str, request: Request):
+    try:
+        docx_file = _generated_file(filename)
+
+        import asyncio
+        loop = asyncio.get_event_loop()
+
+        # Unknown section ids are rejected before an ETag (and cache key) is derived for them
+        etag = await loop.run_in_executor(
+            None, PREVIEW_CACHE.part_etag_for, docx_file, part, _render_section_previews, PREVIEW_SECTIONS
+        )
+        if etag is None:
+            raise HTTPException(status_code=404, detail=f"Preview section not found: {part}")
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+
+        entry = await loop.run_in_executor(
+            None, PREVIEW_CACHE.get_part, docx_file, part, _render_section_previews, PREVIEW_SECTIONS
+        )
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Preview section not found: {part}")
+        return _preview_response(request, entry)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        error_msg = f"Document preview failed: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg)
+        raise HTTPException(status_code=500, detail=f"Preview generation failed: {str(e)}")
+
+
+@app.get("/preview-generated/{filename}/stream")
+async def preview_generated_stream(filename: str):
+    """
+    Stream the chunked preview as newline-delimited JSON.
+
+    The first line is the outline and every following line is one section
+    ({"part": id, "data": {...}}), sent as soon as it is rendered or read
+    from the cache, so the editor can paint chapter one while the rest of
+    the thesis is still converting.
+    """
+    docx_file = _generated_file(filename)
+
+    def lines():
+        try:
+            for name, entry in PREVIEW_CACHE.iter_parts(docx_file, _render_section_previews, PREVIEW_SECTIONS):
+                yield b'{"part": ' + json.dumps(name).encode("utf-8") + b', "data": ' + entry.body(None) + b'}\n'
+        except Exception as e:
+            print(f"[ERROR] Preview stream failed for {filename}: {e}")
+            yield json.dumps({"part": "error", "data": {"message": str(e)}}).encode("utf-8") + b"\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Content-Type-Options": "nosniff"},
+    )
+
+
 # ============================================================================
 # Perfect Template System Endpoints
 # ============================================================================
@@ -971,9 +1331,8 @@ async def analyze_template(file: UploadFile = File(...)):
     """Analyze a university template and return detailed analysis."""
     try:
         # Save uploaded file temporarily
-        temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        temp_path = str(UPLOAD_DIR / f"temp_{uuid.uuid4().hex}_{safe_filename(file.filename)}")
+        await receive_template(file, Path(temp_path))
 
         # Analyze template
         analyzer = TemplateAnalyzer(temp_path)
@@ -1035,13 +1394,14 @@ async def convert_template(
     """Convert DOCX template to structured format."""
     try:
         # Save uploaded file temporarily
-        temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        temp_path = str(UPLOAD_DIR / f"temp_{uuid.uuid4().hex}_{safe_filename(file.filename)}")
+        await receive_template(file, Path(temp_path))
 
-        # Analyze and convert template
-        analyzer = TemplateAnalyzer(temp_path)
-        json_template = analyzer.convert_to_structured_format()
+        # Analyze, convert and compile off the event loop
+        loop = asyncio.get_event_loop()
+        analyzer = await loop.run_in_executor(None, TemplateAnalyzer, temp_path)
+        json_template = await loop.run_in_executor(None, analyzer.convert_to_structured_format)
+        compiled = await loop.run_in_executor(None, compile_uploaded_template, Path(temp_path))
 
         # Clean up
         os.unlink(temp_path)
@@ -1061,7 +1421,8 @@ async def convert_template(
                 "status": "success",
                 "message": "Template converted successfully",
                 "template_data": json_template,
-                "output_file": output_filename
+                "output_file": output_filename,
+                "compiled_template": compiled
             }
         else:
             return {
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Benchmark TemplateAnalyzer's fused paragraph pass against the previous
+one-walk-per-detector layout.
+
+The multi-pass mode replays the old access pattern with the same accumulators:
+one traversal per detector, one per paragraph style for usage counts, and no
+style cache (python-docx resolves `paragraph.style` on every access).
+
+Usage:
+    python benchmark_template_analyzer.py [template.docx] [--repeat N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+from engine.analyzer import paragraph_visitor as pv
+from engine.analyzer.template_analyzer import TemplateAnalyzer
+
+DEFAULT_TEMPLATE = Path(__file__).resolve().parent.parent / "storage" / "references" / "Template-skripsi-final-versi2020.docx"
+
+
+class _Uncached(dict):
+    """Style cache that never stores, so every lookup re-resolves the style."""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class _StyleCount(pv.ParagraphAccumulator):
+    def __init__(self, style_name):
+        self.style_name = style_name
+        self.count = 0
+
+    def visit(self, view):
+        if view.style_name == self.style_name:
+            self.count += 1
+
+    def result(self):
+        return self.count
+
+
+def _analyzer(path: Path) -> TemplateAnalyzer:
+    analyzer = TemplateAnalyzer.__new__(TemplateAnalyzer)
+    analyzer.template_path = path
+    analyzer.doc = Document(str(path))
+    analyzer._scan = None
+    return analyzer
+
+
+def fused(path: Path) -> float:
+    analyzer = _analyzer(path)
+    start = time.perf_counter()
+    analyzer._analyze()
+    return time.perf_counter() - start
+
+
+def multi_pass(path: Path) -> float:
+    doc = Document(str(path))
+    start = time.perf_counter()
+    paragraphs = doc.paragraphs
+    detectors = [
+        pv.StructureAccumulator(len(paragraphs)), pv.PlaceholderAccumulator(), pv.CommonFontAccumulator(),
+        pv.CommonFontAccumulator(), pv.ParagraphFormatAccumulator(), pv.ParagraphFormatAccumulator(),
+        pv.ParagraphFormatAccumulator(), pv.ParagraphFormatAccumulator(), pv.FrontMatterAccumulator(),
+        pv.HeadingHierarchyAccumulator(), pv.CaptionAccumulator(),
+    ]
+    detectors += [_StyleCount(style.name) for style in doc.styles if style.type == WD_STYLE_TYPE.PARAGRAPH]
+    for detector in detectors:
+        pv.visit_paragraphs(doc.paragraphs, [detector], styles=_Uncached())
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("template", nargs="?", default=str(DEFAULT_TEMPLATE))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    path = Path(args.template)
+
+    paragraphs = len(Document(str(path)).paragraphs)
+    print(f"[INFO] {path.name}: {paragraphs} paragraphs, best of {args.repeat}")
+    multi = min(multi_pass(path) for _ in range(args.repeat))
+    single = min(fused(path) for _ in range(args.repeat))
+    print(f"  multi-pass paragraph walks : {multi:8.3f}s")
+    print(f"  fused TemplateAnalyzer pass: {single:8.3f}s  (full _analyze)")
+    print(f"  speedup                    : {multi / single:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Offline benchmark suite for the document pipeline.
+
+Builds synthetic thesis templates and content drafts at fixed sizes, times
+each pipeline stage with the LLM stubbed out, and compares the results with
+a stored baseline. Run with `python -m benchmarks --help` from backend/.
+"""
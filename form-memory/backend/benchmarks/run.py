@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+"""
+Run the offline document-pipeline benchmarks.
+
+Every case runs in a fresh process so its peak RSS is its own, with the LLM
+gateway stubbed and every cache (parsed templates, compiled templates, LLM
+responses) cold at the start of each repeat. Results are written as JSON and
+compared against a stored baseline.
+
+Usage (from backend/):
+    python -m benchmarks                                  # all cases, 100/1k/10k paragraphs
+    python -m benchmarks --sizes 100,1000 --cases template_analyzer,preview
+    python -m benchmarks --save-baseline                  # store results as the new baseline
+    python -m benchmarks --fail-on-regression             # exit 1 if slower than the baseline
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_RESULTS = BENCH_DIR / "results" / "latest.json"
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_THRESHOLD = 1.25
+
+
+# ----------------------------------------------------------------------
+# Cases: each receives the fixture paths for one size and a scratch dir
+# ----------------------------------------------------------------------
+
+def _extract_docx_styles(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from docx_inspector import extract_docx_styles
+    extract_docx_styles(str(fixtures["template"]))
+
+
+def _detect_style_usage(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from docx_inspector import detect_style_usage
+    detect_style_usage(str(fixtures["output"]))
+
+
+def _template_analyzer(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from engine.analyzer.template_analyzer import TemplateAnalyzer
+    TemplateAnalyzer(fixtures["template"]).get_analysis()
+
+
+def _advanced_template_analyzer(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from engine.analyzer.advanced_template_analyzer import AdvancedTemplateAnalyzer
+    AdvancedTemplateAnalyzer(str(fixtures["template"])).analyze_template_comprehensive()
+
+
+def _intelligent_template_adapter(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from engine.analyzer.intelligent_template_adapter import IntelligentTemplateAdapter
+    IntelligentTemplateAdapter(str(fixtures["template"])).analyze_template()
+
+
+def _complete_thesis_builder(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from engine.analyzer.complete_thesis_builder import CompleteThesisBuilder
+    # The stub answers with canned chapter JSON, so the build takes the direct insertion path
+    builder = CompleteThesisBuilder(
+        str(fixtures["template"]),
+        str(fixtures["draft"]),
+        str(scratch / "thesis.docx"),
+        use_ai=True,
+        api_key="benchmark",
+        include_frontmatter=True,
+    )
+    builder.build({
+        "title": "Analisis Pengaruh Sistem Informasi terhadap Kinerja Organisasi",
+        "author": "Mahasiswa Benchmark",
+        "nim": "1234567890",
+        "advisor": "Dosen Pembimbing",
+        "institution": "Universitas Benchmark",
+        "date": "2025",
+    })
+
+
+def _enhanced_preview(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from engine.analyzer.enhanced_preview_service import generate_enhanced_preview
+    result = generate_enhanced_preview(str(fixtures["output"]))
+    if result["status"] != "success":
+        raise RuntimeError(result.get("message", "preview failed"))
+
+
+def _fidelity_validator(fixtures: Dict[str, Path], scratch: Path) -> None:
+    from engine.validator.fidelity_validator import FidelityValidator
+    FidelityValidator(str(fixtures["template"]), str(fixtures["output"])).validate()
+
+
+CASES: Dict[str, Callable[[Dict[str, Path], Path], None]] = {
+    "extract_docx_styles": _extract_docx_styles,
+    "detect_style_usage": _detect_style_usage,
+    "template_analyzer": _template_analyzer,
+    "advanced_template_analyzer": _advanced_template_analyzer,
+    "intelligent_template_adapter": _intelligent_template_adapter,
+    "complete_thesis_builder": _complete_thesis_builder,
+    "preview": _enhanced_preview,
+    "fidelity_validator": _fidelity_validator,
+}
+
+
+# ----------------------------------------------------------------------
+# Isolation
+# ----------------------------------------------------------------------
+
+class StubLLM:
+    """Answers every gateway call instantly with the load test's canned responses and counts the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _content(self, request) -> str:
+        from loadtest.canned import canned_response
+        self.calls += 1
+        return canned_response(request)[1]
+
+    def send(self, api_key, base_url, timeout, request):
+        message = SimpleNamespace(content=self._content(request), role="assistant")
+        usage = SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=usage)
+
+
+def _isolate(scratch: Path) -> StubLLM:
+    """Point every cache at the scratch dir and replace the LLM transport (call before engine imports)."""
+    os.environ["LLM_CACHE_DISABLED"] = "true"
+    os.environ["COMPILED_TEMPLATE_DIR"] = str(scratch / "compiled")
+    os.environ["PREVIEW_CACHE_DIR"] = str(scratch / "previews")
+    os.environ.pop("OPENROUTER_API_KEY", None)
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+    from engine.ai.llm_gateway import get_llm_gateway
+    stub = StubLLM()
+    gateway = get_llm_gateway()
+    gateway._send = stub.send
+    gateway.max_retries = 0
+    return stub
+
+
+def _reset_caches(scratch: Path) -> None:
+    """Make the next repeat start cold."""
+    from engine.analyzer.compiled_template import COMPILED_TEMPLATES
+    from engine.analyzer.template_cache import TEMPLATE_STORE
+    TEMPLATE_STORE.clear()
+    COMPILED_TEMPLATES.clear()
+    shutil.rmtree(COMPILED_TEMPLATES.directory, ignore_errors=True)
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_case(name: str, fixtures: Dict[str, Path], repeat: int, scratch: Path) -> Dict[str, Any]:
+    """Run one case `repeat` times in the current process."""
+    stub = _isolate(scratch)
+    rss_before = _peak_rss_mb()
+    fn = CASES[name]
+    timings = []
+    for _ in range(repeat):
+        _reset_caches(scratch)
+        start = time.perf_counter()
+        fn(fixtures, scratch)
+        timings.append(time.perf_counter() - start)
+    return {
+        "wall_seconds": [round(t, 4) for t in timings],
+        "min_seconds": round(min(timings), 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "peak_rss_mb": _peak_rss_mb(),
+        "baseline_rss_mb": rss_before,
+        "llm_calls": stub.calls,
+    }
+
+
+def _child(name: str, fixtures: Dict[str, Path], repeat: int, scratch: Path, queue) -> None:
+    try:
+        queue.put(run_case(name, fixtures, repeat, scratch))
+    except BaseException as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(name: str, fixtures: Dict[str, Path], repeat: int, scratch: Path,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Run one case in a freshly spawned interpreter so its peak RSS is its own."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(name, fixtures, repeat, scratch, queue))
+    process.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:
+        process.terminate()
+        result = {"error": f"timed out after {timeout}s"}
+    process.join()
+    return result
+
+
+# ----------------------------------------------------------------------
+# Fixtures, reporting and baseline comparison
+# ----------------------------------------------------------------------
+
+def build_fixtures(root: Path, sizes: List[int]) -> Dict[int, Dict[str, Path]]:
+    """Generate (or reuse) the synthetic template, draft and output for each size."""
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    from benchmarks.synthetic import make_draft, make_output, make_template
+
+    fixtures = {}
+    for size in sizes:
+        directory = root / str(size)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "template": directory / "template.docx",
+            "draft": directory / "draft.txt",
+            "output": directory / "output.docx",
+        }
+        start = time.perf_counter()
+        if not paths["template"].exists():
+            make_template(paths["template"], size)
+        if not paths["draft"].exists():
+            make_draft(paths["draft"], size)
+        if not paths["output"].exists():
+            make_output(paths["output"], size)
+        print(f"[INFO] Fixtures for {size} paragraphs ready in {time.perf_counter() - start:.2f}s")
+        fixtures[size] = paths
+    return fixtures
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline run.
+
+    Returns:
+        One row per case/size present in both, with the time and RSS ratios
+        and whether the time ratio exceeds `threshold`
+    """
+    rows = []
+    for key, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(key)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        time_ratio = current["min_seconds"] / previous["min_seconds"] if previous["min_seconds"] else 1.0
+        rss_ratio = current["peak_rss_mb"] / previous["peak_rss_mb"] if previous["peak_rss_mb"] else 1.0
+        rows.append({
+            "case": key,
+            "baseline_seconds": previous["min_seconds"],
+            "seconds": current["min_seconds"],
+            "time_ratio": round(time_ratio, 3),
+            "rss_ratio": round(rss_ratio, 3),
+            "regression": time_ratio > threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated paragraph counts")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated case names")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the minimum is reported")
+    parser.add_argument("--output", default=str(DEFAULT_RESULTS), help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Time ratio above which a case counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any case regressed")
+    parser.add_argument("--fixtures-dir", default=None, help="Reuse fixtures from this directory")
+    parser.add_argument("--timeout", type=float, default=1800, help="Seconds allowed per case")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run cases in this process (easier to profile; RSS is cumulative)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)} (choose from {', '.join(CASES)})")
+
+    workdir = Path(tempfile.mkdtemp(prefix="folio-bench-"))
+    fixtures_root = Path(args.fixtures_dir) if args.fixtures_dir else workdir / "fixtures"
+    try:
+        fixtures = build_fixtures(fixtures_root, sizes)
+        results: Dict[str, Any] = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "cases": {},
+        }
+
+        for case in cases:
+            for size in sizes:
+                key = f"{case}[{size}]"
+                scratch = workdir / "scratch" / key
+                scratch.mkdir(parents=True, exist_ok=True)
+                if args.in_process:
+                    try:
+                        result = run_case(case, fixtures[size], args.repeat, scratch)
+                    except Exception as e:
+                        result = {"error": f"{type(e).__name__}: {e}"}
+                else:
+                    result = run_isolated(case, fixtures[size], args.repeat, scratch, timeout=args.timeout)
+                results["cases"][key] = result
+                if "error" in result:
+                    print(f"  {key:<42} ERROR {result['error']}")
+                else:
+                    print(f"  {key:<42} {result['min_seconds']:>9.3f}s  {result['peak_rss_mb']:>8.1f} MB"
+                          f"  (llm calls: {result['llm_calls']})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"[INFO] Results written to {output}")
+
+    baseline_path = Path(args.baseline)
+    regressions = []
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        rows = compare(results, baseline, args.threshold)
+        print(f"[INFO] Compared with baseline from {baseline.get('created_at', '?')}:")
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"  {row['case']:<42} {row['baseline_seconds']:>9.3f}s -> {row['seconds']:>9.3f}s"
+                  f"  x{row['time_ratio']:<6} rss x{row['rss_ratio']}{flag}")
+        regressions = [row for row in rows if row["regression"]]
+    else:
+        print(f"[INFO] No baseline at {baseline_path}; run with --save-baseline to store one")
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"[INFO] Baseline saved to {baseline_path}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Synthetic Fixtures
+Deterministic Indonesian-thesis-shaped documents for benchmarking: a template
+(front matter, TOC, chapter skeletons with instructions and placeholders,
+back matter), a plain-text content draft, and a filled output. The paragraph
+count scales with `paragraphs`, so the same layout exists at every size.
+"""
+
+import random
+from pathlib import Path
+from typing import List, Union
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Cm, Pt
+
+CHAPTER_TITLES = [
+    "PENDAHULUAN",
+    "TINJAUAN PUSTAKA",
+    "METODOLOGI PENELITIAN",
+    "HASIL DAN PEMBAHASAN",
+    "KESIMPULAN DAN SARAN",
+]
+SUBSECTIONS = [
+    "Latar Belakang", "Rumusan Masalah", "Tujuan Penelitian", "Manfaat Penelitian",
+    "Batasan Masalah", "Landasan Teori", "Penelitian Terdahulu", "Kerangka Pemikiran",
+]
+ROMAN = ["I", "II", "III", "IV", "V"]
+
+_WORDS = (
+    "penelitian ini bertujuan untuk menganalisis pengaruh sistem informasi terhadap kinerja "
+    "organisasi dengan menggunakan metode kuantitatif data dikumpulkan melalui kuesioner yang "
+    "disebarkan kepada responden hasil analisis menunjukkan bahwa terdapat hubungan signifikan "
+    "antara variabel bebas dan variabel terikat pada tingkat kepercayaan lima persen"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 18) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph_text(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 4)))
+
+
+def _chapter_plan(paragraphs: int) -> List[int]:
+    """Body paragraphs per chapter, so the whole document has about `paragraphs` paragraphs."""
+    body = max(len(CHAPTER_TITLES), paragraphs - 40)
+    per_chapter = body // len(CHAPTER_TITLES)
+    plan = [per_chapter] * len(CHAPTER_TITLES)
+    plan[0] += body - per_chapter * len(CHAPTER_TITLES)
+    return plan
+
+
+def _new_document() -> Document:
+    doc = Document()
+    section = doc.sections[0]
+    section.left_margin = Cm(4)
+    section.top_margin = Cm(3)
+    section.right_margin = Cm(3)
+    section.bottom_margin = Cm(3)
+    normal = doc.styles["Normal"]
+    normal.font.name = "Times New Roman"
+    normal.font.size = Pt(12)
+    return doc
+
+
+def _centered(doc: Document, text: str, bold: bool = False) -> None:
+    para = doc.add_paragraph()
+    para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    para.add_run(text).bold = bold
+
+
+def _front_matter(doc: Document) -> None:
+    _centered(doc, "JUDUL SKRIPSI", bold=True)
+    _centered(doc, "SKRIPSI")
+    _centered(doc, "Diajukan untuk memenuhi salah satu syarat memperoleh gelar Sarjana")
+    _centered(doc, "Oleh: [Nama Mahasiswa]")
+    _centered(doc, "NIM: [NIM]")
+    _centered(doc, "PROGRAM STUDI [NAMA PROGRAM STUDI]")
+    _centered(doc, "[NAMA UNIVERSITAS]")
+    _centered(doc, "[TAHUN]")
+
+    for title in ("LEMBAR PENGESAHAN", "PERNYATAAN ORISINALITAS", "KATA PENGANTAR", "ABSTRAK", "ABSTRACT"):
+        doc.add_page_break()
+        _centered(doc, title, bold=True)
+        doc.add_paragraph(f"Tuliskan {title.lower()} di sini sesuai dengan ketentuan yang berlaku.")
+
+    doc.add_page_break()
+    _centered(doc, "DAFTAR ISI", bold=True)
+    page = 1
+    for number, title in zip(ROMAN, CHAPTER_TITLES):
+        doc.add_paragraph(f"BAB {number} {title}\t{page}")
+        page += 7
+    doc.add_paragraph(f"DAFTAR PUSTAKA\t{page}")
+
+    for title in ("DAFTAR TABEL", "DAFTAR GAMBAR"):
+        doc.add_page_break()
+        _centered(doc, title, bold=True)
+        doc.add_paragraph(f"Tabel 1.1 Contoh isi {title.lower()}\t{page}")
+
+
+def _back_matter(doc: Document, rng: random.Random, filled: bool) -> None:
+    doc.add_page_break()
+    doc.add_heading("DAFTAR PUSTAKA", level=1)
+    for i in range(5):
+        if filled:
+            doc.add_paragraph(f"Penulis, A. ({2015 + i}). {_sentence(rng, 8)} Jurnal Sistem Informasi, {i + 1}(2), 10-20.")
+        else:
+            doc.add_paragraph("Tuliskan daftar pustaka sesuai format APA.")
+    doc.add_page_break()
+    doc.add_heading("LAMPIRAN", level=1)
+    doc.add_paragraph("Lampiran 1. Kuesioner Penelitian")
+
+
+def _chapters(doc: Document, rng: random.Random, paragraphs: int, filled: bool) -> None:
+    for (number, title), body in zip(zip(ROMAN, CHAPTER_TITLES), _chapter_plan(paragraphs)):
+        doc.add_page_break()
+        doc.add_heading(f"BAB {number}", level=1)
+        doc.add_heading(title, level=1)
+        chapter = ROMAN.index(number) + 1
+        per_section = max(1, body // len(SUBSECTIONS))
+        written = 0
+        for sub_index, subsection in enumerate(SUBSECTIONS):
+            if written >= body:
+                break
+            doc.add_heading(f"{chapter}.{sub_index + 1} {subsection}", level=2)
+            count = per_section if sub_index < len(SUBSECTIONS) - 1 else body - written
+            for _ in range(max(1, count)):
+                if filled:
+                    doc.add_paragraph(_paragraph_text(rng))
+                else:
+                    doc.add_paragraph(f"[Tuliskan {subsection.lower()} di sini. Jelaskan secara singkat dan jelas.]")
+                written += 1
+            if sub_index == 0:
+                table = doc.add_table(rows=3, cols=3)
+                for row_index, row in enumerate(table.rows):
+                    for col_index, cell in enumerate(row.cells):
+                        cell.text = f"Data {row_index}.{col_index}"
+                doc.add_paragraph(f"Tabel {chapter}.1 Contoh tabel {subsection.lower()}")
+
+
+def make_template(path: Union[str, Path], paragraphs: int, seed: int = 0) -> Path:
+    """Write a thesis template of about `paragraphs` paragraphs with instructions and placeholders."""
+    rng = random.Random(seed)
+    doc = _new_document()
+    _front_matter(doc)
+    _chapters(doc, rng, paragraphs, filled=False)
+    _back_matter(doc, rng, filled=False)
+    path = Path(path)
+    doc.save(str(path))
+    return path
+
+
+def make_output(path: Union[str, Path], paragraphs: int, seed: int = 0) -> Path:
+    """Write a filled thesis with the template's layout, standing in for a build output."""
+    rng = random.Random(seed)
+    doc = _new_document()
+    _front_matter(doc)
+    _chapters(doc, rng, paragraphs, filled=True)
+    _back_matter(doc, rng, filled=True)
+    path = Path(path)
+    doc.save(str(path))
+    return path
+
+
+def make_draft(path: Union[str, Path], paragraphs: int, seed: int = 0) -> Path:
+    """Write a plain-text content draft with chapter and subsection headings."""
+    rng = random.Random(seed)
+    lines = ["JUDUL: Analisis Pengaruh Sistem Informasi terhadap Kinerja Organisasi", ""]
+    for (number, title), body in zip(zip(ROMAN, CHAPTER_TITLES), _chapter_plan(paragraphs)):
+        lines += [f"BAB {number} {title}", ""]
+        chapter = ROMAN.index(number) + 1
+        per_section = max(1, body // len(SUBSECTIONS))
+        written = 0
+        for sub_index, subsection in enumerate(SUBSECTIONS):
+            if written >= body:
+                break
+            lines += [f"{chapter}.{sub_index + 1} {subsection}", ""]
+            count = per_section if sub_index < len(SUBSECTIONS) - 1 else body - written
+            for _ in range(max(1, count)):
+                lines += [_paragraph_text(rng), ""]
+                written += 1
+    lines += ["DAFTAR PUSTAKA", ""]
+    lines += [f"Penulis, A. ({2015 + i}). {_sentence(rng, 8)}" for i in range(5)]
+    path = Path(path)
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
@@ -0,0 +1,271 @@
+"""
+Blob Store
+Content-addressed storage for uploads, references and outputs. Every file is
+stored once under its SHA-256; the human-readable names in storage/uploads,
+storage/references and storage/outputs are hard-link aliases of the blob, so
+the inode link count doubles as the reference count. A background collector
+removes unreferenced blobs and evicts old aliases when over quota.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+
+STORAGE_QUOTA_BYTES = int(os.getenv("STORAGE_QUOTA_BYTES", str(2 * 1024 * 1024 * 1024)))
+STORAGE_GC_GRACE_SECONDS = float(os.getenv("STORAGE_GC_GRACE_SECONDS", "3600"))
+STORAGE_GC_INTERVAL_SECONDS = float(os.getenv("STORAGE_GC_INTERVAL_SECONDS", "600"))
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a file, read in 1 MB chunks."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class BlobStore:
+    """
+    Deduplicating blob store with hard-link aliases.
+
+    Blobs are immutable: never open an alias for writing in place, because the
+    write would go through to the shared blob. Call release() first so the
+    writer creates a fresh file, then put_file() to store the result.
+    """
+
+    def __init__(self, root: Union[str, Path], evictable: Iterable[Union[str, Path]] = (),
+                 quota_bytes: int = STORAGE_QUOTA_BYTES, grace_seconds: float = STORAGE_GC_GRACE_SECONDS):
+        """
+        Args:
+            root: Directory holding the blobs and the staging area
+            evictable: Alias directories the collector may prune when over quota
+            quota_bytes: Total blob size the collector tries to stay under
+            grace_seconds: Minimum age before an unreferenced blob or staging file is removed
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / "sha256"
+        self.staging_dir = self.root / "staging"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self.evictable = [Path(d) for d in evictable]
+        self.quota_bytes = quota_bytes
+        self.grace_seconds = grace_seconds
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._collector: Optional[threading.Thread] = None
+        self._linking_supported = True
+        self.writes = 0
+        self.dedup_hits = 0
+        self.collected = 0
+        self.evicted = 0
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def contains(self, digest: str) -> bool:
+        return self.blob_path(digest).exists()
+
+    def staging_path(self, suffix: str = "") -> Path:
+        """Unique path on the store's filesystem for writing a file before commit()."""
+        return self.staging_dir / f"{uuid.uuid4().hex}{suffix}"
+
+    def commit(self, path: Union[str, Path], digest: str) -> Path:
+        """
+        Move a fully written staging file into the store under its digest.
+
+        If the blob already exists the staging file is dropped, so storing the
+        same content again costs no further writes.
+        """
+        blob = self.blob_path(digest)
+        with self._lock:
+            if blob.exists():
+                Path(path).unlink(missing_ok=True)
+                self.dedup_hits += 1
+            else:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, blob)
+                self.writes += 1
+        return blob
+
+    def link(self, digest: str, alias: Union[str, Path]) -> Path:
+        """
+        Point a human-readable name at a blob, atomically replacing any existing file.
+
+        Falls back to a copy on filesystems without hard links.
+        """
+        alias = Path(alias)
+        blob = self.blob_path(digest)
+        alias.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if alias.exists() and os.path.samefile(alias, blob):
+                return alias
+        except OSError:
+            pass
+
+        temp = alias.with_name(f".{alias.name}.{uuid.uuid4().hex}.link")
+        with self._lock:
+            try:
+                os.link(blob, temp)
+            except OSError as e:
+                if self._linking_supported:
+                    print(f"[WARNING] Hard links unavailable in {alias.parent} ({e}); copying blobs instead")
+                    self._linking_supported = False
+                shutil.copyfile(blob, temp)
+            os.replace(temp, alias)
+        return alias
+
+    def put_file(self, path: Union[str, Path], digest: Optional[str] = None) -> str:
+        """
+        Store an existing file (e.g. a generated output) and turn it into an alias.
+
+        Returns:
+            The file's digest
+        """
+        path = Path(path)
+        digest = digest or file_digest(path)
+        blob = self.blob_path(digest)
+        with self._lock:
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(path, blob)
+                except OSError:
+                    shutil.copyfile(path, blob)
+                self.writes += 1
+                return digest
+            self.dedup_hits += 1
+        self.link(digest, path)
+        return digest
+
+    def release(self, alias: Union[str, Path]) -> None:
+        """Remove an alias so the name can be rewritten without touching the blob."""
+        Path(alias).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Garbage collection
+    # ------------------------------------------------------------------
+
+    def _blobs(self) -> List[Tuple[Path, os.stat_result]]:
+        blobs = []
+        for path in self.blob_dir.glob("*/*"):
+            try:
+                blobs.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return blobs
+
+    def _evictable_aliases(self) -> Dict[Tuple[int, int], List[Path]]:
+        """Map (device, inode) to the alias names found in the evictable directories."""
+        aliases: Dict[Tuple[int, int], List[Path]] = {}
+        for directory in self.evictable:
+            if not directory.exists():
+                continue
+            for path in directory.iterdir():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.is_file() and stat.st_nlink > 1:
+                    aliases.setdefault((stat.st_dev, stat.st_ino), []).append(path)
+        return aliases
+
+    def collect(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Run one garbage-collection pass.
+
+        Unreferenced blobs and abandoned staging files older than the grace period
+        are removed. If the store is still over quota, blobs whose every alias lives
+        in an evictable directory are removed, least recently linked first (a link
+        updates the inode change time).
+
+        Returns:
+            Counts of removed blobs, evicted blobs and the remaining size
+        """
+        now = time.time() if now is None else now
+        removed = evicted = 0
+
+        for path in self.staging_dir.iterdir():
+            try:
+                if now - path.stat().st_mtime > self.grace_seconds:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+        live = []
+        for path, stat in self._blobs():
+            if stat.st_nlink <= 1 and now - stat.st_ctime > self.grace_seconds:
+                with self._lock:
+                    # Re-check under the lock: link() may have just referenced it
+                    try:
+                        if path.stat().st_nlink <= 1:
+                            path.unlink()
+                            removed += 1
+                            continue
+                    except FileNotFoundError:
+                        continue
+            live.append((path, stat))
+
+        total = sum(stat.st_size for _, stat in live)
+        if total > self.quota_bytes:
+            aliases = self._evictable_aliases()
+            for path, stat in sorted(live, key=lambda item: item[1].st_ctime):
+                if total <= self.quota_bytes:
+                    break
+                names = aliases.get((stat.st_dev, stat.st_ino), [])
+                # Only evict when no alias lives outside the evictable directories
+                if stat.st_nlink - 1 != len(names) or now - stat.st_ctime <= self.grace_seconds:
+                    continue
+                with self._lock:
+                    for name in names:
+                        name.unlink(missing_ok=True)
+                    path.unlink(missing_ok=True)
+                total -= stat.st_size
+                evicted += 1
+
+        self.collected += removed
+        self.evicted += evicted
+        if removed or evicted:
+            print(f"[INFO] Blob store GC: removed {removed} unreferenced, evicted {evicted}, {total} bytes in use")
+        return {"removed": removed, "evicted": evicted, "total_bytes": total}
+
+    def start_collector(self, interval: float = STORAGE_GC_INTERVAL_SECONDS) -> None:
+        """Run collect() every `interval` seconds on a daemon thread."""
+        if self._collector is not None and self._collector.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.collect()
+                except Exception as e:
+                    print(f"[WARNING] Blob store GC failed: {e}")
+
+        self._collector = threading.Thread(target=run, name="blob-store-gc", daemon=True)
+        self._collector.start()
+
+    def stop_collector(self) -> None:
+        self._stop.set()
+        if self._collector is not None:
+            self._collector.join(timeout=5)
+            self._collector = None
+
+    def stats(self) -> Dict[str, int]:
+        blobs = self._blobs()
+        return {
+            "blobs": len(blobs),
+            "total_bytes": sum(stat.st_size for _, stat in blobs),
+            "quota_bytes": self.quota_bytes,
+            "writes": self.writes,
+            "dedup_hits": self.dedup_hits,
+            "collected": self.collected,
+            "evicted": self.evicted,
+        }
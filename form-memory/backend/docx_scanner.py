@@ -0,0 +1,338 @@
+"""
+Streaming DOCX scanner.
+
+Reads styles, page margins, chapter/body style guesses and paragraph
+statistics straight from the ZIP members with lxml.etree.iterparse, without
+building a python-docx Document. Only word/styles.xml and word/document.xml
+are opened; each body-level element is cleared as soon as it has been read,
+so memory stays bounded by the largest single paragraph or table rather than
+the whole document.
+
+The results match docx_inspector's python-docx based heuristics:
+
+    scan = scan_docx("template.docx")
+    scan["chapter_style"], scan["body_style"], scan["margins"]
+"""
+
+import re
+import zipfile
+from collections import Counter
+from typing import Any, Dict, IO, Iterator, Optional, Tuple
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+STYLES_PART = "word/styles.xml"
+DOCUMENT_PART = "word/document.xml"
+
+# Paragraphs sampled for the chapter/body style guesses (as detect_style_usage did)
+STYLE_SAMPLE_PARAGRAPHS = 500
+
+CHAPTER_PATTERN = re.compile(r"^BAB\s+(?:[IVX]+|\d+)", re.IGNORECASE)
+
+# Built-in style names stored in lowercase, shown capitalised by Word and python-docx
+_UI_STYLE_NAMES = {"caption": "Caption", "footer": "Footer", "header": "Header",
+                   **{f"heading {i}": f"Heading {i}" for i in range(1, 10)}}
+
+
+def _w(tag: str) -> str:
+    return "{%s}%s" % (W_NS, tag)
+
+
+W_VAL = _w("val")
+BODY = _w("body")
+P = _w("p")
+R = _w("r")
+TBL = _w("tbl")
+SDT = _w("sdt")
+SECT_PR = _w("sectPr")
+STYLE = _w("style")
+HYPERLINK = _w("hyperlink")
+# Body-level elements that can be large; everything else at body level is a marker element
+_BODY_BLOCKS = (P, TBL, SDT, SECT_PR, _w("customXml"), _w("altChunk"))
+
+# Byte patterns used by read_margins to find the first section without parsing paragraphs
+_ROOT_TAG = re.compile(rb"<(?![?!])[^>]*>")
+_ROOT_NAME = re.compile(rb"<([^\s>/]+)")
+_SECT_PR_OPEN = re.compile(rb"<(?:[\w.-]+:)?sectPr[\s/>]")
+_SECT_PR_TAG = re.compile(rb"<(/)?(?:[\w.-]+:)?sectPr(?=[\s/>])[^>]*?(/)?>")
+
+_RUN_TEXT = {_w("tab"): "\t", _w("ptab"): "\t", _w("cr"): "\n", _w("noBreakHyphen"): "-"}
+
+
+class DocxScanError(ValueError):
+    """The file is not a readable DOCX package."""
+
+
+def _clear(elem) -> None:
+    """Free a processed element and the already processed siblings before it."""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _ui_name(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    return _UI_STYLE_NAMES.get(name.lower(), name)
+
+
+def read_styles(stream: IO[bytes]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], Optional[str]]:
+    """
+    Read style definitions from a styles.xml stream.
+
+    Returns:
+        (styles, paragraph_style_names, default_paragraph_style_id) where
+        styles is keyed by styleId in extract_docx_styles' format and
+        paragraph_style_names maps paragraph styleIds to their display names.
+    """
+    styles: Dict[str, Dict[str, Any]] = {}
+    names: Dict[str, str] = {}
+    default_id: Optional[str] = None
+
+    # styles.xml is small next to document.xml, so it is parsed whole
+    for style in etree.parse(stream).getroot().iterchildren(STYLE):
+        style_id = style.get(_w("styleId"))
+        if not style_id:
+            continue
+
+        if style.get(_w("type"), "paragraph") == "paragraph":
+            name_elem = style.find(_w("name"))
+            names[style_id] = _ui_name(name_elem.get(W_VAL)) if name_elem is not None else style_id
+            if style.get(_w("default")) in ("1", "true", "on"):
+                # The spec says the last default wins
+                default_id = style_id
+
+        based = style.find(_w("basedOn"))
+        font = size = None
+        rpr = style.find(_w("rPr"))
+        if rpr is not None:
+            sz = rpr.find(_w("sz"))
+            if sz is not None and sz.get(W_VAL):
+                size = int(sz.get(W_VAL)) / 2
+            rfonts = rpr.find(_w("rFonts"))
+            if rfonts is not None:
+                font = rfonts.get(_w("ascii"))
+
+        spacing = ind = None
+        ppr = style.find(_w("pPr"))
+        if ppr is not None:
+            spacing = ppr.find(_w("spacing"))
+            ind = ppr.find(_w("ind"))
+
+        styles[style_id] = {
+            "font": font,
+            "size": size,
+            "based_on": based.get(W_VAL) if based is not None else None,
+            "paragraph": {
+                "line_spacing": spacing.get(_w("line")) if spacing is not None else None,
+                "line_rule": spacing.get(_w("lineRule")) if spacing is not None else None,
+                "indent_first_line": ind.get(_w("firstLine")) if ind is not None else None,
+                "indent_left": ind.get(_w("left")) if ind is not None else None,
+                "indent_right": ind.get(_w("right")) if ind is not None else None,
+            },
+        }
+
+    return styles, names, default_id
+
+
+def _margins(sect_pr) -> Dict[str, Optional[str]]:
+    pg_mar = sect_pr.find(_w("pgMar"))
+    if pg_mar is None:
+        return {}
+    return {side: pg_mar.get(_w(side)) for side in ("top", "bottom", "left", "right")}
+
+
+def _paragraph_text(p) -> str:
+    """Text of a paragraph's runs, including runs inside hyperlinks (as python-docx reads it)."""
+    parts = []
+    for child in p:
+        runs = (child,) if child.tag == R else child.iterchildren(R) if child.tag == HYPERLINK else ()
+        for run in runs:
+            for item in run:
+                if item.tag == _w("t"):
+                    parts.append(item.text or "")
+                elif item.tag == _w("br"):
+                    if item.get(_w("type"), "textWrapping") == "textWrapping":
+                        parts.append("\n")
+                else:
+                    parts.append(_RUN_TEXT.get(item.tag, ""))
+    return "".join(parts)
+
+
+def iter_body(stream: IO[bytes]) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a document.xml body as ("paragraph", (style_id, text)), ("table", None)
+    and ("section", margins) events, in document order.
+
+    Only paragraphs directly in the body are reported, like Document.paragraphs;
+    every body-level element is cleared once it has been handled.
+    """
+    for _, elem in etree.iterparse(stream, events=("end",), tag=_BODY_BLOCKS, huge_tree=True):
+        if elem.tag == SECT_PR:
+            # Paragraph-level sectPr (end of an earlier section) or the body's final one
+            yield "section", _margins(elem)
+            if elem.getparent() is not None and elem.getparent().tag == BODY:
+                _clear(elem)
+            continue
+
+        parent = elem.getparent()
+        if parent is None or parent.tag != BODY:
+            # Nested in a table or content control; handled with its body-level ancestor
+            continue
+
+        if elem.tag == P:
+            style = None
+            ppr = elem.find(_w("pPr"))
+            if ppr is not None:
+                pstyle = ppr.find(_w("pStyle"))
+                if pstyle is not None:
+                    style = pstyle.get(W_VAL)
+            yield "paragraph", (style, _paragraph_text(elem))
+        elif elem.tag == TBL:
+            yield "table", None
+        _clear(elem)
+
+
+def _open_package(docx_path) -> zipfile.ZipFile:
+    if not zipfile.is_zipfile(docx_path):
+        raise DocxScanError("File is not a valid DOCX/ZIP file")
+    archive = zipfile.ZipFile(docx_path)
+    missing = [part for part in (STYLES_PART, DOCUMENT_PART) if part not in archive.namelist()]
+    if missing:
+        archive.close()
+        raise DocxScanError(f"Missing files in DOCX: {missing}")
+    return archive
+
+
+def scan_docx(docx_path, sample_paragraphs: int = STYLE_SAMPLE_PARAGRAPHS) -> Dict[str, Any]:
+    """
+    Scan a DOCX in a single streaming pass.
+
+    Args:
+        docx_path: Path to the .docx file
+        sample_paragraphs: Leading body paragraphs used for the chapter/body style guesses
+
+    Returns:
+        Dict with styles and margins (as extract_docx_styles), chapter_style and
+        body_style (as detect_style_usage) and paragraph_stats.
+
+    Raises:
+        DocxScanError: If the file is not a DOCX package
+    """
+    with _open_package(docx_path) as archive:
+        with archive.open(STYLES_PART) as stream:
+            styles, names, default_id = read_styles(stream)
+        default_name = names.get(default_id, "Normal") if default_id else "Normal"
+
+        margins: Optional[Dict[str, Optional[str]]] = None
+        chapter_style = "Heading 1"
+        body_candidates: Counter = Counter()
+        style_counts: Counter = Counter()
+        stats = {"paragraphs": 0, "empty_paragraphs": 0, "characters": 0, "tables": 0, "sections": 0}
+
+        with archive.open(DOCUMENT_PART) as stream:
+            for kind, value in iter_body(stream):
+                if kind == "section":
+                    stats["sections"] += 1
+                    if margins is None:
+                        margins = value
+                    continue
+                if kind == "table":
+                    stats["tables"] += 1
+                    continue
+
+                style_id, text = value
+                name = names.get(style_id, default_name) if style_id else default_name
+                stats["paragraphs"] += 1
+                style_counts[name] += 1
+                text = text.strip()
+                if not text:
+                    stats["empty_paragraphs"] += 1
+                    continue
+                stats["characters"] += len(text)
+
+                if stats["paragraphs"] > sample_paragraphs:
+                    continue
+                if CHAPTER_PATTERN.match(text):
+                    chapter_style = name
+                # Body text: long, not all caps (titles), not a heading style
+                if len(text) > 60 and not text.isupper() and "Heading" not in name and "JUDUL" not in name:
+                    body_candidates[name] += 1
+
+    stats["styles_used"] = dict(style_counts.most_common())
+    return {
+        "styles": styles,
+        "margins": margins or {},
+        "chapter_style": chapter_style,
+        "body_style": body_candidates.most_common(1)[0][0] if body_candidates else "Normal",
+        "paragraph_stats": stats,
+    }
+
+
+def _first_sect_pr(stream: IO[bytes], chunk_size: int = 1 << 16):
+    """
+    The first sectPr element of a document.xml stream, or None if there is none.
+
+    Margins are all that is needed here, so instead of parsing every paragraph
+    the decompressed bytes are searched for the first sectPr and only that
+    element is parsed, under a copy of the root tag for its namespaces.
+    """
+    buffer = b""
+    root = None
+    found = False
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        if root is None:
+            match = _ROOT_TAG.search(buffer)
+            if match is not None:
+                root = match.group(0)
+                buffer = buffer[match.end():]
+        if root is not None and not found:
+            match = _SECT_PR_OPEN.search(buffer)
+            if match is not None:
+                found = True
+                buffer = buffer[match.start():]
+            else:
+                # Keep enough for a tag split across chunks
+                buffer = buffer[-64:]
+        if found:
+            end = _sect_pr_end(buffer)
+            if end is not None:
+                root_name = _ROOT_NAME.match(root).group(1)
+                return etree.fromstring(root + buffer[:end] + b"</" + root_name + b">")[0]
+        if not chunk:
+            return None
+
+
+def _sect_pr_end(buffer: bytes) -> Optional[int]:
+    """End offset of the sectPr element starting at buffer[0], once it is complete."""
+    depth = 0
+    for match in _SECT_PR_TAG.finditer(buffer):
+        if match.group(1):
+            depth -= 1
+        elif not match.group(2):
+            depth += 1
+        if depth == 0:
+            return match.end()
+    return None
+
+
+def read_margins(docx_path) -> Dict[str, Optional[str]]:
+    """Page margins of the first section, as extract_docx_styles reports them."""
+    with _open_package(docx_path) as archive:
+        try:
+            with archive.open(DOCUMENT_PART) as stream:
+                sect_pr = _first_sect_pr(stream)
+            return _margins(sect_pr) if sect_pr is not None else {}
+        except etree.XMLSyntaxError:
+            pass
+        # Markup the byte search cannot isolate: fall back to the streaming parse
+        with archive.open(DOCUMENT_PART) as stream:
+            for kind, value in iter_body(stream):
+                if kind == "section":
+                    return value
+    return {}
@@ -10,6 +10,7 @@ from pathlib import Path
 from engine.ai.text_generation import AbstractGenerator, PrefaceGenerator
 from engine.ai.semantic_parser import SemanticParser
 from engine.ai.qa_explainer import QAExplainer
+from engine.ai.llm_gateway import get_llm_gateway
 
 # Try to import AI semantic parser
 try:
@@ -193,49 +194,18 @@ ENHANCEMENT REQUIREMENTS:
 
 ENHANCED TEXT (return only the improved text, no explanations):"""
 
-            # Call OpenRouter API using OpenAI client format for better reliability
-            try:
-                from openai import OpenAI
-
-                client = OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=self.api_key,
-                )
-
-                response = client.chat.completions.create(
-                    model="anthropic/claude-3-haiku",
-                    messages=[{"role": "user", "content": enhancement_prompt}],
-                    max_tokens=4000,
-                    temperature=0.3,  # Lower temperature for consistent academic writing
-                    extra_body={"reasoning": {"enabled": True}}  # Enable reasoning for better quality
-                )
-
-                enhanced_text = response.choices[0].message.content.strip()
-
-            except ImportError:
-                # Fallback to requests if openai package not available
-                import requests
-
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "anthropic/claude-3-haiku",
-                        "messages": [{"role": "user", "content": enhancement_prompt}],
-                        "max_tokens": 4000,
-                        "temperature": 0.3
-                    },
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    enhanced_text = result["choices"][0]["message"]["content"].strip()
-                else:
-                    raise Exception(f"API request failed with status {response.status_code}")
+            # Call OpenRouter through the shared, pooled LLM gateway
+            client = get_llm_gateway().client(self.api_key, "academic_content_enhancer.enhance")
+            response = client.chat.completions.create(
+                model="anthropic/claude-3-haiku",
+                messages=[{"role": "user", "content": enhancement_prompt}],
+                max_tokens=4000,
+                temperature=0.3,  # Lower temperature for consistent academic writing
+                extra_body={"reasoning": {"enabled": True}},  # Enable reasoning for better quality
+                timeout=30
+            )
+
+            enhanced_text = response.choices[0].message.content.strip()
 
             # Validate enhancement quality
             if len(enhanced_text) > len(content) * 0.5:  # Ensure meaningful enhancement
@@ -315,40 +285,27 @@ TASK: Analyze the current structure and provide an optimized version that follow
 OPTIMIZED CONTENT:"""
 
             # Call AI for structure optimization
-            import requests
-
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "openai/gpt-oss-120b:free",
-                    "messages": [{"role": "user", "content": structure_prompt}],
-                    "max_tokens": 4000,
-                    "temperature": 0.2  # Very low temperature for structural consistency
-                },
+            client = get_llm_gateway().client(self.api_key, "academic_content_enhancer.optimize_structure")
+            response = client.chat.completions.create(
+                model="openai/gpt-oss-120b:free",
+                messages=[{"role": "user", "content": structure_prompt}],
+                max_tokens=4000,
+                temperature=0.2,  # Very low temperature for structural consistency
                 timeout=30
             )
 
-            if response.status_code == 200:
-                result = response.json()
-                optimized_text = result["choices"][0]["message"]["content"].strip()
-
-                if len(optimized_text) > len(content) * 0.7:  # Ensure meaningful optimization
-                    optimized["text"] = optimized_text
-                    optimized["improvements"].extend([
-                        f"Structure optimized for {content_type} format",
-                        "Logical flow improved with proper transitions",
-                        "Academic organization enhanced per Indonesian standards"
-                    ])
-                else:
-                    optimized["text"] = content
-                    optimized["improvements"].append("Structure optimization returned insufficient content")
+            optimized_text = (response.choices[0].message.content or "").strip()
+
+            if len(optimized_text) > len(content) * 0.7:  # Ensure meaningful optimization
+                optimized["text"] = optimized_text
+                optimized["improvements"].extend([
+                    f"Structure optimized for {content_type} format",
+                    "Logical flow improved with proper transitions",
+                    "Academic organization enhanced per Indonesian standards"
+                ])
             else:
                 optimized["text"] = content
-                optimized["improvements"].append(f"Structure optimization API call failed (status {response.status_code})")
+                optimized["improvements"].append("Structure optimization returned insufficient content")
 
         except Exception as e:
             optimized["text"] = content
@@ -5,7 +5,8 @@ Classifies front matter blocks by intent using AI.
 
 import json
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway
+from .llm_cache import cached_completion
 
 
 class FrontMatterClassifier:
@@ -66,10 +67,7 @@ OUTPUT FORMAT:
     
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.client = get_llm_gateway().client(api_key, "front_matter_classifier", base_url=base_url)
     
     def classify(self, blocks: List[str]) -> List[Dict[str, Any]]:
         """Classify list of front matter blocks."""
@@ -82,7 +80,9 @@ OUTPUT FORMAT:
                 f"BLOCK {i}:\n{block}" for i, block in enumerate(blocks)
             )
             
-            response = self.client.chat.completions.create(
+            content = cached_completion(
+                self.client,
+                "front_matter_classifier.classify",
                 model="openai/gpt-oss-20b:free",
                 messages=[
                     {
@@ -98,7 +98,6 @@ OUTPUT FORMAT:
                 extra_body={"reasoning": {"enabled": True}}
             )
             
-            content = response.choices[0].message.content
             result = self._extract_json(content)
             
             # Ensure we have classifications for all blocks
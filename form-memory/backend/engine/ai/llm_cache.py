@@ -0,0 +1,323 @@
+"""
+LLM Response Cache
+Persistent SQLite cache of chat completion responses keyed by model,
+normalized messages and sampling parameters, so retries with unchanged
+input skip the OpenRouter round trip entirely.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[3] / "storage" / "cache" / "llm_cache.sqlite3"
+DEFAULT_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+class LLMResponseCache:
+    """
+    Content-addressed store of LLM responses.
+
+    Entries expire after `ttl_seconds`; when the stored responses exceed
+    `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES, enabled: Optional[bool] = None):
+        self.path = Path(path or os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        if enabled is None:
+            enabled = os.getenv("LLM_CACHE_DISABLED", "false").lower() not in ("true", "1", "yes")
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], temperature: Optional[float] = None,
+                 **params) -> str:
+        """Hash of the request fields that determine the response."""
+        normalized = [
+            {
+                "role": str(message.get("role", "")).strip().lower(),
+                "content": " ".join(str(message.get("content", "")).split()),
+            }
+            for message in messages
+        ]
+        payload = {
+            "model": model,
+            "messages": normalized,
+            "temperature": None if temperature is None else round(float(temperature), 4),
+            "params": params,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup and storage
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, call_site: str = "default", record: bool = True) -> Optional[str]:
+        """Return a cached response, or None on miss, expiry or when disabled.
+
+        Args:
+            key: Key from make_key()
+            call_site: Name used for hit-rate metrics
+            record: Set False to peek without counting a hit or miss
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] <= self.ttl_seconds:
+                    conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    if record:
+                        self._record(call_site, "hits")
+                    return row[0]
+                if row:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                if record:
+                    self._record(call_site, "misses")
+        except sqlite3.Error as e:
+            print(f"[WARNING] LLM cache read failed: {e}")
+        return None
+
+    def put(self, key: str, response: str, call_site: str = "default", model: str = "") -> None:
+        """Store a response and evict old entries beyond the size budget."""
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(key, call_site, model, response, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, call_site, model, response, size, now, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+                self._record(call_site, "stores")
+        except sqlite3.Error as e:
+            print(f"[WARNING] LLM cache write failed: {e}")
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry, e.g. when its response turned out unusable."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[WARNING] LLM cache invalidate failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached response and reset metrics."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+            self._metrics.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-call-site hit/miss counters plus overall storage usage."""
+        entries, total_bytes = 0, 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    entries, total_bytes = self._connect().execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+                    ).fetchone()
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            call_sites = {}
+            for call_site, counts in self._metrics.items():
+                lookups = counts.get("hits", 0) + counts.get("misses", 0)
+                call_sites[call_site] = {
+                    **counts,
+                    "hit_rate": round(counts.get("hits", 0) / lookups, 3) if lookups else 0.0,
+                }
+        return {
+            "enabled": self.enabled,
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "call_sites": call_sites,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, call_site TEXT, model TEXT, response TEXT, "
+                "size INTEGER, created_at REAL, last_access REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)")
+            self._conn = conn
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired entries, then least recently used ones over budget."""
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        for key, size in conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+
+    def record(self, call_site: str, counter: str) -> None:
+        """Increment a per-call-site counter ('hits', 'misses' or 'stores')."""
+        with self._lock:
+            self._record(call_site, counter)
+
+    def _record(self, call_site: str, counter: str) -> None:
+        """Increment a per-call-site counter (caller holds the lock)."""
+        counts = self._metrics.setdefault(call_site, {"hits": 0, "misses": 0, "stores": 0})
+        counts[counter] += 1
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
+
+
+def cached_completion(client, call_site: str, use_cache: bool = True,
+                      validate: Optional[Callable[[str], bool]] = None, **request) -> str:
+    """
+    Run `client.chat.completions.create(**request)` through the response cache.
+
+    Args:
+        client: OpenAI-compatible client
+        call_site: Name used for per-call-site hit-rate metrics
+        use_cache: Set False to bypass the cache for this call
+        validate: Optional check; responses failing it are returned but not stored
+        **request: Arguments for chat.completions.create (model, messages, ...)
+
+    Returns:
+        The message content of the first choice
+    """
+    cache = get_llm_cache()
+    params = {k: v for k, v in request.items() if k not in ("model", "messages", "temperature")}
+    key = cache.make_key(request.get("model", ""), request.get("messages", []),
+                         request.get("temperature"), **params)
+
+    if use_cache:
+        cached = cache.get(key, call_site)
+        if cached is not None:
+            print(f"[AI] Cache hit for {call_site} ({request.get('model')})")
+            return cached
+
+    if hasattr(client, "with_call_site"):
+        # Attribute gateway latency/token metrics to the same call site
+        client = client.with_call_site(call_site)
+    response = client.chat.completions.create(**request)
+    content = response.choices[0].message.content if response.choices else None
+    content = content or ""
+
+    if use_cache and content and (validate is None or validate(content)):
+        cache.put(key, content, call_site, request.get("model", ""))
+    return content
+
+
+def cached_race_completion(client, call_site: str, models: List[str], use_cache: bool = True,
+                           validate: Optional[Callable[[str], bool]] = None, **request) -> Tuple[str, str]:
+    """
+    Hedged completion over a model fallback list, through the response cache.
+
+    A cached response from any candidate model is returned without touching
+    the network; otherwise the models are raced by the gateway and the
+    winning response is stored under its own model's key.
+
+    Args:
+        client: Gateway client (plain OpenAI clients fall back to trying models in order)
+        call_site: Name used for per-call-site metrics
+        models: Candidate models in order of preference
+        use_cache: Set False to bypass the cache for this call
+        validate: Optional check; failing responses lose the race and are not stored
+        **request: Arguments for chat.completions.create other than model
+
+    Returns:
+        Tuple of (model, message content)
+    """
+    cache = get_llm_cache()
+    params = {k: v for k, v in request.items() if k not in ("messages", "temperature")}
+
+    def key_for(model: str) -> str:
+        return cache.make_key(model, request.get("messages", []), request.get("temperature"), **params)
+
+    if use_cache:
+        for model in models:
+            cached = cache.get(key_for(model), call_site, record=False)
+            if cached is not None and (validate is None or validate(cached)):
+                cache.record(call_site, "hits")
+                print(f"[AI] Cache hit for {call_site} ({model})")
+                return model, cached
+        cache.record(call_site, "misses")
+
+    gateway = getattr(client, "gateway", None)
+    if gateway is not None:
+        model, content = gateway.race(call_site, models, api_key=client.api_key, base_url=client.base_url,
+                                      validate=validate, **request)
+    else:
+        model, content, last_error = None, None, None
+        for candidate in models:
+            try:
+                content = cached_completion(client, call_site, use_cache=False, model=candidate, **request)
+                if content and (validate is None or validate(content)):
+                    model = candidate
+                    break
+                last_error = ValueError("Response failed validation")
+            except Exception as e:
+                last_error = e
+                print(f"[AI] Model {candidate} failed: {e}")
+        if model is None:
+            raise last_error or ValueError("All AI models failed to respond")
+
+    if use_cache:
+        cache.put(key_for(model), content, call_site, model)
+    return model, content
@@ -0,0 +1,587 @@
+"""
+LLM Gateway
+Process-wide access point for OpenRouter chat completions.
+Clients are built once per API key and reused so connections stay alive
+between requests; every call shares the same timeouts, retry policy,
+concurrency limit and latency/token accounting.
+"""
+
+import contextvars
+import http.client
+import json
+import os
+import random
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from ..metrics import REGISTRY
+
+
+DEFAULT_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+DEFAULT_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+DEFAULT_HEDGE_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "4"))
+DEFAULT_HEDGE_MAX_PARALLEL = int(os.getenv("LLM_HEDGE_MAX_PARALLEL", "3"))
+# How often a race attempt waiting for a concurrency slot checks whether it was cancelled
+SLOT_POLL_SECONDS = 0.05
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "folio_llm_request_duration_seconds", "LLM request latency by call site, model and outcome",
+    ["call_site", "model", "outcome"],
+)
+LLM_TOKENS = REGISTRY.counter(
+    "folio_llm_tokens_total", "LLM tokens used by call site, model and kind (prompt/completion)",
+    ["call_site", "model", "kind"],
+)
+
+
+class LLMGatewayError(Exception):
+    """HTTP error returned by the completion endpoint."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LLMConfigurationError(LLMGatewayError):
+    """The gateway is not configured to make calls (e.g. no API key)."""
+
+
+def _resolve_api_key(api_key: Optional[str]) -> str:
+    """Return the explicit key or OPENROUTER_API_KEY; fail before any request is sent without one."""
+    key = api_key or os.getenv("OPENROUTER_API_KEY")
+    if not key:
+        raise LLMConfigurationError("No OpenRouter API key configured: set OPENROUTER_API_KEY or pass api_key")
+    return key
+
+
+class _AbandonedAttempt(Exception):
+    """A race attempt that lost to another model."""
+
+
+class _Cancellation:
+    """
+    Cancel token for one race attempt.
+
+    Once race() has a winner it cancels the attempts still running: the
+    callbacks registered through on_cancel() run at once (shutting down the
+    attempt's connection) and the attempt gives up instead of retrying.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[WARNING] Cancelling LLM attempt failed: {e}")
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        """Run `callback` if the attempt is cancelled while inside the block."""
+        with self._lock:
+            cancelled = self.cancelled
+            if not cancelled:
+                self._callbacks.append(callback)
+        if cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if any(registered is callback for registered in self._callbacks):
+                    self._callbacks.remove(callback)
+
+
+# Cancel token of the race attempt running in the current thread, if any
+_current_attempt: contextvars.ContextVar[Optional[_Cancellation]] = contextvars.ContextVar(
+    "llm_race_attempt", default=None
+)
+
+
+def _attempt_cancelled() -> bool:
+    cancel = _current_attempt.get()
+    return cancel is not None and cancel.cancelled
+
+
+def _shutdown(conn: http.client.HTTPConnection) -> None:
+    """Unblock a thread waiting on this connection (close() alone does not wake a blocked read)."""
+    sock = conn.sock
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _HTTPTransport:
+    """
+    Minimal keep-alive JSON transport used when the openai package is missing.
+
+    One persistent HTTPS connection is kept per thread and reopened if the
+    server closed it. A cancelled race attempt has its connection shut down,
+    so the thread blocked on the response returns at once.
+    """
+
+    def __init__(self, base_url: str):
+        parsed = urlparse(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.netloc
+        self.path = parsed.path.rstrip("/")
+        self._local = threading.local()
+
+    def post(self, endpoint: str, api_key: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        response = self._open(endpoint, api_key, payload, timeout)
+        with self._abortable(self._local.conn):
+            return json.loads(response.read().decode("utf-8"))
+
+    @contextmanager
+    def _abortable(self, conn: http.client.HTTPConnection) -> Iterator[None]:
+        """Shut `conn` down if the race attempt using it is cancelled inside the block."""
+        cancel = _current_attempt.get()
+        if cancel is None:
+            yield
+            return
+        try:
+            with cancel.on_cancel(lambda: _shutdown(conn)):
+                yield
+        finally:
+            if cancel.cancelled:
+                # The response may have been cut off; never reuse the connection
+                self._close()
+
+    def _open(self, endpoint: str, api_key: str, payload: Dict[str, Any], timeout: float):
+        """Send the request on the pooled connection and return the response."""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        }
+        for attempt in range(2):
+            conn = self._connection(timeout)
+            try:
+                with self._abortable(conn):
+                    conn.request("POST", f"{self.path}{endpoint}", body=body, headers=headers)
+                    response = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Stale pooled connection; reconnect once
+                self._close()
+                if attempt or _attempt_cancelled():
+                    raise
+        if response.status != 200:
+            data = response.read()
+            raise LLMGatewayError(
+                f"API request failed with status {response.status}: {data[:200]!r}", response.status
+            )
+        return response
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = factory(self.host, timeout=timeout)
+            self._local.conn = conn
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+
+def _to_namespace(value: Any) -> Any:
+    """Convert a decoded JSON response into attribute-style objects."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
+
+
+class _Completions:
+    def __init__(self, owner: "GatewayClient"):
+        self._owner = owner
+
+    def create(self, **request):
+        return self._owner.gateway.complete(
+            self._owner.call_site, api_key=self._owner.api_key, base_url=self._owner.base_url, **request
+        )
+
+
+class GatewayClient:
+    """
+    Drop-in replacement for `OpenAI(...)` exposing `chat.completions.create`.
+
+    Calls are routed through the shared gateway and attributed to `call_site`.
+    """
+
+    def __init__(self, gateway: "LLMGateway", api_key: Optional[str], call_site: str, base_url: Optional[str]):
+        self.gateway = gateway
+        self.api_key = api_key
+        self.call_site = call_site
+        self.base_url = base_url
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def with_call_site(self, call_site: str) -> "GatewayClient":
+        """Return a client for the same key whose calls are attributed to `call_site`."""
+        return GatewayClient(self.gateway, self.api_key, call_site, self.base_url)
+
+
+class LLMGateway:
+    """
+    Shared, pooled access to OpenAI-compatible chat completion endpoints.
+
+    Args:
+        base_url: Default endpoint
+        timeout: Default per-call timeout in seconds
+        max_retries: Retries for rate limits, 5xx responses and network errors
+        max_concurrency: Maximum number of requests in flight process-wide
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 max_retries: int = DEFAULT_MAX_RETRIES, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._transports: Dict[str, _HTTPTransport] = {}
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+
+    def client(self, api_key: Optional[str] = None, call_site: str = "default",
+               base_url: Optional[str] = None) -> GatewayClient:
+        """Return a lightweight client bound to this gateway."""
+        return GatewayClient(self, api_key, call_site, base_url)
+
+    def complete(self, call_site: str = "default", api_key: Optional[str] = None,
+                 base_url: Optional[str] = None, timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, **request):
+        """
+        Run a chat completion with pooling, retries and accounting.
+
+        Args:
+            call_site: Name used for per-call-site metrics
+            api_key: OpenRouter key (defaults to OPENROUTER_API_KEY)
+            base_url: Endpoint override
+            timeout: Per-call timeout in seconds
+            max_retries: Per-call retry override
+            **request: chat.completions.create arguments (model, messages, ...)
+
+        Returns:
+            Response object exposing `choices[0].message.content` and `usage`
+
+        Raises:
+            LLMConfigurationError: If no API key is passed or configured
+        """
+        api_key = _resolve_api_key(api_key)
+        base_url = base_url or self.base_url
+        timeout = timeout or self.timeout
+        retries = self.max_retries if max_retries is None else max(0, max_retries)
+        model = request.get("model")
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                with self._slot():
+                    response = self._send(api_key, base_url, timeout, request)
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                if _attempt_cancelled():
+                    self._record(call_site, elapsed, model=model, cancelled=True)
+                    raise _AbandonedAttempt(f"{model} was cancelled") from e
+                if attempt < retries and self._is_retryable(e):
+                    attempt += 1
+                    delay = self._backoff(attempt)
+                    self._record(call_site, elapsed, model=model, retry=True)
+                    print(f"[WARNING] LLM call {call_site} failed ({e}); retry {attempt}/{retries} in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                self._record(call_site, elapsed, model=model, error=True)
+                raise
+            self._record(call_site, time.perf_counter() - start, model=model,
+                         usage=getattr(response, "usage", None))
+            return response
+
+    def race(self, call_site: str, models: List[str], api_key: Optional[str] = None,
+             base_url: Optional[str] = None, validate: Optional[Callable[[str], bool]] = None,
+             hedge_delay: float = DEFAULT_HEDGE_DELAY_SECONDS,
+             max_parallel: int = DEFAULT_HEDGE_MAX_PARALLEL, **request) -> Tuple[str, str]:
+        """
+        Hedged completion over a model fallback list.
+
+        The first model starts immediately; the next candidate is launched when
+        `hedge_delay` passes without an answer or as soon as a running attempt
+        fails, with at most `max_parallel` attempts in flight. The first valid
+        response wins. Attempts that have not started are cancelled. Ones
+        already on the wire are cancelled too and their results discarded: the
+        stdlib transport shuts their connections down at once, while the openai
+        client cannot interrupt a request, which then finishes in the
+        background. Either way an attempt keeps its concurrency slot until its
+        request has actually returned, so `max_concurrency` bounds the requests
+        really in flight upstream.
+
+        Args:
+            call_site: Name used for per-call-site metrics
+            models: Candidate models in order of preference
+            validate: Optional check on the response content
+            hedge_delay: Seconds to wait on the running attempts before hedging
+            max_parallel: Maximum number of concurrent attempts
+            **request: chat.completions.create arguments other than model
+
+        Returns:
+            Tuple of (winning model, response content)
+        """
+        if not models:
+            raise ValueError("No models to try")
+        # A missing key fails every candidate the same way; report it once, up front
+        api_key = _resolve_api_key(api_key)
+        executor = self._hedge_pool()
+        queue = list(models)
+        pending: Dict[Any, str] = {}
+        cancels: Dict[Any, _Cancellation] = {}
+        last_error: Optional[Exception] = None
+
+        def launch() -> None:
+            model = queue.pop(0)
+            if len(queue) < len(models) - 1:
+                self._count(call_site, "hedges")
+            print(f"[AI] Attempting {call_site} with model: {model}")
+            # With candidates left, failing fast beats retrying: the next model is the retry
+            options = dict(api_key=api_key, base_url=base_url, max_retries=0 if len(models) > 1 else None)
+            cancel = _Cancellation()
+            future = executor.submit(self._run_attempt, cancel, self.complete, call_site,
+                                     model=model, **options, **request)
+            pending[future] = model
+            cancels[future] = cancel
+
+        launch()
+        next_hedge = time.monotonic() + hedge_delay
+        try:
+            while pending:
+                can_hedge = bool(queue) and len(pending) < max(1, max_parallel)
+                timeout = max(0.0, next_hedge - time.monotonic()) if can_hedge else None
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    launch()
+                    next_hedge = time.monotonic() + hedge_delay
+                    continue
+
+                for future in done:
+                    model = pending.pop(future)
+                    try:
+                        response = future.result()
+                        content = response.choices[0].message.content if response.choices else None
+                        if not content:
+                            raise ValueError("Empty response from AI")
+                        if validate is not None and not validate(content):
+                            raise ValueError("Response failed validation")
+                    except _AbandonedAttempt:
+                        continue
+                    except Exception as e:
+                        last_error = e
+                        print(f"[AI] Model {model} failed: {e}")
+                        continue
+                    print(f"[AI] {call_site} answered by {model}")
+                    return model, content
+
+                # Fast failure: hedge immediately instead of waiting out the delay
+                if queue and len(pending) < max(1, max_parallel):
+                    launch()
+                    next_hedge = time.monotonic() + hedge_delay
+        finally:
+            for future in pending:
+                future.cancel()
+                cancels[future].cancel()
+
+        raise last_error or ValueError("All AI models failed to respond")
+
+    @staticmethod
+    def _run_attempt(cancel: _Cancellation, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run one race attempt on a worker thread, cancellable through `cancel`."""
+        token = _current_attempt.set(cancel)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_attempt.reset(token)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-call-site latency, error and token counters."""
+        with self._lock:
+            call_sites = {}
+            for call_site, counts in self._metrics.items():
+                calls = counts["calls"]
+                call_sites[call_site] = {
+                    **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in counts.items()},
+                    "avg_latency_seconds": round(counts["latency_seconds"] / calls, 3) if calls else 0.0,
+                }
+        return {
+            "transport": "openai" if OPENAI_AVAILABLE else "http",
+            "clients": len(self._clients) + len(self._transports),
+            "timeout_seconds": self.timeout,
+            "max_retries": self.max_retries,
+            "max_concurrency": self.max_concurrency,
+            "call_sites": call_sites,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        """
+        Hold a concurrency slot until the call returns, even one cancelled by a race.
+
+        A race attempt still waiting for a slot gives up as soon as it is
+        cancelled instead of tying up a hedge worker until a slot frees.
+        """
+        while not self._semaphore.acquire(timeout=SLOT_POLL_SECONDS):
+            if _attempt_cancelled():
+                raise _AbandonedAttempt("cancelled while waiting for a slot")
+        try:
+            if _attempt_cancelled():
+                raise _AbandonedAttempt("cancelled before it was sent")
+            yield
+        finally:
+            self._semaphore.release()
+
+    def _send(self, api_key: str, base_url: str, timeout: float, request: Dict[str, Any]):
+        """Issue one request over the pooled client for this key and endpoint."""
+        if OPENAI_AVAILABLE:
+            return self._openai_client(api_key, base_url).chat.completions.create(timeout=timeout, **request)
+
+        payload = {k: v for k, v in request.items() if k != "extra_body"}
+        payload.update(request.get("extra_body") or {})
+        data = self._transport(base_url).post("/chat/completions", api_key, payload, timeout)
+        return _to_namespace(data)
+
+    def _openai_client(self, api_key: str, base_url: str):
+        """Return the shared OpenAI client for a key, building it once."""
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # Retries are handled here so they honour the shared backoff policy
+                client = OpenAI(api_key=api_key, base_url=base_url, timeout=self.timeout, max_retries=0)
+                self._clients[key] = client
+            return client
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        """Worker threads for hedged attempts; the semaphore still bounds the network."""
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency * 2, thread_name_prefix="llm-hedge"
+                )
+            return self._hedge_executor
+
+    def _transport(self, base_url: str) -> _HTTPTransport:
+        with self._lock:
+            transport = self._transports.get(base_url)
+            if transport is None:
+                transport = _HTTPTransport(base_url)
+                self._transports[base_url] = transport
+            return transport
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Rate limits, server errors, timeouts and dropped connections are retried."""
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in RETRYABLE_STATUS
+        name = type(error).__name__
+        return isinstance(error, (TimeoutError, ConnectionError, http.client.HTTPException)) \
+            or "Timeout" in name or "Connection" in name
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter, capped at 8 seconds."""
+        return random.uniform(0, min(8.0, 0.5 * (2 ** attempt)))
+
+    def _record(self, call_site: str, elapsed: float, usage: Any = None,
+                retry: bool = False, error: bool = False, counter: Optional[str] = None,
+                model: Optional[str] = None, cancelled: bool = False) -> None:
+        if counter is None:
+            self._export(call_site, model or "unknown", elapsed, usage,
+                         "retry" if retry else "cancelled" if cancelled else "error" if error else "ok")
+        with self._lock:
+            counts = self._metrics.setdefault(call_site, {
+                "calls": 0, "errors": 0, "retries": 0, "hedges": 0, "cancelled": 0, "latency_seconds": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            if counter is not None:
+                counts[counter] += 1
+                return
+            counts["latency_seconds"] += elapsed
+            if retry:
+                counts["retries"] += 1
+                return
+            if cancelled:
+                counts["cancelled"] += 1
+                return
+            counts["calls"] += 1
+            if error:
+                counts["errors"] += 1
+            if usage is not None:
+                counts["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+                counts["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    @staticmethod
+    def _export(call_site: str, model: str, elapsed: float, usage: Any, outcome: str) -> None:
+        """Per-model latency and token usage for /metrics."""
+        LLM_REQUEST_SECONDS.observe(elapsed, call_site=call_site, model=model, outcome=outcome)
+        if usage is not None:
+            for kind in ("prompt", "completion"):
+                tokens = getattr(usage, f"{kind}_tokens", 0) or 0
+                if tokens:
+                    LLM_TOKENS.inc(tokens, call_site=call_site, model=model, kind=kind)
+
+    def _count(self, call_site: str, counter: str) -> None:
+        self._record(call_site, 0.0, counter=counter)
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Return the process-wide LLM gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
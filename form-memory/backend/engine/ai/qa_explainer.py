@@ -6,7 +6,7 @@ Severity grouping and reporting only - no formatting advice.
 
 import json
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway
 
 
 class QAExplainer:
@@ -50,10 +50,7 @@ OUTPUT FORMAT:
     
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter or custom endpoint."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key or "OPENROUTER_API_KEY",
-        )
+        self.client = get_llm_gateway().client(api_key, "qa_explainer", base_url=base_url)
     
     def explain_diffs(self, diffs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Explain XML diffs in Indonesian."""
@@ -6,7 +6,8 @@ Detects chapter, section, and element boundaries by meaning.
 
 import json
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway
+from .llm_cache import cached_completion
 
 
 class SemanticParser:
@@ -77,15 +78,14 @@ Be conservative: if unsure, lower confidence and add warning."""
     
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.client = get_llm_gateway().client(api_key, "semantic_parser", base_url=base_url)
     
     def parse(self, text: str) -> Dict[str, Any]:
         """Parse raw text into semantic structure."""
         try:
-            response = self.client.chat.completions.create(
+            content = cached_completion(
+                self.client,
+                "semantic_parser.parse",
                 model="openai/gpt-oss-20b:free",
                 messages=[
                     {
@@ -101,8 +101,6 @@ Be conservative: if unsure, lower confidence and add warning."""
                 extra_body={"reasoning": {"enabled": True}}
             )
             
-            content = response.choices[0].message.content
-            
             # Extract JSON from response
             result = self._extract_json(content)
             return result
@@ -6,7 +6,8 @@ ASSISTIVE ONLY - executor must not blindly trust output.
 
 import json
 from typing import Dict, Any, Optional, List
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway
+from .llm_cache import cached_completion
 
 
 class StyleIntentInference:
@@ -63,17 +64,16 @@ CONFIDENCE GUIDELINES:
     
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.client = get_llm_gateway().client(api_key, "style_intent_inference", base_url=base_url)
     
     def infer(self, style_data: Dict[str, Any]) -> Dict[str, Any]:
         """Infer semantic role from style data."""
         try:
             prompt = self._build_prompt(style_data)
             
-            response = self.client.chat.completions.create(
+            content = cached_completion(
+                self.client,
+                "style_intent_inference.infer",
                 model="openai/gpt-oss-20b:free",
                 messages=[
                     {
@@ -89,7 +89,6 @@ CONFIDENCE GUIDELINES:
                 extra_body={"reasoning": {"enabled": True}}
             )
             
-            content = response.choices[0].message.content
             result = self._extract_json(content)
             
             # Validate confidence
@@ -6,6 +6,8 @@ Uses AI to intelligently determine where content should be placed in different t
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import json
+from .llm_cache import cached_completion
+from .llm_gateway import get_llm_gateway
 
 
 class TemplateContentPlacer:
@@ -99,11 +101,7 @@ class TemplateContentPlacer:
             Placement recommendations
         """
         try:
-            from openai import OpenAI
-            client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=self.api_key
-            )
+            client = get_llm_gateway().client(self.api_key, "template_content_placer")
             
             prompt = f"""You are an expert in Indonesian academic thesis template analysis. Analyze this template structure and provide intelligent content placement recommendations.
 
@@ -150,7 +148,9 @@ OUTPUT FORMAT (JSON):
     ]
 }}"""
             
-            response = client.chat.completions.create(
+            result_text = cached_completion(
+                client,
+                "template_content_placer.placement",
                 model="openai/gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an expert in Indonesian academic thesis formatting and template analysis."},
@@ -160,8 +160,6 @@ OUTPUT FORMAT (JSON):
                 max_tokens=2000
             )
             
-            result_text = response.choices[0].message.content
-            
             # Parse JSON response
             try:
                 # Extract JSON from response (might have markdown code blocks)
@@ -5,7 +5,7 @@ Never called from executor - requires user consent.
 """
 
 from typing import Optional, Dict, Any
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway
 
 
 class AbstractGenerator:
@@ -24,10 +24,7 @@ RULES:
 
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.client = get_llm_gateway().client(api_key, "text_generation.abstract", base_url=base_url)
     
     def generate_abstract_id(
         self,
@@ -123,10 +120,7 @@ RULES:
 
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.client = get_llm_gateway().client(api_key, "text_generation.preface", base_url=base_url)
     
     def generate_preface(
         self,
@@ -5,7 +5,7 @@ Fully rewrites raw thesis content using AI for academic quality enhancement.
 
 from typing import Dict, List, Any, Optional
 import json
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway
 
 
 class ThesisRewriter:
@@ -36,10 +36,7 @@ Raw content to rewrite:
 
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """Initialize with OpenRouter."""
-        self.client = OpenAI(
-            base_url=base_url or "https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.client = get_llm_gateway().client(api_key, "thesis_rewriter", base_url=base_url)
 
     def rewrite_thesis(self, raw_text: str) -> Dict[str, Any]:
         """Rewrite raw thesis text using AI."""
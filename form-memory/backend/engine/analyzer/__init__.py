@@ -7,5 +7,6 @@ from .template_analyzer import TemplateAnalyzer
 from .content_extractor import ContentExtractor
 from .content_mapper import ContentMapper
 from .document_merger import DocumentMerger
+from .template_cache import TemplateStore, get_template_store
 
-__all__ = ['TemplateAnalyzer', 'ContentExtractor', 'ContentMapper', 'DocumentMerger']
+__all__ = ['TemplateAnalyzer', 'ContentExtractor', 'ContentMapper', 'DocumentMerger', 'TemplateStore', 'get_template_store']
@@ -12,6 +12,7 @@ from docx.shared import Pt, Inches
 from .advanced_template_analyzer import TemplateStructure, ZoneType
 from .content_zone_mapper import InsertionPlan, ContentItem, ContentType
 from .style_inheritance_engine import StyleInheritanceEngine, StyleRules
+from .paragraph_index import paragraph_index
 
 
 class InsertionStrategy(Enum):
@@ -294,10 +295,11 @@ class AdaptiveInsertionEngine:
         """
         try:
             # Find the target paragraph
-            if zone.start_paragraph >= len(doc.paragraphs):
+            paragraphs = paragraph_index(doc)
+            if zone.start_paragraph >= len(paragraphs):
                 return False
 
-            target_para = doc.paragraphs[zone.start_paragraph]
+            target_para = paragraphs[zone.start_paragraph]
 
             # Clear existing content
             target_para.clear()
@@ -325,13 +327,14 @@ class AdaptiveInsertionEngine:
         try:
             # Find insertion point considering hierarchy
             insert_position = self._find_hierarchy_aware_position(zone, template_structure)
+            paragraphs = paragraph_index(doc)
 
-            if insert_position >= len(doc.paragraphs):
+            if insert_position >= len(paragraphs):
                 # Append to document
-                new_para = doc.add_paragraph(content_item.content)
+                new_para = paragraphs.add_paragraph(content_item.content)
                 target_para = new_para
             else:
-                target_para = doc.paragraphs[insert_position]
+                target_para = paragraphs[insert_position]
                 target_para.clear()
                 run = target_para.add_run(content_item.content)
 
@@ -486,7 +489,7 @@ class AdaptiveInsertionEngine:
         # Check document integrity
         try:
             # Basic validation that document is still readable
-            para_count = len(context.document.paragraphs)
+            para_count = len(paragraph_index(context.document))
             if para_count < 10:
                 result.errors.append("Document appears corrupted after insertion")
         except Exception as e:
@@ -499,7 +502,7 @@ class AdaptiveInsertionEngine:
             # This would require additional libraries for TOC updating
 
             # Clean up any remaining placeholders
-            for para in doc.paragraphs:
+            for para in paragraph_index(doc):
                 if para.text.strip() in ['[empty]', 'TULISKAN ISI', 'Format paragraf dengan style']:
                     para.clear()
 
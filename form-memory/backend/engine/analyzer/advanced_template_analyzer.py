@@ -15,6 +15,7 @@ from docx.shared import Pt, RGBColor, Inches
 from docx.enum.style import WD_STYLE_TYPE
 from dataclasses import dataclass, field
 from enum import Enum
+from .template_cache import TEMPLATE_STORE
 
 
 class ZoneType(Enum):
@@ -202,7 +203,7 @@ class AdvancedTemplateAnalyzer:
     def _load_template(self) -> None:
         """Load and validate the DOCX template"""
         try:
-            self.doc = Document(str(self.template_path))
+            self.doc = TEMPLATE_STORE.borrow(self.template_path)
             if self.doc:
                 print(f"[INFO] Loaded template: {len(self.doc.paragraphs)} paragraphs, "
                       f"{len(self.doc.tables)} tables, {len(self.doc.styles)} styles")
@@ -700,7 +701,7 @@ class AdvancedTemplateAnalyzer:
             if match:
                 if len(match.groups()) >= 2:
                     info['numbering'] = f"{match.group(1)}.{match.group(2)}"
-                    info['title'] = match.group(-1)  # Last group is usually the title
+                    info['title'] = match.groups()[-1]  # Last group is usually the title
                 break
 
         return info
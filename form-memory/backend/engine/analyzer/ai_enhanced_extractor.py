@@ -5,10 +5,13 @@ Combines rule-based extraction with AI semantic analysis for better chapter dete
 
 from typing import Dict, List, Any, Tuple, Optional
 import re
+import threading
 from pathlib import Path
-from docx import Document
-from .content_extractor import ContentExtractor
+from .content_source import ContentSource
 from ..ai.semantic_parser import SemanticParser
+from ..ai.llm_gateway import get_llm_gateway
+from .generation_planner import GenerationPlanner
+from ..tracing import DEBUG, get_tracer
 from enum import Enum
 
 # Try to import AI semantic parser
@@ -18,6 +21,8 @@ try:
 except ImportError:
     AI_AVAILABLE = False
 
+trace = get_tracer("ai_extractor")
+
 
 class SectionType(str, Enum):
     """Document section types identified by AI."""
@@ -38,28 +43,55 @@ class SectionType(str, Enum):
 class AIEnhancedContentExtractor:
     """Extracts content using AI semantic analysis when available."""
     
-    def __init__(self, content_path: str, use_ai: bool = True, api_key: Optional[str] = None):
-        """Initialize with content file.
+    def __init__(self, content_path: str, use_ai: bool = True, api_key: Optional[str] = None,
+                 source: Optional[ContentSource] = None):
+        """Initialize with content file. Nothing is read or generated until first use.
 
         Args:
             content_path: Path to DOCX or TXT file
             use_ai: Whether to use AI semantic analysis (if available)
             api_key: OpenRouter API key for AI features
+            source: Shared content source; the file is read through it at most once
         """
         self.content_path = Path(content_path)
         self.is_docx = self.content_path.suffix.lower() == '.docx'
         self.use_ai = use_ai and AI_AVAILABLE and api_key is not None
         self.api_key = api_key
         self.semantic_parser = SemanticParser(api_key=api_key) if self.use_ai else None
-        
-        # Load content - keep ContentExtractor object separately
-        self._content_extractor = ContentExtractor(str(self.content_path))
-        loaded_content = self._content_extractor._load_content()
+        self.source = source if source is not None else ContentSource(
+            str(self.content_path), use_ai=use_ai, api_key=api_key
+        )
+
+        # Rule-based view of the same source
+        self._content_extractor = self.source.extractor
 
         # Store analyzed data for access by thesis builder
         self.analyzed_data = None
-        self.raw_text = self._extract_raw_text()
-        self.sections = self._extract_sections()
+        self._sections = None
+        self._extract_lock = threading.RLock()
+
+    @property
+    def raw_text(self) -> str:
+        """All text content of the source."""
+        return self.source.raw_text
+
+    @property
+    def sections(self) -> List[Dict[str, Any]]:
+        """Sections from AI (or rule-based) extraction, extracted on first access."""
+        if self._sections is None:
+            self.extract()
+        return self._sections
+
+    @sections.setter
+    def sections(self, value: List[Dict[str, Any]]) -> None:
+        self._sections = value
+
+    def extract(self) -> List[Dict[str, Any]]:
+        """Run the extraction (and AI generation, when enabled) once."""
+        with self._extract_lock:
+            if self._sections is None:
+                self._sections = self._extract_sections()
+        return self._sections
     
     def _load_content(self) -> Dict[str, Any]:
         """Load content from file."""
@@ -70,38 +102,29 @@ class AIEnhancedContentExtractor:
     
     def _extract_from_docx(self) -> Dict[str, Any]:
         """Extract content from DOCX file."""
-        doc = Document(self.content_path)
-        
+        metadata = self.source.metadata
         return {
             "sections": [],  # Will be populated by _extract_sections()
-            "raw_text": self._get_docx_text(doc),
-            "tables": self._extract_tables_from_docx(doc),
+            "raw_text": self.source.raw_text,
+            "tables": self.source.tables,
             "metadata": {
-                "title": doc.core_properties.title or "",
-                "author": doc.core_properties.author or "",
+                "title": metadata.get("title", ""),
+                "author": metadata.get("author", ""),
             }
         }
     
     def _extract_from_text(self) -> Dict[str, Any]:
         """Extract content from TXT file."""
-        with open(self.content_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
         return {
             "sections": [],  # Will be populated by _extract_sections()
-            "raw_text": text,
+            "raw_text": self.source.raw_text,
             "tables": [],
             "metadata": {}
         }
     
     def _extract_raw_text(self) -> str:
         """Get all text content."""
-        if self.is_docx:
-            doc = Document(self.content_path)
-            return self._get_docx_text(doc)
-        else:
-            with open(self.content_path, 'r', encoding='utf-8') as f:
-                return f.read()
+        return self.source.raw_text
     
     def _extract_sections(self) -> List[Dict[str, Any]]:
         """Extract sections using AI if available, fallback to rules."""
@@ -212,87 +235,10 @@ class AIEnhancedContentExtractor:
         return sections
 
     def _generate_comprehensive_thesis_content(self, raw_text: str) -> Dict[str, Any]:
-        """Generate comprehensive thesis content using AI with detailed prompt."""
-        import json
-
-        prompt = f"""
-You are analyzing Indonesian thesis draft text and converting it into structured academic content.
-
-Raw Text:
-{raw_text}
-
-Generate comprehensive thesis content in valid JSON format. Each section should have substantive academic content.
-
-Return ONLY valid JSON:
-
-{{
-  "metadata": {{
-    "title": "Full thesis title",
-    "author": "Author name",
-    "nim": "Student ID"
-  }},
-
-  "abstract": {{
-    "indonesian": "Complete Indonesian abstract (200-300 words) with background, objectives, methods, and conclusions.",
-    "english": "Complete English abstract (200-300 words) same content as Indonesian.",
-    "keywords_id": ["keyword1", "keyword2", "keyword3"],
-    "keywords_en": ["keyword1", "keyword2", "keyword3"]
-  }},
-
-  "chapter1": {{
-    "latar_belakang": "Write 2-3 paragraphs explaining the research background and context.",
-    "rumusan_masalah": "Write 1-2 paragraphs stating the research problems clearly.",
-    "tujuan_penelitian": "Write 1-2 paragraphs describing research objectives.",
-    "manfaat_penelitian": "Write 1 paragraph explaining research benefits.",
-    "batasan_masalah": "Write 1 paragraph defining research scope and limitations."
-  }},
-
-  "chapter2": {{
-    "landasan_teori": "Write 2-3 paragraphs covering fundamental theories.",
-    "penelitian_terkait": "Write 2 paragraphs reviewing related research.",
-    "kerangka_pemikiran": "Write 1-2 paragraphs explaining the conceptual framework."
-  }},
-
-  "chapter3": {{
-    "desain_penelitian": "Write 1-2 paragraphs describing research design.",
-    "metode_pengumpulan_data": "Write 2 paragraphs detailing data collection methods.",
-    "metode_analisis": "Write 1-2 paragraphs explaining analysis methods.",
-    "tools": "Write 1 paragraph listing tools and technologies."
-  }},
-
-  "chapter4": {{
-    "analisis_kebutuhan": "Write 2 paragraphs analyzing system requirements.",
-    "perancangan_sistem": "Write 2-3 paragraphs describing system design.",
-    "perancangan_interface": "Write 1-2 paragraphs explaining interface design."
-  }},
-
-  "chapter5": {{
-    "implementasi": "Write 2 paragraphs describing system implementation.",
-    "hasil_pengujian": "Write 2 paragraphs presenting testing results.",
-    "pembahasan": "Write 2 paragraphs discussing results.",
-    "evaluasi": "Write 1-2 paragraphs evaluating system performance."
-  }},
-
-  "chapter6": {{
-    "kesimpulan": "Write 2 paragraphs drawing conclusions.",
-    "saran": "Write 1-2 paragraphs providing recommendations."
-  }},
-
-  "references": [
-    "Reference 1 in APA format",
-    "Reference 2 in APA format"
-  ]
-}}
-
-IMPORTANT: Return ONLY the JSON object, NO extra text, no markdown code blocks, just pure JSON.
-The content must be in Indonesian, except for keywords_en and abstract.english.
-Expand the raw text into professional, academic paragraphs. If the draft is sparse, use your knowledge to fill in standard academic details for a Computer Science/Informatika thesis.
-"""
-
+        """Generate comprehensive thesis content using per-section AI prompts run in parallel."""
         try:
-            # Call AI with comprehensive prompt using OpenAI client directly
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key, base_url="https://openrouter.ai/api/v1")
+            # Generate each chapter and the front matter as separate prompts through the shared LLM gateway
+            client = get_llm_gateway().client(self.api_key, "ai_enhanced_extractor")
 
             models_to_try = [
                 "google/gemini-2.0-flash-exp:free",
@@ -304,110 +250,30 @@ Expand the raw text into professional, academic paragraphs. If the draft is spar
                 "deepseek/deepseek-chat:free",
                 "microsoft/phi-3-medium-128k-instruct:free"
             ]
-            
-            last_error = None
-            response = None
-            
-            for model_name in models_to_try:
-                try:
-                    print(f"[AI] Attempting content generation with model: {model_name}")
-                    response = client.chat.completions.create(
-                        model=model_name,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are an expert at analyzing Indonesian thesis content and generating comprehensive academic paragraphs."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        temperature=0.3
-                    )
-                    break # Success!
-                except Exception as e:
-                    last_error = e
-                    print(f"[AI] Model {model_name} failed: {e}")
-                    # Continue to next model regardless of error type (429, 404, etc.)
-                    continue
-            
-            if not response:
-                print(f"[ERROR] All AI models failed. Last error: {last_error}")
-                raise last_error or ValueError("All AI models failed to respond")
-
-            # Parse response
-            raw_response = response.choices[0].message.content if response.choices else str(response)
-            if not raw_response:
-                raise ValueError("Empty response from AI")
-
-            # Improved Clean response: find the first { and last }
-            import re
-            json_match = re.search(r'(\{.*\})', raw_response, re.DOTALL)
-            if json_match:
-                clean_response = json_match.group(1)
-            else:
-                clean_response = raw_response.replace('```json', '').replace('```', '').strip()
 
-            # Parse JSON with better error handling
-            try:
-                analyzed_data = json.loads(clean_response)
-            except json.JSONDecodeError as e:
-                print(f"[ERROR] JSON parsing failed: {e}")
-                print(f"[ERROR] Raw response length: {len(clean_response)} chars")
-                print(f"[ERROR] Raw response preview: {clean_response[:300]}...")
-
-                # Try to fix common JSON issues
-                fixed_response = clean_response
-
-                # Remove any trailing content after the last valid brace
-                last_brace = fixed_response.rfind('}')
-                if last_brace > 0:
-                    fixed_response = fixed_response[:last_brace + 1]
-
-                # Try parsing the fixed response
-                try:
-                    analyzed_data = json.loads(fixed_response)
-                    print("[INFO] Successfully parsed JSON after fixing")
-                except json.JSONDecodeError as e2:
-                    print(f"[ERROR] JSON still invalid after fixing: {e2}")
-
-                    # Last resort: try to extract partial data
-                    try:
-                        # Extract metadata if available
-                        metadata_match = re.search(r'"metadata"\s*:\s*\{[^}]*\}', fixed_response)
-                        if metadata_match:
-                            metadata_str = metadata_match.group()
-                            metadata = json.loads(f"{{{metadata_str}}}")
-                            analyzed_data = {'metadata': metadata}
-                            print("[WARNING] Only partial data extracted (metadata only)")
-                        else:
-                            raise ValueError("Could not extract any valid JSON")
-                    except Exception as e3:
-                        print(f"[ERROR] Fatal JSON extraction error: {e3}")
-                        print(f"[DEBUG] Full Raw AI Response:\n{raw_response}")
-                        raise ValueError(f"Could not extract JSON from AI response: {str(e2)}")
-
-            # VERIFY AI response has actual content
-            print(f"[VERIFY] AI response keys: {list(analyzed_data.keys())}")
-
-            for chapter_key in ['chapter1', 'chapter2', 'chapter3', 'chapter4', 'chapter5', 'chapter6']:
-                if chapter_key in analyzed_data:
-                    chapter_data = analyzed_data[chapter_key]
-                    print(f"\n[VERIFY] {chapter_key}:")
-                    for subsection, content in chapter_data.items():
+            planner = GenerationPlanner(client, models_to_try)
+            analyzed_data, failed_chunks = planner.generate(raw_text)
+
+            if not analyzed_data:
+                raise ValueError("All AI models failed to respond")
+
+            if failed_chunks:
+                # Keep what the AI produced; only the failed sections use fallback content
+                fallback_data = self._generate_fallback_content(self.raw_text)
+                for chunk in failed_chunks:
+                    print(f"[WARNING] Using fallback content for {chunk.name}: {chunk.error}")
+                    for key in chunk.keys:
+                        analyzed_data[key] = fallback_data[key]
+
+            # VERIFY AI response has actual content (previews are only built when tracing at debug level)
+            if trace.enabled(DEBUG):
+                trace.debug("AI response keys: %s", list(analyzed_data.keys()))
+                for chapter_key in ['chapter1', 'chapter2', 'chapter3', 'chapter4', 'chapter5', 'chapter6']:
+                    for subsection, content in analyzed_data.get(chapter_key, {}).items():
                         content_length = len(content) if content else 0
-                        preview = content[:100] if content else "[EMPTY]"
-                        # Handle Unicode characters safely
-                        try:
-                            print(f"  - {subsection}: {content_length} chars | Preview: {preview}...")
-                        except UnicodeEncodeError:
-                            safe_preview = preview.encode('ascii', 'replace').decode('ascii')
-                            print(f"  - {subsection}: {content_length} chars | Preview: {safe_preview}...")
-
-                        # ALERT if content is too short
-                        if content_length < 200:
-                            print(f"  ⚠️  WARNING: {subsection} content is too short ({content_length} chars)")
+                        trace.debug("%s %s: %s chars%s | Preview: %s...", chapter_key, subsection, content_length,
+                                    " (too short)" if content_length < 200 else "",
+                                    content[:100] if content else "[EMPTY]")
 
             # STOP if no content
             if all(len(str(v)) < 100 for v in analyzed_data.get('chapter1', {}).values()):
@@ -680,30 +546,6 @@ Expand the raw text into professional, academic paragraphs. If the draft is spar
         
         return "unknown"
     
-    def _get_docx_text(self, doc) -> str:
-        """Get all text from DOCX."""
-        return '\n'.join(para.text for para in doc.paragraphs)
-    
-    def _extract_tables_from_docx(self, doc) -> List[Dict[str, Any]]:
-        """Extract tables from DOCX."""
-        tables = []
-        
-        for i, table in enumerate(doc.tables):
-            table_data = {
-                "index": i,
-                "rows": len(table.rows),
-                "cols": len(table.columns),
-                "content": []
-            }
-            
-            for row in table.rows:
-                row_data = [cell.text for cell in row.cells]
-                table_data["content"].append(row_data)
-            
-            tables.append(table_data)
-        
-        return tables
-    
     def get_sections(self) -> List[Dict[str, Any]]:
         """Get extracted sections."""
         return self._content_extractor.get_sections()
@@ -10,6 +10,7 @@ import re
 from pathlib import Path
 from engine.ai.text_generation import AbstractGenerator
 from engine.ai.semantic_parser import SemanticParser
+from engine.ai.llm_gateway import get_llm_gateway
 from .mammoth_processor import MammothDocxProcessor
 
 
@@ -164,21 +165,17 @@ OUTPUT FORMAT: Provide a comprehensive JSON structure with:
 ANALYSIS:"""
 
         try:
-            # Call OpenRouter API using OpenAI client format for better reliability
+            # Call OpenRouter through the shared, pooled LLM gateway
             try:
-                from openai import OpenAI
-
-                client = OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=self.api_key,
-                )
+                client = get_llm_gateway().client(self.api_key, "ai_template_intelligence.analyze_structure")
 
                 response = client.chat.completions.create(
                     model="openai/gpt-oss-120b:free",  # Using the model from user's example
                     messages=[{"role": "user", "content": analysis_prompt}],
                     max_tokens=3000,
                     temperature=0.1,  # Very low temperature for consistent analysis
-                    extra_body={"reasoning": {"enabled": True}}  # Enable reasoning for better quality
+                    extra_body={"reasoning": {"enabled": True}},  # Enable reasoning for better quality
+                    timeout=45
                 )
 
                 ai_response = response.choices[0].message.content
@@ -196,39 +193,6 @@ ANALYSIS:"""
                     ai_analysis = self._parse_structured_analysis_response(ai_response)
                     print(f"[AI] Template analysis completed (parsed from text)")
 
-            except ImportError:
-                # Fallback to requests if openai package not available
-                import requests
-
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "openai/gpt-oss-120b:free",
-                        "messages": [{"role": "user", "content": analysis_prompt}],
-                        "max_tokens": 3000,
-                        "temperature": 0.1
-                    },
-                    timeout=45
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result["choices"][0]["message"]["content"].strip()
-
-                    try:
-                        ai_analysis = json.loads(ai_response)
-                        print(f"[AI] Template analysis completed with {len(ai_analysis)} analysis components")
-                    except json.JSONDecodeError:
-                        ai_analysis = self._parse_structured_analysis_response(ai_response)
-                        print(f"[AI] Template analysis completed (parsed from text)")
-                else:
-                    print(f"[AI] Template analysis API failed (status {response.status_code}), using enhanced fallback")
-                    ai_analysis = self._enhanced_fallback_structure_analysis(context, html_content)
-
             except Exception as e:
                 print(f"[AI] Template analysis request failed: {e}, using enhanced fallback")
                 ai_analysis = self._enhanced_fallback_structure_analysis(context, html_content)
@@ -926,19 +890,15 @@ FORMATTED THESIS CONTENT:"""
 
             # Call AI for intelligent content application
             try:
-                from openai import OpenAI
-
-                client = OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=self.api_key,
-                )
+                client = get_llm_gateway().client(self.api_key, "ai_template_intelligence.apply_content")
 
                 response = client.chat.completions.create(
                     model="openai/gpt-oss-120b:free",
                     messages=[{"role": "user", "content": application_prompt}],
                     max_tokens=5000,
                     temperature=0.2,  # Low temperature for consistent formatting
-                    extra_body={"reasoning": {"enabled": True}}  # Enable reasoning for better quality
+                    extra_body={"reasoning": {"enabled": True}},  # Enable reasoning for better quality
+                    timeout=45
                 )
 
                 formatted_content = response.choices[0].message.content
@@ -951,32 +911,8 @@ FORMATTED THESIS CONTENT:"""
                     else:
                         print("[AI] Content formatting returned insufficient content, using enhanced version")
 
-            except ImportError:
-                # Fallback to requests if openai package not available
-                import requests
-
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "openai/gpt-oss-120b:free",
-                        "messages": [{"role": "user", "content": application_prompt}],
-                        "max_tokens": 5000,
-                        "temperature": 0.2
-                    },
-                    timeout=45
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    formatted_content = result["choices"][0]["message"]["content"].strip()
-
-                    if len(formatted_content) > len(content) * 0.8:
-                        print(f"[AI] Content formatting completed: {len(formatted_content)} characters")
-                        return formatted_content
+            except Exception as e:
+                print(f"[AI] Content formatting request failed: {e}")
 
             # Fallback to content enhancer
             if self.content_enhancer:
@@ -0,0 +1,477 @@
+"""
+Compiled Templates
+Analyze a template once, build many times. A compiled template captures
+everything the build phase reads from template analysis (document zones,
+chapter/subsection landmarks, insertion points, placeholder locations, style
+info and instruction markers) as JSON versioned by the template's content hash
+and ANALYZER_VERSION, so builds load it instead of re-analyzing the DOCX.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.shared import Length
+
+from ..metrics import span
+from .template_cache import TEMPLATE_STORE
+from .template_instructions import iter_instruction_paragraphs
+
+# Bump whenever the analyzers change what they detect so stale artifacts are recompiled
+ANALYZER_VERSION = "2"
+
+DEFAULT_COMPILED_DIR = Path(os.getenv(
+    "COMPILED_TEMPLATE_DIR",
+    str(Path(__file__).resolve().parents[3] / "storage" / "compiled"),
+))
+DEFAULT_MAX_ENTRIES = int(os.getenv("COMPILED_TEMPLATE_CACHE_MAX_ENTRIES", "64"))
+
+# Chapters the builder fills; insertion points are precomputed for each
+CHAPTER_NUMBERS = range(1, 7)
+
+
+def extract_template_style_info(doc, paragraphs) -> Tuple[Dict[str, Any], Dict[str, Any], Any]:
+    """
+    Extract the "Isi Paragraf" formatting and default font the builder preserves.
+
+    Args:
+        doc: Template Document
+        paragraphs: Body paragraphs of the document
+
+    Returns:
+        Tuple of (styles_info, font_info, isi_paragraf_style)
+    """
+    template_styles_info = {}
+    template_font_info = {}
+
+    # Extract "Isi Paragraf" style formatting
+    isi_paragraf_style = None
+    for style in doc.styles:
+        if style.name.lower() == 'isi paragraf':
+            isi_paragraf_style = style
+            # Extract paragraph format
+            try:
+                pf = style.paragraph_format
+                template_styles_info['Isi Paragraf'] = {
+                    'line_spacing': pf.line_spacing,
+                    'first_line_indent': pf.first_line_indent,
+                    'left_indent': pf.left_indent,
+                    'alignment': pf.alignment,
+                    'space_before': pf.space_before,
+                    'space_after': pf.space_after
+                }
+            except:
+                pass
+            # Extract font
+            try:
+                if hasattr(style, 'font') and style.font:
+                    template_font_info['Isi Paragraf'] = {
+                        'name': style.font.name,
+                        'size': style.font.size
+                    }
+            except:
+                pass
+            break
+
+    # Extract default font from template (check styles first, then paragraphs)
+    # Try to get font from "Normal" style or "Isi Paragraf" style
+    for style in doc.styles:
+        try:
+            if style.name == 'Normal' or style.name == 'Isi Paragraf':
+                if hasattr(style, 'font') and style.font:
+                    font_name = style.font.name
+                    font_size = style.font.size
+                    if font_name:
+                        template_font_info['default'] = {
+                            'name': font_name,
+                            'size': font_size
+                        }
+                        break
+        except:
+            continue
+
+    # If still not found, check paragraph runs
+    if 'default' not in template_font_info:
+        for para in paragraphs[:100]:
+            for run in para.runs:
+                if run.font.name:
+                    template_font_info['default'] = {
+                        'name': run.font.name,
+                        'size': run.font.size
+                    }
+                    break
+            if 'default' in template_font_info:
+                break
+
+    return template_styles_info, template_font_info, isi_paragraf_style
+
+
+def _encode(value: Any) -> Any:
+    """Make python-docx lengths and alignments JSON-safe, reversibly."""
+    if isinstance(value, WD_PARAGRAPH_ALIGNMENT):
+        return {"alignment": int(value.value)}
+    if isinstance(value, Length):
+        return {"emu": int(value)}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"emu"}:
+            return Length(value["emu"])
+        if set(value) == {"alignment"}:
+            return WD_PARAGRAPH_ALIGNMENT(value["alignment"])
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+class CompiledAnalysis:
+    """
+    Stand-in for TemplateAnalyzer backed by a compiled template.
+
+    Exposes the parts of `analysis` that ContentMapper and the analysis report
+    read, plus the pre-rendered summary.
+    """
+
+    def __init__(self, template_path: Path, analysis: Dict[str, Any], summary: str):
+        self.template_path = template_path
+        self.analysis = analysis
+        self._summary = summary
+
+    def get_analysis(self) -> Dict[str, Any]:
+        return self.analysis
+
+    def get_summary(self) -> str:
+        return self._summary
+
+
+class CompiledTemplateAdapter:
+    """Read-only IntelligentTemplateAdapter replacement backed by a compiled template."""
+
+    def __init__(self, compiled: "CompiledTemplate"):
+        self.template_path = Path(compiled.template_path)
+        self.structure = compiled.structure()
+        self._document_zones = dict(compiled.zones)
+        self._insertion_points = compiled.insertion_points
+
+    def analyze_template(self):
+        return self.structure
+
+    def get_content_insertion_points(self, chapter_num: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return the insertion points computed at compile time for a chapter."""
+        return [(index, dict(meta)) for index, meta in self._insertion_points.get(str(chapter_num), [])]
+
+
+@dataclass
+class CompiledTemplate:
+    """Analysis results the build phase needs, in a JSON-serializable form."""
+
+    template_hash: str
+    analyzer_version: str
+    template_path: str
+    compiled_at: float
+    compile_seconds: float = 0.0
+    paragraph_count: int = 0
+    zones: Dict[str, Optional[int]] = field(default_factory=dict)
+    template_type: str = "unknown"
+    chapters: List[Dict[str, Any]] = field(default_factory=list)
+    subsections: List[Dict[str, Any]] = field(default_factory=list)
+    placeholders: List[Dict[str, Any]] = field(default_factory=list)
+    content_zones: List[Dict[str, Any]] = field(default_factory=list)
+    style_mapping: Dict[str, str] = field(default_factory=dict)
+    font_info: Dict[str, Any] = field(default_factory=dict)
+    insertion_points: Dict[str, List[Tuple[int, Dict[str, Any]]]] = field(default_factory=dict)
+    styles_info: Dict[str, Any] = field(default_factory=dict)
+    template_font_info: Dict[str, Any] = field(default_factory=dict)
+    has_isi_paragraf: bool = False
+    instruction_markers: List[Dict[str, Any]] = field(default_factory=list)
+    instruction_language: str = "id"
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    summary: str = ""
+
+    @property
+    def main_content_start(self) -> Optional[int]:
+        return self.zones.get('main_content_start')
+
+    def structure(self):
+        """Rebuild the TemplateStructure the adaptive analysis produced."""
+        from .intelligent_template_adapter import TemplatePattern, TemplateStructure
+        return TemplateStructure(
+            template_path=self.template_path,
+            chapter_patterns=[TemplatePattern(**p) for p in self.chapters],
+            subsection_patterns=[TemplatePattern(**p) for p in self.subsections],
+            placeholder_patterns=[TemplatePattern(**p) for p in self.placeholders],
+            content_zones=[TemplatePattern(**p) for p in self.content_zones],
+            style_mapping=dict(self.style_mapping),
+            font_info=_decode(self.font_info),
+            template_type=self.template_type,
+        )
+
+    def adapter(self) -> CompiledTemplateAdapter:
+        return CompiledTemplateAdapter(self)
+
+    def analyzer(self) -> CompiledAnalysis:
+        return CompiledAnalysis(Path(self.template_path), self.analysis, self.summary)
+
+    def instruction_paragraphs(self, paragraphs, language: Optional[str]) -> Optional[List[Tuple[Any, str]]]:
+        """
+        Resolve the instruction markers against a fresh copy of the template.
+
+        Args:
+            paragraphs: Body paragraphs of the unmodified template copy
+            language: Template language of the build
+
+        Returns:
+            (paragraph, kind) pairs, or None when the markers were compiled
+            for another language or do not line up with the paragraphs (the
+            caller then scans the document itself)
+        """
+        if language != self.instruction_language or len(paragraphs) != self.paragraph_count:
+            return None
+        resolved = []
+        for marker in self.instruction_markers:
+            para = paragraphs[marker['index']]
+            if para.text.strip() != marker['text']:
+                return None
+            resolved.append((para, marker['kind']))
+        return resolved
+
+    def style_info(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return (styles_info, font_info) with python-docx values restored."""
+        return _decode(self.styles_info), _decode(self.template_font_info)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompiledTemplate":
+        data = dict(data)
+        data['insertion_points'] = {
+            chapter: [tuple(point) for point in points]
+            for chapter, points in data.get('insertion_points', {}).items()
+        }
+        return cls(**data)
+
+
+def compile_template(template_path: Union[str, Path], language: str = 'id') -> CompiledTemplate:
+    """
+    Run every template analysis the build reads and capture the results.
+
+    Args:
+        template_path: Path to the template DOCX
+        language: Template language used to locate instruction paragraphs
+
+    Returns:
+        CompiledTemplate for the template's current contents
+    """
+    from .intelligent_template_adapter import IntelligentTemplateAdapter
+    from .template_analyzer import TemplateAnalyzer
+
+    path = Path(template_path)
+    start = time.perf_counter()
+    digest = TEMPLATE_STORE.digest_for(path)
+    doc = TEMPLATE_STORE.borrow(path)
+    paragraphs = doc.paragraphs
+
+    adapter = IntelligentTemplateAdapter(str(path))
+    structure = adapter.analyze_template()
+    zones = dict(getattr(adapter, '_document_zones', {}) or {})
+    insertion_points = {}
+    if zones.get('main_content_start') is not None:
+        for chapter_num in CHAPTER_NUMBERS:
+            points = adapter.get_content_insertion_points(chapter_num)
+            if points:
+                insertion_points[str(chapter_num)] = [list(point) for point in points]
+
+    styles_info, font_info, isi_paragraf_style = extract_template_style_info(doc, paragraphs)
+
+    style_names: Dict[Any, str] = {}
+
+    def style_name(para) -> str:
+        style_id = para._p.style
+        if style_id not in style_names:
+            style = para.style
+            style_names[style_id] = style.name if style is not None and style.name else ""
+        return style_names[style_id]
+
+    markers = [
+        {'index': index, 'kind': kind, 'text': para.text.strip()}
+        for index, para, kind in iter_instruction_paragraphs(paragraphs, language, style_name)
+    ]
+
+    analyzer = TemplateAnalyzer(str(path))
+    full_analysis = analyzer.analysis
+    analysis = {
+        key: full_analysis.get(key, {})
+        for key in ('front_matter', 'placeholders', 'formatting_rules', 'margins',
+                    'document_properties', 'special_elements', 'heading_hierarchy')
+    }
+    analysis['styles'] = {name: {'name': name} for name in full_analysis.get('styles', {})}
+
+    compiled = CompiledTemplate(
+        template_hash=digest,
+        analyzer_version=ANALYZER_VERSION,
+        template_path=str(path),
+        compiled_at=time.time(),
+        paragraph_count=len(paragraphs),
+        zones=zones,
+        template_type=structure.template_type,
+        chapters=[asdict(p) for p in structure.chapter_patterns],
+        subsections=[asdict(p) for p in structure.subsection_patterns],
+        placeholders=[asdict(p) for p in structure.placeholder_patterns],
+        content_zones=[asdict(p) for p in structure.content_zones],
+        style_mapping=dict(structure.style_mapping),
+        font_info=_encode(structure.font_info),
+        insertion_points=insertion_points,
+        styles_info=_encode(styles_info),
+        template_font_info=_encode(font_info),
+        has_isi_paragraf=isi_paragraf_style is not None,
+        instruction_markers=markers,
+        instruction_language=language,
+        analysis=json.loads(json.dumps(_encode(analysis), default=str)),
+        summary=analyzer.get_summary(),
+    )
+    compiled.compile_seconds = round(time.perf_counter() - start, 3)
+    # Round-trip so the in-memory artifact matches what later loads from disk
+    return CompiledTemplate.from_dict(json.loads(json.dumps(compiled.to_dict(), default=str)))
+
+
+class CompiledTemplateStore:
+    """
+    Disk-backed store of compiled templates keyed by content hash and analyzer version.
+
+    Artifacts live in `<directory>/<sha256>.v<ANALYZER_VERSION>.json`; the
+    most recently used `max_entries` of them are also kept in memory.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_COMPILED_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max(1, max_entries)
+        self._memory: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        # digest -> [lock, threads using it]; dropped once nobody is compiling that template
+        self._compile_locks: Dict[str, List[Any]] = {}
+        self.hits = 0
+        self.disk_loads = 0
+        self.compiles = 0
+        self.evictions = 0
+
+    def artifact_path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.v{ANALYZER_VERSION}.json"
+
+    def load(self, template_path: Union[str, Path]) -> Optional[CompiledTemplate]:
+        """Return the compiled template if one exists for the current contents."""
+        digest = TEMPLATE_STORE.digest_for(template_path)
+        with self._lock:
+            compiled = self._memory.get(digest)
+            if compiled is not None:
+                self._memory.move_to_end(digest)
+                self.hits += 1
+                return compiled
+
+        artifact = self.artifact_path(digest)
+        if not artifact.exists():
+            return None
+        try:
+            with open(artifact, "r", encoding="utf-8") as handle:
+                compiled = CompiledTemplate.from_dict(json.load(handle))
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable compiled template {artifact.name}: {e}")
+            return None
+        if compiled.template_hash != digest or compiled.analyzer_version != ANALYZER_VERSION:
+            return None
+
+        with self._lock:
+            self._remember(digest, compiled)
+            self.disk_loads += 1
+        return compiled
+
+    def get(self, template_path: Union[str, Path]) -> CompiledTemplate:
+        """Return the compiled template, compiling and persisting it on a miss."""
+        compiled = self.load(template_path)
+        if compiled is not None:
+            return compiled
+
+        digest = TEMPLATE_STORE.digest_for(template_path)
+        with self._lock:
+            entry = self._compile_locks.setdefault(digest, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                # Another thread may have compiled it while we waited
+                compiled = self.load(template_path)
+                if compiled is None:
+                    compiled = self.compile(template_path)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._compile_locks[digest]
+        return compiled
+
+    def compile(self, template_path: Union[str, Path]) -> CompiledTemplate:
+        """Compile a template and write the artifact, replacing any existing one."""
+        with span("template_compile"):
+            compiled = compile_template(template_path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        artifact = self.artifact_path(compiled.template_hash)
+        tmp_path = artifact.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(compiled.to_dict(), handle, ensure_ascii=False, default=str)
+            os.replace(tmp_path, artifact)
+        except OSError as e:
+            print(f"[WARNING] Could not persist compiled template: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+        with self._lock:
+            self._remember(compiled.template_hash, compiled)
+            self.compiles += 1
+        print(f"[INFO] Compiled template {Path(template_path).name} in {compiled.compile_seconds:.3f}s")
+        return compiled
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "analyzer_version": ANALYZER_VERSION,
+                "in_memory": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_loads": self.disk_loads,
+                "compiles": self.compiles,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        """Drop compiled templates held in memory (artifacts on disk are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_loads = self.compiles = self.evictions = 0
+
+    def _remember(self, digest: str, compiled: CompiledTemplate) -> None:
+        """Keep an artifact in memory, evicting the least recently used beyond max_entries."""
+        self._memory[digest] = compiled
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+
+COMPILED_TEMPLATES = CompiledTemplateStore()
+
+
+def get_compiled_templates() -> CompiledTemplateStore:
+    """Return the process-wide compiled template store."""
+    return COMPILED_TEMPLATES
@@ -4,19 +4,34 @@ Orchestrates the creation of a complete, properly structured thesis document
 with all front matter, main content, and back matter.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
 from docx import Document
 from docx.shared import Pt, Inches
 import re
 from .template_analyzer import TemplateAnalyzer
+from .template_cache import TEMPLATE_STORE
+from .compiled_template import COMPILED_TEMPLATES, extract_template_style_info
+from .paragraph_index import paragraph_index, find_paragraph_index
+from .document_zones import document_zones, invalidate_document_zones
+from .template_instructions import (
+    ANCHOR_KEYWORDS, TEMPLATE_KEYWORD_CATEGORIES, NIM_PATTERN, YEAR_PATTERN, SUPERVISOR_NAME_PATTERNS, SUPERVISOR_SIGNATURE_PATTERN,
+    EXAMINER_SIGNATURE_PATTERN, instruction_kind, iter_instruction_paragraphs, template_keyword_matcher
+)
 from .content_extractor import ContentExtractor
+from .content_source import ContentSource
 from .ai_enhanced_extractor import AIEnhancedContentExtractor
 from .content_mapper import ContentMapper
 from .document_merger import DocumentMerger
+from .docx_writer import save_document
 from .front_matter_generator import FrontMatterGenerator, BackMatterGenerator
 from ..parser.normalized_extractor import extract_normalized_structure
 from ..ai.thesis_rewriter import ThesisRewriter
+from ..metrics import span
+from ..tracing import DEBUG, get_tracer
 
 # Advanced Template Intelligence System (New)
 try:
@@ -31,6 +46,9 @@ except ImportError:
     print("[WARNING] Advanced template intelligence system not available, using legacy system")
 
 
+trace = get_tracer("builder")
+
+
 class CompleteThesisBuilder:
     """Builds complete thesis documents from templates and content."""
 
@@ -191,7 +209,7 @@ class CompleteThesisBuilder:
         }
     }
 
-    def __init__(self, template_path: str, content_path: str, output_path: str, use_ai: bool = True, api_key: Optional[str] = None, include_frontmatter: bool = True, university_config: str = 'indonesian_standard'):
+    def __init__(self, template_path: str, content_path: str, output_path: str, use_ai: bool = True, api_key: Optional[str] = None, include_frontmatter: bool = True, university_config: str = 'indonesian_standard', progress_callback: Optional[Callable[[str], None]] = None):
         """Initialize with paths and options.
 
         Args:
@@ -202,7 +220,9 @@ class CompleteThesisBuilder:
             api_key: OpenRouter API key for AI features
             include_frontmatter: Whether to include front matter
             university_config: University template configuration ('indonesian_standard', 'english_standard', 'international')
+            progress_callback: Optional callable receiving the current build stage name
         """
+        self.progress_callback = progress_callback
         self.template_path = Path(template_path)
         self.content_path = Path(content_path)
         self.output_path = Path(output_path)
@@ -214,14 +234,20 @@ class CompleteThesisBuilder:
         self.config = self.UNIVERSITY_CONFIGS.get(university_config, self.UNIVERSITY_CONFIGS['indonesian_standard'])
         print(f"[INIT] Using university configuration: {university_config}")
 
-        # Initialize components
-        self.analyzer = TemplateAnalyzer(str(self.template_path))
-
-        # Use AI-enhanced extractor when available
-        self.ai_extractor = AIEnhancedContentExtractor(str(self.content_path), use_ai=use_ai, api_key=api_key)
-        self.extractor = ContentExtractor(str(self.content_path))
+        self._prepared_adapter = None
+        self.compiled_template = None
+        # (document, [(paragraph, kind)]) located from the compiled template's instruction markers
+        self._instruction_marks = None
+
+        # Content and template are loaded lazily: constructing a builder does no
+        # I/O or network work. build() overlaps AI content generation with
+        # template preparation; each view is computed at most once.
+        self.content = ContentSource(str(self.content_path), use_ai=use_ai, api_key=api_key)
+        self._analyzer = None
+        self._mapper = None
+        self._semantic_validation = None
+        self._template_lock = threading.Lock()
         self.ai_data = {}  # Will be populated during build
-        self.mapper = ContentMapper(self.analyzer, self.extractor, self.ai_data)
 
         # Initialize AI-powered components for perfect formatting (optional)
         self.perfect_adapter = None
@@ -229,23 +255,75 @@ class CompleteThesisBuilder:
 
         # Initialize AI components dynamically in build method
         self.thesis_rewriter = ThesisRewriter(api_key=api_key) if api_key else None
-        self.ai_data = {}  # Will be populated during build
 
         # Initialize semantic validation
         self.semantic_validator = None
 
-        # AI extraction will be run during build process, not in init
+    @property
+    def extractor(self) -> ContentExtractor:
+        """Rule-based view of the content (read on first use)."""
+        return self.content.extractor
+
+    @property
+    def ai_extractor(self) -> AIEnhancedContentExtractor:
+        """AI-enhanced view of the content; generation runs on first use."""
+        return self.content.analysis
+
+    @property
+    def analyzer(self):
+        """Template analysis, from the compiled artifact when available."""
+        if self._analyzer is None:
+            self._prepare_template()
+        return self._analyzer
+
+    @property
+    def mapper(self) -> ContentMapper:
+        """Content-to-template mapping, built on first use."""
+        if self._mapper is None:
+            self._mapper = ContentMapper(self.analyzer, self.extractor, self.ai_data)
+        return self._mapper
+
+    @property
+    def semantic_validation(self) -> Optional[Dict[str, Any]]:
+        """Semantic validation of the extracted structure (AI mode only)."""
+        if self.use_ai and self._semantic_validation is None:
+            self._semantic_validation = self.ai_extractor.get_semantic_validation()
+        return self._semantic_validation
+
+    def _prepare_template(self) -> None:
+        """Load the compiled template (or analyze the template) once."""
+        with self._template_lock:
+            if self._analyzer is not None:
+                return
+            self._report_progress("analyzing_template")
+            self.compiled_template = self._load_compiled_template()
+            if self.compiled_template is not None:
+                adapter = self.compiled_template.adapter()
+                self._prepared_adapter = (adapter, adapter.structure)
+                self._analyzer = self.compiled_template.analyzer()
+            else:
+                self._prepare_template_structure()
+                with span("template_analysis"):
+                    self._analyzer = TemplateAnalyzer(str(self.template_path))
 
-        # Initialize AI-powered components for perfect formatting (optional)
-        self.perfect_adapter = None
-        self.quality_validator = None
+    def _prepare(self) -> None:
+        """Prepare template and content for a build.
 
-        # Initialize AI components dynamically in build method
-        self.thesis_rewriter = ThesisRewriter(api_key=api_key) if api_key else None
-        self.ai_data = {}  # Will be populated during build
+        Content generation is network-bound, so the AI-enhanced extraction runs
+        while the compiled template is loaded (or the template analyzed, if it
+        cannot be compiled).
+        """
+        if self.content.computed('analysis'):
+            self._prepare_template()
+            return
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="content-extract") as executor:
+            # Run in a copy of this context so the extraction's trace events reach the request's capture
+            extraction = executor.submit(contextvars.copy_context().run, lambda: self.content.analysis)
+            self._prepare_template()
 
-        # Semantic validation
-        self.semantic_validation = self.ai_extractor.get_semantic_validation() if use_ai else None
+            # Use AI-enhanced extractor when available
+            self._report_progress("extracting_content")
+            extraction.result()
 
     def _copy_styles_from_template(self, target_doc: Document, template_doc: Document) -> None:
         """Copy styles from template document to target document."""
@@ -267,6 +345,43 @@ class CompleteThesisBuilder:
         except Exception as e:
             print(f"[WARNING] Failed to copy styles from template: {e}")
     
+    def _locate_instructions(self, doc) -> None:
+        """Resolve the compiled instruction markers in a fresh copy of the template, if possible."""
+        self._instruction_marks = None
+        if self.compiled_template is None:
+            return
+        marks = self.compiled_template.instruction_paragraphs(paragraph_index(doc), self.config.get('language'))
+        if marks is not None:
+            self._instruction_marks = (doc, marks)
+
+    def _load_compiled_template(self):
+        """Load the compiled template artifact, compiling it on first use."""
+        try:
+            return COMPILED_TEMPLATES.get(self.template_path)
+        except Exception as e:
+            print(f"[WARNING] Compiled template unavailable, analyzing template directly: {e}")
+            return None
+
+    def _prepare_template_structure(self) -> None:
+        """Run the adaptive template analysis ahead of time so the build can reuse it."""
+        try:
+            from .intelligent_template_adapter import IntelligentTemplateAdapter
+            with span("template_structure"):
+                adapter = IntelligentTemplateAdapter(str(self.template_path), api_key=self.api_key)
+                self._prepared_adapter = (adapter, adapter.analyze_template())
+        except Exception as e:
+            print(f"[WARNING] Template structure preparation failed, will retry during build: {e}")
+            self._prepared_adapter = None
+
+    def _report_progress(self, stage: str) -> None:
+        """Forward the current build stage to the progress callback, if any."""
+        if self.progress_callback:
+            try:
+                self.progress_callback(stage)
+            except Exception as e:
+                print(f"[WARNING] Progress callback failed: {e}")
+
+    @span("build")
     def build(self, user_data: Optional[Dict[str, Any]] = None) -> Path:
         """Build the complete thesis document with perfect formatting.
 
@@ -277,7 +392,8 @@ class CompleteThesisBuilder:
             Path to created DOCX file
         """
         user_data = user_data or {}
-        print(f"[DEBUG] Starting build with use_ai={self.use_ai}, api_key={'present' if self.api_key else 'missing'}")
+        trace.debug("Starting build with use_ai=%s, api_key=%s", self.use_ai, 'present' if self.api_key else 'missing')
+        self._prepare()
 
         # CRITICAL FIX: Check if we have substantial analyzed_data from first AI call
         analyzed_data = None
@@ -316,8 +432,9 @@ class CompleteThesisBuilder:
         print("[INFO] 🚀 Using Advanced Template Intelligence System v2.0")
 
         # Step 1: Analyze template with advanced analyzer
-        template_analyzer = AdvancedTemplateAnalyzer(str(self.template_path))
-        template_structure = template_analyzer.analyze_template_comprehensive()
+        with span("advanced_template_analysis"):
+            template_analyzer = AdvancedTemplateAnalyzer(str(self.template_path))
+            template_structure = template_analyzer.analyze_template_comprehensive()
 
         # Step 2: Generate dynamic AI content based on template analysis
         content_generator = DynamicContentGenerator()
@@ -329,22 +446,25 @@ class CompleteThesisBuilder:
             user_text = "Generate a basic academic thesis structure."
 
         # Generate content with template awareness
-        generated_content = content_generator.generate_content(
-            user_text=user_text,
-            template_structure=template_structure,
-            user_metadata=user_data,
-            api_key=self.api_key or ""
-        )
+        with span("content_generation"):
+            generated_content = content_generator.generate_content(
+                user_text=user_text,
+                template_structure=template_structure,
+                user_metadata=user_data,
+                api_key=self.api_key or ""
+            )
 
         analyzed_data = generated_content.content
         print(f"[INFO] Generated content: {len(analyzed_data)} chapters with quality score {generated_content.quality_metrics.get('overall_score', 0):.1f}")
 
         # Step 3: Map content to zones
-        zone_mapper = ContentZoneMapper(template_structure)
-        insertion_plan = zone_mapper.map_ai_content_to_zones(analyzed_data)
+        with span("zone_mapping"):
+            zone_mapper = ContentZoneMapper(template_structure)
+            insertion_plan = zone_mapper.map_ai_content_to_zones(analyzed_data)
 
-        # Step 4: Load and prepare document
-        doc = Document(str(self.template_path))
+        # Step 4: Load and prepare document (private copy of the cached template)
+        doc = TEMPLATE_STORE.copy_document(self.template_path)
+        self._locate_instructions(doc)
 
         # Step 5: Apply metadata and front matter
         self._apply_metadata_and_front_matter(doc, user_data, analyzed_data)
@@ -359,7 +479,8 @@ class CompleteThesisBuilder:
         )
 
         insertion_engine = AdaptiveInsertionEngine()
-        result = insertion_engine.execute_insertion_plan(insertion_context)
+        with span("chapter_insertion"):
+            result = insertion_engine.execute_insertion_plan(insertion_context)
 
         if not result.success:
             error_msg = f"Content insertion failed: {', '.join(result.errors)}"
@@ -367,7 +488,8 @@ class CompleteThesisBuilder:
 
         # Step 7: Save and return
         output_path = self._get_output_path(user_data)
-        doc.save(str(output_path))
+        with span("save"):
+            save_document(doc, output_path, source=self.template_path)
 
         print(f"[SUCCESS] Advanced system v2.0 completed. Output: {output_path}")
         print(f"[METRICS] Content quality: {generated_content.quality_metrics.get('overall_score', 0):.1f}")
@@ -451,100 +573,41 @@ class CompleteThesisBuilder:
             'saran': 'Saran'
         }
 
-        # Verify analyzed_data has content
-        print(f"[VERIFY] Analyzed data keys: {list(analyzed_data.keys())}")
-
-        # Check each chapter content
-        for i in range(1, 7):
-            chapter_key = f'chapter{i}'
-            if chapter_key in analyzed_data:
-                chapter = analyzed_data[chapter_key]
-                print(f"\n[VERIFY] Chapter {i}:")
+        # Verify analyzed_data has content (previews are only built when tracing at debug level)
+        if trace.enabled(DEBUG):
+            trace.debug("Analyzed data keys: %s", list(analyzed_data.keys()))
+            for i in range(1, 7):
+                chapter = analyzed_data.get(f'chapter{i}')
+                if chapter is None:
+                    trace.debug("Chapter %s: NOT FOUND", i)
+                    continue
                 for subsection, content in chapter.items():
                     content_length = len(content) if content else 0
-                    preview = content[:100] if content else "[EMPTY]"
-                    # Handle Unicode characters safely
-                    try:
-                        print(f"  - {subsection}: {content_length} chars | Preview: {preview}...")
-                    except UnicodeEncodeError:
-                        safe_preview = preview.encode('ascii', 'replace').decode('ascii')
-                        print(f"  - {subsection}: {content_length} chars | Preview: {safe_preview}...")
+                    trace.debug("Chapter %s %s: %s chars%s | Preview: %s...", i, subsection, content_length,
+                                " (too short)" if content_length < 200 else "",
+                                content[:100] if content else "[EMPTY]")
 
-                    if content_length < 200:
-                        print(f"  [WARNING] {subsection} content is too short ({content_length} chars)")
-            else:
-                print(f"\n[VERIFY] Chapter {i}: NOT FOUND")
+        # Compiled template (styles, adaptive structure) for this build
+        self._prepare_template()
 
         # Load template
         try:
-            doc = Document(str(self.template_path))
-            print(f"\n[INFO] Template loaded: {len(doc.paragraphs)} paragraphs")
+            doc = TEMPLATE_STORE.copy_document(self.template_path)
+            paragraphs = paragraph_index(doc)
+            self._locate_instructions(doc)
+            print(f"\n[INFO] Template loaded: {len(paragraphs)} paragraphs")
         except Exception as e:
             print(f"[ERROR] Failed to load template: {e}")
             return self.output_path
 
         # Extract template styles and fonts for preservation
-        template_styles_info = {}
-        template_font_info = {}
-        
-        # Extract "Isi Paragraf" style formatting
-        isi_paragraf_style = None
-        for style in doc.styles:
-            if style.name.lower() == 'isi paragraf':
-                isi_paragraf_style = style
-                # Extract paragraph format
-                try:
-                    pf = style.paragraph_format
-                    template_styles_info['Isi Paragraf'] = {
-                        'line_spacing': pf.line_spacing,
-                        'first_line_indent': pf.first_line_indent,
-                        'left_indent': pf.left_indent,
-                        'alignment': pf.alignment,
-                        'space_before': pf.space_before,
-                        'space_after': pf.space_after
-                    }
-                except:
-                    pass
-                # Extract font
-                try:
-                    if hasattr(style, 'font') and style.font:
-                        template_font_info['Isi Paragraf'] = {
-                            'name': style.font.name,
-                            'size': style.font.size
-                        }
-                except:
-                    pass
-                break
-        
-        # Extract default font from template (check styles first, then paragraphs)
-        # Try to get font from "Normal" style or "Isi Paragraf" style
-        for style in doc.styles:
-            try:
-                if style.name == 'Normal' or style.name == 'Isi Paragraf':
-                    if hasattr(style, 'font') and style.font:
-                        font_name = style.font.name
-                        font_size = style.font.size
-                        if font_name:
-                            template_font_info['default'] = {
-                                'name': font_name,
-                                'size': font_size
-                            }
-                            break
-            except:
-                continue
-        
-        # If still not found, check paragraph runs
-        if 'default' not in template_font_info:
-            for para in doc.paragraphs[:100]:
-                for run in para.runs:
-                    if run.font.name:
-                        template_font_info['default'] = {
-                            'name': run.font.name,
-                            'size': run.font.size
-                        }
-                        break
-                if 'default' in template_font_info:
-                    break
+        if self.compiled_template is not None:
+            template_styles_info, template_font_info = self.compiled_template.style_info()
+            isi_paragraf_style = None
+            if self.compiled_template.has_isi_paragraf:
+                isi_paragraf_style = next((style for style in doc.styles if style.name.lower() == 'isi paragraf'), None)
+        else:
+            template_styles_info, template_font_info, isi_paragraf_style = extract_template_style_info(doc, paragraphs)
         
         # Store for use in formatting methods (ensure they're always dicts)
         self.template_styles_info = template_styles_info if template_styles_info else {}
@@ -557,12 +620,18 @@ class CompleteThesisBuilder:
 
         # PHASE 1: Intelligent Adaptive Template Analysis
         print("[INFO] Phase 1: Analyzing template with adaptive intelligence...")
+        self._report_progress("template_structure")
+        structure_span = span("template_structure").start()
         
         # Use intelligent template adapter if available
         try:
-            from .intelligent_template_adapter import IntelligentTemplateAdapter
-            adapter = IntelligentTemplateAdapter(str(self.template_path), api_key=getattr(self, 'api_key', None))
-            template_structure = adapter.analyze_template()
+            if getattr(self, '_prepared_adapter', None):
+                # Analyzed while content generation was running
+                adapter, template_structure = self._prepared_adapter
+            else:
+                from .intelligent_template_adapter import IntelligentTemplateAdapter
+                adapter = IntelligentTemplateAdapter(str(self.template_path), api_key=getattr(self, 'api_key', None))
+                template_structure = adapter.analyze_template()
             
             # Convert to landmark format for compatibility
             landmark_chapters = {}
@@ -581,26 +650,26 @@ class CompleteThesisBuilder:
                 chapter_num = pattern.metadata.get('chapter_num')
                 # CRITICAL: Only use chapters in main content area
                 if chapter_num and (main_content_start is None or pattern.location >= main_content_start):
-                    landmark_chapters[chapter_num] = doc.paragraphs[pattern.location]
-                    print(f"[ADAPTIVE] Found Chapter {chapter_num} at paragraph {pattern.location}: {pattern.text[:50]}")
+                    landmark_chapters[chapter_num] = paragraphs[pattern.location]
+                    trace.debug("Found Chapter %s at paragraph %s: %s", chapter_num, pattern.location, pattern.text[:50])
                 elif chapter_num:
-                    print(f"[ADAPTIVE] SKIPPED Chapter {chapter_num} at paragraph {pattern.location} - in front matter")
+                    trace.debug("SKIPPED Chapter %s at paragraph %s - in front matter", chapter_num, pattern.location)
             
             for pattern in template_structure.subsection_patterns:
                 chapter_num = pattern.metadata.get('chapter_num', 0)
                 # CRITICAL: Only use subsections in main content area
                 if main_content_start is None or pattern.location >= main_content_start:
                     landmark_subsections.append({
-                        'para': doc.paragraphs[pattern.location],
+                        'para': paragraphs[pattern.location],
                         'chapter': chapter_num,
                         'is_anak': pattern.metadata.get('is_child', False),
                         'original_text': pattern.text,
                         'subsection_number': pattern.metadata.get('subsection_num'),
                         'full_number': pattern.metadata.get('full_number', '')
                     })
-                    print(f"[ADAPTIVE] Found Subsection at paragraph {pattern.location} (Chapter {chapter_num}): {pattern.text[:50]}")
+                    trace.debug("Found Subsection at paragraph %s (Chapter %s): %s", pattern.location, chapter_num, pattern.text[:50])
                 else:
-                    print(f"[ADAPTIVE] SKIPPED Subsection at paragraph {pattern.location} - in front matter")
+                    trace.debug("SKIPPED Subsection at paragraph %s - in front matter", pattern.location)
             
             # Store template structure and adapter for later use
             self.template_structure = template_structure
@@ -661,7 +730,7 @@ class CompleteThesisBuilder:
             landmark_subsections = [] # list of (paragraph_obj, chapter_num, original_text)
             
             current_chapter = 0
-            for i, para in enumerate(doc.paragraphs):
+            for i, para in enumerate(paragraphs):
                 text = para.text.strip()
                 text_upper = text.upper()
                 if not text: continue
@@ -697,7 +766,7 @@ class CompleteThesisBuilder:
 
                 if is_ch:
                     # CRITICAL: Check for TOC entry - multiple indicators
-                    style_name = para.style.name.lower() if para.style else ""
+                    style_name = paragraphs.style_name(para).lower()
                     is_toc_entry = (
                         'toc' in style_name or  # TOC style
                         '\t' in text or  # Tab character
@@ -709,17 +778,17 @@ class CompleteThesisBuilder:
                     
                     if not is_toc_entry:
                         # Check surrounding paragraphs for front matter keywords
-                        for j in range(max(0, i - 10), min(i + 10, len(doc.paragraphs))):
-                            check_text = doc.paragraphs[j].text.upper()
-                            check_style = doc.paragraphs[j].style.name.lower() if doc.paragraphs[j].style else ""
+                        for j in range(max(0, i - 10), min(i + 10, len(paragraphs))):
+                            check_text = paragraphs[j].text.upper()
+                            check_style = paragraphs.style_name(paragraphs[j]).lower()
                             if any(fm in check_text for fm in ['DAFTAR ISI', 'DAFTAR GAMBAR', 'DAFTAR TABEL', 'DAFTAR LAMPIRAN']):
                                 # Check if we're still in that section
                                 # Look ahead to see if we've left it
                                 found_exit = False
-                                for k in range(j + 1, min(j + 50, len(doc.paragraphs))):
-                                    exit_text = doc.paragraphs[k].text.strip().upper()
-                                    exit_style = doc.paragraphs[k].style.name.lower() if doc.paragraphs[k].style else ""
-                                    if ('BAB I' in exit_text or 'BAB 1' in exit_text) and 'toc' not in exit_style and '\t' not in doc.paragraphs[k].text:
+                                for k in range(j + 1, min(j + 50, len(paragraphs))):
+                                    exit_text = paragraphs[k].text.strip().upper()
+                                    exit_style = paragraphs.style_name(paragraphs[k]).lower()
+                                    if ('BAB I' in exit_text or 'BAB 1' in exit_text) and 'toc' not in exit_style and '\t' not in paragraphs[k].text:
                                         if k <= i:  # We've passed it
                                             found_exit = True
                                             break
@@ -730,10 +799,10 @@ class CompleteThesisBuilder:
                     if not is_toc_entry and not is_in_front_matter:
                         landmark_chapters[ch_num] = para
                         current_chapter = ch_num
-                        print(f"[DEBUG] Landmark found: Chapter {ch_num} at paragraph {i}")
+                        trace.debug("Landmark found: Chapter %s at paragraph %s", ch_num, i)
                     else:
                         reason = "TOC entry" if is_toc_entry else "in front matter"
-                        print(f"[DEBUG] SKIPPED Chapter {ch_num} at paragraph {i} - {reason}")
+                        trace.debug("SKIPPED Chapter %s at paragraph %s - %s", ch_num, i, reason)
                     continue
 
                 # 2. Detect Subsections - Enhanced patterns
@@ -770,11 +839,13 @@ class CompleteThesisBuilder:
                         'original_text': text,
                         'subsection_number': subsection_number
                     })
-                    print(f"[DEBUG] Landmark found: Subsection anchor at paragraph {i} (Chapter {current_chapter}): {text}")
+                    trace.debug("Landmark found: Subsection anchor at paragraph %s (Chapter %s): %s", i, current_chapter, text)
 
         print(f"[INFO] Structure Analysis Complete: Found {len(landmark_chapters)} chapters and {len(landmark_subsections)} subsection anchors")
+        structure_span.finish()
 
         # PHASE 2: Metadata and Abstract (Standard logic)
+        self._report_progress("abstract")
         metadata = analyzed_data.get('metadata', {})
         title = metadata.get('title', user_data.get('title', 'Untitled Thesis'))
         author = metadata.get('author', user_data.get('author', 'Unknown'))
@@ -788,17 +859,20 @@ class CompleteThesisBuilder:
 
         # PHASE 3: Clean template instructions (now protects landmarks)
         print("[INFO] Phase 3: Cleaning template instructions...")
+        self._report_progress("cleaning_instructions")
         self._clean_template_instructions(doc, user_data, self.config)
 
         # PHASE 4: Targeted Content Insertion
         print("\n[INFO] Phase 4: Targeted Content Insertion...")
+        self._report_progress("inserting_content")
+        insertion_span = span("chapter_insertion").start()
         total_insertions = 0
         
         # RE-SCAN Landmarks after cleaning to ensure object validity
         landmark_chapters = {}
         landmark_subsections = []
         current_chapter = 0
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             text = para.text.strip()
             text_upper = text.upper().replace('\v', ' ').replace('\n', ' ')
             ch_num = 0
@@ -874,25 +948,25 @@ class CompleteThesisBuilder:
         for chapter_num in range(1, 7):
             chapter_content = chapters_data.get(chapter_num, {})
             if not chapter_content:
-                print(f"[DEBUG] No content keys for Chapter {chapter_num}")
+                trace.debug("No content keys for Chapter %s", chapter_num)
                 continue
             
             # Find subsections for THIS chapter
             # Include 'is_anak' in the mapping so child subsections don't stay empty
             current_sub_anchors = [s for s in landmark_subsections if s['chapter'] == chapter_num]
-            print(f"[DEBUG] Chapter {chapter_num} has {len(current_sub_anchors)} sub-anchors (including Anak Subbab)")
+            trace.debug("Chapter %s has %s sub-anchors (including Anak Subbab)", chapter_num, len(current_sub_anchors))
             
             # If intelligent adapter is available, use it to find additional insertion points
             if hasattr(self, 'intelligent_adapter') and self.intelligent_adapter:
                 try:
                     insertion_points = self.intelligent_adapter.get_content_insertion_points(chapter_num)
-                    print(f"[ADAPTIVE] Found {len(insertion_points)} intelligent insertion points for Chapter {chapter_num}")
+                    trace.debug("Found %s intelligent insertion points for Chapter %s", len(insertion_points), chapter_num)
                     # Store for potential use
                     if not hasattr(self, 'intelligent_insertion_points'):
                         self.intelligent_insertion_points = {}
                     self.intelligent_insertion_points[chapter_num] = insertion_points
                 except Exception as e:
-                    print(f"[WARNING] Failed to get intelligent insertion points: {e}")
+                    trace.warning("Failed to get intelligent insertion points: %s", e)
             
             # Find the chapter heading to update its text (remove "TULISKAN JUDUL...")
             last_inserted_para = None
@@ -924,7 +998,7 @@ class CompleteThesisBuilder:
             for i, key in enumerate(expected_subsections):
                 content = chapter_content.get(key)
                 if not content or len(str(content).strip()) < 50:
-                    print(f"[DEBUG] Skipping {key}: content too short or missing ({len(str(content)) if content else 0} chars)")
+                    trace.debug("Skipping %s: content too short or missing (%s chars)", key, len(str(content)) if content else 0)
                     continue
                 
                 target_para = None
@@ -940,9 +1014,9 @@ class CompleteThesisBuilder:
                         if point_meta.get('is_subsection') and point_idx == i:
                             # Use intelligent insertion point
                             try:
-                                anchor_para = doc.paragraphs[point_para_idx]
+                                anchor_para = paragraphs[point_para_idx]
                                 use_intelligent_insertion = True
-                                print(f"[ADAPTIVE] Using intelligent insertion point at paragraph {point_para_idx}")
+                                trace.debug("Using intelligent insertion point at paragraph %s", point_para_idx)
                             except:
                                 pass
                             break
@@ -980,10 +1054,10 @@ class CompleteThesisBuilder:
                     
                     # 2. Find target paragraph (the one after the anchor)
                     try:
-                        idx = doc.paragraphs.index(anchor_para)
+                        idx = paragraphs.index(anchor_para)
                         # Look for content paragraph in next few paragraphs
-                        for j in range(idx + 1, min(idx + 5, len(doc.paragraphs))):
-                            next_para = doc.paragraphs[j]
+                        for j in range(idx + 1, min(idx + 5, len(paragraphs))):
+                            next_para = paragraphs[j]
                             next_text = next_para.text.strip()
                             
                             # Skip if this is another heading/subsection/BAB
@@ -1001,7 +1075,7 @@ class CompleteThesisBuilder:
                             target_para = self._insert_paragraph_after(anchor_para, "")
                             total_insertions += 1
                     except Exception as e:
-                        print(f"[WARNING] Error finding target paragraph for {key}: {e}")
+                        trace.warning("Error finding target paragraph for %s: %s", key, e)
                         # Fallback: insert new paragraph
                         try:
                             target_para = self._insert_paragraph_after(anchor_para, "")
@@ -1020,7 +1094,7 @@ class CompleteThesisBuilder:
                             # Check if this point is suitable (not already used, is a placeholder or content zone)
                             if point_meta.get('type') in ['placeholder', 'content_zone']:
                                 try:
-                                    point_para = doc.paragraphs[point_para_idx]
+                                    point_para = paragraphs[point_para_idx]
                                     # Check if this paragraph is still a placeholder
                                     point_text = point_para.text.strip()
                                     if (len(point_text) < 100 or 
@@ -1028,7 +1102,7 @@ class CompleteThesisBuilder:
                                         # Use this as target
                                         target_para = point_para
                                         intelligent_insertion_used = True
-                                        print(f"[ADAPTIVE] Using intelligent insertion point at paragraph {point_para_idx} for {key}")
+                                        trace.debug("Using intelligent insertion point at paragraph %s for %s", point_para_idx, key)
                                         break
                                 except:
                                     continue
@@ -1048,7 +1122,7 @@ class CompleteThesisBuilder:
                             # Find chapter heading and use the paragraph after it
                             # Get main content start to avoid TOC
                             main_content_start = self._find_main_content_start(doc) or 0
-                            for para_idx, para in enumerate(doc.paragraphs):
+                            for para_idx, para in enumerate(paragraphs):
                                 # Skip front matter
                                 if para_idx < main_content_start:
                                     continue
@@ -1063,15 +1137,15 @@ class CompleteThesisBuilder:
                                 if f"BAB {self._to_roman(chapter_num)}" in para_text:
                                     # Verify it's not a TOC entry
                                     is_toc = False
-                                    for j in range(max(0, para_idx - 2), min(para_idx + 3, len(doc.paragraphs))):
+                                    for j in range(max(0, para_idx - 2), min(para_idx + 3, len(paragraphs))):
                                         if j != para_idx:
-                                            check_para = doc.paragraphs[j]
+                                            check_para = paragraphs[j]
                                             if '\t' in check_para.text or re.search(r'\s+\d+\s*$', check_para.text):
                                                 is_toc = True
                                                 break
                                     
-                                    if not is_toc and para_idx + 1 < len(doc.paragraphs):
-                                        insert_after = doc.paragraphs[para_idx + 1]
+                                    if not is_toc and para_idx + 1 < len(paragraphs):
+                                        insert_after = paragraphs[para_idx + 1]
                                         break
                         
                         if insert_after:
@@ -1089,13 +1163,13 @@ class CompleteThesisBuilder:
                                 target_para = self._insert_paragraph_after(heading_para, "")
                                 last_inserted_para = heading_para
                                 total_insertions += 1
-                                print(f"[SUCCESS] Created subsection heading and content for {key} ({subsection_number}) in Chapter {chapter_num}")
+                                trace.debug("Created subsection heading and content for %s (%s) in Chapter %s", key, subsection_number, chapter_num)
                             except Exception as e:
-                                print(f"[WARNING] Failed to create subsection for {key}: {e}")
+                                trace.warning("Failed to create subsection for %s: %s", key, e)
                                 import traceback
                                 traceback.print_exc()
                         else:
-                            print(f"[WARNING] Nowhere to put {key} in Chapter {chapter_num} - no insertion point")
+                            trace.warning("Nowhere to put %s in Chapter %s - no insertion point", key, chapter_num)
 
                 if target_para:
                     # Check if this subsection already has substantial content (prevent duplicates)
@@ -1105,7 +1179,7 @@ class CompleteThesisBuilder:
                         is_placeholder = any(ph in existing_content.upper() for ph in ['TULISKAN', 'KETIK', 'ISI', 'FORMAT PARAGRAF', 'SUBBAB'])
                         if not is_placeholder:
                             # Real content exists - skip to prevent duplication
-                            print(f"[SKIP] Subsection {subsection_number} ({key}) already has content ({len(existing_content)} chars), skipping duplicate")
+                            trace.debug("Subsection %s (%s) already has content (%s chars), skipping duplicate", subsection_number, key, len(existing_content))
                             subsection_counter += 1
                             continue
                     
@@ -1148,14 +1222,18 @@ class CompleteThesisBuilder:
                     last_inserted_para = target_para
                     total_insertions += 1
                     subsection_counter += 1
-                    print(f"[SUCCESS] Filled {key} ({subsection_number}) in Chapter {chapter_num}")
+                    trace.debug("Filled %s (%s) in Chapter %s", key, subsection_number, chapter_num)
+
+        insertion_span.finish()
 
         # PHASE 5: Cleanup remaining landmarks and anchors
         print("\n[INFO] Phase 5: Finalizing document structure...")
+        self._report_progress("finalizing")
+        finalize_span = span("finalizing").start()
         anchors_to_clear = ['SUBBAB', 'ANAK SUBBAB', 'CUCU SUBBAB', '[SUBBAB]', '[ANAK SUBBAB]', '[CUCU SUBBAB]']
         paras_to_delete = []
         
-        for p in doc.paragraphs:
+        for p in paragraphs:
             p_text = p.text.strip().upper()
             
             # Check for exact anchor keywords or common numbered variants (e.g., 1.1.1 Anak Subbab)
@@ -1174,9 +1252,9 @@ class CompleteThesisBuilder:
             p_text_original = p.text.strip()
             if re.match(r'^\.\d+', p_text_original):  # Starts with .1, .2, etc. (missing chapter number)
                 # Try to infer chapter number from context
-                para_idx = doc.paragraphs.index(p)
+                para_idx = paragraphs.index(p)
                 for i in range(max(0, para_idx - 10), para_idx):
-                    prev_text = doc.paragraphs[i].text.strip()
+                    prev_text = paragraphs[i].text.strip()
                     # Check if previous paragraph is a BAB heading
                     bab_match = re.search(r'BAB\s+([IVX\d]+)', prev_text, re.I)
                     if bab_match:
@@ -1189,7 +1267,7 @@ class CompleteThesisBuilder:
                                 fixed_text = f"{chapter_num}.{subsection_num}" + p_text_original[subsection_match.end():]
                                 p.clear()
                                 p.add_run(fixed_text)
-                                print(f"[FIX] Fixed subsection numbering: '{p_text_original[:30]}' -> '{fixed_text[:30]}'")
+                                trace.debug("Fixed subsection numbering: '%s' -> '%s'", p_text_original[:30], fixed_text[:30])
                                 break
                         except:
                             pass
@@ -1198,7 +1276,7 @@ class CompleteThesisBuilder:
             try:
                 p_element = p._element
                 if p_element is not None and p_element.getparent() is not None:
-                    p_element.getparent().remove(p_element)
+                    paragraphs.remove(p)
             except:
                 try: p.text = ""
                 except: pass
@@ -1207,19 +1285,25 @@ class CompleteThesisBuilder:
 
         if total_insertions == 0:
             print("[ERROR] NO CONTENT WAS INSERTED!")
+            finalize_span.finish(error=True)
             return self.output_path
 
         # APPLY CRITICAL FORMATTING FIXES (with template preservation)
         print("[INFO] Applying critical formatting fixes...")
-        for para in doc.paragraphs:
+        for para in paragraphs:
             if para.text.strip():
                 self._apply_paragraph_formatting(para, preserve_template=True)
 
         self._apply_list_formatting(doc)
         self._apply_heading_formatting(doc)
 
+        finalize_span.finish()
+
         # Final save
-        doc.save(str(self.output_path))
+        self._report_progress("saving")
+        with span("save"):
+            # Media and other parts the build did not touch are copied from the template as-is
+            save_document(doc, self.output_path, source=self.template_path)
         print(f"[INFO] Document saved to: {self.output_path}")
 
         final_size = self.output_path.stat().st_size if self.output_path.exists() else 0
@@ -1339,7 +1423,7 @@ class CompleteThesisBuilder:
                     
                     return  # Done with template preservation
             except Exception as e:
-                print(f"[WARNING] Failed to apply template formatting: {e}")
+                trace.warning("Failed to apply template formatting: %s", e)
                 # Fall through to default formatting
         
         # DEFAULT FORMATTING (when preserve_template is False or template info not available)
@@ -1395,10 +1479,11 @@ class CompleteThesisBuilder:
 
     def _apply_list_formatting(self, doc):
         """Apply proper list formatting (CRITICAL FIXES)."""
+        paragraphs = paragraph_index(doc)
         from docx.shared import Inches
 
         # Find all paragraphs that might be lists
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
 
             # Check for numbered lists (1., 2., etc.) or bulleted (•, -, etc.)
@@ -1422,6 +1507,7 @@ class CompleteThesisBuilder:
                 except:
                     pass
 
+    @span("metadata_replacement")
     def _clean_template_instructions(self, doc, user_data, config):
         """Remove template instructional text and replace placeholders with dynamic user metadata detection."""
         replacements = 0
@@ -1442,21 +1528,10 @@ class CompleteThesisBuilder:
         year = user_data.get('year', user_data.get('tahun', ''))
         degree = user_data.get('degree', user_data.get('gelar', ''))
 
-        print(f"[INFO] Processing user metadata:")
-        print(f"  title: '{title[:50]}...'")
-        print(f"  author: '{author}'")
-        print(f"  nim: '{nim}'")
-        print(f"  university: '{university}'")
-        print(f"  faculty: '{faculty}'")
-        print(f"  program: '{program}'")
-        print(f"  department: '{department}'")
-        print(f"  supervisor1: '{supervisor1}'")
-        print(f"  supervisor2: '{supervisor2}'")
-        print(f"  examiner1: '{examiner1}'")
-        print(f"  examiner2: '{examiner2}'")
-        print(f"  city: '{city}'")
-        print(f"  year: '{year}'")
-        print(f"  degree: '{degree}'")
+        trace.debug("Processing user metadata", title=title[:50], author=author, nim=nim, university=university,
+                    faculty=faculty, program=program, department=department, supervisor1=supervisor1,
+                    supervisor2=supervisor2, examiner1=examiner1, examiner2=examiner2, city=city, year=year,
+                    degree=degree)
 
         # Phase 1: Dynamic metadata detection and replacement
         replacements += self._apply_dynamic_metadata_replacement(doc, {
@@ -1479,11 +1554,15 @@ class CompleteThesisBuilder:
         # Phase 2: Remove instructional text (keep existing logic)
         replacements += self._remove_instructional_text(doc, config)
 
+        # Cleaned text can move zone boundaries; re-zone on next use
+        invalidate_document_zones(doc)
+
         print(f"[INFO] Cleaned {replacements} template instructions and placeholders")
         return replacements
 
     def _extract_template_metadata(self, doc) -> Dict[str, str]:
         """Extract university, faculty, program, and other metadata from template."""
+        paragraphs = paragraph_index(doc)
         template_metadata = {
             'university': '',
             'faculty': '',
@@ -1498,105 +1577,62 @@ class CompleteThesisBuilder:
             'degree': ''
         }
 
-        for para in doc.paragraphs:
+        matcher = template_keyword_matcher()
+        city_names = set(TEMPLATE_KEYWORD_CATEGORIES['template_city'])
+
+        for para in paragraphs:
             text = para.text.strip()
             if not text:
                 continue
 
-            text_upper = text.upper()
+            matched = matcher.scan(text)
 
             # Extract university information
-            if not template_metadata['university']:
-                university_patterns = [
-                    'UNIVERSITAS ISLAM INDONESIA', 'UII',
-                    'UNIVERSITAS GADJAH MADA', 'UGM',
-                    'UNIVERSITAS INDONESIA', 'UI',
-                    'INSTITUT TEKNOLOGI BANDUNG', 'ITB',
-                    'INSTITUT PERTANIAN BOGOR', 'IPB'
-                ]
-                for pattern in university_patterns:
-                    if pattern in text_upper:
-                        template_metadata['university'] = text.strip()
-                        break
+            if not template_metadata['university'] and 'template_university' in matched:
+                template_metadata['university'] = text.strip()
 
             # Extract faculty information
-            if not template_metadata['faculty']:
-                faculty_patterns = [
-                    'FAKULTAS TEKNIK', 'FAKULTAS MIPA', 'FAKULTAS EKONOMI',
-                    'FAKULTAS KEDOKTERAN', 'FAKULTAS HUKUM', 'FAKULTAS SASTRA'
-                ]
-                for pattern in faculty_patterns:
-                    if pattern in text_upper:
-                        template_metadata['faculty'] = text.strip()
-                        break
+            if not template_metadata['faculty'] and 'template_faculty' in matched:
+                template_metadata['faculty'] = text.strip()
 
             # Extract program information
-            if not template_metadata['program']:
-                program_patterns = [
-                    'PROGRAM STUDI INFORMATIKA', 'TEKNIK INFORMATIKA',
-                    'PROGRAM STUDI TEKNIK', 'SISTEM INFORMASI',
-                    'PROGRAM STUDI EKONOMI', 'PROGRAM STUDI MANAJEMEN'
-                ]
-                for pattern in program_patterns:
-                    if pattern in text_upper:
-                        template_metadata['program'] = text.strip()
-                        break
+            if not template_metadata['program'] and 'template_program' in matched:
+                template_metadata['program'] = text.strip()
 
             # Extract department information
-            if not template_metadata['department']:
-                dept_patterns = ['JURUSAN', 'DEPARTEMEN', 'DEPARTMENT']
-                for pattern in dept_patterns:
-                    if pattern in text_upper and len(text.split()) <= 5:
-                        template_metadata['department'] = text.strip()
-                        break
+            if not template_metadata['department'] and 'template_department' in matched and len(text.split()) <= 5:
+                template_metadata['department'] = text.strip()
 
             # Extract city information
-            if not template_metadata['city']:
-                city_patterns = ['YOGYAKARTA', 'JAKARTA', 'BANDUNG', 'SURABAYA', 'SEMARANG', 'MALANG']
-                for pattern in city_patterns:
-                    if pattern in text_upper and ',' in text:
-                        # Extract city from "City, Date" format
-                        city_part = text.split(',')[0].strip()
-                        if city_part.upper() in city_patterns:
-                            template_metadata['city'] = city_part
-                            break
+            if not template_metadata['city'] and 'template_city' in matched and ',' in text:
+                # Extract city from "City, Date" format
+                city_part = text.split(',')[0].strip()
+                if city_part.upper() in city_names:
+                    template_metadata['city'] = city_part
 
             # Extract year information
             if not template_metadata['year']:
-                year_match = re.search(r'\b(20\d{2})\b', text)
+                year_match = YEAR_PATTERN.search(text)
                 if year_match:
                     template_metadata['year'] = year_match.group(1)
 
             # Extract supervisor names (look for patterns)
             if not template_metadata['supervisor1']:
-                # Look for supervisor patterns
-                supervisor_patterns = [
-                    r'\(\s*([^,]+),\s*S\.T[^)]*\)',  # (Name, S.T.)
-                    r'Pembimbing\s*:\s*([^,\n]+)',   # Pembimbing: Name
-                ]
-                for pattern in supervisor_patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
+                for pattern in SUPERVISOR_NAME_PATTERNS:
+                    match = pattern.search(text)
                     if match:
                         template_metadata['supervisor1'] = match.group(1).strip()
                         break
 
-            # Extract degree information
-            if not template_metadata['degree']:
-                degree_patterns = [
-                    'SARJANA KOMPUTER', 'SARJANA TEKNIK', 'SARJANA SAINS',
-                    'MAGISTER', 'DOKTOR', 'S.KOM', 'S.T.', 'M.KOM', 'M.T.'
-                ]
-                for pattern in degree_patterns:
-                    if pattern in text_upper:
-                        # Look for degree context
-                        if 'gelar' in text.lower() or 'sarjana' in text.lower():
-                            template_metadata['degree'] = text.strip()
-                            break
+            # Extract degree information (only in a degree context)
+            if not template_metadata['degree'] and 'template_degree' in matched and 'degree_context' in matched:
+                template_metadata['degree'] = text.strip()
 
         return template_metadata
 
     def _apply_dynamic_metadata_replacement(self, doc, user_metadata: Dict[str, str]) -> int:
         """Dynamically detect and replace user metadata using pattern recognition."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
 
         # First, extract template metadata to fill in gaps
@@ -1612,32 +1648,27 @@ class CompleteThesisBuilder:
               f"program='{complete_metadata.get('program', '')}', "
               f"supervisor1='{complete_metadata.get('supervisor1', '')}'")
 
+        # One keyword scan per paragraph answers every category check below
+        matcher = template_keyword_matcher()
+
         # Process paragraphs for metadata replacement
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             if not para.text.strip():
                 continue
 
             text = para.text.strip()
             original_text = text
+            matched = matcher.scan(text)
 
             # TITLE DETECTION AND REPLACEMENT (EXTREMELY SELECTIVE)
             if user_metadata.get('title'):
                 # ONLY replace very specific title placeholders that are clearly instructional
 
                 # Pattern 1: Explicit instructional title text (very specific)
-                instructional_phrases = [
-                    'tuliskan judul',
-                    'tulis judul',
-                    'judul skripsi',
-                    'judul tesis',
-                    'bagian ini adalah bagian judul',
-                    'tuliskan judul dengan pola'
-                ]
-
                 # EXCLUDE chapter headers that might contain "judul"
-                is_chapter_header = any(term in text.upper() for term in ['BAB I', 'BAB II', 'BAB III', 'BAB IV', 'BAB V', 'BAB VI', 'CHAPTER'])
+                is_chapter_header = 'chapter_header' in matched
 
-                if any(phrase in text.lower() for phrase in instructional_phrases) and not is_chapter_header:
+                if 'title_instruction' in matched and not is_chapter_header:
                     # Preserve prefix if exists
                     if ':' in text:
                         prefix = text.split(':')[0] + ': '
@@ -1645,7 +1676,7 @@ class CompleteThesisBuilder:
                     else:
                         para.text = user_metadata['title']
                     replacements += 1
-                    print(f"[METADATA] Replaced title (instructional pattern): '{original_text[:50]}...' -> '{user_metadata['title'][:50]}...'")
+                    trace.debug("Replaced title (instructional pattern): '%s...' -> '%s...'", original_text[:50], user_metadata['title'][:50])
                     continue
 
                 # Pattern 2: ONLY replace very specific short title placeholders (exclude chapter headers and other document elements)
@@ -1653,44 +1684,38 @@ class CompleteThesisBuilder:
                 if (len(words) <= 4 and
                     any(word in ['judul', 'title'] for word in words) and
                     not is_chapter_header and
-                    not any(term in text.upper() for term in ['HALAMAN', 'LEMBAR', 'KATA', 'DAFTAR', 'TABEL', 'GAMBAR', 'FAKULTAS', 'UNIVERSITAS', 'PROGRAM', 'PENGESAHAN', 'PENGANTAR'])):
+                    'title_excluded' not in matched):
                     para.text = user_metadata['title']
                     replacements += 1
-                    print(f"[METADATA] Replaced title (short title placeholder): '{original_text}' -> '{user_metadata['title'][:50]}...'")
+                    trace.debug("Replaced title (short title placeholder): '%s' -> '%s...'", original_text, user_metadata['title'][:50])
                     continue
 
             # AUTHOR/NAME DETECTION AND REPLACEMENT
             if user_metadata.get('author'):
                 # Pattern 1: Specific name placeholders that are clearly meant to be replaced
-                name_placeholders = [
-                    'nama mahasiswa', 'nama lengkap mahasiswa', 'student name',
-                    'author name', 'john doe', 'jane smith'
-                ]
-
-                if any(placeholder.lower() in text.lower() for placeholder in name_placeholders):
+                if 'name_placeholder' in matched:
                     if ':' in text:
                         prefix = text.split(':')[0] + ': '
                         para.text = prefix + user_metadata['author']
                     else:
                         para.text = user_metadata['author']
                     replacements += 1
-                    print(f"[METADATA] Replaced author (placeholder pattern): '{original_text}' -> '{user_metadata['author']}'")
+                    trace.debug("Replaced author (placeholder pattern): '%s' -> '%s'", original_text, user_metadata['author'])
                     continue
 
                 # Pattern 2: Parenthesized placeholders like "(Nama Mahasiswa)"
-                if text.strip().startswith('(') and text.strip().endswith(')') and 'mahasiswa' in text.lower():
+                if text.strip().startswith('(') and text.strip().endswith(')') and 'student' in matched:
                     para.text = f"({user_metadata['author']})"
                     replacements += 1
-                    print(f"[METADATA] Replaced author (parentheses pattern): '{original_text}' -> '({user_metadata['author']})'")
+                    trace.debug("Replaced author (parentheses pattern): '%s' -> '(%s)'", original_text, user_metadata['author'])
                     continue
 
             # NIM/Student ID DETECTION AND REPLACEMENT
             if user_metadata.get('nim'):
                 # Pattern 1: 8-10 digit numbers (common NIM length)
                 # Use word boundaries and ensure it's not part of a larger string
-                nim_pattern = re.compile(r'\b(94523999|\d{8,10})\b')
-                if nim_pattern.search(text):
-                    new_text = nim_pattern.sub(user_metadata['nim'], text)
+                if NIM_PATTERN.search(text):
+                    new_text = NIM_PATTERN.sub(user_metadata['nim'], text)
                     if new_text != text:
                         para.text = new_text
                         replacements += 1
@@ -1698,8 +1723,7 @@ class CompleteThesisBuilder:
 
             # UNIVERSITY/INSTITUTION DETECTION AND REPLACEMENT
             if complete_metadata.get('university') and complete_metadata['university'] != template_metadata.get('university'):
-                university_keywords = ['universitas', 'university', 'institut', 'institute', 'sekolah tinggi']
-                if any(keyword.lower() in text.lower() for keyword in university_keywords):
+                if 'university' in matched:
                     target = complete_metadata['university']
                     if ':' in text:
                         para.text = text.split(':')[0] + ': ' + target
@@ -1710,8 +1734,7 @@ class CompleteThesisBuilder:
 
             # FACULTY DETECTION AND REPLACEMENT
             if complete_metadata.get('faculty') and complete_metadata['faculty'] != template_metadata.get('faculty'):
-                faculty_keywords = ['fakultas', 'faculty', 'jurusan', 'department']
-                if any(keyword.lower() in text.lower() for keyword in faculty_keywords):
+                if 'faculty' in matched:
                     target = complete_metadata['faculty']
                     if ':' in text:
                         para.text = text.split(':')[0] + ': ' + target
@@ -1722,8 +1745,7 @@ class CompleteThesisBuilder:
 
             # PROGRAM/STUDY PROGRAM DETECTION AND REPLACEMENT
             if complete_metadata.get('program') and complete_metadata['program'] != template_metadata.get('program'):
-                program_keywords = ['program studi', 'prodi', 'study program', 'program pendidikan']
-                if any(keyword.lower() in text.lower() for keyword in program_keywords):
+                if 'program' in matched:
                     target = complete_metadata['program']
                     if ':' in text:
                         para.text = text.split(':')[0] + ': ' + target
@@ -1734,7 +1756,7 @@ class CompleteThesisBuilder:
 
             # SUPERVISOR NAME DETECTION AND REPLACEMENT
             supervisor_val = None
-            if any(k in text.lower() for k in ['pembimbing', 'supervisor']):
+            if 'supervisor' in matched:
                 if '2' in text or 'II' in text:
                     supervisor_val = complete_metadata.get('supervisor2')
                 else:
@@ -1742,8 +1764,7 @@ class CompleteThesisBuilder:
             
             if supervisor_val:
                 # Regex must look for actual placeholder indicators within brackets or colons
-                sig_pattern = re.compile(r'(\(\s*(?:Nama|NAMA|Dr\.|DR\.)[^)]*\)|:\s*(?:Nama|NAMA|Dr\.|DR\.)[^\n,]+)', re.I)
-                match = sig_pattern.search(text)
+                match = SUPERVISOR_SIGNATURE_PATTERN.search(text)
                 if match:
                     para.text = text.replace(match.group(1), f"( {supervisor_val} )" if '(' in match.group(1) else f": {supervisor_val}")
                     replacements += 1
@@ -1751,15 +1772,14 @@ class CompleteThesisBuilder:
 
             # EXAMINER NAME DETECTION AND REPLACEMENT
             examiner_val = None
-            if any(k in text.lower() for k in ['penguji', 'anggota', 'examiner']):
+            if 'examiner' in matched:
                 if '2' in text or 'II' in text or '3' in text or 'III' in text:
                     examiner_val = complete_metadata.get('examiner2')
                 else:
                     examiner_val = complete_metadata.get('examiner1')
 
             if examiner_val:
-                 sig_pattern = re.compile(r'(\(\s*(?:Nama|NAMA|Dr\.|DR\.|Anggota|Penguji)[^)]*\)|:\s*(?:Nama|NAMA|Dr\.|DR\.|Anggota|Penguji)[^\n,]+)', re.I)
-                 match = sig_pattern.search(text)
+                 match = EXAMINER_SIGNATURE_PATTERN.search(text)
                  if match:
                     para.text = text.replace(match.group(1), f"( {examiner_val} )" if '(' in match.group(1) else f": {examiner_val}")
                     replacements += 1
@@ -1769,13 +1789,13 @@ class CompleteThesisBuilder:
             # CITY DETECTION AND REPLACEMENT
             if complete_metadata.get('city'):
                 # Look for city in date lines like "City, Date"
-                if ',' in text and any(month in text.lower() for month in ['januari', 'februari', 'maret', 'april', 'mei', 'juni', 'juli', 'agustus', 'september', 'oktober', 'november', 'desember', 'january', 'february', 'march']):
+                if ',' in text and 'month' in matched:
                     city_part = text.split(',')[0].strip()
                     if city_part and city_part != complete_metadata['city']:
                         new_text = text.replace(city_part, complete_metadata['city'])
                         para.text = new_text
                         replacements += 1
-                        print(f"[METADATA] Replaced city: '{original_text}' -> '{new_text}'")
+                        trace.debug("Replaced city: '%s' -> '%s'", original_text, new_text)
                         continue
 
             # YEAR DETECTION AND REPLACEMENT (Conservative)
@@ -1783,9 +1803,8 @@ class CompleteThesisBuilder:
                 # ONLY replace if it's a metadata-like line (Short) or contains markers
                 # Avoid citations like "Zukhri (2014)" or long paragraphs with years
                 if len(text) < 100 and not any(k in text for k in ['Zukhri', 'Sumber:', 'References']):
-                    year_pattern = re.compile(r'\b(20\d{2})\b')
-                    if year_pattern.search(text):
-                        new_text = year_pattern.sub(complete_metadata['year'], text)
+                    if YEAR_PATTERN.search(text):
+                        new_text = YEAR_PATTERN.sub(complete_metadata['year'], text)
                         if new_text != text:
                             para.text = new_text
                             replacements += 1
@@ -1798,29 +1817,29 @@ class CompleteThesisBuilder:
                     for para in cell.paragraphs:
                         text = para.text.strip()
                         if not text: continue
+                        matched = matcher.scan(text)
 
                         # Use the same prefix-aware logic as paragraphs
-                        if complete_metadata.get('title') and any(phrase in text.lower() for phrase in ['tuliskan judul', 'tulis judul']):
+                        if complete_metadata.get('title') and 'cell_title' in matched:
                              para.text = (text.split(':')[0] + ': ' if ':' in text else '') + complete_metadata['title']
                              replacements += 1
                         
-                        if complete_metadata.get('author') and any(p in text.lower() for p in ['nama mahasiswa', 'nama penulis', 'n a m a']):
+                        if complete_metadata.get('author') and 'cell_author' in matched:
                              para.text = (text.split(':')[0] + ': ' if ':' in text else '') + complete_metadata['author']
                              replacements += 1
 
-                        if complete_metadata.get('nim') and any(p in text.lower() for p in ['nim', 'nomor induk', 'n i m']):
-                             nim_pattern = re.compile(r'\b(94523999|\d{8,10})\b')
-                             if nim_pattern.search(text):
-                                 para.text = nim_pattern.sub(complete_metadata['nim'], text)
+                        if complete_metadata.get('nim') and 'cell_nim' in matched:
+                             if NIM_PATTERN.search(text):
+                                 para.text = NIM_PATTERN.sub(complete_metadata['nim'], text)
                              else:
                                  para.text = (text.split(':')[0] + ': ' if ':' in text else '') + complete_metadata['nim']
                              replacements += 1
 
-                        if complete_metadata.get('program') and any(p in text.lower() for p in ['program studi', 'prodi']):
+                        if complete_metadata.get('program') and 'cell_program' in matched:
                              para.text = (text.split(':')[0] + ': ' if ':' in text else '') + complete_metadata['program']
                              replacements += 1
                         
-                        if complete_metadata.get('faculty') and 'fakultas' in text.lower():
+                        if complete_metadata.get('faculty') and 'cell_faculty' in matched:
                              para.text = (text.split(':')[0] + ': ' if ':' in text else '') + complete_metadata['faculty']
                              replacements += 1
 
@@ -1828,6 +1847,7 @@ class CompleteThesisBuilder:
 
     def _remove_instructional_text(self, doc, config) -> int:
         """Remove template instructional text (existing logic)."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
         paragraphs_to_remove = []
 
@@ -1836,146 +1856,34 @@ class CompleteThesisBuilder:
         nim = config.get('nim_placeholder', ['94523999'])[0]
 
         # Landmarks to protect (exact text only)
-        anchor_keywords = ['SUBBAB', 'ANAK SUBBAB', '[SUBBAB]', '[ANAK SUBBAB]']
-        
-        # Track if we are in the Table of Contents section
-        in_toc_section = False
-
-        for para in doc.paragraphs:
-            text = para.text
-            text_strip = text.strip()
-            text_upper = text_strip.upper()
-            
-            # Detect TOC section
-            if any(kw in text_upper for kw in ['DAFTAR ISI', 'DAFTAR TABEL', 'DAFTAR GAMBAR']):
-                in_toc_section = True
-            elif text_upper.startswith(('BAB I', 'CHAPTER 1')):
-                in_toc_section = False
-
-            # PROTECT: Do not delete structural elements or headings
-            # But allow cleaning if they are clearly dummy TOC entries or instructions
-            is_landmark = text_upper in anchor_keywords or (text_upper.startswith('BAB') and len(text_strip) <  50)
-            
-            if is_landmark:
-                # Still protect actual landmarks
-                continue
-            
-            if (not in_toc_section) and (para.style and 'Heading' in str(para.style.name)):
-                # Protect real headings in the body
-                continue
-            
-            # Additional dummy entries check (especially for TOC)
-            is_dummy_toc = in_toc_section and (
-                re.search(r'^\d\.\d\s+.*Subbab', text_strip, re.I) or
-                re.search(r'^\d\.\d\.\d\s+.*Anak Subbab', text_strip, re.I) or
-                any(kw in text_upper for kw in [
-                    'LATAR BELAKANG', 'RUMUSAN MASALAH', 'TUJUAN PENELITIAN', 'MANFAAT PENELITIAN', 
-                    'KAJIAN PUSTAKA', 'LANDASAN TEORI', 'DESAIN PENELITIAN', 'PENGUMPULAN DATA',
-                    'METODE PENELITIAN', 'METODOLOGI', 'ANALISIS DATA', 'HASIL PENELITIAN',
-                    'IMPLEMENTASI SISTEM', 'PENGUJIAN', 'PEMBAHASAN HASIL', 'KESIMPULAN', 'SARAN'
-                ])
-            )
-
-            # Remove instructional text from title/approval pages (language-specific)
-            if config.get('language') == 'id':
-                instructional_phrases = [
-                    "The title and each student's name may differ",
-                    "Adjust the layout to maintain neat formatting",
-                    "Replace the date and names in this template",
-                    "Tuliskan judul skripsi di sini",
-                    "TULISKAN JUDUL BAB DI BARIS INI",
-                    # Indonesian academic template instructions
-                    "Format paragraf dengan style",
-                    "Format paragraf dengan",
-                    "Baris pertama berjarak 1 cm",
-                    "Subbab dengan penomoran menggunakan 2 angka",
-                    "Anak Subbab dengan penomoran menggunakan 3 angka",
-                    "penomoran cukup dengan menggunakan huruf abjad",
-                    "Cucu Subbab tidak perlu penomoran",
-                    "Cucu Subbab",
-                    "Tuliskan isi bab",
-                    "Isi bab di sini",
-                    "Ketik isi bab",
-                    "Tulis konten bab",
-                    "BAB PENGANTAR",
-                    "BAB PENUTUP",
-                    "TINJAUAN PUSTAKA",
-                    "METODOLOGI PENELITIAN",
-                    "HASIL DAN PEMBAHASAN",
-                    "KESIMPULAN DAN SARAN",
-                    # Formula and Code instructions
-                    "Akurasi=(Solusi Maksimum",
-                    "Solusi Maksimum-Solusi Minimum",
-                    "#include <iostream>",
-                    "using namespace std;",
-                    "int main()",
-                    "cout << \"Hello world!\"",
-                    # Additional template formatting instructions
-                    "Penyebutan dengan nomor",
-                    "Penomoran level",
-                    "Jika di dalam penyebutan",
-                    "Notasi algoritmik",
-                    "kode program atau pseudocode",
-                    "Gunakan reference manager",
-                    "Glosarium memuat",
-                    "Compile proses",
-                    "Debug langkah",
-                    "Untuk membuat persamaan",
-                    "Lampiran tidak perlu",
-                    "Untuk mengacu ke gambar",
-                    "Untuk mengacu ke tabel",
-                    "Silakan copy paste",
-                    "Cara copy paste persamaan",
-                    "Contoh kode program yang dianggap",
-                    "Contoh persamaan",
-                    "Contoh tabel yang dibuat",
-                    "Gunakan cara yang sama",
-                    "Diharapkan dengan adanya Gambar",
-                    "Sumber: Gunakan menu References",
-                    "Untuk mengacu ke tabel",
-                    # CRITICAL: Remove title subtitle instructions
-                    "DENGAN POLA PIRAMIDA TERBALIK",
-                    "LEBIH PANJANG DARI BARIS BAWAH)",
-                    "PENGARAN KEBALIK",
-                    "(BARIS ATAS",
-                    "BARIS BAWAH)",
-                    "HALAMAN JUDUL",
-                    "HALAMAN PENGESAHAN",
-                    "PERNYATAAN KEASLIAN",
-                    "Pernyataan ini harus ditandatangani",
-                    "TUGAS AKHIR",
-                    "Bagian ini bebas untuk diisikan",
-                    "Idealnya halaman persembahan",
-                    "Idealnya halaman moto",
-                    "pola piramida terbalik",
-                ]
-            else:
-                instructional_phrases = [
-                    "Replace this text with your thesis title",
-                    "Replace with your name",
-                    "Replace with your student ID"
-                ]
-
-            if is_dummy_toc:
+        anchor_keywords = ANCHOR_KEYWORDS
+        matcher = template_keyword_matcher(config.get('language'))
+
+        # Dummy TOC entries and short instructional paragraphs
+        marks = self._instruction_marks
+        if marks is not None and marks[0] is doc:
+            # Located when the template was compiled; earlier phases may have rewritten
+            # or removed some, so re-check each one's current text before removing it
+            for para, kind in marks[1]:
+                p = para._p
+                if p is None or p.getparent() is None:
+                    continue
+                text = para.text
+                if instruction_kind(text, matcher.scan(text), in_toc_section=kind == 'dummy_toc') is not None:
+                    paragraphs_to_remove.append(para)
+                    replacements += 1
+        else:
+            for _, para, _ in iter_instruction_paragraphs(paragraphs, config.get('language'), paragraphs.style_name):
+                # Store for deletion later to avoid iterator issues
                 paragraphs_to_remove.append(para)
                 replacements += 1
-                continue
-
-            for phrase in instructional_phrases:
-                if phrase.lower() in text.lower():
-                    # CRITICAL: If it's a short instructional paragraph, remove it
-                    if len(text) < 500: # Slightly larger window for instructions
-                        # Store for deletion later to avoid iterator issues
-                        paragraphs_to_remove.append(para)
-                        replacements += 1
-                        break
 
         # Remove the marked paragraphs in reverse order
         for para in reversed(paragraphs_to_remove):
             try:
                 p = para._element
                 if p is not None and p.getparent() is not None:
-                    p.getparent().remove(p)
+                    paragraphs.remove(para)
                 para._p = para._element = None
             except:
                 try:
@@ -1991,13 +1899,14 @@ class CompleteThesisBuilder:
                 table_text = " ".join(cell.text for row in table.rows for cell in row.cells).upper()
             except: pass
             
-            is_toc_table = any(kw in table_text for kw in ['SUBBAB', 'LATAR BELAKANG', 'DAFTAR ISI']) and len(table_text) < 5000
+            is_toc_table = len(table_text) < 5000 and 'toc_table' in matcher.scan(table_text)
 
             for row in table.rows:
                 for cell in row.cells:
                     cell_text = cell.text.strip()
                     cell_upper = cell_text.upper()
                     if not cell_text: continue
+                    matched = matcher.scan(cell_text)
 
                     # PROTECT landmarks even in tables
                     if cell_upper in anchor_keywords or (cell_upper.startswith('BAB') and len(cell_text) < 50):
@@ -2006,26 +1915,25 @@ class CompleteThesisBuilder:
                     # Dummy TOC entry in table cell
                     if is_toc_table and (
                         re.search(r'^\d\.\d(\.\d)?\s+', cell_text) or
-                        any(kw in cell_upper for kw in ['SUBBAB', 'LATAR BELAKANG', 'RUMUSAN MASALAH', 'TUJUAN', 'MANFAAT'])
+                        'toc_cell' in matched
                     ):
                         cell.text = ''
                         replacements += 1
                         continue
 
                     # Remove instructional text from table cells
-                    for phrase in instructional_phrases:
-                        if phrase.lower() in cell_text.lower():
-                            cell.text = ''
-                            replacements += 1
-                            break
+                    if 'instruction' in matched:
+                        cell.text = ''
+                        replacements += 1
 
         return replacements
 
     def _apply_heading_formatting(self, doc):
         """Apply proper heading formatting and numbering."""
+        paragraphs = paragraph_index(doc)
         from docx.shared import Pt
 
-        for para in doc.paragraphs:
+        for para in paragraphs:
             # Level 3 headings (subsection like 1.1, 2.1, etc.)
             if para.style and 'heading 3' in str(para.style).lower():
                 # Ensure bold formatting
@@ -2038,19 +1946,20 @@ class CompleteThesisBuilder:
 
     def _fix_chapter_title_formatting(self, doc):
         """Fix chapter title formatting using Shift+Enter instead of separate paragraphs."""
+        paragraphs = paragraph_index(doc)
         # This is complex to implement programmatically
         # For now, we'll ensure proper spacing and formatting
 
         chapter_pattern = None
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             text = para.text.strip().upper()
 
             if text.startswith('BAB ') and any(c.isdigit() or c in 'IVX' for c in text.split()[1][:3] if len(text.split()) > 1):
                 chapter_pattern = i
 
                 # Look for the next paragraph which should be the chapter title
-                if i + 1 < len(doc.paragraphs):
-                    title_para = doc.paragraphs[i + 1]
+                if i + 1 < len(paragraphs):
+                    title_para = paragraphs[i + 1]
                     title_text = title_para.text.strip()
 
                     # If it's a chapter title, ensure proper formatting
@@ -2081,14 +1990,14 @@ class CompleteThesisBuilder:
         """Populate template placeholders with AI-analyzed content while preserving formatting."""
         replacements_made = 0
 
-        print(f"[DEBUG] Starting template population with {len(ai_sections)} AI sections")
+        trace.debug("Starting template population with %s AI sections", len(ai_sections))
 
         # DEBUG: Log what AI sections contain
         for i, section in enumerate(ai_sections[:3]):  # First 3 sections
             content = section.get('content', [])
-            print(f"[DEBUG] AI Section {i}: title='{section.get('title', 'no title')}', content_lines={len(content)}")
+            trace.debug("AI Section %s: title='%s', content_lines=%s", i, section.get('title', 'no title'), len(content))
             if content:
-                print(f"[DEBUG] Content preview: {content[0][:100]}..." if content[0] else "Empty content")
+                trace.debug("Content preview: %s...", content[0][:100] if content[0] else "Empty content")
 
         # Replace user data placeholders first (title, author, etc.)
         replacements_made += self._replace_user_data_placeholders(doc, user_data)
@@ -2102,6 +2011,7 @@ class CompleteThesisBuilder:
 
     def _replace_user_data_placeholders(self, doc, user_data):
         """Replace user data placeholders like title, author, etc."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
 
         # Title placeholders
@@ -2112,45 +2022,46 @@ class CompleteThesisBuilder:
 
         title = user_data.get('title', '')
         if title:
-            for para in doc.paragraphs:
+            for para in paragraphs:
                 text = para.text.upper()
                 for placeholder in title_placeholders:
                     if placeholder.upper() in text:
                         para.text = title
                         replacements += 1
-                        print(f"[DEBUG] Replaced title placeholder with: '{title}'")
+                        trace.debug("Replaced title placeholder with: '%s'", title)
                         break
 
         # Author placeholders
         author_placeholders = [r'NAMA PENULIS', r'NAMA MAHASISWA', r'AUTHOR']
         author = user_data.get('author', '')
         if author:
-            for para in doc.paragraphs:
+            for para in paragraphs:
                 text = para.text.upper()
                 for placeholder in author_placeholders:
                     if placeholder in text:
                         para.text = author
                         replacements += 1
-                        print(f"[DEBUG] Replaced author placeholder with: '{author}'")
+                        trace.debug("Replaced author placeholder with: '%s'", author)
                         break
 
         # NIM placeholders
         nim_placeholders = [r'NIM', r'NOMOR INDUK MAHASISWA']
         nim = user_data.get('nim', '')
         if nim:
-            for para in doc.paragraphs:
+            for para in paragraphs:
                 text = para.text.upper()
                 for placeholder in nim_placeholders:
                     if placeholder in text:
                         para.text = nim
                         replacements += 1
-                        print(f"[DEBUG] Replaced NIM placeholder with: '{nim}'")
+                        trace.debug("Replaced NIM placeholder with: '%s'", nim)
                         break
 
         return replacements
 
     def _replace_chapter_placeholders(self, doc, ai_sections):
         """Replace chapter content placeholders with AI-analyzed sections."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
 
         # Map AI sections to chapter numbers - more flexible mapping
@@ -2173,14 +2084,14 @@ class CompleteThesisBuilder:
             elif i == 5 or 'BAB VI' in title:
                 chapter_mapping['VI'] = section
 
-        print(f"[DEBUG] Chapter mapping: {list(chapter_mapping.keys())}")
+        trace.debug("Chapter mapping: %s", list(chapter_mapping.keys()))
 
         # Replace content in ALL paragraphs that look like placeholders
         # This is the key fix - insert content instead of clearing
         content_inserted = 0
         placeholders_cleared = 0
 
-        for para_idx, para in enumerate(doc.paragraphs):
+        for para_idx, para in enumerate(paragraphs):
             text = para.text.strip()
             upper_text = text.upper()
 
@@ -2201,16 +2112,16 @@ class CompleteThesisBuilder:
             )
 
             if is_placeholder:
-                print(f"[DEBUG] Processing paragraph {para_idx}: '{text[:50]}...' (placeholder: {is_placeholder})")
+                trace.debug("Processing paragraph %s: '%s...' (placeholder: %s)", para_idx, text[:50], is_placeholder)
 
                 # Find which chapter this belongs to
                 chapter_num = self._find_parent_chapter(doc, para)
-                print(f"[DEBUG] Chapter context: {chapter_num}")
+                trace.debug("Chapter context: %s", chapter_num)
 
                 if chapter_num and chapter_num in chapter_mapping:
                     ai_section = chapter_mapping[chapter_num]
                     content_lines = ai_section.get('content', [])
-                    print(f"[DEBUG] AI section has {len(content_lines)} content lines")
+                    trace.debug("AI section has %s content lines", len(content_lines))
 
                     # CRITICAL FIX: Insert actual content instead of clearing
                     if content_lines and len(content_lines) > 0:
@@ -2221,7 +2132,7 @@ class CompleteThesisBuilder:
                         if len(full_content) > 1000:  # Split long content
                             # Split into paragraphs at sentence boundaries
                             sentences = full_content.replace('?', '.').replace('!', '.').split('.')
-                            paragraphs = []
+                            chunks = []
                             current_para = ""
                             for sentence in sentences:
                                 sentence = sentence.strip()
@@ -2229,23 +2140,23 @@ class CompleteThesisBuilder:
                                     continue
                                 if len(current_para + sentence) > 500:
                                     if current_para:
-                                        paragraphs.append(current_para + '.')
+                                        chunks.append(current_para + '.')
                                     current_para = sentence
                                 else:
                                     current_para += ('. ' if current_para else '') + sentence
 
                             if current_para:
-                                paragraphs.append(current_para + '.')
+                                chunks.append(current_para + '.')
 
                             # Insert first paragraph into current paragraph
-                            para.text = paragraphs[0]
+                            para.text = chunks[0]
                             content_inserted += 1
 
                             # Add additional paragraphs
                             current_para_obj = para
-                            for additional_para in paragraphs[1:]:
+                            for additional_para in chunks[1:]:
                                 if additional_para.strip():
-                                    new_para = doc.add_paragraph(additional_para)
+                                    new_para = paragraphs.add_paragraph(additional_para)
                                     # Copy style from original
                                     new_para.style = para.style
                                     if hasattr(para, 'paragraph_format'):
@@ -2255,37 +2166,38 @@ class CompleteThesisBuilder:
                                     current_para_obj = new_para
                                     content_inserted += 1
 
-                            print(f"[DEBUG] INSERTED MULTI-PARAGRAPH content for chapter {chapter_num}: {len(full_content)} chars total")
+                            trace.debug("INSERTED MULTI-PARAGRAPH content for chapter %s: %s chars total", chapter_num, len(full_content))
                         elif full_content:
                             para.text = full_content
                             content_inserted += 1
-                            print(f"[DEBUG] INSERTED content for chapter {chapter_num}: {len(full_content)} chars")
-                            print(f"[DEBUG] Content preview: {full_content[:100]}...")
+                            trace.debug("INSERTED content for chapter %s: %s chars", chapter_num, len(full_content))
+                            trace.debug("Content preview: %s...", full_content[:100])
                         else:
                             para.text = ""  # Clear if no content
                             placeholders_cleared += 1
                     else:
                         para.text = ""  # Clear if no content available
                         placeholders_cleared += 1
-                        print(f"[DEBUG] No content available for chapter {chapter_num}")
+                        trace.debug("No content available for chapter %s", chapter_num)
                 else:
                     # If we can't map to a chapter, clear the placeholder
                     para.text = ""
                     placeholders_cleared += 1
-                    print(f"[DEBUG] Cleared unmapped placeholder: '{text[:50]}...'")
+                    trace.debug("Cleared unmapped placeholder: '%s...'", text[:50])
             else:
-                print(f"[DEBUG] Skipping paragraph {para_idx}: not a placeholder")
+                trace.debug("Skipping paragraph %s: not a placeholder", para_idx)
 
-        print(f"[DEBUG] Content insertion summary: {content_inserted} paragraphs filled, {placeholders_cleared} placeholders cleared")
+        trace.debug("Content insertion summary: %s paragraphs filled, %s placeholders cleared", content_inserted, placeholders_cleared)
         replacements += content_inserted
 
-        print(f"[DEBUG] Chapter content replacement completed: {replacements} insertions")
+        trace.debug("Chapter content replacement completed: %s insertions", replacements)
         return replacements
 
     def _find_parent_chapter(self, doc, target_para):
         """Find the chapter number for a given paragraph by looking backwards."""
+        paragraphs = paragraph_index(doc)
         para_index = None
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             if para == target_para:
                 para_index = i
                 break
@@ -2295,7 +2207,7 @@ class CompleteThesisBuilder:
 
         # Look backwards for chapter header
         for i in range(para_index - 1, max(-1, para_index - 10), -1):
-            para = doc.paragraphs[i]
+            para = paragraphs[i]
             text = para.text.strip().upper()
             if text.startswith('BAB '):
                 parts = text.split()
@@ -2308,6 +2220,7 @@ class CompleteThesisBuilder:
 
     def _clean_generic_placeholders(self, doc):
         """Clean up any remaining generic placeholders."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
 
         placeholders_to_clear = [
@@ -2315,20 +2228,21 @@ class CompleteThesisBuilder:
             r'KONTEN', r'CONTENT', r'PLACEHOLDER'
         ]
 
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.upper()
             for placeholder in placeholders_to_clear:
                 if placeholder in text and len(text) < 100:  # Only clear short placeholder text
                     para.text = ""
                     replacements += 1
-                    print(f"[DEBUG] Cleared generic placeholder: '{text[:50]}...'")
+                    trace.debug("Cleared generic placeholder: '%s...'", text[:50])
                     break
 
         return replacements
 
     def _populate_template_structured(self, doc, ai_sections, user_data):
         """Fallback method: Populate template in a structured way if intelligent replacement fails."""
-        print("[DEBUG] Using structured population approach")
+        paragraphs = paragraph_index(doc)
+        trace.debug("Using structured population approach")
 
         # Find main content area (after front matter)
         main_content_start = self._find_main_content_start(doc)
@@ -2338,146 +2252,47 @@ class CompleteThesisBuilder:
         for idx, section in enumerate(ai_sections, 1):
             if idx > 1:
                 # Add page break between chapters
-                if insert_position < len(doc.paragraphs):
-                    doc.paragraphs[insert_position].insert_page_break_before()
+                if insert_position < len(paragraphs):
+                    paragraphs[insert_position].insert_page_break_before()
 
             # Add chapter title
             title = section.get('title', f'Chapter {idx}')
-            if insert_position < len(doc.paragraphs):
-                doc.paragraphs[insert_position].text = title
+            if insert_position < len(paragraphs):
+                paragraphs[insert_position].text = title
                 insert_position += 1
             else:
-                new_para = doc.add_paragraph(title)
+                new_para = paragraphs.add_paragraph(title)
                 new_para.style = "Heading 1"
-                insert_position = len(doc.paragraphs)
+                insert_position = len(paragraphs)
 
             # Add chapter content
             content = section.get('content', [])
             for line in content:
                 if isinstance(line, str) and line.strip():
-                    if insert_position < len(doc.paragraphs):
-                        doc.paragraphs[insert_position].text = line
+                    if insert_position < len(paragraphs):
+                        paragraphs[insert_position].text = line
                         insert_position += 1
                     else:
-                        new_para = doc.add_paragraph(line)
+                        new_para = paragraphs.add_paragraph(line)
                         new_para.style = "Normal"
-                        insert_position = len(doc.paragraphs)
+                        insert_position = len(paragraphs)
 
     def _find_main_content_start(self, doc):
         """Find where main content should start in the template (after front matter).
-        CRITICAL: Must detect and skip all TOC entries including those with TOC styles."""
-        front_matter_keywords = ['DAFTAR ISI', 'DAFTAR GAMBAR', 'DAFTAR TABEL', 'DAFTAR LAMPIRAN', 
-                                 'TABLE OF CONTENTS', 'LIST OF FIGURES', 'LIST OF TABLES']
-        last_front_matter_index = -1
-        toc_section_end = None
-        
-        # Find the last front matter section and track TOC area
-        for i, para in enumerate(doc.paragraphs):
-            text = para.text.strip().upper()
-            style_name = para.style.name.lower() if para.style else ""
-            
-            # Check if we're entering a front matter section
-            if any(keyword in text for keyword in front_matter_keywords):
-                last_front_matter_index = i
-                if 'DAFTAR ISI' in text or 'TABLE OF CONTENTS' in text:
-                    # Find where TOC section ends
-                    for j in range(i + 1, min(i + 100, len(doc.paragraphs))):
-                        next_para = doc.paragraphs[j]
-                        next_text = next_para.text.strip().upper()
-                        next_style = next_para.style.name.lower() if next_para.style else ""
-                        # TOC ends when we hit another front matter section or main content
-                        if any(kw in next_text for kw in ['DAFTAR GAMBAR', 'DAFTAR TABEL', 'BAB I', 'BAB 1']):
-                            # But verify it's not still a TOC entry
-                            if 'toc' not in next_style and '\t' not in next_para.text:
-                                toc_section_end = j
-                                break
-        
-        # Look for the first actual chapter heading AFTER front matter
-        search_start = max(0, last_front_matter_index + 1)
-        for i in range(search_start, len(doc.paragraphs)):
-            para = doc.paragraphs[i]
-            text = para.text.strip().upper()
-            style_name = para.style.name.lower() if para.style else ""
-            
-            # CRITICAL: Skip TOC entries - check multiple indicators
-            is_toc_entry = (
-                'toc' in style_name or  # TOC style (toc 1, toc 2, etc.)
-                '\t' in para.text or  # Tab character
-                re.search(r'\s+\d+\s*$', para.text) or  # Page number at end
-                (len(text) < 100 and 'BAB' in text and any(char.isdigit() or char in 'IVX' for char in text))  # Short BAB entry likely TOC
-            )
-            
-            if is_toc_entry:
-                continue
-            
-            # CRITICAL: If we're still in TOC section area, skip
-            if toc_section_end and i < toc_section_end:
-                continue
-            
-            # Check if we're still in a front matter section by looking backwards
-            still_in_front_matter = False
-            for j in range(max(0, i - 30), i):
-                check_text = doc.paragraphs[j].text.strip().upper()
-                check_style = doc.paragraphs[j].style.name.lower() if doc.paragraphs[j].style else ""
-                if any(kw in check_text for kw in front_matter_keywords):
-                    # Check if this front matter section is still active
-                    # Look ahead to see if we've left it
-                    found_exit = False
-                    for k in range(j + 1, min(j + 100, len(doc.paragraphs))):
-                        exit_text = doc.paragraphs[k].text.strip().upper()
-                        exit_style = doc.paragraphs[k].style.name.lower() if doc.paragraphs[k].style else ""
-                        # If we find a non-TOC BAB I, we've exited
-                        if ('BAB I' in exit_text or 'BAB 1' in exit_text) and 'toc' not in exit_style and '\t' not in doc.paragraphs[k].text:
-                            if k <= i:  # We've passed it
-                                found_exit = True
-                                break
-                        # If we find another front matter section, we've moved on
-                        if any(kw in exit_text for kw in ['DAFTAR GAMBAR', 'DAFTAR TABEL']) and 'toc' not in exit_style:
-                            if k <= i:  # We've passed it
-                                found_exit = True
-                                break
-                    if not found_exit and k > i:
-                        still_in_front_matter = True
-                        break
-            
-            if still_in_front_matter:
-                continue
-            
-            # Check for actual chapter heading (not in TOC)
-            if ('BAB I' in text or 'BAB 1' in text or 'CHAPTER 1' in text) and len(text) > 10:
-                # Additional verification: check surrounding paragraphs for TOC indicators
-                is_toc_entry = False
-                for j in range(max(0, i - 5), min(i + 6, len(doc.paragraphs))):
-                    check_para = doc.paragraphs[j]
-                    check_style = check_para.style.name.lower() if check_para.style else ""
-                    if j != i and ('toc' in check_style or '\t' in check_para.text):
-                        is_toc_entry = True
-                        break
-                
-                if not is_toc_entry:
-                    print(f"[DEBUG] Found main content start at paragraph {i}: {text[:50]}")
-                    return i
-        
-        # If no chapter found, return after last front matter or default
-        if last_front_matter_index >= 0:
-            estimated_start = last_front_matter_index + 50  # More conservative estimate
-            print(f"[DEBUG] No clear BAB I found, using estimated start: {estimated_start}")
-            return estimated_start
-        
-        # Default to middle of document
-        default_start = len(doc.paragraphs) // 2
-        print(f"[DEBUG] Using default main content start: {default_start}")
-        return default_start
+        CRITICAL: Must detect and skip all TOC entries including those with TOC styles.
+        Served from the document's zone map, which scans the document once."""
+        return document_zones(doc).main_content_start
 
     def _add_ai_main_content(self, doc: Document, user_data: Dict[str, Any], ai_content: str, structure_mapping: Dict[str, Any]) -> None:
         """Add main content using AI-enhanced formatting."""
-        print(f"[DEBUG] Processing AI content with structure mapping: {list(structure_mapping.keys())}")
+        paragraphs = paragraph_index(doc)
+        trace.debug("Processing AI content with structure mapping: %s", list(structure_mapping.keys()))
 
         # If we have structured AI content, use it
         if ai_content and structure_mapping:
             # Parse AI-enhanced content into sections
             sections = self._parse_ai_content_sections(ai_content)
-            print(f"[DEBUG] Parsed {len(sections)} sections from AI content")
+            trace.debug("Parsed %s sections from AI content", len(sections))
 
             for idx, section in enumerate(sections, 1):
                 # Add page break before chapter (except first)
@@ -2486,7 +2301,7 @@ class CompleteThesisBuilder:
 
                 # Add chapter heading
                 title = section.get("title", f"Chapter {idx}")
-                heading_para = doc.add_paragraph(title)
+                heading_para = paragraphs.add_paragraph(title)
                 heading_para.style = "Heading 1"
                 heading_run = heading_para.runs[0]
                 heading_run.font.bold = True
@@ -2497,7 +2312,7 @@ class CompleteThesisBuilder:
                 if isinstance(content, list):
                     for line in content:
                         if isinstance(line, str) and line.strip():
-                            para = doc.add_paragraph(line)
+                            para = paragraphs.add_paragraph(line)
                             para.style = "Normal"
                             para.paragraph_format.left_indent = Inches(0.0)
                             para.paragraph_format.first_line_indent = Inches(1.0)
@@ -2507,7 +2322,7 @@ class CompleteThesisBuilder:
                                 run.font.name = "Times New Roman"
         else:
             # Fallback to standard content processing
-            print("[DEBUG] No AI structure mapping, falling back to standard content")
+            trace.debug("No AI structure mapping, falling back to standard content")
             try:
                 normalized = extract_normalized_structure(str(self.content_path))
                 self._add_main_content(doc, user_data, normalized)
@@ -2558,11 +2373,12 @@ class CompleteThesisBuilder:
 
     def _apply_intelligent_content_replacement(self, doc: Document, ai_content: str, structure_mapping: Dict[str, Any], user_data: Dict[str, Any]) -> Document:
         """Apply intelligent content replacement to template document."""
-        print(f"[DEBUG] Applying intelligent content replacement to {len(doc.paragraphs)} paragraphs")
+        paragraphs = paragraph_index(doc)
+        trace.debug("Applying intelligent content replacement to %s paragraphs", len(paragraphs))
 
         # Parse AI content into structured sections
         ai_sections = self._parse_ai_content_sections(ai_content)
-        print(f"[DEBUG] AI content parsed into {len(ai_sections)} sections")
+        trace.debug("AI content parsed into %s sections", len(ai_sections))
 
         # Strategy: Replace template placeholders with real content
         replacements_made = 0
@@ -2578,18 +2394,18 @@ class CompleteThesisBuilder:
         ]
 
         # Simple and safe chapter title replacement
-        print(f"[DEBUG] Starting chapter replacement with {len(ai_sections)} AI sections")
+        trace.debug("Starting chapter replacement with %s AI sections", len(ai_sections))
         for ai_section in ai_sections[:3]:  # Debug first few
-            print(f"[DEBUG] AI section: {ai_section.get('title', 'no title')}")
+            trace.debug("AI section: %s", ai_section.get('title', 'no title'))
 
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             text = para.text.strip()
 
             # Check if this paragraph matches a chapter pattern
             for pattern in chapter_patterns:
                 if re.match(pattern, text.upper()):
                     chapter_num = text.split()[1] if len(text.split()) > 1 else ""
-                    print(f"[DEBUG] Found chapter {chapter_num} at paragraph {i}")
+                    trace.debug("Found chapter %s at paragraph %s", chapter_num, i)
 
                     # Find corresponding AI content - try simpler matching
                     ai_content_section = None
@@ -2603,25 +2419,26 @@ class CompleteThesisBuilder:
                     if ai_content_section:
                         # Simply replace the chapter title
                         new_title = ai_content_section.get('title', text.split('\n')[0])
-                        print(f"[DEBUG] Setting paragraph {i} text to: '{new_title}'")
+                        trace.debug("Setting paragraph %s text to: '%s'", i, new_title)
                         try:
                             para.text = new_title
                             replacements_made += 1
-                            print(f"[DEBUG] Replaced chapter {chapter_num} title successfully")
+                            trace.debug("Replaced chapter %s title successfully", chapter_num)
                         except Exception as e:
-                            print(f"[ERROR] Failed to set paragraph text: {e}")
+                            trace.error("Failed to set paragraph text: %s", e)
                     else:
-                        print(f"[DEBUG] No matching AI content for chapter {chapter_num}")
+                        trace.debug("No matching AI content for chapter %s", chapter_num)
                     break
 
-        print(f"[DEBUG] Chapter replacement completed. Document state: {type(doc)}")
-        print(f"[DEBUG] Document has {len(doc.paragraphs) if doc else 0} paragraphs")
+        trace.debug("Chapter replacement completed. Document state: %s", type(doc))
+        trace.debug("Document has %s paragraphs", len(paragraphs) if doc else 0)
 
         # Skip all placeholder cleaning to avoid document corruption
-        print(f"[DEBUG] Skipping all placeholder cleaning")
+        trace.debug("Skipping all placeholder cleaning")
 
     def _apply_simple_chapter_titles(self, doc: Document) -> None:
         """Apply standard chapter titles by directly replacing template placeholders."""
+        paragraphs = paragraph_index(doc)
         # Standard chapter titles
         chapter_titles = {
             'I': 'BAB I: PENDAHULUAN',
@@ -2635,7 +2452,7 @@ class CompleteThesisBuilder:
         replacements_made = 0
 
         # Find and replace each chapter by looking for the specific template pattern
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
 
             # Look for the exact template pattern: "BAB X\nTULISKAN JUDUL BAB DI BARIS INI"
@@ -2653,12 +2470,12 @@ class CompleteThesisBuilder:
                             new_title = chapter_titles[chapter_marker]
                             para.text = new_title
                             replacements_made += 1
-                            print(f"[DEBUG] Replaced template chapter {chapter_marker} with: '{new_title}'")
+                            trace.debug("Replaced template chapter %s with: '%s'", chapter_marker, new_title)
 
-        print(f"[DEBUG] Made {replacements_made} template chapter replacements")
+        trace.debug("Made %s template chapter replacements", replacements_made)
 
         # Also replace any remaining single-line chapter headers
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
             if text.startswith('BAB ') and 'TULISKAN' in text.upper():
                 parts = text.split()
@@ -2668,18 +2485,19 @@ class CompleteThesisBuilder:
                         new_title = chapter_titles[chapter_marker]
                         para.text = new_title
                         replacements_made += 1
-                        print(f"[DEBUG] Replaced single-line chapter {chapter_marker} with: '{new_title}'")
+                        trace.debug("Replaced single-line chapter %s with: '%s'", chapter_marker, new_title)
 
-        print(f"[DEBUG] Total chapter replacements: {replacements_made}")
+        trace.debug("Total chapter replacements: %s", replacements_made)
 
     def _apply_safe_chapter_titles(self, doc: Document, ai_content: str, structure_mapping: Dict[str, Any]) -> None:
         """Safely replace chapter titles without risking document corruption."""
+        paragraphs = paragraph_index(doc)
         # Parse AI content sections
         ai_sections = self._parse_ai_content_sections(ai_content)
 
-        print(f"[DEBUG] AI content parsed into {len(ai_sections)} sections")
+        trace.debug("AI content parsed into %s sections", len(ai_sections))
         for i, section in enumerate(ai_sections[:5]):  # Show first 5 for debugging
-            print(f"[DEBUG] AI section {i+1}: '{section.get('title', 'no title')}'")
+            trace.debug("AI section %s: '%s'", i + 1, section.get('title', 'no title'))
 
         # Standard chapter titles to use when AI content doesn't match
         standard_titles = {
@@ -2702,14 +2520,14 @@ class CompleteThesisBuilder:
         replacements_made = 0
 
         # Apply title replacements safely
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             text = para.text.strip()
 
             # Check if this paragraph matches a chapter pattern
             for pattern_idx, pattern in enumerate(chapter_patterns):
                 if re.match(pattern, text.upper()):
                     chapter_num = ['I', 'II', 'III', 'IV', 'V'][pattern_idx]
-                    print(f"[DEBUG] Found chapter {chapter_num} at paragraph {i}")
+                    trace.debug("Found chapter %s at paragraph %s", chapter_num, i)
 
                     # Try to find corresponding AI content first
                     ai_content_section = None
@@ -2723,24 +2541,25 @@ class CompleteThesisBuilder:
                     if ai_content_section:
                         # Use AI-generated title
                         new_title = ai_content_section.get('title', text.split('\n')[0])
-                        print(f"[DEBUG] Using AI title: '{new_title}'")
+                        trace.debug("Using AI title: '%s'", new_title)
                     else:
                         # Use standard title
                         new_title = standard_titles.get(chapter_num, text.split('\n')[0])
-                        print(f"[DEBUG] Using standard title: '{new_title}'")
+                        trace.debug("Using standard title: '%s'", new_title)
 
                     try:
                         para.text = new_title
                         replacements_made += 1
-                        print(f"[DEBUG] Replaced chapter {chapter_num} title successfully")
+                        trace.debug("Replaced chapter %s title successfully", chapter_num)
                     except Exception as e:
-                        print(f"[ERROR] Failed to set paragraph text: {e}")
+                        trace.error("Failed to set paragraph text: %s", e)
                     break  # Break out of pattern matching loop
 
-        print(f"[DEBUG] Total chapter replacements made: {replacements_made}")
+        trace.debug("Total chapter replacements made: %s", replacements_made)
 
     def _clean_title_placeholders_only(self, doc: Document, user_data: Dict[str, Any]) -> None:
         """Safely clean only title placeholders without corrupting the document."""
+        paragraphs = paragraph_index(doc)
         if not user_data.get('title'):
             return
 
@@ -2750,7 +2569,7 @@ class CompleteThesisBuilder:
             r'.*HALAMAN JUDUL.*'
         ]
 
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
             for pattern in title_placeholders:
                 if re.match(pattern, text.upper(), re.IGNORECASE | re.DOTALL):
@@ -2759,6 +2578,7 @@ class CompleteThesisBuilder:
 
     def _clean_remaining_placeholders(self, doc: Document, user_data: Dict[str, Any], ai_sections: List[Dict[str, Any]], replacements_made: int) -> None:
         """Clean up any remaining placeholders in the document."""
+        paragraphs = paragraph_index(doc)
 
         # Title placeholders
         title_placeholders = [
@@ -2767,14 +2587,14 @@ class CompleteThesisBuilder:
             r'.*HALAMAN.*JUDUL.*',
         ]
 
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
             for pattern in title_placeholders:
                 if re.match(pattern, text.upper(), re.IGNORECASE):
                     if user_data.get('title'):
                         para.text = user_data['title']
                         replacements_made += 1
-                        print(f"[DEBUG] Replaced title placeholder with: '{user_data['title']}'")
+                        trace.debug("Replaced title placeholder with: '%s'", user_data['title'])
                     break
 
         # Chapter content placeholders
@@ -2786,14 +2606,14 @@ class CompleteThesisBuilder:
             r'.*CUCU SUBBAB.*',
         ]
 
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
             for pattern in chapter_placeholders:
                 if re.match(pattern, text.upper(), re.IGNORECASE):
                     # Clear placeholder content
                     para.text = ""
                     replacements_made += 1
-                    print(f"[DEBUG] Cleared placeholder content: '{text[:50]}...'")
+                    trace.debug("Cleared placeholder content: '%s...'", text[:50])
                     break
 
         # Front matter placeholders
@@ -2803,7 +2623,7 @@ class CompleteThesisBuilder:
             r'.*GAMBAR.*JUDUL.*',
         ]
 
-        for para in doc.paragraphs:
+        for para in paragraphs:
             text = para.text.strip()
             for pattern in front_matter_placeholders:
                 if re.match(pattern, text.upper(), re.IGNORECASE):
@@ -2813,26 +2633,27 @@ class CompleteThesisBuilder:
                     else:
                         para.text = ""  # Clear generic placeholders
                     replacements_made += 1
-                    print(f"[DEBUG] Cleaned front matter placeholder")
+                    trace.debug("Cleaned front matter placeholder")
                     break
 
-        print(f"[DEBUG] Made {replacements_made} content replacements")
+        trace.debug("Made %s content replacements", replacements_made)
 
         # If still no meaningful replacements, add content in main sections
         if replacements_made < 3:
-            print("[DEBUG] Insufficient replacements, adding content to main body")
+            trace.debug("Insufficient replacements, adding content to main body")
             self._add_content_to_main_body(doc, ai_sections, user_data)
 
         return doc
 
     def _add_content_to_main_body(self, doc: Document, ai_sections: List[Dict[str, Any]], user_data: Dict[str, Any]) -> None:
         """Add content to the main body of the document when intelligent replacement fails."""
-        print("[DEBUG] Adding content to main body sections")
+        paragraphs = paragraph_index(doc)
+        trace.debug("Adding content to main body sections")
 
         # Find the main content area (after front matter, before back matter)
         main_content_start = None
 
-        for i, para in enumerate(doc.paragraphs):
+        for i, para in enumerate(paragraphs):
             text = para.text.strip().upper()
             # Look for the start of main content (BAB I or similar)
             if 'BAB I' in text or 'BAB 1' in text or 'CHAPTER 1' in text:
@@ -2848,19 +2669,20 @@ class CompleteThesisBuilder:
         for section in ai_sections:
             # Insert chapter title
             title = section.get('title', 'Chapter')
-            doc.paragraphs[insert_position].text = title
+            paragraphs[insert_position].text = title
 
             # Insert content
             content_lines = section.get('content', [])
             for line in content_lines:
                 if isinstance(line, str) and line.strip():
-                    new_para = doc.add_paragraph(line)
+                    new_para = paragraphs.add_paragraph(line)
                     new_para.style = "Normal"
 
             insert_position += 1
 
     def _replace_chapter_content(self, doc: Document, chapter_start_idx: int, ai_section: Dict[str, Any]) -> None:
         """Replace the content area of a chapter with clean AI content."""
+        paragraphs = paragraph_index(doc)
         content_lines = ai_section.get('content', [])
         if not content_lines:
             return
@@ -2868,7 +2690,7 @@ class CompleteThesisBuilder:
         # Find the end of this chapter (next chapter or major section break)
         chapter_end_idx = self._find_chapter_end(doc, chapter_start_idx)
 
-        print(f"[DEBUG] Chapter content area: paragraphs {chapter_start_idx + 1} to {chapter_end_idx}")
+        trace.debug("Chapter content area: paragraphs %s to %s", chapter_start_idx + 1, chapter_end_idx)
 
         # Clear existing content in this range (keep the chapter title)
         insert_idx = chapter_start_idx + 1
@@ -2878,7 +2700,7 @@ class CompleteThesisBuilder:
         while insert_idx < chapter_end_idx and content_idx < len(content_lines):
             line = content_lines[content_idx].strip()
             if line and len(line) > 10:  # Only substantial content
-                para = doc.paragraphs[insert_idx]
+                para = paragraphs[insert_idx]
                 para.text = line
 
                 # Apply consistent formatting
@@ -2899,7 +2721,7 @@ class CompleteThesisBuilder:
         while content_idx < len(content_lines):
             line = content_lines[content_idx].strip()
             if line and len(line) > 10:
-                new_para = doc.add_paragraph(line)
+                new_para = paragraphs.add_paragraph(line)
                 new_para.style = "Normal"
                 new_para.paragraph_format.left_indent = Inches(0.0)
                 new_para.paragraph_format.first_line_indent = Inches(1.0)
@@ -2911,9 +2733,10 @@ class CompleteThesisBuilder:
 
     def _find_chapter_end(self, doc: Document, chapter_start_idx: int) -> int:
         """Find the end of a chapter section."""
+        paragraphs = paragraph_index(doc)
         # Look for the next chapter or major section break
-        for i in range(chapter_start_idx + 1, len(doc.paragraphs)):
-            text = doc.paragraphs[i].text.strip().upper()
+        for i in range(chapter_start_idx + 1, len(paragraphs)):
+            text = paragraphs[i].text.strip().upper()
 
             # Next chapter starts
             if text.startswith('BAB ') and any(c.isdigit() or c in 'IVX' for c in text.split()[1][:3] if len(text.split()) > 1):
@@ -2923,16 +2746,17 @@ class CompleteThesisBuilder:
             if any(keyword in text for keyword in ['DAFTAR PUSTAKA', 'LAMPIRAN', 'TABEL', 'GAMBAR']):
                 return i
 
-        return len(doc.paragraphs)  # End of document
+        return len(paragraphs)  # End of document
 
     def _replace_template_section(self, doc: Document, section_name: str, ai_section: Dict[str, Any]) -> int:
         """Replace a template section with AI content."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
 
         # Find paragraphs containing the section name
-        for para in doc.paragraphs:
+        for para in paragraphs:
             if section_name.lower() in para.text.lower():
-                print(f"[DEBUG] Found section '{section_name}' in paragraph")
+                trace.debug("Found section '%s' in paragraph", section_name)
                 # Replace the content
                 para.text = ai_section.get('title', section_name)
 
@@ -2941,7 +2765,7 @@ class CompleteThesisBuilder:
                 current_para = para
                 for line in content:
                     if isinstance(line, str) and line.strip():
-                        new_para = doc.add_paragraph(line)
+                        new_para = paragraphs.add_paragraph(line)
                         new_para.style = "Normal"
                         # Copy formatting from nearby paragraphs
                         if hasattr(current_para, 'paragraph_format'):
@@ -2959,18 +2783,19 @@ class CompleteThesisBuilder:
 
     def _append_to_template_section(self, doc: Document, section_name: str, ai_section: Dict[str, Any]) -> int:
         """Append AI content to an existing template section."""
+        paragraphs = paragraph_index(doc)
         replacements = 0
 
         # Find paragraphs containing the section name
-        for para in doc.paragraphs:
+        for para in paragraphs:
             if section_name.lower() in para.text.lower():
-                print(f"[DEBUG] Found section '{section_name}' to append to")
+                trace.debug("Found section '%s' to append to", section_name)
                 # Add content after this paragraph
                 content = ai_section.get('content', [])
                 current_para = para
                 for line in content:
                     if isinstance(line, str) and line.strip():
-                        new_para = doc.add_paragraph(line)
+                        new_para = paragraphs.add_paragraph(line)
                         new_para.style = "Normal"
                         # Copy formatting
                         if hasattr(current_para, 'paragraph_format'):
@@ -3025,6 +2850,7 @@ class CompleteThesisBuilder:
     
     def _add_main_content(self, doc: Document, user_data: Dict[str, Any], normalized: Dict[str, Any] | None = None) -> None:
         """Add main content (chapters/sections from extractor or normalized)."""
+        paragraphs = paragraph_index(doc)
         if normalized and isinstance(normalized, dict) and normalized.get("chapters"):
             sections = []
             for ch in normalized.get("chapters", []):
@@ -3052,7 +2878,7 @@ class CompleteThesisBuilder:
             
             # Add chapter heading
             title = section.get("title", f"Chapter {idx}")
-            heading_para = doc.add_paragraph(title)
+            heading_para = paragraphs.add_paragraph(title)
             heading_para.style = "Heading 1"
             heading_run = heading_para.runs[0]
             heading_run.font.bold = True
@@ -3063,7 +2889,7 @@ class CompleteThesisBuilder:
             if isinstance(content, list):
                 for line in content:
                     if isinstance(line, str) and line.strip():
-                        para = doc.add_paragraph(line)
+                        para = paragraphs.add_paragraph(line)
                         para.style = "Normal"
                         # Apply paragraph formatting
                         para.paragraph_format.left_indent = Inches(0.0)
@@ -3074,7 +2900,7 @@ class CompleteThesisBuilder:
                             run.font.name = "Times New Roman"
             else:
                 # Content is a single string
-                para = doc.add_paragraph(str(content))
+                para = paragraphs.add_paragraph(str(content))
                 para.style = "Normal"
                 para.paragraph_format.left_indent = Inches(0.0)
                 para.paragraph_format.first_line_indent = Inches(1.0)
@@ -3087,7 +2913,7 @@ class CompleteThesisBuilder:
             for lst in section.get("lists", []):
                 style_name = "List Number" if lst.get("ordered") else "List Bullet"
                 for item in lst.get("items", []):
-                    para = doc.add_paragraph(item)
+                    para = paragraphs.add_paragraph(item)
                     para.style = style_name
     
     def _add_back_matter(self, doc: Document, user_data: Dict[str, Any]) -> None:
@@ -3150,22 +2976,22 @@ class CompleteThesisBuilder:
 
     def _build_standard(self, user_data: Dict[str, Any]) -> Path:
         """Build thesis using standard processing (fallback method)."""
-        print(f"[DEBUG] Starting standard build with user_data keys: {list(user_data.keys())}")
-        print(f"[DEBUG] Template path: {self.template_path}, exists: {self.template_path.exists()}")
-        print(f"[DEBUG] Content path: {self.content_path}, exists: {self.content_path.exists()}")
+        trace.debug("Starting standard build with user_data keys: %s", list(user_data.keys()))
+        trace.debug("Template path: %s, exists: %s", self.template_path, self.template_path.exists())
+        trace.debug("Content path: %s, exists: %s", self.content_path, self.content_path.exists())
 
         # Load template document and extract styles, then create new document
         try:
             template_doc = Document(str(self.template_path))
-            print(f"[DEBUG] Template loaded successfully, {len(template_doc.paragraphs)} paragraphs, {len(template_doc.styles)} styles")
+            trace.debug("Template loaded successfully, %s paragraphs, %s styles", len(template_doc.paragraphs), len(template_doc.styles))
 
             # Create new document (don't keep template content)
             doc = Document()
-            print(f"[DEBUG] New document created with {len(doc.styles)} default styles")
+            trace.debug("New document created with %s default styles", len(doc.styles))
 
             # Copy styles from template to new document
             self._copy_styles_from_template(doc, template_doc)
-            print(f"[DEBUG] After style copying: {len(doc.styles)} styles in new document")
+            trace.debug("After style copying: %s styles in new document", len(doc.styles))
 
         except Exception as e:
             print(f"[WARNING] Failed to load template, creating new document: {e}")
@@ -3173,37 +2999,38 @@ class CompleteThesisBuilder:
 
         # Build sections in order
         if self.include_frontmatter:
-            print("[DEBUG] Adding front matter...")
+            trace.debug("Adding front matter...")
             self._add_front_matter(doc, user_data)
-            print(f"[DEBUG] Front matter added, document now has {len(doc.paragraphs)} paragraphs")
+            trace.debug("Front matter added, document now has %s paragraphs", len(paragraph_index(doc)))
 
         # Prefer normalized extractor where available
         try:
-            print("[DEBUG] Attempting normalized extraction...")
+            trace.debug("Attempting normalized extraction...")
             normalized = extract_normalized_structure(str(self.content_path))
-            print(f"[DEBUG] Normalized extraction successful: {normalized is not None}")
+            trace.debug("Normalized extraction successful: %s", normalized is not None)
             if normalized:
-                print(f"[DEBUG] Normalized structure keys: {list(normalized.keys())}")
+                trace.debug("Normalized structure keys: %s", list(normalized.keys()))
                 if 'chapters' in normalized:
-                    print(f"[DEBUG] Found {len(normalized['chapters'])} chapters")
+                    trace.debug("Found %s chapters", len(normalized['chapters']))
         except Exception as e:
-            print(f"[DEBUG] Normalized extraction failed: {e}")
+            trace.debug("Normalized extraction failed: %s", e)
             normalized = None
 
-        print("[DEBUG] Adding main content...")
+        trace.debug("Adding main content...")
         self._add_main_content(doc, user_data, normalized)
-        print(f"[DEBUG] Main content added, document now has {len(doc.paragraphs)} paragraphs")
+        trace.debug("Main content added, document now has %s paragraphs", len(paragraph_index(doc)))
 
-        print("[DEBUG] Adding back matter...")
+        trace.debug("Adding back matter...")
         self._add_back_matter(doc, user_data)
-        print(f"[DEBUG] Back matter added, document now has {len(doc.paragraphs)} paragraphs")
+        trace.debug("Back matter added, document now has %s paragraphs", len(paragraph_index(doc)))
 
         # Save
-        print(f"[DEBUG] Saving document to: {self.output_path}")
-        doc.save(str(self.output_path))
+        trace.debug("Saving document to: %s", self.output_path)
+        with span("save"):
+            doc.save(str(self.output_path))
 
         final_size = self.output_path.stat().st_size if self.output_path.exists() else 0
-        print(f"[DEBUG] Document saved successfully, size: {final_size} bytes")
+        trace.debug("Document saved successfully, size: %s bytes", final_size)
 
         return self.output_path
 
@@ -3220,6 +3047,7 @@ class CompleteThesisBuilder:
             i += 1
         return roman_num
 
+    @span("abstract_insertion")
     def _insert_abstract(self, doc, analyzed_data, config):
         """Insert abstract and keywords with university-specific configuration."""
         abstract_data = analyzed_data.get('abstract', {})
@@ -3251,6 +3079,7 @@ class CompleteThesisBuilder:
 
     def _insert_single_abstract(self, doc, abstract_data, lang_key, section_patterns, keyword_label):
         """Insert a single abstract (Indonesian or English) with keywords."""
+        paragraphs = paragraph_index(doc)
         insertions = 0
         abstract_text = abstract_data.get(lang_key, '')
         # Fix: Use correct keywords key
@@ -3264,7 +3093,7 @@ class CompleteThesisBuilder:
         print(f"[INFO] Looking for {lang_key} abstract section with patterns: {section_patterns}")
 
         # Find the abstract section
-        for para_index, para in enumerate(doc.paragraphs):
+        for para_index, para in enumerate(paragraphs):
             para_text_upper = para.text.upper()
             found_section = False
 
@@ -3272,7 +3101,7 @@ class CompleteThesisBuilder:
             for pattern in section_patterns:
                 if pattern in para_text_upper:
                     found_section = True
-                    print(f"[INFO] Found {lang_key} abstract section: '{para.text.strip()}'")
+                    trace.debug("Found %s abstract section: '%s'", lang_key, para.text.strip())
                     break
 
             if found_section:
@@ -3280,8 +3109,8 @@ class CompleteThesisBuilder:
                 keywords_inserted = False
 
                 # Look for content insertion point (next few paragraphs)
-                for i in range(para_index + 1, min(para_index + 15, len(doc.paragraphs))):
-                    content_para = doc.paragraphs[i]
+                for i in range(para_index + 1, min(para_index + 15, len(paragraphs))):
+                    content_para = paragraphs[i]
 
                     # Skip if this is another section header
                     if any(header in content_para.text.upper() for header in
@@ -3310,12 +3139,12 @@ class CompleteThesisBuilder:
 
                         insertions += 1
                         content_inserted = True
-                        print(f"[SUCCESS] Inserted {lang_key} abstract ({len(abstract_text)} chars)")
-                        print(f"[SUCCESS] Replaced: '{old_content}...' with abstract content")
+                        trace.debug("Inserted %s abstract (%s chars)", lang_key, len(abstract_text))
+                        trace.debug("Replaced: '%s...' with abstract content", old_content)
 
                         # Look for keywords insertion point (next paragraph)
-                        if keywords and i + 1 < len(doc.paragraphs):
-                            keyword_para = doc.paragraphs[i + 1]
+                        if keywords and i + 1 < len(paragraphs):
+                            keyword_para = paragraphs[i + 1]
                             keyword_text_lower = keyword_para.text.lower()
 
                             if ('kata kunci' in keyword_text_lower or
@@ -3329,14 +3158,14 @@ class CompleteThesisBuilder:
 
                                 insertions += 1
                                 keywords_inserted = True
-                                print(f"[SUCCESS] Inserted {lang_key} keywords: {keywords_text}")
+                                trace.debug("Inserted %s keywords: %s", lang_key, keywords_text)
 
                         break
 
                 if not content_inserted:
-                    print(f"[WARNING] Could not find content insertion point for {lang_key} abstract")
+                    trace.warning("Could not find content insertion point for %s abstract", lang_key)
                 if keywords and not keywords_inserted:
-                    print(f"[WARNING] Could not find keywords insertion point for {lang_key}")
+                    trace.warning("Could not find keywords insertion point for %s", lang_key)
 
                 break  # Stop looking for more sections
 
@@ -3344,6 +3173,7 @@ class CompleteThesisBuilder:
 
     def _insert_chapter_with_headings(self, doc, chapter_num, chapter_content):
         """Insert chapter content with proper subsection headings."""
+        paragraphs = paragraph_index(doc)
         insertions = 0
 
         # Subsection title mapping
@@ -3372,31 +3202,18 @@ class CompleteThesisBuilder:
         }
 
         # Find main content start to avoid inserting in front matter (DAFTAR ISI, etc.)
-        main_content_start = self._find_main_content_start(doc)
-        if main_content_start is None:
-            main_content_start = 0
-        
+        zones = document_zones(doc)
+        main_content_start = zones.main_content_start
+
         # Find chapter heading - ONLY in main content area (not in front matter)
         chapter_heading_index = None
-        for i, para in enumerate(doc.paragraphs):
-            # Skip front matter sections
-            if i < main_content_start:
+        for i, para in enumerate(paragraphs):
+            # Skip front matter, TOC and back matter sections
+            if i < main_content_start or not zones.zone_of(para).is_main:
                 continue
             
             para_text = para.text.upper()
             
-            # Skip if this is in a front matter section (DAFTAR ISI, DAFTAR GAMBAR, etc.)
-            # Check if we're still in front matter by looking backwards
-            is_in_front_matter = False
-            for j in range(max(0, i - 10), i):
-                check_text = doc.paragraphs[j].text.upper()
-                if any(fm in check_text for fm in ['DAFTAR ISI', 'DAFTAR GAMBAR', 'DAFTAR TABEL', 'DAFTAR LAMPIRAN', 'TABLE OF CONTENTS']):
-                    is_in_front_matter = True
-                    break
-            
-            if is_in_front_matter:
-                continue
-            
             # Check if this paragraph is a TOC entry (has tab or page number pattern)
             if '\t' in para.text or re.search(r'\s+\d+\s*$', para.text):
                 # Likely a TOC entry, skip it
@@ -3408,14 +3225,14 @@ class CompleteThesisBuilder:
                 # TOC entries are usually short and have page numbers
                 if len(para.text.strip()) < 50 or re.search(r'\d+\s*$', para.text.strip()):
                     # Might be TOC entry, check next paragraph
-                    if i + 1 < len(doc.paragraphs):
-                        next_para = doc.paragraphs[i + 1]
+                    if i + 1 < len(paragraphs):
+                        next_para = paragraphs[i + 1]
                         # If next paragraph also looks like TOC, skip
                         if '\t' in next_para.text or re.search(r'\s+\d+\s*$', next_para.text):
                             continue
                 
                 chapter_heading_index = i
-                print(f"[INFO] Found Chapter {chapter_num} heading at paragraph {i} (main content area)")
+                trace.debug("Found Chapter %s heading at paragraph %s (main content area)", chapter_num, i)
                 break
 
         if chapter_heading_index is None:
@@ -3438,7 +3255,7 @@ class CompleteThesisBuilder:
 
             if heading_para:
                 # Find content paragraph after heading
-                heading_index = doc.paragraphs.index(heading_para)
+                heading_index = paragraphs.index(heading_para)
                 content_para = self._find_content_paragraph_after(doc, heading_index)
 
                 if content_para:
@@ -3446,7 +3263,7 @@ class CompleteThesisBuilder:
                     existing_content = content_para.text.strip()
                     if len(existing_content) > 100:
                         # Already has content - skip to prevent duplication
-                        print(f"[SKIP] Subsection {heading_text} already has content ({len(existing_content)} chars), skipping duplicate insertion")
+                        trace.debug("Subsection %s already has content (%s chars), skipping duplicate insertion", heading_text, len(existing_content))
                         subsection_counter += 1
                         continue
                     
@@ -3458,21 +3275,21 @@ class CompleteThesisBuilder:
                     # Apply proper academic formatting (CRITICAL FIXES)
                     self._apply_paragraph_formatting(content_para)
 
-                    print(f"[SUCCESS] {heading_text}: {len(subsection_content)} chars")
+                    trace.debug("%s: %s chars", heading_text, len(subsection_content))
                     insertions += 1
-                    current_index = doc.paragraphs.index(content_para) + 1
+                    current_index = paragraphs.index(content_para) + 1
                 else:
                     # No content paragraph found - check if next paragraphs already have this subsection content
                     # Look ahead to see if subsection already exists with content
                     subsection_num = f"{chapter_num}.{subsection_counter}"
                     found_duplicate = False
-                    for check_idx in range(heading_index + 1, min(heading_index + 10, len(doc.paragraphs))):
-                        check_para = doc.paragraphs[check_idx]
+                    for check_idx in range(heading_index + 1, min(heading_index + 10, len(paragraphs))):
+                        check_para = paragraphs[check_idx]
                         check_text = check_para.text.strip()
                         # Check if this is another subsection heading with same number
                         if re.match(rf'^{re.escape(subsection_num)}\s+', check_text):
                             # Found duplicate subsection heading - skip
-                            print(f"[SKIP] Duplicate subsection {subsection_num} found at paragraph {check_idx}, skipping")
+                            trace.debug("Duplicate subsection %s found at paragraph %s, skipping", subsection_num, check_idx)
                             found_duplicate = True
                             break
                         # Check if this paragraph has substantial content and is after our heading
@@ -3480,14 +3297,14 @@ class CompleteThesisBuilder:
                             # Might be content for this subsection - check if it's before next subsection
                             # Look ahead for next subsection
                             has_next_subsection = False
-                            for next_idx in range(check_idx + 1, min(check_idx + 5, len(doc.paragraphs))):
-                                next_para_text = doc.paragraphs[next_idx].text.strip()
+                            for next_idx in range(check_idx + 1, min(check_idx + 5, len(paragraphs))):
+                                next_para_text = paragraphs[next_idx].text.strip()
                                 if re.match(rf'^{chapter_num}\.\d+\s+', next_para_text):
                                     has_next_subsection = True
                                     break
                             if not has_next_subsection:
                                 # This might be content for our subsection - skip to avoid duplicate
-                                print(f"[SKIP] Subsection {heading_text} appears to already have content, skipping")
+                                trace.debug("Subsection %s appears to already have content, skipping", heading_text)
                                 found_duplicate = True
                                 break
                     
@@ -3502,8 +3319,10 @@ class CompleteThesisBuilder:
     def _find_or_create_heading(self, doc, start_index, heading_text):
         """Find existing heading or create new one. Prevents duplicates by checking exact subsection numbers.
         CRITICAL: Only searches in main content area, not in front matter."""
+        paragraphs = paragraph_index(doc)
         # Get main content start to avoid front matter
-        main_content_start = self._find_main_content_start(doc) or 0
+        zones = document_zones(doc)
+        main_content_start = zones.main_content_start or 0
         
         # Ensure we're searching in main content area
         if start_index < main_content_start:
@@ -3514,8 +3333,8 @@ class CompleteThesisBuilder:
         subsection_num = heading_text.split()[0] if heading_text else ""
         
         # Search for existing heading with EXACT subsection number match
-        for i in range(start_index, min(start_index + 20, len(doc.paragraphs))):
-            para = doc.paragraphs[i]
+        for i in range(start_index, min(start_index + 20, len(paragraphs))):
+            para = paragraphs[i]
             para_text = para.text.strip()
             
             # CRITICAL: Skip if we're still in front matter
@@ -3527,10 +3346,8 @@ class CompleteThesisBuilder:
                 continue
             
             # CRITICAL: Skip if this is in a front matter section
-            for j in range(max(0, i - 5), min(i + 5, len(doc.paragraphs))):
-                check_text = doc.paragraphs[j].text.upper()
-                if any(fm in check_text for fm in ['DAFTAR ISI', 'DAFTAR GAMBAR', 'DAFTAR TABEL', 'DAFTAR LAMPIRAN']):
-                    continue  # Skip this paragraph
+            if not zones.zone_of(para).is_main:
+                continue
             
             # Check if this paragraph already has the exact subsection number
             # Match pattern: "1.1" or "1.1 " at the start of the paragraph
@@ -3541,7 +3358,7 @@ class CompleteThesisBuilder:
                     para.clear()
                     para.add_run(heading_text)
                     para.style = 'Heading 3'
-                    print(f"[INFO] Reusing existing subsection heading: {subsection_num}")
+                    trace.debug("Reusing existing subsection heading: %s", subsection_num)
                     return para
                 # If it's not a heading style but has the number, it might be content - skip
                 continue
@@ -3554,8 +3371,8 @@ class CompleteThesisBuilder:
                 continue
 
         # If not found, try to find a placeholder paragraph (ONLY in main content)
-        for i in range(start_index, min(start_index + 20, len(doc.paragraphs))):
-            para = doc.paragraphs[i]
+        for i in range(start_index, min(start_index + 20, len(paragraphs))):
+            para = paragraphs[i]
             para_text = para.text.strip()
             
             # CRITICAL: Skip if we're still in front matter
@@ -3577,7 +3394,7 @@ class CompleteThesisBuilder:
                 para.clear()
                 para.add_run(heading_text)
                 para.style = 'Heading 3'
-                print(f"[INFO] Created new subsection heading: {subsection_num}")
+                trace.debug("Created new subsection heading: %s", subsection_num)
                 return para
 
         print(f"[WARNING] Could not find or create heading for: {heading_text}")
@@ -3585,20 +3402,22 @@ class CompleteThesisBuilder:
 
     def _find_content_paragraph_after(self, doc, heading_index):
         """Find content paragraph after heading. CRITICAL: Only searches in main content area."""
+        paragraphs = paragraph_index(doc)
         # Get main content start to avoid front matter
-        main_content_start = self._find_main_content_start(doc) or 0
+        zones = document_zones(doc)
+        main_content_start = zones.main_content_start or 0
         
         # CRITICAL: Ensure heading is in main content
         if heading_index < main_content_start:
             print(f"[WARNING] Heading at index {heading_index} is in front matter (main content starts at {main_content_start})")
             return None
         
-        for i in range(heading_index + 1, min(heading_index + 10, len(doc.paragraphs))):
+        for i in range(heading_index + 1, min(heading_index + 10, len(paragraphs))):
             # CRITICAL: Skip if we've gone back into front matter
             if i < main_content_start:
                 continue
             
-            para = doc.paragraphs[i]
+            para = paragraphs[i]
             para_text = para.text.strip()
             
             # CRITICAL: Skip TOC entries
@@ -3606,14 +3425,7 @@ class CompleteThesisBuilder:
                 continue
             
             # CRITICAL: Skip if this is in a front matter section
-            is_in_front_matter = False
-            for j in range(max(0, i - 5), min(i + 5, len(doc.paragraphs))):
-                check_text = doc.paragraphs[j].text.upper()
-                if any(fm in check_text for fm in ['DAFTAR ISI', 'DAFTAR GAMBAR', 'DAFTAR TABEL', 'DAFTAR LAMPIRAN']):
-                    is_in_front_matter = True
-                    break
-            
-            if is_in_front_matter:
+            if not zones.zone_of(para).is_main:
                 continue
             
             # Check if this is a content paragraph
@@ -3628,6 +3440,7 @@ class CompleteThesisBuilder:
 
     def _insert_references(self, doc, analyzed_data):
         """Insert references into DAFTAR PUSTAKA section."""
+        paragraphs = paragraph_index(doc)
         references = analyzed_data.get('references', [])
         if not references:
             return 0
@@ -3635,15 +3448,15 @@ class CompleteThesisBuilder:
         insertions = 0
 
         # Find DAFTAR PUSTAKA section
-        for para in doc.paragraphs:
+        for para in paragraphs:
             if 'DAFTAR PUSTAKA' in para.text.upper():
-                para_index = doc.paragraphs.index(para)
-                print(f"[INFO] Found DAFTAR PUSTAKA at paragraph {para_index}")
+                para_index = paragraphs.index(para)
+                trace.debug("Found DAFTAR PUSTAKA at paragraph %s", para_index)
 
                 # Clear existing placeholder content
                 cleared_count = 0
-                for i in range(para_index + 1, min(para_index + 20, len(doc.paragraphs))):
-                    ref_para = doc.paragraphs[i]
+                for i in range(para_index + 1, min(para_index + 20, len(paragraphs))):
+                    ref_para = paragraphs[i]
                     if ('Gunakan reference manager' in ref_para.text or
                         'DAFTAR PUSTAKA' in ref_para.text.upper() or
                         len(ref_para.text.strip()) < 50):
@@ -3656,8 +3469,8 @@ class CompleteThesisBuilder:
                 # Insert references
                 insert_index = para_index + 1
                 for ref in references[:15]:  # Limit to 15 references
-                    if insert_index < len(doc.paragraphs):
-                        target_para = doc.paragraphs[insert_index]
+                    if insert_index < len(paragraphs):
+                        target_para = paragraphs[insert_index]
                         target_para.clear()
                         target_para.add_run(ref)
                         target_para.style = 'Normal'
@@ -3665,25 +3478,26 @@ class CompleteThesisBuilder:
                         insert_index += 1
                     else:
                         # Add new paragraph
-                        new_para = doc.add_paragraph(ref)
+                        new_para = paragraphs.add_paragraph(ref)
                         new_para.style = 'Normal'
                         insertions += 1
 
-                print(f"[SUCCESS] Inserted {insertions} references")
+                trace.debug("Inserted %s references", insertions)
                 break
 
         return insertions
 
     def _replace_user_metadata_in_doc(self, doc, title, author, nim):
         """Helper to replace core metadata everywhere."""
+        paragraphs = paragraph_index(doc)
         metadata_replacements = 0
-        for para_idx, para in enumerate(doc.paragraphs):
+        for para_idx, para in enumerate(paragraphs):
             text = para.text.strip()
             # Title
             if any(phrase in text.upper() for phrase in ['TULIS JUDUL', 'JUDUL SKRIPSI', 'BAGIAN JUDUL']):
                 is_title_page = False
-                for i in range(max(0, para_idx - 5), min(para_idx + 5, len(doc.paragraphs))):
-                    if 'HALAMAN JUDUL' in doc.paragraphs[i].text.upper():
+                for i in range(max(0, para_idx - 5), min(para_idx + 5, len(paragraphs))):
+                    if 'HALAMAN JUDUL' in paragraphs[i].text.upper():
                         is_title_page = True; break
                 if is_title_page:
                     self._replace_text_preserve_formatting(para, para.text, title)
@@ -3720,7 +3534,11 @@ class CompleteThesisBuilder:
         
         new_p = OxmlElement('w:p')
         paragraph._element.addnext(new_p)
-        new_para = Paragraph(new_p, paragraph._parent)
+        index = find_paragraph_index(paragraph)
+        if index is not None:
+            new_para = index.note_inserted(new_p, after=paragraph)
+        else:
+            new_para = Paragraph(new_p, paragraph._parent)
         if text:
             new_para.add_run(text)
         if style:
@@ -3757,6 +3575,17 @@ class CompleteThesisBuilder:
             if para.runs[i].text:
                 para.runs[i].text = ""
 
+def _template_cache_delta(before: Dict[str, Any]) -> Dict[str, Any]:
+    """Template cache activity since the given stats snapshot."""
+    after = TEMPLATE_STORE.stats()
+    return {
+        "hits": after["hits"] - before["hits"],
+        "misses": after["misses"] - before["misses"],
+        "saved_parse_seconds": round(after["saved_seconds"] - before["saved_seconds"], 3),
+    }
+
+
+@span("create_complete_thesis")
 def create_complete_thesis(
     template_path: str,
     content_path: str,
@@ -3766,7 +3595,8 @@ def create_complete_thesis(
     include_frontmatter: bool = True,
     api_key: Optional[str] = None,
     university_config: str = 'indonesian_standard',
-    use_simple_builder: bool = False
+    use_simple_builder: bool = False,
+    progress_callback: Optional[Callable[[str], None]] = None
 ) -> Dict[str, Any]:
     """Convenience function to create a complete thesis in one call.
 
@@ -3780,6 +3610,7 @@ def create_complete_thesis(
         api_key: OpenRouter API key
         university_config: University template configuration
         use_simple_builder: Use simple, reliable builder instead of complex template system
+        progress_callback: Optional callable receiving the current build stage name
     
     Returns:
         Dictionary with:
@@ -3823,8 +3654,9 @@ def create_complete_thesis(
             }
         
         # Try complex builder with fallback to simple builder
+        cache_before = TEMPLATE_STORE.stats()
         try:
-            builder = CompleteThesisBuilder(template_path, content_path, output_path, use_ai=use_ai, include_frontmatter=include_frontmatter, api_key=api_key, university_config=university_config)
+            builder = CompleteThesisBuilder(template_path, content_path, output_path, use_ai=use_ai, include_frontmatter=include_frontmatter, api_key=api_key, university_config=university_config, progress_callback=progress_callback)
             
             # Get analysis before building
             report = builder.get_analysis_report()
@@ -3838,6 +3670,7 @@ def create_complete_thesis(
                 "message": "Complete thesis document created successfully",
                 "report": report,
                 "file_size": output.stat().st_size if output.exists() else 0,
+                "template_cache": _template_cache_delta(cache_before),
             }
         except Exception as complex_e:
             print(f"[CREATE_THESIS] Complex builder failed: {complex_e}")
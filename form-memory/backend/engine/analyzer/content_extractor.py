@@ -3,17 +3,26 @@ import re
 from pathlib import Path
 from docx import Document
 
+from .content_source import ContentSource
+
 
 class ContentExtractor:
     """A lightweight, robust content extractor for DOCX/TXT inputs."""
 
-    def __init__(self, content_path: str, debug_mapping: bool = False):
+    def __init__(self, content_path: str, debug_mapping: bool = False, source: Optional[ContentSource] = None):
         self.content_path = Path(content_path)
         self.is_docx = self.content_path.suffix.lower() == ".docx"
         self._debug_mapping = bool(debug_mapping)
-        data = self._load_content()
-        self._sections = data.get("sections", [])
-        self._raw_text = data.get("raw_text", "")
+        # The file is read lazily, once, by the shared content source
+        self.source = source if source is not None else ContentSource(str(self.content_path))
+
+    @property
+    def _sections(self) -> List[Dict[str, Any]]:
+        return self.source.sections
+
+    @property
+    def _raw_text(self) -> str:
+        return self.source.raw_text
 
     def _load_content(self) -> Dict[str, Any]:
         if self.is_docx:
@@ -22,29 +31,17 @@ class ContentExtractor:
             return self._extract_from_text()
 
     def _extract_from_docx(self) -> Dict[str, Any]:
-        doc = Document(str(self.content_path))
-        # No heavy cleaning; keep parser simple and robust
-        cleaned_doc = doc
-        sections = self._extract_sections_from_docx(cleaned_doc)
         return {
-            "sections": sections,
-            "raw_text": self._get_docx_text(cleaned_doc),
-            "tables": self._extract_tables_from_docx(cleaned_doc),
-            "metadata": {
-                "title": doc.core_properties.title or "",
-                "author": doc.core_properties.author or "",
-                "formatting_quality": self._assess_docx_quality(doc),
-                "needs_cleanup": self._detect_formatting_issues(doc),
-            },
+            "sections": self.source.sections,
+            "raw_text": self.source.raw_text,
+            "tables": self.source.tables,
+            "metadata": self.source.metadata,
         }
 
     def _extract_from_text(self) -> Dict[str, Any]:
-        with open(self.content_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-        sections = self._extract_sections_from_text(text)
         return {
-            "sections": sections,
-            "raw_text": text,
+            "sections": self.source.sections,
+            "raw_text": self.source.raw_text,
             "tables": [],
             "metadata": {},
         }
@@ -177,8 +174,7 @@ class ContentExtractor:
         return self._raw_text
 
     def get_tables(self) -> List[Dict[str, Any]]:
-        content_data = self._load_content()
-        return content_data.get("tables", [])
+        return self.source.tables
 
     def get_section_by_title(self, title_pattern: str) -> Optional[Dict[str, Any]]:
         for section in self._sections:
@@ -0,0 +1,152 @@
+"""
+Content Source
+Single ingestion point for one uploaded content file (DOCX/TXT).
+Creating a source does no I/O: the file is read on first use and every view
+(raw text, sections, tables, metadata, AI analysis) is computed at most once,
+then shared by the rule-based and AI-enhanced extractors.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from docx import Document
+
+from ..metrics import span
+
+
+class ContentSource:
+    """Lazily loaded, memoized views over one content file."""
+
+    def __init__(self, content_path: str, use_ai: bool = True, api_key: Optional[str] = None):
+        """
+        Register a content file without reading it.
+
+        Args:
+            content_path: Path to DOCX or TXT file
+            use_ai: Whether the AI analysis view may call the LLM
+            api_key: OpenRouter API key for AI features
+        """
+        self.content_path = Path(content_path)
+        self.is_docx = self.content_path.suffix.lower() == '.docx'
+        self.use_ai = use_ai
+        self.api_key = api_key
+        self.reads = 0  # Times the file was read from disk (at most one)
+
+        self._views: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _view(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return a memoized view, computing it once even under concurrent access."""
+        if name in self._views:
+            return self._views[name]
+        with self._locks_guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        # One lock per view, so a slow view (the AI analysis) never blocks the others
+        with lock:
+            if name not in self._views:
+                with span(f"content_{name}"):
+                    self._views[name] = compute()
+        return self._views[name]
+
+    def computed(self, name: str) -> bool:
+        """Check whether a view has been computed."""
+        return name in self._views
+
+    # ------------------------------------------------------------------
+    # File views
+    # ------------------------------------------------------------------
+
+    @property
+    def document(self):
+        """Parsed DOCX (None for text files)."""
+        return self._view('document', self._read_document)
+
+    def _read_document(self):
+        if not self.is_docx:
+            return None
+        self.reads += 1
+        return Document(str(self.content_path))
+
+    @property
+    def raw_text(self) -> str:
+        """All text content, one paragraph (or line) per line."""
+        return self._view('raw_text', self._read_text)
+
+    def _read_text(self) -> str:
+        if self.is_docx:
+            return '\n'.join(para.text for para in self.document.paragraphs)
+        self.reads += 1
+        with open(self.content_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    @property
+    def sections(self) -> List[Dict[str, Any]]:
+        """Rule-based sections (headings by outline level, style or numbering)."""
+        def parse():
+            if self.is_docx:
+                return self.extractor._extract_sections_from_docx(self.document)
+            return self.extractor._extract_sections_from_text(self.raw_text)
+        return self._view('sections', parse)
+
+    @property
+    def tables(self) -> List[Dict[str, Any]]:
+        """Table contents (DOCX only)."""
+        def parse():
+            if not self.is_docx:
+                return []
+            return self.extractor._extract_tables_from_docx(self.document)
+        return self._view('tables', parse)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Document properties and formatting assessment (DOCX only)."""
+        def parse():
+            if not self.is_docx:
+                return {}
+            doc = self.document
+            return {
+                "title": doc.core_properties.title or "",
+                "author": doc.core_properties.author or "",
+                "formatting_quality": self.extractor._assess_docx_quality(doc),
+                "needs_cleanup": self.extractor._detect_formatting_issues(doc),
+            }
+        return self._view('metadata', parse)
+
+    # ------------------------------------------------------------------
+    # Extractor views
+    # ------------------------------------------------------------------
+
+    @property
+    def extractor(self):
+        """Rule-based ContentExtractor reading from this source."""
+        def create():
+            from .content_extractor import ContentExtractor
+            return ContentExtractor(str(self.content_path), source=self)
+        return self._view('extractor', create)
+
+    @property
+    def ai_extractor(self):
+        """AIEnhancedContentExtractor reading from this source (not yet run)."""
+        def create():
+            from .ai_enhanced_extractor import AIEnhancedContentExtractor
+            return AIEnhancedContentExtractor(
+                str(self.content_path), use_ai=self.use_ai, api_key=self.api_key,
+                source=self
+            )
+        return self._view('ai_extractor', create)
+
+    @property
+    def analysis(self):
+        """
+        Run the AI-enhanced extraction once and return its extractor.
+
+        This is the only view that may call the LLM; `analysis.analyzed_data`
+        holds the generated thesis content when AI generation ran.
+        """
+        def run():
+            extractor = self.ai_extractor
+            extractor.extract()
+            return extractor
+        return self._view('analysis', run)
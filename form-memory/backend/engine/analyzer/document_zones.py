@@ -0,0 +1,267 @@
+"""
+Document Zone Map
+Labels every body paragraph of a thesis document with the zone it belongs to
+(front matter, table-of-contents entry, main content chapter N, back matter).
+Computed once per document and kept valid as paragraphs are inserted, so
+placement code asks `zone_of(paragraph)` instead of rescanning the document.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Set
+
+from ..metrics import span
+from ..tracing import get_tracer
+from .paragraph_index import ParagraphIndex, paragraph_index
+from .template_instructions import template_keyword_matcher
+
+FRONT_MATTER = 'front_matter'
+TOC_ENTRY = 'toc'
+MAIN_CONTENT = 'main'
+BACK_MATTER = 'back_matter'
+
+BACK_MATTER_HEADINGS = ('DAFTAR PUSTAKA', 'REFERENCES', 'BIBLIOGRAPHY', 'LAMPIRAN', 'APPENDIX')
+
+_CHAPTER_HEADING = re.compile(r'^(?:BAB|CHAPTER)\s+([IVXLC]+|\d+)\b', re.I)
+_PAGE_NUMBER_SUFFIX = re.compile(r'\s+\d+\s*$')
+_ROMAN_VALUES = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100}
+
+trace = get_tracer("zones")
+
+
+@dataclass(frozen=True)
+class Zone:
+    """Zone of a paragraph; `chapter` is set for main content only."""
+    kind: str
+    chapter: Optional[int] = None
+
+    @property
+    def is_main(self) -> bool:
+        return self.kind == MAIN_CONTENT
+
+
+def _chapter_number(token: str) -> int:
+    if token.isdigit():
+        return int(token)
+    total, previous = 0, 0
+    for char in reversed(token.upper()):
+        value = _ROMAN_VALUES[char]
+        total = total - value if value < previous else total + value
+        previous = max(previous, value)
+    return total
+
+
+def is_toc_line(raw_text: str, style_name: str) -> bool:
+    """Check for a table-of-contents line: TOC style, tab leader or trailing page number."""
+    return 'toc' in style_name or '\t' in raw_text or bool(_PAGE_NUMBER_SUFFIX.search(raw_text))
+
+
+def find_main_content_start(raw_texts: Sequence[str], style_names: Sequence[str],
+                            keywords: Sequence[Set[str]]) -> int:
+    """
+    Find where main content starts (after front matter), skipping every TOC entry.
+
+    Short "BAB ..." lines (under 100 characters) are taken for TOC entries, so
+    a chapter heading that short is only reached through the estimate.
+
+    Args:
+        raw_texts: Paragraph texts in document order
+        style_names: Lowercased paragraph style names
+        keywords: Keyword categories per paragraph from template_keyword_matcher()
+
+    Returns:
+        Paragraph index of the first main-content paragraph (may be an estimate
+        past the end of the document when no chapter heading is found)
+    """
+    count = len(raw_texts)
+    last_front_matter_index = -1
+    toc_section_end = None
+    
+    # Find the last front matter section and track TOC area
+    for i in range(count):
+        text = raw_texts[i].strip().upper()
+        style_name = style_names[i]
+        
+        # Check if we're entering a front matter section
+        if 'front_matter' in keywords[i]:
+            last_front_matter_index = i
+            if 'toc_title' in keywords[i]:
+                # Find where TOC section ends
+                for j in range(i + 1, min(i + 100, count)):
+                    next_style = style_names[j]
+                    # TOC ends when we hit another front matter section or main content
+                    if 'list_section' in keywords[j] or 'bab_one' in keywords[j]:
+                        # But verify it's not still a TOC entry
+                        if 'toc' not in next_style and '\t' not in raw_texts[j]:
+                            toc_section_end = j
+                            break
+    
+    # Look for the first actual chapter heading AFTER front matter
+    search_start = max(0, last_front_matter_index + 1)
+    for i in range(search_start, count):
+        raw_text = raw_texts[i]
+        text = raw_text.strip().upper()
+        style_name = style_names[i]
+        
+        # CRITICAL: Skip TOC entries - check multiple indicators
+        is_toc_entry = (
+            'toc' in style_name or  # TOC style (toc 1, toc 2, etc.)
+            '\t' in raw_text or  # Tab character
+            re.search(r'\s+\d+\s*$', raw_text) or  # Page number at end
+            (len(text) < 100 and 'BAB' in text and any(char.isdigit() or char in 'IVX' for char in text))  # Short BAB entry likely TOC
+        )
+        
+        if is_toc_entry:
+            continue
+        
+        # CRITICAL: If we're still in TOC section area, skip
+        if toc_section_end and i < toc_section_end:
+            continue
+        
+        # Check if we're still in a front matter section by looking backwards
+        still_in_front_matter = False
+        for j in range(max(0, i - 30), i):
+            if 'front_matter' in keywords[j]:
+                # Check if this front matter section is still active
+                # Look ahead to see if we've left it
+                found_exit = False
+                for k in range(j + 1, min(j + 100, count)):
+                    exit_style = style_names[k]
+                    # If we find a non-TOC BAB I, we've exited
+                    if 'bab_one' in keywords[k] and 'toc' not in exit_style and '\t' not in raw_texts[k]:
+                        if k <= i:  # We've passed it
+                            found_exit = True
+                            break
+                    # If we find another front matter section, we've moved on
+                    if 'list_section' in keywords[k] and 'toc' not in exit_style:
+                        if k <= i:  # We've passed it
+                            found_exit = True
+                            break
+                if not found_exit and k > i:
+                    still_in_front_matter = True
+                    break
+        
+        if still_in_front_matter:
+            continue
+        
+        # Check for actual chapter heading (not in TOC)
+        if 'chapter_one' in keywords[i] and len(text) > 10:
+            # Additional verification: check surrounding paragraphs for TOC indicators
+            is_toc_entry = False
+            for j in range(max(0, i - 5), min(i + 6, count)):
+                check_style = style_names[j]
+                if j != i and ('toc' in check_style or '\t' in raw_texts[j]):
+                    is_toc_entry = True
+                    break
+            
+            if not is_toc_entry:
+                trace.debug("Found main content start at paragraph %s: %s", i, text[:50])
+                return i
+    
+    # If no chapter found, return after last front matter or default
+    if last_front_matter_index >= 0:
+        estimated_start = last_front_matter_index + 50  # More conservative estimate
+        trace.debug("No clear BAB I found, using estimated start: %s", estimated_start)
+        return estimated_start
+    
+    # Default to middle of document
+    default_start = count // 2
+    trace.debug("Using default main content start: %s", default_start)
+    return default_start
+
+
+class DocumentZoneMap:
+    """
+    Zone label for every body paragraph of a document.
+
+    Labels are keyed by paragraph element, so they survive insertions that
+    shift positions; a paragraph inserted after the map was built belongs to
+    the zone of the nearest labelled paragraph before it.
+    """
+
+    def __init__(self, paragraphs: ParagraphIndex):
+        self._paragraphs = paragraphs
+        snapshot = list(paragraphs)
+        raw_texts = [p.text for p in snapshot]
+        style_names = [paragraphs.style_name(p).lower() for p in snapshot]
+        matcher = template_keyword_matcher()
+        keywords = [matcher.scan(text) for text in raw_texts]
+
+        start = find_main_content_start(raw_texts, style_names, keywords)
+        self._start_index = start
+        self._start_element = snapshot[start]._p if 0 <= start < len(snapshot) else None
+        self._zones: Dict[Any, Zone] = {}
+
+        chapter = None
+        in_back_matter = False
+        for i, para in enumerate(snapshot):
+            if i < start:
+                kind = TOC_ENTRY if is_toc_line(raw_texts[i], style_names[i]) else FRONT_MATTER
+                self._zones[para._p] = Zone(kind)
+                continue
+
+            text = raw_texts[i].strip().upper()
+            match = _CHAPTER_HEADING.match(text)
+            if match:
+                chapter = _chapter_number(match.group(1))
+                in_back_matter = False
+            elif len(text) < 50 and (text.startswith(BACK_MATTER_HEADINGS) or 'front_matter' in keywords[i]):
+                in_back_matter = True
+            self._zones[para._p] = Zone(BACK_MATTER) if in_back_matter else Zone(MAIN_CONTENT, chapter)
+
+    @property
+    def main_content_start(self) -> int:
+        """Current index of the first main-content paragraph."""
+        if self._start_element is None:
+            return self._start_index
+        position = self._paragraphs.position_of(self._start_element)
+        return position if position is not None else self._start_index
+
+    def zone_of(self, paragraph) -> Zone:
+        """
+        Return the zone of a paragraph.
+
+        Args:
+            paragraph: Paragraph or <w:p> element in the document body
+
+        Returns:
+            Zone of the paragraph (front matter when nothing precedes it)
+        """
+        element = getattr(paragraph, '_p', paragraph)
+        zone = self._zones.get(element)
+        if zone is not None:
+            return zone
+
+        sibling = element.getprevious()
+        while sibling is not None and zone is None:
+            zone = self._zones.get(sibling)
+            sibling = sibling.getprevious()
+        zone = zone or Zone(FRONT_MATTER)
+        self._zones[element] = zone
+        return zone
+
+    def zone_at(self, index: int) -> Zone:
+        """Return the zone of the paragraph at a position."""
+        return self.zone_of(self._paragraphs[index])
+
+
+def document_zones(document) -> DocumentZoneMap:
+    """
+    Return the zone map of a document, computing it on first use.
+
+    The map is cached on the document's ParagraphIndex and dropped when the
+    index is rebuilt; call invalidate_document_zones() after editing text
+    that moves zone boundaries.
+    """
+    paragraphs = paragraph_index(document)
+    zones = paragraphs.derived.get('zones')
+    if zones is None:
+        with span("zone_mapping"):
+            zones = DocumentZoneMap(paragraphs)
+        paragraphs.derived['zones'] = zones
+    return zones
+
+
+def invalidate_document_zones(document) -> None:
+    """Drop a document's cached zone map."""
+    paragraph_index(document).derived.pop('zones', None)
@@ -0,0 +1,219 @@
+"""
+DOCX Writer
+Saves python-docx Documents built from a template without recompressing the
+parts the build never touched.
+
+Document.save() serializes and deflates every part of the package, including
+the images, fonts and embedded objects that make up most of a template's size.
+save_document() writes the same package, but a part whose bytes are identical
+to the member of the source ZIP (same size and CRC-32) is copied as the raw
+compressed bytes of that member. XML parts the build changed (document.xml,
+styles.xml, numbering.xml, ...) are serialized and deflated as before.
+
+    save_document(doc, output_path, source=template_path)
+
+iter_document_bytes() produces the same package as a stream of chunks, for
+writing straight into an HTTP response without a file on disk.
+"""
+
+import io
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, IO, Iterator, Optional, Union
+
+from docx.opc.pkgwriter import PackageWriter
+
+from ..metrics import REGISTRY
+
+PathLike = Union[str, Path]
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+SAVE_PARTS = REGISTRY.counter(
+    "folio_docx_save_parts_total", "Package parts written by save_document", ["mode"]
+)
+SAVE_BYTES = REGISTRY.counter(
+    "folio_docx_save_bytes_total", "Uncompressed bytes of package parts written by save_document", ["mode"]
+)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable buffer drained between package parts."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ReusingZipWriter:
+    """
+    Package writer that copies unchanged members from a source ZIP.
+
+    Implements the write()/close() interface python-docx's PackageWriter
+    expects of its physical writer.
+
+    Args:
+        destination: Path or writable binary file (need not be seekable)
+        source: ZIP whose members may be reused; None writes every part
+    """
+
+    def __init__(self, destination: Union[PathLike, IO[bytes]], source: Optional[PathLike] = None):
+        self._zipf = zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED)
+        self._source: Optional[zipfile.ZipFile] = None
+        self._source_members: Dict[str, zipfile.ZipInfo] = {}
+        if source is not None:
+            try:
+                self._source = zipfile.ZipFile(source)
+                self._source_members = {info.filename: info for info in self._source.infolist()}
+            except (OSError, zipfile.BadZipFile) as e:
+                # Reuse is only an optimization; write every part instead
+                print(f"[WARNING] Cannot reuse parts of {source}: {e}")
+        self.reused = 0
+        self.written = 0
+        self.reused_bytes = 0
+        self.written_bytes = 0
+
+    def write(self, pack_uri, blob: bytes) -> None:
+        """Add a part, reusing the source member's compressed bytes when identical."""
+        name = pack_uri.membername
+        info = self._source_members.get(name)
+        if info is not None and self._unchanged(info, blob) and self._copy_raw(info):
+            self.reused += 1
+            self.reused_bytes += len(blob)
+            return
+        self._zipf.writestr(name, blob)
+        self.written += 1
+        self.written_bytes += len(blob)
+
+    def close(self) -> None:
+        self._zipf.close()
+        if self._source is not None:
+            self._source.close()
+        SAVE_PARTS.inc(self.reused, mode="reused")
+        SAVE_PARTS.inc(self.written, mode="written")
+        SAVE_BYTES.inc(self.reused_bytes, mode="reused")
+        SAVE_BYTES.inc(self.written_bytes, mode="written")
+
+    @staticmethod
+    def _unchanged(info: zipfile.ZipInfo, blob: bytes) -> bool:
+        return (
+            info.file_size == len(blob)
+            and info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+            and not info.flag_bits & 0x1  # encrypted
+            and info.CRC == zlib.crc32(blob)
+        )
+
+    def _copy_raw(self, info: zipfile.ZipInfo) -> bool:
+        """Append a source member to the output without decompressing it."""
+        fp = self._source.fp
+        fp.seek(info.header_offset)
+        header = fp.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size or header[:4] != _LOCAL_HEADER_SIGNATURE:
+            return False
+        *_, name_length, extra_length = _LOCAL_HEADER.unpack(header)
+        fp.seek(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+        raw = fp.read(info.compress_size)
+        if len(raw) != info.compress_size:
+            return False
+
+        member = zipfile.ZipInfo(info.filename, info.date_time)
+        member.compress_type = info.compress_type
+        member.CRC = info.CRC
+        member.file_size = info.file_size
+        member.compress_size = info.compress_size
+        member.external_attr = 0o600 << 16
+
+        # zipfile has no public API for adding pre-compressed data; this mirrors
+        # what ZipFile.writestr does around the compressor, under the same lock.
+        # The CRC and sizes are known, so the local header carries them and no
+        # data descriptor follows, even on an unseekable destination
+        out = self._zipf
+        with out._lock:
+            if out._writing:
+                raise ValueError("Can't write to ZIP archive while an open writing handle exists.")
+            member.header_offset = out.fp.tell()
+            out.fp.write(member.FileHeader())
+            out.fp.write(raw)
+            out.filelist.append(member)
+            out.NameToInfo[member.filename] = member
+            out.start_dir = out.fp.tell()
+            out._didModify = True
+        return True
+
+
+def _iter_package_writes(document, writer: ReusingZipWriter) -> Iterator[None]:
+    """Write the package part by part (the order python-docx uses), pausing after each."""
+    package = document.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+    PackageWriter._write_content_types_stream(writer, parts)
+    PackageWriter._write_pkg_rels(writer, package.rels)
+    yield
+    for part in parts:
+        writer.write(part.partname, part.blob)
+        if len(part.rels):
+            writer.write(part.partname.rels_uri, part.rels.xml)
+        yield
+
+
+def save_document(document, destination: Union[PathLike, IO[bytes]], source: Optional[PathLike] = None) -> Dict[str, int]:
+    """
+    Save a Document like Document.save(), reusing unchanged parts of `source`.
+
+    Args:
+        document: python-docx Document
+        destination: Output path or writable binary file
+        source: The DOCX the document was loaded from (usually the template)
+
+    Returns:
+        Counts of reused and written parts and their uncompressed bytes
+    """
+    if isinstance(destination, Path):
+        destination = str(destination)
+    writer = ReusingZipWriter(destination, source)
+    try:
+        for _ in _iter_package_writes(document, writer):
+            pass
+    finally:
+        writer.close()
+    return {"reused": writer.reused, "written": writer.written,
+            "reused_bytes": writer.reused_bytes, "written_bytes": writer.written_bytes}
+
+
+def iter_document_bytes(document, source: Optional[PathLike] = None) -> Iterator[bytes]:
+    """
+    Serialize a Document as a stream of chunks (e.g. for a StreamingResponse).
+
+    Each chunk holds one or more complete package parts. Since the output is
+    never seeked, rewritten parts are followed by a ZIP data descriptor; parts
+    reused from `source` are copied with a local header that already holds
+    their CRC and sizes.
+    """
+    sink = _ChunkSink()
+    writer = ReusingZipWriter(sink, source)
+    try:
+        for _ in _iter_package_writes(document, writer):
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
@@ -7,6 +7,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 import re
 from .advanced_template_analyzer import TemplateStructure, ZoneType
+from ..ai.llm_cache import cached_completion
+from ..ai.llm_gateway import get_llm_gateway
 
 
 @dataclass
@@ -239,14 +241,11 @@ class DynamicContentGenerator:
     def _call_ai_generation(self, prompt: str, api_key: str) -> Dict[str, Any]:
         """Call AI API for content generation"""
         try:
-            import openai
+            client = get_llm_gateway().client(api_key, "dynamic_content_generator")
 
-            client = openai.OpenAI(
-                api_key=api_key,
-                base_url="https://openrouter.ai/api/v1"
-            )
-
-            response = client.chat.completions.create(
+            content = cached_completion(
+                client,
+                "dynamic_content_generator.generate",
                 model="openai/gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an expert academic content generator for Indonesian university theses. Generate high-quality, formal academic content in Indonesian."},
@@ -255,8 +254,6 @@ class DynamicContentGenerator:
                 temperature=0.7,
                 max_tokens=4000
             )
-
-            content = response.choices[0].message.content
             print(f"[AI] Generated {len(content)} characters of content")
 
             # Parse JSON response
@@ -3,12 +3,23 @@ Enhanced Document Preview Service
 Provides high-quality DOCX-to-HTML conversion with styling preservation.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 import mammoth
 from docx import Document
+from docx.oxml.ns import qn
 from docx.shared import RGBColor, Pt
 from docx.enum.text import WD_COLOR_INDEX
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from .document_zones import BACK_MATTER, FRONT_MATTER, MAIN_CONTENT, document_zones
+
+SECTION_TITLES = {
+    'front-matter': 'Front Matter',
+    'main': 'Main Content',
+    'back-matter': 'Back Matter',
+}
 
 
 class EnhancedPreviewService:
@@ -138,6 +149,110 @@ class EnhancedPreviewService:
                 "html_content": f"<div style='color: red; padding: 20px;'>Error generating preview: {str(e)}</div>"
             }
 
+    def iter_section_previews(self, docx_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Render a document as an outline followed by one HTML fragment per section.
+
+        Sections follow the document zone map: front matter (including the
+        table of contents), one section per chapter, then back matter. The
+        outline is built from paragraph text alone, so it is yielded before
+        any section HTML is converted.
+
+        Args:
+            docx_path: Path to the DOCX file
+
+        Yields:
+            ('outline', outline payload) first, then (section id, section payload)
+            for every section in document order
+        """
+        doc = Document(str(docx_path))
+        sections = self._split_sections(doc)
+
+        yield 'outline', {
+            "sections": [
+                {key: section[key] for key in ('id', 'title', 'kind', 'chapter',
+                                               'paragraph_count', 'table_count', 'word_count')}
+                for section in sections
+            ],
+            "metadata": self._extract_metadata(doc),
+            "css_styles": self.base_css,
+        }
+
+        for section in sections:
+            yield section['id'], {
+                "id": section['id'],
+                "title": section['title'],
+                "html_content": self._convert_blocks_to_html(doc, section['id'], section['blocks']),
+            }
+
+    def _split_sections(self, doc: Document) -> List[Dict[str, Any]]:
+        """Group the body's paragraphs and tables into contiguous zone sections."""
+        zones = document_zones(doc)
+        sections: List[Dict[str, Any]] = []
+        seen: Dict[str, int] = {}
+        current = None
+        zone = None
+
+        for child in doc.element.body.iterchildren():
+            if child.tag == qn('w:p'):
+                zone = zones.zone_of(child)
+            elif child.tag != qn('w:tbl'):
+                continue
+
+            if zone is None or not (zone.is_main or zone.kind == BACK_MATTER):
+                base_id = 'front-matter'
+            elif zone.kind == BACK_MATTER:
+                base_id = 'back-matter'
+            elif zone.chapter is not None:
+                base_id = f'chapter-{zone.chapter}'
+            else:
+                base_id = 'main'
+
+            if current is None or current['base_id'] != base_id:
+                seen[base_id] = seen.get(base_id, 0) + 1
+                section_id = base_id if seen[base_id] == 1 else f'{base_id}-{seen[base_id]}'
+                current = {
+                    'id': section_id,
+                    'base_id': base_id,
+                    'title': '',
+                    'kind': zone.kind if zone is not None else FRONT_MATTER,
+                    'chapter': zone.chapter if zone is not None and zone.kind == MAIN_CONTENT else None,
+                    'paragraph_count': 0,
+                    'table_count': 0,
+                    'word_count': 0,
+                    'blocks': [],
+                }
+                sections.append(current)
+
+            current['blocks'].append(child)
+            if child.tag == qn('w:tbl'):
+                current['table_count'] += 1
+                continue
+
+            text = Paragraph(child, doc._body).text.strip()
+            if not text:
+                continue
+            current['paragraph_count'] += 1
+            current['word_count'] += len(text.split())
+            if not current['title']:
+                current['title'] = SECTION_TITLES.get(base_id) or text[:120]
+
+        return sections
+
+    def _convert_blocks_to_html(self, doc: Document, section_id: str, blocks: List[Any]) -> str:
+        """Convert a section's body elements to an HTML fragment, keeping tables in place."""
+        html_parts = [f'<section class="document-section" data-section="{section_id}">']
+        for element in blocks:
+            if element.tag == qn('w:tbl'):
+                html_parts.append(self._convert_table(Table(element, doc._body)))
+                continue
+            para = Paragraph(element, doc._body)
+            if not para.text.strip():
+                continue
+            html_parts.append(self._convert_paragraph_content(para, self._get_paragraph_class(para)))
+        html_parts.append('</section>')
+        return '\n'.join(html_parts)
+
     def _convert_to_html(self, doc: Document) -> str:
         """Convert DOCX document to styled HTML."""
         html_parts = []
@@ -287,4 +402,9 @@ preview_service = EnhancedPreviewService()
 
 def generate_enhanced_preview(docx_path: str) -> Dict[str, Any]:
     """Convenience function to generate enhanced document preview."""
-    return preview_service.generate_preview(docx_path)
\ No newline at end of file
+    return preview_service.generate_preview(docx_path)
+
+
+def iter_section_previews(docx_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Convenience function to render a document's outline and per-section previews."""
+    return preview_service.iter_section_previews(docx_path)
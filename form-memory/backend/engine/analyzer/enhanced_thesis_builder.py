@@ -15,6 +15,7 @@ from docxtpl import DocxTemplate  # type: ignore
 
 from .template_analyzer import TemplateAnalyzer
 from .content_extractor import ContentExtractor
+from .content_source import ContentSource
 from .ai_enhanced_extractor import AIEnhancedContentExtractor
 from .content_mapper import ContentMapper
 from .front_matter_generator import FrontMatterGenerator
@@ -39,8 +40,10 @@ class EnhancedThesisBuilder:
 
         # Initialize analyzers
         self.analyzer = TemplateAnalyzer(str(self.template_path))
-        self.extractor = ContentExtractor(str(self.content_path))
-        self.ai_extractor = AIEnhancedContentExtractor(str(self.content_path), use_ai=use_ai) if use_ai else None
+        # One content source: both extractors share a single read of the file
+        self.content = ContentSource(str(self.content_path), use_ai=use_ai)
+        self.extractor = self.content.extractor
+        self.ai_extractor = self.content.ai_extractor if use_ai else None
 
         print(f"[EnhancedThesisBuilder] Initialized with template: {template_path}")
         print(f"[EnhancedThesisBuilder] AI enabled: {use_ai}")
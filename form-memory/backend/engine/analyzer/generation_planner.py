@@ -0,0 +1,258 @@
+"""
+Generation Planner
+Splits thesis content generation into independent front-matter, chapter and
+reference prompts, runs them concurrently and merges the answers into the
+`analyzed_data` shape CompleteThesisBuilder expects.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..ai.llm_cache import cached_race_completion
+
+
+DEFAULT_PARALLELISM = int(os.getenv("LLM_GENERATION_PARALLELISM", "4"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("LLM_GENERATION_MAX_ATTEMPTS", "2"))
+
+SYSTEM_PROMPT = "You are an expert at analyzing Indonesian thesis content and generating comprehensive academic paragraphs."
+
+# Subsections generated for each chapter, with the instruction for each
+CHAPTER_SCHEMA: Dict[str, Dict[str, str]] = {
+    "chapter1": {
+        "latar_belakang": "Write 2-3 paragraphs explaining the research background and context.",
+        "rumusan_masalah": "Write 1-2 paragraphs stating the research problems clearly.",
+        "tujuan_penelitian": "Write 1-2 paragraphs describing research objectives.",
+        "manfaat_penelitian": "Write 1 paragraph explaining research benefits.",
+        "batasan_masalah": "Write 1 paragraph defining research scope and limitations.",
+    },
+    "chapter2": {
+        "landasan_teori": "Write 2-3 paragraphs covering fundamental theories.",
+        "penelitian_terkait": "Write 2 paragraphs reviewing related research.",
+        "kerangka_pemikiran": "Write 1-2 paragraphs explaining the conceptual framework.",
+    },
+    "chapter3": {
+        "desain_penelitian": "Write 1-2 paragraphs describing research design.",
+        "metode_pengumpulan_data": "Write 2 paragraphs detailing data collection methods.",
+        "metode_analisis": "Write 1-2 paragraphs explaining analysis methods.",
+        "tools": "Write 1 paragraph listing tools and technologies.",
+    },
+    "chapter4": {
+        "analisis_kebutuhan": "Write 2 paragraphs analyzing system requirements.",
+        "perancangan_sistem": "Write 2-3 paragraphs describing system design.",
+        "perancangan_interface": "Write 1-2 paragraphs explaining interface design.",
+    },
+    "chapter5": {
+        "implementasi": "Write 2 paragraphs describing system implementation.",
+        "hasil_pengujian": "Write 2 paragraphs presenting testing results.",
+        "pembahasan": "Write 2 paragraphs discussing results.",
+        "evaluasi": "Write 1-2 paragraphs evaluating system performance.",
+    },
+    "chapter6": {
+        "kesimpulan": "Write 2 paragraphs drawing conclusions.",
+        "saran": "Write 1-2 paragraphs providing recommendations.",
+    },
+}
+
+FRONT_MATTER_SCHEMA = {
+    "metadata": {
+        "title": "Full thesis title",
+        "author": "Author name",
+        "nim": "Student ID",
+    },
+    "abstract": {
+        "indonesian": "Complete Indonesian abstract (200-300 words) with background, objectives, methods, and conclusions.",
+        "english": "Complete English abstract (200-300 words) same content as Indonesian.",
+        "keywords_id": ["keyword1", "keyword2", "keyword3"],
+        "keywords_en": ["keyword1", "keyword2", "keyword3"],
+    },
+}
+
+REFERENCES_SCHEMA = {
+    "references": [
+        "Reference 1 in APA format",
+        "Reference 2 in APA format",
+    ],
+}
+
+
+def parse_json_object(content: str) -> Dict[str, Any]:
+    """
+    Extract the JSON object from a model response.
+
+    Strips surrounding prose and code fences and drops trailing text after
+    the last closing brace before giving up.
+
+    Raises:
+        ValueError: If no JSON object can be parsed
+    """
+    json_match = re.search(r'(\{.*\})', content or "", re.DOTALL)
+    if json_match:
+        clean = json_match.group(1)
+    else:
+        clean = (content or "").replace('```json', '').replace('```', '').strip()
+
+    try:
+        data = json.loads(clean)
+    except json.JSONDecodeError:
+        last_brace = clean.rfind('}')
+        try:
+            data = json.loads(clean[:last_brace + 1]) if last_brace > 0 else None
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Could not extract JSON from AI response: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("AI response is not a JSON object")
+    return data
+
+
+class GenerationChunk:
+    """One independently generated slice of the thesis."""
+
+    def __init__(self, name: str, keys: List[str], schema: Dict[str, Any], focus: str,
+                 validate: Callable[[Dict[str, Any]], bool]):
+        self.name = name
+        self.keys = keys
+        self.schema = schema
+        self.focus = focus
+        self._validate = validate
+        self.attempts = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.model: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def prompt(self, raw_text: str) -> str:
+        return f"""
+You are analyzing Indonesian thesis draft text and converting it into structured academic content.
+
+Raw Text:
+{raw_text}
+
+Generate {self.focus} in valid JSON format. Each section should have substantive academic content.
+
+Return ONLY valid JSON:
+
+{json.dumps(self.schema, indent=2, ensure_ascii=False)}
+
+IMPORTANT: Return ONLY the JSON object, NO extra text, no markdown code blocks, just pure JSON.
+The content must be in Indonesian, except for keywords_en and abstract.english.
+Expand the raw text into professional, academic paragraphs. If the draft is sparse, use your knowledge to fill in standard academic details for a Computer Science/Informatika thesis.
+"""
+
+    def is_valid(self, content: str) -> bool:
+        """Check a response parses and carries every key this chunk owns."""
+        try:
+            data = parse_json_object(content)
+        except ValueError:
+            return False
+        return all(key in data for key in self.keys) and self._validate(data)
+
+
+def _has_subsections(chapter_key: str) -> Callable[[Dict[str, Any]], bool]:
+    def check(data: Dict[str, Any]) -> bool:
+        chapter = data.get(chapter_key)
+        return isinstance(chapter, dict) and any(
+            isinstance(chapter.get(name), str) and chapter.get(name).strip()
+            for name in CHAPTER_SCHEMA[chapter_key]
+        )
+    return check
+
+
+class GenerationPlanner:
+    """
+    Plans and runs per-section generation requests.
+
+    Args:
+        client: Gateway client used for the requests
+        models: Candidate models raced for each chunk
+        parallelism: Number of chunks generated concurrently
+        max_attempts: Attempts per chunk; only failed chunks are retried
+        temperature: Sampling temperature for every chunk
+    """
+
+    def __init__(self, client, models: List[str], parallelism: int = DEFAULT_PARALLELISM,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, temperature: float = 0.3,
+                 call_site: str = "ai_enhanced_extractor.generate"):
+        self.client = client
+        self.models = models
+        self.parallelism = max(1, parallelism)
+        self.max_attempts = max(1, max_attempts)
+        self.temperature = temperature
+        self.call_site = call_site
+
+    def plan(self) -> List[GenerationChunk]:
+        """Return the independent chunks making up a full thesis."""
+        chunks = [
+            GenerationChunk(
+                "front_matter", ["metadata", "abstract"], FRONT_MATTER_SCHEMA,
+                "the thesis metadata and abstract",
+                lambda data: isinstance(data.get("abstract"), dict),
+            )
+        ]
+        for chapter_key, subsections in CHAPTER_SCHEMA.items():
+            chunks.append(GenerationChunk(
+                chapter_key, [chapter_key], {chapter_key: subsections},
+                f"comprehensive content for {chapter_key.replace('chapter', 'BAB ')}",
+                _has_subsections(chapter_key),
+            ))
+        chunks.append(GenerationChunk(
+            "references", ["references"], REFERENCES_SCHEMA,
+            "the reference list",
+            lambda data: isinstance(data.get("references"), list),
+        ))
+        return chunks
+
+    def generate(self, raw_text: str) -> Tuple[Dict[str, Any], List[GenerationChunk]]:
+        """
+        Generate every chunk concurrently and merge the results.
+
+        Returns:
+            Tuple of (merged analyzed_data, chunks that still failed)
+        """
+        chunks = self.plan()
+        pending = chunks
+        for attempt in range(1, self.max_attempts + 1):
+            if not pending:
+                break
+            if attempt > 1:
+                print(f"[AI] Retrying {len(pending)} failed chunk(s): {', '.join(c.name for c in pending)}")
+            self._run(pending, raw_text)
+            pending = [chunk for chunk in pending if chunk.result is None]
+
+        analyzed_data: Dict[str, Any] = {}
+        for chunk in chunks:
+            if chunk.result is not None:
+                for key in chunk.keys:
+                    analyzed_data[key] = chunk.result[key]
+
+        print(f"[AI] Generated {len(chunks) - len(pending)}/{len(chunks)} chunks")
+        return analyzed_data, pending
+
+    def _run(self, chunks: List[GenerationChunk], raw_text: str) -> None:
+        with ThreadPoolExecutor(max_workers=min(self.parallelism, len(chunks)),
+                                thread_name_prefix="thesis-gen") as executor:
+            futures = {executor.submit(self._generate_chunk, chunk, raw_text): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    chunk.model, chunk.result = future.result()
+                    chunk.error = None
+                except Exception as e:
+                    chunk.error = str(e)
+                    print(f"[AI] Chunk {chunk.name} failed: {e}")
+
+    def _generate_chunk(self, chunk: GenerationChunk, raw_text: str) -> Tuple[str, Dict[str, Any]]:
+        chunk.attempts += 1
+        model, content = cached_race_completion(
+            self.client,
+            f"{self.call_site}.{chunk.name}",
+            self.models,
+            validate=chunk.is_valid,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": chunk.prompt(raw_text)},
+            ],
+            temperature=self.temperature,
+        )
+        return model, parse_json_object(content)
@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from docx import Document
 import re
 from pathlib import Path
+from .template_cache import TEMPLATE_STORE
 
 
 @dataclass
@@ -119,8 +120,8 @@ class IntelligentTemplateAdapter:
         """
         print("[ADAPTIVE] Starting intelligent template analysis...")
         
-        # Load template
-        self.doc = Document(str(self.template_path))
+        # Load template (shared parsed snapshot, read-only)
+        self.doc = TEMPLATE_STORE.borrow(self.template_path)
         
         # Initialize structure
         self.structure = TemplateStructure(template_path=str(self.template_path))
@@ -0,0 +1,84 @@
+"""
+Keyword Matcher
+Aho-Corasick automaton mapping many keyword lists to categories, so a
+paragraph is scanned once for every category instead of once per phrase.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+class KeywordMatcher:
+    """Case-insensitive multi-pattern substring matcher."""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        """
+        Build the automaton.
+
+        Args:
+            categories: Category name -> keywords; a category matches when any
+                of its keywords occurs anywhere in the scanned text
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+        self.categories = tuple(categories)
+
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._add(keyword.lower(), category)
+        self._link()
+
+    def _add(self, keyword: str, category: str) -> None:
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(frozenset())
+            state = nxt
+        self._out[state] = self._out[state] | {category}
+
+    def _link(self) -> None:
+        """Compute failure links breadth-first and fold suffix outputs into each state."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] | self._out[self._fail[nxt]]
+
+    def scan_lower(self, text: str) -> Set[str]:
+        """Return the categories matched in already-lowercased text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def scan(self, text: str) -> Set[str]:
+        """
+        Return every category with a keyword in the text.
+
+        Args:
+            text: Paragraph or cell text (any case)
+
+        Returns:
+            Set of matched category names
+        """
+        return self.scan_lower(text.lower()) if text else set()
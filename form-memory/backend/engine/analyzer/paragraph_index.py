@@ -0,0 +1,259 @@
+"""
+Paragraph Index
+Incrementally maintained view of a document's body paragraphs.
+python-docx rebuilds `doc.paragraphs` from the XML body on every access; this
+index builds it once and keeps it in sync as paragraphs are inserted or removed.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+
+class ParagraphIndex:
+    """
+    Positional index over the body paragraphs of a python-docx Document.
+
+    Behaves like the list returned by `doc.paragraphs` (len, indexing, slicing,
+    iteration, index()) but positional access is O(1) and structural edits made
+    through insert_after(), add_paragraph() and remove() update it in place.
+
+    Recorded positions below `_dirty_from` are exact; an edit only marks the
+    entries after it stale, and position_of() renumbers stale entries lazily,
+    just as far as the paragraph it is looking for. Sequential inserts (each
+    after the previous new paragraph, or moving forward through the body)
+    therefore cost O(1) amortized instead of a renumbering of the whole tail.
+    """
+
+    def __init__(self, document):
+        self._document = document
+        self._body = document.element.body
+        self._parent = document._body
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the index from the XML body."""
+        self._paragraphs: List[Paragraph] = [
+            Paragraph(p, self._parent) for p in self._body.iterchildren(qn('w:p'))
+        ]
+        self._positions: Dict[Any, int] = {}
+        self._dirty_from = 0
+        self._child_count = len(self._body)
+        self._last_child = self._body[-1] if len(self._body) else None
+        self._style_names: Dict[Optional[str], str] = {}
+        # Data derived from the paragraphs (e.g. the zone map); dropped on rebuild
+        self.derived: Dict[str, Any] = {}
+
+    def is_current(self, document) -> bool:
+        """
+        Check the index still belongs to this document body and saw every edit.
+
+        Edits made behind the index's back are detected when they change the
+        number of body children or the last child. An outside edit that keeps
+        both, such as replacing one paragraph element with another in the
+        middle of the body, goes unnoticed; call refresh() after such edits.
+        """
+        body = document.element.body
+        if body is not self._body or len(body) != self._child_count:
+            return False
+        return (body[-1] if len(body) else None) is self._last_child
+
+    # ------------------------------------------------------------------
+    # List-like read access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._paragraphs)
+
+    def __getitem__(self, key: Union[int, slice]):
+        return self._paragraphs[key]
+
+    def __iter__(self) -> Iterator[Paragraph]:
+        # Iterate a snapshot so callers may edit the document while looping,
+        # exactly as they could with the list from doc.paragraphs
+        return iter(list(self._paragraphs))
+
+    def index(self, paragraph: Paragraph) -> int:
+        """Return the position of a paragraph, matching on its XML element."""
+        position = self.position_of(paragraph)
+        if position is None:
+            raise ValueError("paragraph is not in the document body")
+        return position
+
+    def position_of(self, paragraph: Union[Paragraph, Any]) -> Optional[int]:
+        """Return the position of a paragraph or <w:p> element, or None."""
+        element = getattr(paragraph, '_p', paragraph)
+        paragraphs = self._paragraphs
+        position = self._positions.get(element)
+        if position is not None and position < len(paragraphs) and paragraphs[position]._p is element:
+            return position
+
+        # Positions before _dirty_from are exact, so a stale entry lies further on
+        for i in range(self._dirty_from, len(paragraphs)):
+            current = paragraphs[i]._p
+            self._positions[current] = i
+            if current is element:
+                self._dirty_from = i + 1
+                return i
+        self._dirty_from = len(paragraphs)
+        return None
+
+    def style_name(self, paragraph: Paragraph) -> str:
+        """
+        Return the paragraph's style name ('' when unstyled).
+
+        Resolving `paragraph.style` walks the whole styles part, so names are
+        cached per style id for the lifetime of the index.
+        """
+        style_id = paragraph._p.style
+        name = self._style_names.get(style_id)
+        if name is None:
+            style = paragraph.style
+            name = style.name if style is not None and style.name else ""
+            self._style_names[style_id] = name
+        return name
+
+    # ------------------------------------------------------------------
+    # Structural edits
+    # ------------------------------------------------------------------
+
+    def insert_after(self, paragraph: Paragraph, text: Optional[str] = None,
+                     style: Optional[str] = None) -> Paragraph:
+        """Insert a new paragraph after `paragraph` and index it."""
+        new_p = OxmlElement('w:p')
+        paragraph._element.addnext(new_p)
+        new_para = self.note_inserted(new_p, after=paragraph)
+        if text:
+            new_para.add_run(text)
+        if style is not None:
+            new_para.style = style
+        return new_para
+
+    def add_paragraph(self, text: str = '', style: Optional[str] = None) -> Paragraph:
+        """Append a paragraph to the end of the body, like Document.add_paragraph."""
+        new_para = self._document.add_paragraph(text, style)
+        self._paragraphs.append(new_para)
+        self._child_count += 1
+        self._note_tail(new_para._p)
+        return new_para
+
+    def remove(self, paragraph: Union[Paragraph, Any]) -> None:
+        """Remove a paragraph from the document body and the index."""
+        element = getattr(paragraph, '_p', paragraph)
+        position = self.position_of(element)
+        parent = element.getparent()
+        if parent is None:
+            return
+        parent.remove(element)
+        if parent is self._body:
+            self._child_count -= 1
+            if element is self._last_child:
+                self._last_child = parent[-1] if len(parent) else None
+        if position is not None:
+            del self._paragraphs[position]
+            self._positions.pop(element, None)
+            self._dirty_from = min(self._dirty_from, position)
+
+    def note_inserted(self, element, after: Optional[Paragraph] = None) -> Paragraph:
+        """
+        Record a <w:p> element already inserted into the XML tree.
+
+        Args:
+            element: The inserted <w:p> element
+            after: Paragraph it was inserted after, when known
+
+        Returns:
+            Paragraph wrapping the element
+        """
+        if element.getparent() is not self._body:
+            # Table cells, headers etc. are not part of doc.paragraphs
+            parent = after._parent if after is not None else self._parent
+            return Paragraph(element, parent)
+
+        position = self._position_for_new(element, after)
+        new_para = Paragraph(element, self._parent)
+        self._paragraphs.insert(position, new_para)
+        self._child_count += 1
+        self._note_tail(element)
+        # The new entry's position is exact; only the entries after it shifted
+        self._positions[element] = position
+        self._dirty_from = min(self._dirty_from, position + 1)
+        return new_para
+
+    def note_inserted_block(self, elements: List[Any], after: Optional[Paragraph] = None) -> List[Paragraph]:
+        """
+        Record consecutive <w:p> elements spliced into the XML tree together.
+
+        Args:
+            elements: The inserted <w:p> elements, in document order
+            after: Paragraph the block was inserted after, when known
+
+        Returns:
+            Paragraphs wrapping the elements
+        """
+        if not elements:
+            return []
+        if elements[0].getparent() is not self._body:
+            parent = after._parent if after is not None else self._parent
+            return [Paragraph(element, parent) for element in elements]
+
+        position = self._position_for_new(elements[0], after)
+        new_paras = [Paragraph(element, self._parent) for element in elements]
+        self._paragraphs[position:position] = new_paras
+        self._child_count += len(new_paras)
+        self._note_tail(elements[-1])
+        for offset, element in enumerate(elements):
+            self._positions[element] = position + offset
+        self._dirty_from = min(self._dirty_from, position + len(elements))
+        return new_paras
+
+    def _note_tail(self, element) -> None:
+        """Track the body's last child when an indexed edit appended at the end."""
+        if element.getnext() is None:
+            self._last_child = element
+
+    def _position_for_new(self, element, after: Optional[Paragraph]) -> int:
+        """Position a newly inserted body element should occupy."""
+        if after is not None and element.getprevious() is after._p:
+            position = self.position_of(after)
+            if position is not None:
+                return position + 1
+
+        # Walk back over tables/bookmarks to the nearest indexed paragraph
+        sibling = element.getprevious()
+        while sibling is not None:
+            if sibling.tag == qn('w:p'):
+                position = self.position_of(sibling)
+                if position is not None:
+                    return position + 1
+            sibling = sibling.getprevious()
+        return 0
+
+
+def paragraph_index(document) -> ParagraphIndex:
+    """
+    Return the ParagraphIndex bound to a document, creating it on first use.
+
+    The index is attached to the document part so paragraphs can find it
+    through `paragraph.part`. It is rebuilt if the body was edited behind
+    its back (e.g. by code still using python-docx directly).
+    """
+    part = document.part
+    index = getattr(part, '_paragraph_index', None)
+    if index is None or index._body is not document.element.body:
+        index = ParagraphIndex(document)
+        part._paragraph_index = index
+    elif not index.is_current(document):
+        # Refresh in place so callers holding this index stay in sync
+        index.refresh()
+    return index
+
+
+def find_paragraph_index(paragraph: Paragraph) -> Optional[ParagraphIndex]:
+    """Return the index attached to a paragraph's document, if any."""
+    try:
+        return getattr(paragraph.part, '_paragraph_index', None)
+    except Exception:
+        return None
@@ -0,0 +1,428 @@
+"""
+Paragraph Visitor
+Single-pass traversal of a document's body paragraphs feeding pluggable
+accumulators. Each paragraph's style, outline level, text, runs and format
+are resolved once and shared by every accumulator, instead of each analysis
+walking `doc.paragraphs` (and re-resolving styles) on its own.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+class ParagraphView:
+    """Lazily resolved, shared facts about one paragraph."""
+
+    __slots__ = ("paragraph", "index", "_styles", "_text", "_runs", "_format", "_style_info")
+
+    def __init__(self, paragraph, index: int, styles: Dict[Optional[str], Tuple[Any, Optional[str], Optional[int]]]):
+        self.paragraph = paragraph
+        self.index = index
+        self._styles = styles
+        self._text: Optional[str] = None
+        self._runs = None
+        self._format = None
+        self._style_info = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.paragraph.text
+        return self._text
+
+    @property
+    def runs(self) -> list:
+        if self._runs is None:
+            self._runs = self.paragraph.runs
+        return self._runs
+
+    @property
+    def paragraph_format(self):
+        if self._format is None:
+            self._format = self.paragraph.paragraph_format
+        return self._format
+
+    @property
+    def style(self):
+        return self._resolve_style()[0]
+
+    @property
+    def style_name(self) -> Optional[str]:
+        return self._resolve_style()[1]
+
+    @property
+    def outline_level(self) -> Optional[int]:
+        """Outline level declared by the paragraph's style, if any."""
+        return self._resolve_style()[2]
+
+    def _resolve_style(self) -> Tuple[Any, Optional[str], Optional[int]]:
+        # Resolving `paragraph.style` walks the whole styles part, so the
+        # style and its outline level are cached per style id for the pass
+        if self._style_info is None:
+            style_id = self.paragraph._p.style
+            info = self._styles.get(style_id)
+            if info is None:
+                style = self.paragraph.style
+                outline_level = None
+                if style:
+                    try:
+                        outline_level_attr = style.element.xpath('.//w:outlineLvl/@w:val')
+                        if outline_level_attr:
+                            outline_level = int(outline_level_attr[0])
+                    except Exception:
+                        outline_level = None
+                info = (style, style.name if style is not None else None, outline_level)
+                self._styles[style_id] = info
+            self._style_info = info
+        return self._style_info
+
+
+class ParagraphAccumulator:
+    """Collects one analysis result while paragraphs are visited."""
+
+    def visit(self, view: ParagraphView) -> None:
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+
+def visit_paragraphs(paragraphs: Iterable, accumulators: Iterable[ParagraphAccumulator],
+                     styles: Optional[Dict] = None) -> None:
+    """
+    Walk the paragraphs once, handing each to every accumulator in order.
+
+    Args:
+        paragraphs: Body paragraphs (e.g. `doc.paragraphs`)
+        accumulators: Accumulators fed with a ParagraphView per paragraph
+        styles: Optional style-id cache to share across traversals
+    """
+    accumulators = list(accumulators)
+    if styles is None:
+        styles = {}
+    for index, paragraph in enumerate(paragraphs):
+        view = ParagraphView(paragraph, index, styles)
+        for accumulator in accumulators:
+            accumulator.visit(view)
+
+
+def _most_common(counts: Dict[Any, int], default: Any) -> Any:
+    return max(counts, key=counts.get) if counts else default
+
+
+# ----------------------------------------------------------------------
+# Template analysis accumulators
+# ----------------------------------------------------------------------
+
+class StyleUsageAccumulator(ParagraphAccumulator):
+    """Number of paragraphs using each style name."""
+
+    def __init__(self):
+        self.counts: Dict[Optional[str], int] = {}
+
+    def visit(self, view: ParagraphView) -> None:
+        name = view.style_name
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def result(self) -> Dict[Optional[str], int]:
+        return self.counts
+
+
+SECTION_KEYWORDS = [
+    "halaman judul", "cover", "halaman pengesahan", "pernyataan",
+    "kata pengantar", "preface", "abstrak", "abstract", "sari",
+    "daftar isi", "daftar tabel", "daftar gambar", "daftar lampiran",
+    "glossary", "glosarium", "bibliography", "references", "daftar pustaka",
+    "appendix", "lampiran", "bab", "chapter", "kesimpulan", "conclusion"
+]
+
+
+def is_section_marker(text: str) -> bool:
+    """Check if text is a section marker (cover, approval, abstract, etc.)."""
+    text_lower = text.lower().strip()
+    return any(keyword in text_lower for keyword in SECTION_KEYWORDS)
+
+
+class StructureAccumulator(ParagraphAccumulator):
+    """Outline-level headings and section marker paragraphs."""
+
+    def __init__(self, paragraph_count: int):
+        # Recorded as the heading "index" for compatibility with earlier output
+        self.paragraph_count = paragraph_count
+        self.headings: List[Dict[str, Any]] = []
+        self.markers: List[Dict[str, Any]] = []
+
+    def visit(self, view: ParagraphView) -> None:
+        outline_level = view.outline_level if view.style else None
+        if outline_level is not None:
+            self.headings.append({
+                "level": outline_level,
+                "style": view.style_name,
+                "text": view.text[:100],  # First 100 chars
+                "index": self.paragraph_count,
+            })
+        if is_section_marker(view.text):
+            self.markers.append({
+                "type": "section_marker",
+                "text": view.text,
+                "style": view.style_name if view.style else None,
+            })
+
+    def result(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "headings": self.headings,
+            "paragraphs": self.markers,
+            "tables": [],
+            "hierarchy": list(self.headings),
+        }
+
+
+PLACEHOLDER_PATTERNS = [
+    r"\[.*?\]",  # [Placeholder]
+    r"\{.*?\}",  # {Placeholder}
+    r"{{.*?}}",  # {{Placeholder}} Jinja2-style
+    r"TULIS\s+.*?(?=\n|$)",  # TULIS... (Indonesian)
+    r"BAGIAN\s+.*?(?=\n|$)",  # BAGIAN... (Indonesian)
+    r"<.*?>",  # <Placeholder>
+]
+_PLACEHOLDER_RES = [re.compile(pattern, re.IGNORECASE) for pattern in PLACEHOLDER_PATTERNS]
+
+
+class PlaceholderAccumulator(ParagraphAccumulator):
+    """Placeholder text and paragraphs carrying field codes."""
+
+    def __init__(self):
+        self.placeholders = {"text_placeholders": [], "field_codes": [], "blank_sections": []}
+
+    def visit(self, view: ParagraphView) -> None:
+        text = view.text
+        for pattern in _PLACEHOLDER_RES:
+            matches = pattern.findall(text)
+            if matches:
+                self.placeholders["text_placeholders"].extend(matches)
+        if view.paragraph._element.findall('.//{%s}fldChar' % W_NS):
+            self.placeholders["field_codes"].append(text)
+
+    def result(self) -> Dict[str, List[str]]:
+        return self.placeholders
+
+
+class CommonFontAccumulator(ParagraphAccumulator):
+    """Most common run font name and size."""
+
+    def __init__(self):
+        self.fonts: Dict[str, int] = {}
+        self.sizes: Dict[float, int] = {}
+
+    def visit(self, view: ParagraphView) -> None:
+        for run in view.runs:
+            font = run.font
+            font_name = font.name or "Calibri"
+            self.fonts[font_name] = self.fonts.get(font_name, 0) + 1
+            if font.size:
+                size = font.size.pt
+                self.sizes[size] = self.sizes.get(size, 0) + 1
+
+    def result(self) -> Tuple[str, float]:
+        return _most_common(self.fonts, "Times New Roman"), _most_common(self.sizes, 12.0)
+
+
+class ParagraphFormatAccumulator(ParagraphAccumulator):
+    """Common indentation, spacing, alignment and line spacing."""
+
+    def __init__(self):
+        self.indents = {"first_line": [], "left": [], "right": []}
+        self.space_before: Dict[float, int] = {}
+        self.space_after: Dict[float, int] = {}
+        self.alignments: Dict[str, int] = {}
+        self.spacings: Dict[Any, int] = {}
+
+    def visit(self, view: ParagraphView) -> None:
+        pf = view.paragraph_format
+        if not pf:
+            return
+        if pf.first_line_indent:
+            self.indents["first_line"].append(pf.first_line_indent.inches)
+        if pf.left_indent:
+            self.indents["left"].append(pf.left_indent.inches)
+        if pf.right_indent:
+            self.indents["right"].append(pf.right_indent.inches)
+        if pf.space_before:
+            sb = pf.space_before.pt
+            self.space_before[sb] = self.space_before.get(sb, 0) + 1
+        if pf.space_after:
+            sa = pf.space_after.pt
+            self.space_after[sa] = self.space_after.get(sa, 0) + 1
+        if pf.alignment:
+            align = str(pf.alignment)
+            self.alignments[align] = self.alignments.get(align, 0) + 1
+        if pf.line_spacing:
+            spacing = pf.line_spacing
+            self.spacings[spacing] = self.spacings.get(spacing, 0) + 1
+
+    def indentation(self) -> Dict[str, Any]:
+        first_line, left = self.indents["first_line"], self.indents["left"]
+        return {
+            "common_first_line": max(set(first_line), key=first_line.count) if first_line else 0,
+            "common_left": max(set(left), key=left.count) if left else 0,
+        }
+
+    def spacing(self) -> Dict[str, Any]:
+        return {
+            "common_space_before": _most_common(self.space_before, 0),
+            "common_space_after": _most_common(self.space_after, 0),
+        }
+
+    def alignment(self) -> str:
+        return _most_common(self.alignments, "CENTER")
+
+    def line_spacing(self) -> float:
+        return _most_common(self.spacings, 1.5)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "indentation_pattern": self.indentation(),
+            "spacing_pattern": self.spacing(),
+            "alignment_pattern": self.alignment(),
+            "line_spacing_pattern": self.line_spacing(),
+        }
+
+
+FRONT_MATTER_MARKERS = [
+    ("cover", ["halaman judul", "cover", "judul"]),
+    ("approval", ["pengesahan", "approval", "persetujuan"]),
+    ("statement", ["pernyataan", "declaration", "keaslian"]),
+    ("dedication", ["persembahan", "dedication"]),
+    ("motto", ["motto"]),
+    ("preface", ["kata pengantar", "preface", "pengantar"]),
+    ("abstract_id", ["abstrak", "ringkasan"]),
+    ("abstract_en", ["abstract"]),
+    ("glossary", ["glosarium", "glossary", "istilah"]),
+    ("toc", ["daftar isi", "table of contents"]),
+    ("list_figures", ["daftar gambar", "list of figures"]),
+    ("list_tables", ["daftar tabel", "list of tables"]),
+]
+
+
+class FrontMatterAccumulator(ParagraphAccumulator):
+    """Front matter section types mentioned by paragraphs."""
+
+    def __init__(self):
+        self.front_matter = {"sections": [], "page_breaks": [], "required_sections": []}
+
+    def visit(self, view: ParagraphView) -> None:
+        text_lower = view.text.lower().strip()
+        for section_type, keywords in FRONT_MATTER_MARKERS:
+            if any(kw in text_lower for kw in keywords):
+                self.front_matter["sections"].append(section_type)
+                self.front_matter["required_sections"].append(section_type)
+
+    def result(self) -> Dict[str, Any]:
+        return self.front_matter
+
+
+_ROMAN_CHAPTER_RE = re.compile(r"^(BAB|CHAPTER)\s+[IVX]+")
+_ARABIC_CHAPTER_RE = re.compile(r"^(BAB|CHAPTER)\s+\d+")
+
+
+class HeadingHierarchyAccumulator(ParagraphAccumulator):
+    """Heading styles with examples and the chapter numbering pattern."""
+
+    def __init__(self):
+        self.heading_styles: Dict[str, Dict[str, Any]] = {}
+        self.numbering_pattern: Optional[str] = None
+
+    def visit(self, view: ParagraphView) -> None:
+        if view.style:
+            outline_level = view.outline_level
+            if outline_level is not None:
+                style_name = view.style_name
+                if style_name not in self.heading_styles:
+                    self.heading_styles[style_name] = {"level": outline_level, "examples": []}
+                if len(self.heading_styles[style_name]["examples"]) < 3:
+                    self.heading_styles[style_name]["examples"].append(view.text[:50])
+
+        text = view.text
+        if text and _ROMAN_CHAPTER_RE.match(text):
+            self.numbering_pattern = "roman_uppercase"
+        elif text and _ARABIC_CHAPTER_RE.match(text):
+            self.numbering_pattern = "arabic"
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "heading_styles": self.heading_styles,
+            "numbering_pattern": self.numbering_pattern,
+            "title_format": None,
+        }
+
+
+class CaptionAccumulator(ParagraphAccumulator):
+    """Figure and equation caption paragraphs."""
+
+    def __init__(self):
+        self.figures: List[str] = []
+        self.equations: List[str] = []
+
+    def visit(self, view: ParagraphView) -> None:
+        text_lower = view.text.lower()
+        if "gambar" in text_lower or "figure" in text_lower:
+            self.figures.append(view.text[:50])
+        elif "persamaan" in text_lower or "equation" in text_lower:
+            self.equations.append(view.text[:50])
+
+    def result(self) -> Tuple[List[str], List[str]]:
+        return self.figures, self.equations
+
+
+CITATION_PATTERNS = {
+    "APA": [r"\([A-Za-z]+, \d{4}\)", r"\([A-Za-z]+ & [A-Za-z]+, \d{4}\)"],  # (Author, Year)
+    "MLA": [r"\([A-Za-z]+ \d+\)", r'\([A-Za-z]+ \d+ [A-Za-z]+\)'],  # (Author Page)
+    "Chicago": [r"\[[\d]+\]", r"\([A-Za-z]+ [\d]+, [\d]+\)"],  # [1] or (Author Year, Page)
+    "Harvard": [r"\([A-Za-z]+, [\d]+\)", r"\([A-Za-z]+ [\d]+\)"],  # (Author Year)
+    "Vancouver": [r"\[[\d]+\]", r"^[\[\d]+]"]  # [1]
+}
+
+REFERENCE_FORMATS = {
+    "ALPHABETICAL": r"^[A-Z][a-zA-Z]+, [A-Z]\.",  # Author, Initials
+    "NUMERICAL": r"^\[[\d]+\]",  # [1], [2], etc.
+    "FOOTNOTE": r"^[1-9][0-9]*\.",  # 1., 2., etc.
+}
+
+_BAB_RE = re.compile(r"BAB\s+[IVX]+\s*[:-]?\s*(.+)", re.IGNORECASE)
+
+
+class AcademicStyleAccumulator(ParagraphAccumulator):
+    """First citation style and reference format seen, and the BAB heading count."""
+
+    def __init__(self):
+        self._citations = [(style, [re.compile(p) for p in patterns])
+                           for style, patterns in CITATION_PATTERNS.items()]
+        self._references = [(name, re.compile(p)) for name, p in REFERENCE_FORMATS.items()]
+        self.citation_style: Optional[str] = None
+        self.reference_format: Optional[str] = None
+        self.bab_count = 0
+
+    def visit(self, view: ParagraphView) -> None:
+        text = view.text
+        if self.citation_style is None:
+            for style, patterns in self._citations:
+                if any(pattern.search(text) for pattern in patterns):
+                    self.citation_style = style
+                    break
+        if self.reference_format is None:
+            stripped = text.strip()
+            for format_type, pattern in self._references:
+                if pattern.match(stripped):
+                    self.reference_format = format_type
+                    break
+        if _BAB_RE.match(text):
+            self.bab_count += 1
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "citation_style": self.citation_style or "UNKNOWN",
+            "reference_format": self.reference_format or "UNKNOWN",
+            "bab_count": self.bab_count,
+        }
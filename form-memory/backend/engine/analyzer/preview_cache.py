@@ -0,0 +1,387 @@
+"""
+Preview Cache
+Rendered document previews keyed by the SHA-256 of the output file. Each
+preview is rendered once per output version and stored pre-compressed (gzip,
+plus Brotli when available), so repeat previews are served as cached bytes or
+answered with 304 Not Modified via the ETag. Regenerating an output changes its
+hash, which retires the previous preview automatically.
+
+Chunked previews (e.g. one part per chapter) are cached part by part, so a
+single chapter can be served without loading the rest of the thesis.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+from ..metrics import span
+
+# Bump whenever the preview renderer changes its output so cached previews are rebuilt
+PREVIEW_VERSION = "1"
+
+DEFAULT_PREVIEW_DIR = Path(os.getenv(
+    "PREVIEW_CACHE_DIR",
+    str(Path(__file__).resolve().parents[3] / "storage" / "previews"),
+))
+DEFAULT_MEMORY_ENTRIES = int(os.getenv("PREVIEW_CACHE_MEMORY_ENTRIES", "16"))
+DEFAULT_MAX_FILES = int(os.getenv("PREVIEW_CACHE_MAX_FILES", "256"))
+
+
+class PreviewEntry:
+    """One rendered preview, held compressed."""
+
+    def __init__(self, key: str, gzip_body: bytes, br_body: Optional[bytes] = None):
+        self.key = key
+        self.etag = f'"{key}.v{PREVIEW_VERSION}"'
+        self.gzip_body = gzip_body
+        self.br_body = br_body
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.gzip_body) + len(self.br_body or b"")
+
+    def body(self, encoding: Optional[str]) -> bytes:
+        """Return the body in the given content encoding (None for identity)."""
+        if encoding == "br" and self.br_body is not None:
+            return self.br_body
+        if encoding == "gzip":
+            return self.gzip_body
+        return gzip.decompress(self.gzip_body)
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Pick the best stored encoding the client accepts (Brotli, then gzip, then identity)."""
+        accepted = set()
+        for token in (accept_encoding or "").split(","):
+            name, _, params = token.partition(";")
+            quality = params.replace(" ", "").removeprefix("q=")
+            try:
+                if params and float(quality) <= 0:
+                    continue
+            except ValueError:
+                pass
+            accepted.add(name.strip().lower())
+        if self.br_body is not None and ("br" in accepted or "*" in accepted):
+            return "br"
+        if "gzip" in accepted or "*" in accepted:
+            return "gzip"
+        return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    strip = lambda tag: tag.strip().removeprefix("W/")
+    return any(strip(tag) == etag for tag in if_none_match.split(","))
+
+
+class PreviewCache:
+    """
+    Disk-backed, memory-fronted cache of compressed previews.
+
+    Entries live in `<directory>/<key>.v<PREVIEW_VERSION>.json.gz` (and `.br`);
+    the key is the output's SHA-256, suffixed with a hash of the variant (e.g.
+    the download filename) when the rendered payload depends on it.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_PREVIEW_DIR,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES, max_files: int = DEFAULT_MAX_FILES):
+        self.directory = Path(directory)
+        self.memory_entries = memory_entries
+        self.max_files = max_files
+        self._memory: "OrderedDict[str, PreviewEntry]" = OrderedDict()
+        self._digests: Dict[Tuple[str, int, int, int], str] = {}
+        self._current: Dict[Tuple[str, str], str] = {}
+        self._render_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_loads = 0
+        self.renders = 0
+        self.invalidations = 0
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        stem = self.directory / f"{key}.v{PREVIEW_VERSION}.json"
+        return stem.with_name(stem.name + ".gz"), stem.with_name(stem.name + ".br")
+
+    def key_for(self, docx_path: Union[str, Path], variant: str = "") -> str:
+        """
+        Return the cache key for the current contents of an output file.
+
+        The digest is memoized on (path, size, mtime, inode), so only a rewritten
+        output is hashed again; a changed key retires the previous entry.
+        """
+        path = Path(docx_path).resolve()
+        stat = path.stat()
+        stamp = (str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+        with self._lock:
+            digest = self._digests.get(stamp)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+
+        key = digest
+        if variant:
+            key = f"{digest}-{hashlib.sha1(variant.encode('utf-8')).hexdigest()[:8]}"
+
+        with self._lock:
+            self._digests[stamp] = digest
+            previous = self._current.get((str(path), variant))
+            self._current[(str(path), variant)] = key
+        if previous is not None and previous != key:
+            self.invalidate(previous)
+        return key
+
+    def etag_for(self, docx_path: Union[str, Path], variant: str = "") -> str:
+        """ETag of the preview for the current contents, without rendering or loading it."""
+        return PreviewEntry(self.key_for(docx_path, variant), b"").etag
+
+    def get(self, docx_path: Union[str, Path], render: Callable[[Path], Dict[str, Any]],
+            variant: str = "") -> PreviewEntry:
+        """
+        Return the cached preview, rendering and compressing it on a miss.
+
+        Args:
+            docx_path: Output document to preview
+            render: Builds the JSON payload for the document; raise to avoid caching a failure
+            variant: Extra input the payload depends on (part of the key)
+
+        Returns:
+            PreviewEntry with the compressed payload and its ETag
+        """
+        key = self.key_for(docx_path, variant)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+        with render_lock:
+            entry = self._lookup(key)
+            if entry is None:
+                entry = self._render(key, Path(docx_path), render)
+        with self._lock:
+            self._render_locks.pop(key, None)
+        return entry
+
+    def _lookup(self, key: str) -> Optional[PreviewEntry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        gz_path, br_path = self._paths(key)
+        try:
+            gzip_body = gz_path.read_bytes()
+            br_body = br_path.read_bytes() if br_path.exists() else None
+        except OSError:
+            return None
+        entry = PreviewEntry(key, gzip_body, br_body)
+        with self._lock:
+            self.disk_loads += 1
+            self._remember(entry)
+        return entry
+
+    def _render(self, key: str, docx_path: Path, render: Callable[[Path], Dict[str, Any]]) -> PreviewEntry:
+        with span("preview_render"):
+            entry = self._store(key, render(docx_path))
+        with self._lock:
+            self.renders += 1
+        print(f"[INFO] Rendered preview {docx_path.name}: {len(entry.gzip_body)} bytes gzipped")
+        return entry
+
+    def _store(self, key: str, payload: Any) -> PreviewEntry:
+        """Compress a JSON payload, persist it and keep it in memory."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        entry = PreviewEntry(
+            key,
+            gzip.compress(body, compresslevel=9, mtime=0),
+            brotli.compress(body, quality=11) if BROTLI_AVAILABLE else None,
+        )
+
+        gz_path, br_path = self._paths(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for path, data in ((gz_path, entry.gzip_body), (br_path, entry.br_body)):
+                if data is None:
+                    continue
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            self._prune()
+        except OSError as e:
+            print(f"[WARNING] Could not persist preview {key[:12]}: {e}")
+
+        with self._lock:
+            self._remember(entry)
+        return entry
+
+    def iter_parts(self, docx_path: Union[str, Path],
+                   render_parts: Callable[[Path], Iterator[Tuple[str, Any]]],
+                   variant: str) -> Iterator[Tuple[str, PreviewEntry]]:
+        """
+        Yield the named parts of a chunked preview in order, rendering on a miss.
+
+        Parts are cached individually (key variant `<variant>#<name>`) as soon
+        as they are rendered, so a consumer streaming them sees the first part
+        before the last one exists. A manifest listing the part names is
+        written once the render completes; until then the preview counts as
+        uncached.
+
+        Args:
+            docx_path: Output document to preview
+            render_parts: Yields (name, payload) pairs; raise to avoid caching a failure
+            variant: Name of the chunked view (part of every key)
+        """
+        manifest_key = self.key_for(docx_path, f"{variant}#")
+        cached = self._cached_parts(docx_path, variant, manifest_key)
+        if cached is not None:
+            yield from cached
+            return
+
+        with self._lock:
+            render_lock = self._render_locks.setdefault(manifest_key, threading.Lock())
+        try:
+            with render_lock:
+                cached = self._cached_parts(docx_path, variant, manifest_key)
+                if cached is not None:
+                    yield from cached
+                    return
+
+                names = []
+                for name, payload in render_parts(Path(docx_path)):
+                    names.append(name)
+                    yield name, self._store(self.key_for(docx_path, f"{variant}#{name}"), payload)
+                self._store(manifest_key, {"parts": names})
+                with self._lock:
+                    self.renders += 1
+                print(f"[INFO] Rendered {len(names)} preview parts for {Path(docx_path).name}")
+        finally:
+            with self._lock:
+                self._render_locks.pop(manifest_key, None)
+
+    def _cached_parts(self, docx_path: Union[str, Path], variant: str,
+                      manifest_key: str) -> Optional[List[Tuple[str, PreviewEntry]]]:
+        """Return every cached part of a chunked preview, or None if any is missing."""
+        manifest = self._lookup(manifest_key)
+        if manifest is None:
+            return None
+        parts = []
+        for name in json.loads(manifest.body(None))["parts"]:
+            entry = self._lookup(self.key_for(docx_path, f"{variant}#{name}"))
+            if entry is None:
+                return None
+            parts.append((name, entry))
+        return parts
+
+    def part_names(self, docx_path: Union[str, Path],
+                   render_parts: Callable[[Path], Iterator[Tuple[str, Any]]],
+                   variant: str) -> List[str]:
+        """Names of a chunked preview's parts, from its manifest (rendering it on a miss)."""
+        manifest = self._lookup(self.key_for(docx_path, f"{variant}#"))
+        if manifest is not None:
+            return json.loads(manifest.body(None))["parts"]
+        return [name for name, _ in self.iter_parts(docx_path, render_parts, variant)]
+
+    def part_etag_for(self, docx_path: Union[str, Path], part: str,
+                      render_parts: Callable[[Path], Iterator[Tuple[str, Any]]],
+                      variant: str) -> Optional[str]:
+        """
+        ETag of one part of a chunked preview, or None if the render has no such part.
+
+        Part names come from the request, so they are checked against the
+        manifest before a key is derived (and remembered) for them.
+        """
+        if part not in self.part_names(docx_path, render_parts, variant):
+            return None
+        return self.etag_for(docx_path, f"{variant}#{part}")
+
+    def get_part(self, docx_path: Union[str, Path], part: str,
+                 render_parts: Callable[[Path], Iterator[Tuple[str, Any]]],
+                 variant: str) -> Optional[PreviewEntry]:
+        """Return one part of a chunked preview (None if the render has no such part)."""
+        if part not in self.part_names(docx_path, render_parts, variant):
+            return None
+        entry = self._lookup(self.key_for(docx_path, f"{variant}#{part}"))
+        if entry is not None:
+            return entry
+        found = None
+        for name, rendered in self.iter_parts(docx_path, render_parts, variant):
+            if name == part:
+                found = rendered
+        return found
+
+    def _remember(self, entry: PreviewEntry) -> None:
+        """Add an entry to the in-memory LRU (caller holds the lock)."""
+        self._memory[entry.key] = entry
+        self._memory.move_to_end(entry.key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self) -> None:
+        """Keep only the most recently written preview files on disk."""
+        files = sorted(self.directory.glob("*.json.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in files[self.max_files:]:
+            self._delete_files(stale.name.split(".v")[0])
+
+    def _delete_files(self, key: str) -> None:
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def invalidate(self, key: str) -> None:
+        """Drop a preview from memory and disk (its output was regenerated)."""
+        with self._lock:
+            self._memory.pop(key, None)
+            self.invalidations += 1
+        self._delete_files(key)
+
+    def forget(self, docx_path: Union[str, Path]) -> None:
+        """Retire every preview of an output that is being rewritten."""
+        path = str(Path(docx_path).resolve())
+        with self._lock:
+            stale = [key for (owner, _), key in self._current.items() if owner == path]
+            self._current = {slot: key for slot, key in self._current.items() if slot[0] != path}
+            self._digests = {stamp: digest for stamp, digest in self._digests.items() if stamp[0] != path}
+        for key in stale:
+            self.invalidate(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "preview_version": PREVIEW_VERSION,
+                "brotli": BROTLI_AVAILABLE,
+                "in_memory": len(self._memory),
+                "hits": self.hits,
+                "disk_loads": self.disk_loads,
+                "renders": self.renders,
+                "invalidations": self.invalidations,
+            }
+
+
+PREVIEW_CACHE = PreviewCache()
+
+
+def get_preview_cache() -> PreviewCache:
+    """Return the process-wide preview cache."""
+    return PREVIEW_CACHE
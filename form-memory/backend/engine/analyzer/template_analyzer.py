@@ -13,6 +13,13 @@ import re
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.style import WD_STYLE_TYPE
+from .template_cache import TEMPLATE_STORE
+from .paragraph_visitor import (
+    visit_paragraphs, is_section_marker, ParagraphAccumulator, StyleUsageAccumulator,
+    StructureAccumulator, PlaceholderAccumulator, CommonFontAccumulator,
+    ParagraphFormatAccumulator, FrontMatterAccumulator, HeadingHierarchyAccumulator,
+    CaptionAccumulator, AcademicStyleAccumulator,
+)
 
 # Try to import Mammoth for enhanced DOCX processing
 try:
@@ -62,22 +69,29 @@ class TemplateAnalyzer:
 
         # Use comprehensive DOCX analyzer with Mammoth enhancement if available
         self.analyzer_type = "docx"
-        self.doc = Document(str(self.template_path))
-
-        # Try to enhance analysis with Mammoth if available
+        # Shared parsed template - read-only, never mutate self.doc
+        self.doc = TEMPLATE_STORE.borrow(self.template_path)
+        self._scan: Optional[Dict[str, ParagraphAccumulator]] = None
+        self.analysis = TEMPLATE_STORE.get_analysis(
+            self.template_path, "template_analyzer", self._run_analysis
+        )
+
+    def _run_analysis(self) -> Dict[str, Any]:
+        """Run the full analysis, enhanced with Mammoth when available."""
         if MAMMOTH_AVAILABLE:
             try:
-                self.analysis = self._analyze_with_mammoth()
+                return self._analyze_with_mammoth()
             except Exception as e:
                 print(f"Mammoth analysis failed, using python-docx: {e}")
-                self.analysis = self._analyze()
-        else:
-            self.analysis = self._analyze()
+                return self._analyze()
+        return self._analyze()
 
 
     
     def _analyze(self) -> Dict[str, Any]:
         """Perform complete Indonesian university template analysis."""
+        # Every paragraph-level detector below reads from this single traversal
+        self._paragraph_scan()
         analysis = {
             "styles": self._extract_styles(),
             "structure": self._detect_structure(),
@@ -99,6 +113,31 @@ class TemplateAnalyzer:
 
         return analysis
     
+    def _paragraph_scan(self) -> Dict[str, ParagraphAccumulator]:
+        """
+        Walk the body paragraphs once, feeding every paragraph accumulator.
+
+        The scan is kept for the analyzer's lifetime (the template document is
+        read-only), so the individual _detect_* helpers share one traversal.
+        """
+        scan = getattr(self, '_scan', None)
+        if scan is None:
+            paragraphs = self.doc.paragraphs
+            scan = {
+                "style_usage": StyleUsageAccumulator(),
+                "structure": StructureAccumulator(len(paragraphs)),
+                "placeholders": PlaceholderAccumulator(),
+                "fonts": CommonFontAccumulator(),
+                "paragraph_format": ParagraphFormatAccumulator(),
+                "front_matter": FrontMatterAccumulator(),
+                "heading_hierarchy": HeadingHierarchyAccumulator(),
+                "captions": CaptionAccumulator(),
+                "academic": AcademicStyleAccumulator(),
+            }
+            visit_paragraphs(paragraphs, scan.values())
+            self._scan = scan
+        return scan
+
     def _extract_styles(self) -> Dict[str, Dict[str, Any]]:
         """Extract all paragraph and character styles from template."""
         styles_info = {}
@@ -140,51 +179,11 @@ class TemplateAnalyzer:
     
     def _count_style_usage(self, style_name: str) -> int:
         """Count how many paragraphs use a specific style."""
-        count = 0
-        for para in self.doc.paragraphs:
-            if para.style.name == style_name:
-                count += 1
-        return count
+        return self._paragraph_scan()["style_usage"].result().get(style_name, 0)
     
     def _detect_structure(self) -> Dict[str, List[Dict[str, Any]]]:
         """Detect document structure (headings, sections, hierarchy)."""
-        structure = {
-            "headings": [],
-            "paragraphs": [],
-            "tables": [],
-            "hierarchy": []
-        }
-        
-        current_heading_level = None
-        
-        for para in self.doc.paragraphs:
-            # Detect headings - check for outline level in style
-            outline_level = None
-            if para.style:
-                try:
-                    outline_level_attr = para.style.element.xpath('.//w:outlineLvl/@w:val')
-                    if outline_level_attr:
-                        outline_level = int(outline_level_attr[0])
-                except Exception:
-                    outline_level = None
-            
-            if outline_level is not None:
-                heading_data = {
-                    "level": outline_level,
-                    "style": para.style.name,
-                    "text": para.text[:100],  # First 100 chars
-                    "index": len(self.doc.paragraphs),
-                }
-                structure["headings"].append(heading_data)
-                structure["hierarchy"].append(heading_data)
-            
-            # Detect key section markers
-            if self._is_section_marker(para.text):
-                structure["paragraphs"].append({
-                    "type": "section_marker",
-                    "text": para.text,
-                    "style": para.style.name if para.style else None,
-                })
+        structure = self._paragraph_scan()["structure"].result()
         
         # Detect tables
         for table in self.doc.tables:
@@ -198,15 +197,7 @@ class TemplateAnalyzer:
     
     def _is_section_marker(self, text: str) -> bool:
         """Check if text is a section marker (cover, approval, abstract, etc.)."""
-        section_keywords = [
-            "halaman judul", "cover", "halaman pengesahan", "pernyataan",
-            "kata pengantar", "preface", "abstrak", "abstract", "sari",
-            "daftar isi", "daftar tabel", "daftar gambar", "daftar lampiran",
-            "glossary", "glosarium", "bibliography", "references", "daftar pustaka",
-            "appendix", "lampiran", "bab", "chapter", "kesimpulan", "conclusion"
-        ]
-        text_lower = text.lower().strip()
-        return any(keyword in text_lower for keyword in section_keywords)
+        return is_section_marker(text)
     
     def _has_table_header(self, table) -> bool:
         """Check if table has a header row."""
@@ -221,37 +212,8 @@ class TemplateAnalyzer:
         return False
     
     def _detect_placeholders(self) -> Dict[str, List[str]]:
-        """Detect placeholder text that needs to be replaced."""
-        placeholders = {
-            "text_placeholders": [],
-            "field_codes": [],
-            "blank_sections": []
-        }
-        
-        placeholder_patterns = [
-            r"\[.*?\]",  # [Placeholder]
-            r"\{.*?\}",  # {Placeholder}
-            r"{{.*?}}",  # {{Placeholder}} Jinja2-style
-            r"TULIS\s+.*?(?=\n|$)",  # TULIS... (Indonesian)
-            r"BAGIAN\s+.*?(?=\n|$)",  # BAGIAN... (Indonesian)
-            r"<.*?>",  # <Placeholder>
-        ]
-        
-        for para in self.doc.paragraphs:
-            text = para.text
-            for pattern in placeholder_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    placeholders["text_placeholders"].extend(matches)
-        
-        # Also check for field codes
-        for para in self.doc.paragraphs:
-            if hasattr(para, '_element'):
-                fldChar = para._element.findall('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}fldChar')
-                if fldChar:
-                    placeholders["field_codes"].append(para.text)
-        
-        return placeholders
+        """Detect placeholder text and field codes that need to be replaced."""
+        return self._paragraph_scan()["placeholders"].result()
     
     def _analyze_sections(self) -> Dict[str, Any]:
         """Analyze document sections (headers, footers, page setup)."""
@@ -377,118 +339,31 @@ class TemplateAnalyzer:
     
     def _detect_common_font(self) -> str:
         """Detect most common font in document."""
-        fonts = {}
-        for para in self.doc.paragraphs:
-            for run in para.runs:
-                font_name = run.font.name or "Calibri"
-                fonts[font_name] = fonts.get(font_name, 0) + 1
-        
-        return max(fonts, key=fonts.get) if fonts else "Times New Roman"
+        return self._paragraph_scan()["fonts"].result()[0]
     
     def _detect_common_font_size(self) -> float:
         """Detect most common font size in document."""
-        sizes = {}
-        for para in self.doc.paragraphs:
-            for run in para.runs:
-                if run.font.size:
-                    size = run.font.size.pt
-                    sizes[size] = sizes.get(size, 0) + 1
-        
-        return max(sizes, key=sizes.get) if sizes else 12.0
+        return self._paragraph_scan()["fonts"].result()[1]
     
     def _detect_indentation_pattern(self) -> Dict[str, Any]:
         """Detect paragraph indentation patterns."""
-        indents = {"first_line": [], "left": [], "right": []}
-        
-        for para in self.doc.paragraphs:
-            if para.paragraph_format:
-                pf = para.paragraph_format
-                if pf.first_line_indent:
-                    indents["first_line"].append(pf.first_line_indent.inches)
-                if pf.left_indent:
-                    indents["left"].append(pf.left_indent.inches)
-                if pf.right_indent:
-                    indents["right"].append(pf.right_indent.inches)
-        
-        return {
-            "common_first_line": max(set(indents["first_line"]), key=indents["first_line"].count) if indents["first_line"] else 0,
-            "common_left": max(set(indents["left"]), key=indents["left"].count) if indents["left"] else 0,
-        }
+        return self._paragraph_scan()["paragraph_format"].indentation()
     
     def _detect_spacing_pattern(self) -> Dict[str, Any]:
         """Detect paragraph spacing patterns."""
-        space_before = {}
-        space_after = {}
-        
-        for para in self.doc.paragraphs:
-            if para.paragraph_format:
-                pf = para.paragraph_format
-                if pf.space_before:
-                    sb = pf.space_before.pt
-                    space_before[sb] = space_before.get(sb, 0) + 1
-                if pf.space_after:
-                    sa = pf.space_after.pt
-                    space_after[sa] = space_after.get(sa, 0) + 1
-        
-        return {
-            "common_space_before": max(space_before, key=space_before.get) if space_before else 0,
-            "common_space_after": max(space_after, key=space_after.get) if space_after else 0,
-        }
+        return self._paragraph_scan()["paragraph_format"].spacing()
     
     def _detect_alignment_pattern(self) -> str:
         """Detect common paragraph alignment."""
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        alignments = {}
-        
-        for para in self.doc.paragraphs:
-            if para.paragraph_format and para.paragraph_format.alignment:
-                align = str(para.paragraph_format.alignment)
-                alignments[align] = alignments.get(align, 0) + 1
-        
-        return max(alignments, key=alignments.get) if alignments else "CENTER"
+        return self._paragraph_scan()["paragraph_format"].alignment()
     
     def _detect_line_spacing_pattern(self) -> float:
         """Detect common line spacing."""
-        spacings = {}
-        
-        for para in self.doc.paragraphs:
-            if para.paragraph_format and para.paragraph_format.line_spacing:
-                spacing = para.paragraph_format.line_spacing
-                spacings[spacing] = spacings.get(spacing, 0) + 1
-        
-        return max(spacings, key=spacings.get) if spacings else 1.5
+        return self._paragraph_scan()["paragraph_format"].line_spacing()
     
     def _detect_front_matter(self) -> Dict[str, Any]:
         """Detect front matter sections (cover, approval, etc.)."""
-        front_matter = {
-            "sections": [],
-            "page_breaks": [],
-            "required_sections": []
-        }
-        
-        section_markers = [
-            ("cover", ["halaman judul", "cover", "judul"]),
-            ("approval", ["pengesahan", "approval", "persetujuan"]),
-            ("statement", ["pernyataan", "declaration", "keaslian"]),
-            ("dedication", ["persembahan", "dedication"]),
-            ("motto", ["motto"]),
-            ("preface", ["kata pengantar", "preface", "pengantar"]),
-            ("abstract_id", ["abstrak", "ringkasan"]),
-            ("abstract_en", ["abstract"]),
-            ("glossary", ["glosarium", "glossary", "istilah"]),
-            ("toc", ["daftar isi", "table of contents"]),
-            ("list_figures", ["daftar gambar", "list of figures"]),
-            ("list_tables", ["daftar tabel", "list of tables"]),
-        ]
-        
-        for para in self.doc.paragraphs:
-            text_lower = para.text.lower().strip()
-            for section_type, keywords in section_markers:
-                if any(kw in text_lower for kw in keywords):
-                    front_matter["sections"].append(section_type)
-                    front_matter["required_sections"].append(section_type)
-        
-        return front_matter
+        return self._paragraph_scan()["front_matter"].result()
     
     def _extract_properties(self) -> Dict[str, str]:
         """Extract document properties (title, author, etc.)."""
@@ -517,44 +392,7 @@ class TemplateAnalyzer:
     
     def _analyze_heading_hierarchy(self) -> Dict[str, Any]:
         """Analyze heading hierarchy (e.g., BAB, subbab 1.1)."""
-        hierarchy = {
-            "heading_styles": {},
-            "numbering_pattern": None,
-            "title_format": None
-        }
-        
-        heading_styles = {}
-        for para in self.doc.paragraphs:
-            if para.style:
-                # Safely extract outline level from XML
-                outline_level = None
-                try:
-                    outline_level_attr = para.style.element.xpath('.//w:outlineLvl/@w:val')
-                    if outline_level_attr:
-                        outline_level = int(outline_level_attr[0])
-                except Exception:
-                    outline_level = None
-                
-                if outline_level is not None:
-                    style_name = para.style.name
-                    if style_name not in heading_styles:
-                        heading_styles[style_name] = {
-                            "level": outline_level,
-                            "examples": []
-                        }
-                    if len(heading_styles[style_name]["examples"]) < 3:
-                        heading_styles[style_name]["examples"].append(para.text[:50])
-        
-        hierarchy["heading_styles"] = heading_styles
-        
-        # Detect numbering pattern
-        for para in self.doc.paragraphs:
-            if para.text and re.match(r"^(BAB|CHAPTER)\s+[IVX]+", para.text):
-                hierarchy["numbering_pattern"] = "roman_uppercase"
-            elif para.text and re.match(r"^(BAB|CHAPTER)\s+\d+", para.text):
-                hierarchy["numbering_pattern"] = "arabic"
-        
-        return hierarchy
+        return self._paragraph_scan()["heading_hierarchy"].result()
     
     def _detect_special_elements(self) -> Dict[str, List[str]]:
         """Detect special elements (tables, figures, equations, etc.)."""
@@ -571,13 +409,10 @@ class TemplateAnalyzer:
         for i, table in enumerate(self.doc.tables):
             special["tables"].append(f"Table {i+1}")
         
-        # Detect figure/table captions
-        for para in self.doc.paragraphs:
-            text_lower = para.text.lower()
-            if "gambar" in text_lower or "figure" in text_lower:
-                special["figures"].append(para.text[:50])
-            elif "persamaan" in text_lower or "equation" in text_lower:
-                special["equations"].append(para.text[:50])
+        # Detect figure/equation captions
+        figures, equations = self._paragraph_scan()["captions"].result()
+        special["figures"].extend(figures)
+        special["equations"].extend(equations)
         
         return special
     
@@ -787,40 +622,11 @@ Placeholders Found: {len(self.analysis['placeholders']['text_placeholders'])}
 
     def _detect_citation_style(self) -> str:
         """Detect citation style used in the document."""
-        # Look for citation patterns in text
-        citation_patterns = {
-            "APA": [r"\([A-Za-z]+, \d{4}\)", r"\([A-Za-z]+ & [A-Za-z]+, \d{4}\)"],  # (Author, Year)
-            "MLA": [r"\([A-Za-z]+ \d+\)", r'\([A-Za-z]+ \d+ [A-Za-z]+\)'],  # (Author Page)
-            "Chicago": [r"\[[\d]+\]", r"\([A-Za-z]+ [\d]+, [\d]+\)"],  # [1] or (Author Year, Page)
-            "Harvard": [r"\([A-Za-z]+, [\d]+\)", r"\([A-Za-z]+ [\d]+\)"],  # (Author Year)
-            "Vancouver": [r"\[[\d]+\]", r"^[[\d]+]"]  # [1]
-        }
-
-        for para in self.doc.paragraphs:
-            text = para.text
-            for style, patterns in citation_patterns.items():
-                if any(re.search(pattern, text) for pattern in patterns):
-                    return style
-
-        return "UNKNOWN"
+        return self._paragraph_scan()["academic"].result()["citation_style"]
 
     def _detect_reference_format(self) -> str:
         """Detect reference/bibliography format."""
-        # Check for common Indonesian academic reference formats
-        reference_formats = {
-            "ALPHABETICAL": r"^[A-Z][a-zA-Z]+, [A-Z]\.",  # Author, Initials
-            "NUMERICAL": r"^\[[\d]+\]",  # [1], [2], etc.
-            "FOOTNOTE": r"^[1-9][0-9]*\.",  # 1., 2., etc.
-        }
-
-        # Look for bibliography/reference sections
-        for para in self.doc.paragraphs:
-            text = para.text.strip()
-            for format_type, pattern in reference_formats.items():
-                if re.match(pattern, text):
-                    return format_type
-
-        return "UNKNOWN"
+        return self._paragraph_scan()["academic"].result()["reference_format"]
 
     def _check_structure_completeness(self) -> Dict[str, Any]:
         """Check completeness of Indonesian thesis structure."""
@@ -839,11 +645,7 @@ Placeholders Found: {len(self.analysis['placeholders']['text_placeholders'])}
         structure["front_matter_complete"] = len(present_front) >= len(required_front) * 0.8
 
         # Check main content (BAB structure)
-        bab_pattern = r"BAB\s+[IVX]+\s*[:-]?\s*(.+)"
-        bab_count = 0
-        for para in self.doc.paragraphs:
-            if re.match(bab_pattern, para.text, re.IGNORECASE):
-                bab_count += 1
+        bab_count = self._paragraph_scan()["academic"].result()["bab_count"]
         structure["main_content_complete"] = bab_count >= 3  # At least BAB I, II, III
 
         # Check back matter
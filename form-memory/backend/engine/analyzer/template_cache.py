@@ -0,0 +1,215 @@
+"""
+Template Cache
+Content-hash keyed store of parsed DOCX templates shared by all analyzers.
+Each template is parsed once; analyzers borrow the shared snapshot while the
+builder receives a deep copy it is free to mutate.
+"""
+
+import copy
+import hashlib
+import os
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from docx import Document
+
+from ..metrics import span
+
+
+DEFAULT_MAX_BYTES = int(os.getenv("TEMPLATE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("TEMPLATE_CACHE_MAX_ENTRIES", "32"))
+
+
+class TemplateSnapshot:
+    """Parsed template plus the analysis results computed from it."""
+
+    def __init__(self, digest: str, path: Path, document, size_bytes: int, parse_seconds: float):
+        self.digest = digest
+        self.path = path
+        self.document = document
+        self.size_bytes = size_bytes
+        self.parse_seconds = parse_seconds
+        self.analysis: Dict[str, Any] = {}
+        self.analysis_seconds: Dict[str, float] = {}
+
+
+class TemplateStore:
+    """
+    LRU cache of parsed templates keyed by the SHA-256 of the file contents.
+
+    Borrowed documents are shared between callers and must be treated as
+    read-only; use copy_document() when the document will be modified.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, TemplateSnapshot]" = OrderedDict()
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def digest_for(self, template_path: Union[str, Path]) -> str:
+        """Return the SHA-256 of a template, memoized on path, size and mtime."""
+        path = Path(template_path).resolve()
+        stat = path.stat()
+        stamp = (str(path), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._digests.get(stamp)
+        if digest:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._digests[stamp] = digest
+        return digest
+
+    def remember_digest(self, template_path: Union[str, Path], digest: str) -> None:
+        """Seed the digest memo with a hash computed elsewhere (e.g. while streaming an upload)."""
+        path = Path(template_path).resolve()
+        stat = path.stat()
+        with self._lock:
+            self._digests[(str(path), stat.st_size, stat.st_mtime_ns)] = digest
+
+    def get(self, template_path: Union[str, Path]) -> TemplateSnapshot:
+        """Return the snapshot for a template, parsing it on a miss."""
+        path = Path(template_path)
+        digest = self.digest_for(path)
+
+        with self._lock:
+            snapshot = self._entries.get(digest)
+            if snapshot is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                self.saved_seconds += snapshot.parse_seconds
+                return snapshot
+
+        start = time.perf_counter()
+        document = Document(str(path))
+        parse_seconds = time.perf_counter() - start
+        snapshot = TemplateSnapshot(digest, path, document, self._estimate_size(path), parse_seconds)
+
+        with self._lock:
+            existing = self._entries.get(digest)
+            if existing is not None:
+                # Another thread parsed the same template while we were busy
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return existing
+            self.misses += 1
+            self._entries[digest] = snapshot
+            self._total_bytes += snapshot.size_bytes
+            self._evict()
+
+        print(f"[INFO] Template cache miss: parsed {path.name} in {parse_seconds:.3f}s")
+        return snapshot
+
+    def borrow(self, template_path: Union[str, Path]):
+        """Return the shared, read-only Document for a template."""
+        return self.get(template_path).document
+
+    def copy_document(self, template_path: Union[str, Path]):
+        """Return a private deep copy of the template Document for mutation."""
+        with span("template_load"):
+            document = copy.deepcopy(self.get(template_path).document)
+        # Objects the shared Document cached around its body (python-docx's _Body,
+        # a paragraph index) hold child elements that deepcopy copies a second
+        # time, detached from the copied tree; drop them so they are rebuilt
+        document._Document__body = None
+        document.part.__dict__.pop('_paragraph_index', None)
+        return document
+
+    def get_analysis(self, template_path: Union[str, Path], name: str,
+                     factory: Callable[[], Any]) -> Any:
+        """
+        Return a cached analysis result for a template, computing it on first use.
+
+        Args:
+            template_path: Path to the template DOCX
+            name: Analyzer identifier the result is stored under
+            factory: Callable producing the result when it is not cached
+
+        Returns:
+            A deep copy of the cached result, safe for the caller to modify
+        """
+        snapshot = self.get(template_path)
+
+        with self._lock:
+            if name in snapshot.analysis:
+                self.saved_seconds += snapshot.analysis_seconds.get(name, 0.0)
+                return copy.deepcopy(snapshot.analysis[name])
+
+        start = time.perf_counter()
+        result = factory()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            snapshot.analysis[name] = result
+            snapshot.analysis_seconds[name] = elapsed
+        return copy.deepcopy(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
+
+    def clear(self) -> None:
+        """Drop all cached templates and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self._total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+            self.saved_seconds = 0.0
+
+    def _evict(self) -> None:
+        """Evict least recently used templates until within budget."""
+        while self._entries and (
+            self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            if len(self._entries) == 1:
+                break
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size_bytes
+            self.evictions += 1
+
+    @staticmethod
+    def _estimate_size(path: Path) -> int:
+        """Estimate in-memory size from the uncompressed size of the package parts."""
+        try:
+            with zipfile.ZipFile(path) as archive:
+                return sum(info.file_size for info in archive.infolist())
+        except Exception:
+            return path.stat().st_size
+
+
+TEMPLATE_STORE = TemplateStore()
+
+
+def get_template_store() -> TemplateStore:
+    """Return the process-wide template store."""
+    return TEMPLATE_STORE
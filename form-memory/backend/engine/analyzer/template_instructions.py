@@ -0,0 +1,263 @@
+"""
+Template Instructions
+Rules identifying instructional text, metadata placeholders and dummy
+table-of-contents entries in university templates. Shared by the thesis
+builder, which replaces or removes them, and the template compiler, which
+records where they sit in the pristine template.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher
+
+# Landmarks to protect (exact text only)
+ANCHOR_KEYWORDS = ['SUBBAB', 'ANAK SUBBAB', '[SUBBAB]', '[ANAK SUBBAB]']
+
+DUMMY_TOC_KEYWORDS = [
+    'LATAR BELAKANG', 'RUMUSAN MASALAH', 'TUJUAN PENELITIAN', 'MANFAAT PENELITIAN',
+    'KAJIAN PUSTAKA', 'LANDASAN TEORI', 'DESAIN PENELITIAN', 'PENGUMPULAN DATA',
+    'METODE PENELITIAN', 'METODOLOGI', 'ANALISIS DATA', 'HASIL PENELITIAN',
+    'IMPLEMENTASI SISTEM', 'PENGUJIAN', 'PEMBAHASAN HASIL', 'KESIMPULAN', 'SARAN'
+]
+
+INSTRUCTIONAL_PHRASES_ID = [
+    "The title and each student's name may differ",
+    "Adjust the layout to maintain neat formatting",
+    "Replace the date and names in this template",
+    "Tuliskan judul skripsi di sini",
+    "TULISKAN JUDUL BAB DI BARIS INI",
+    # Indonesian academic template instructions
+    "Format paragraf dengan style",
+    "Format paragraf dengan",
+    "Baris pertama berjarak 1 cm",
+    "Subbab dengan penomoran menggunakan 2 angka",
+    "Anak Subbab dengan penomoran menggunakan 3 angka",
+    "penomoran cukup dengan menggunakan huruf abjad",
+    "Cucu Subbab tidak perlu penomoran",
+    "Cucu Subbab",
+    "Tuliskan isi bab",
+    "Isi bab di sini",
+    "Ketik isi bab",
+    "Tulis konten bab",
+    "BAB PENGANTAR",
+    "BAB PENUTUP",
+    "TINJAUAN PUSTAKA",
+    "METODOLOGI PENELITIAN",
+    "HASIL DAN PEMBAHASAN",
+    "KESIMPULAN DAN SARAN",
+    # Formula and Code instructions
+    "Akurasi=(Solusi Maksimum",
+    "Solusi Maksimum-Solusi Minimum",
+    "#include <iostream>",
+    "using namespace std;",
+    "int main()",
+    "cout << \"Hello world!\"",
+    # Additional template formatting instructions
+    "Penyebutan dengan nomor",
+    "Penomoran level",
+    "Jika di dalam penyebutan",
+    "Notasi algoritmik",
+    "kode program atau pseudocode",
+    "Gunakan reference manager",
+    "Glosarium memuat",
+    "Compile proses",
+    "Debug langkah",
+    "Untuk membuat persamaan",
+    "Lampiran tidak perlu",
+    "Untuk mengacu ke gambar",
+    "Untuk mengacu ke tabel",
+    "Silakan copy paste",
+    "Cara copy paste persamaan",
+    "Contoh kode program yang dianggap",
+    "Contoh persamaan",
+    "Contoh tabel yang dibuat",
+    "Gunakan cara yang sama",
+    "Diharapkan dengan adanya Gambar",
+    "Sumber: Gunakan menu References",
+    "Untuk mengacu ke tabel",
+    # CRITICAL: Remove title subtitle instructions
+    "DENGAN POLA PIRAMIDA TERBALIK",
+    "LEBIH PANJANG DARI BARIS BAWAH)",
+    "PENGARAN KEBALIK",
+    "(BARIS ATAS",
+    "BARIS BAWAH)",
+    "HALAMAN JUDUL",
+    "HALAMAN PENGESAHAN",
+    "PERNYATAAN KEASLIAN",
+    "Pernyataan ini harus ditandatangani",
+    "TUGAS AKHIR",
+    "Bagian ini bebas untuk diisikan",
+    "Idealnya halaman persembahan",
+    "Idealnya halaman moto",
+    "pola piramida terbalik",
+]
+
+INSTRUCTIONAL_PHRASES_DEFAULT = [
+    "Replace this text with your thesis title",
+    "Replace with your name",
+    "Replace with your student ID"
+]
+
+
+# Keyword categories scanned in one pass per paragraph (matched case-insensitively)
+TEMPLATE_KEYWORD_CATEGORIES: Dict[str, List[str]] = {
+    # Table of contents / front matter navigation
+    'toc_section': ['DAFTAR ISI', 'DAFTAR TABEL', 'DAFTAR GAMBAR'],
+    'dummy_toc': DUMMY_TOC_KEYWORDS,
+    'front_matter': ['DAFTAR ISI', 'DAFTAR GAMBAR', 'DAFTAR TABEL', 'DAFTAR LAMPIRAN',
+                     'TABLE OF CONTENTS', 'LIST OF FIGURES', 'LIST OF TABLES'],
+    'toc_title': ['DAFTAR ISI', 'TABLE OF CONTENTS'],
+    'list_section': ['DAFTAR GAMBAR', 'DAFTAR TABEL'],
+    'bab_one': ['BAB I', 'BAB 1'],
+    'chapter_one': ['BAB I', 'BAB 1', 'CHAPTER 1'],
+    'toc_table': ['SUBBAB', 'LATAR BELAKANG', 'DAFTAR ISI'],
+    'toc_cell': ['SUBBAB', 'LATAR BELAKANG', 'RUMUSAN MASALAH', 'TUJUAN', 'MANFAAT'],
+    # Metadata already present in the template
+    'template_university': ['UNIVERSITAS ISLAM INDONESIA', 'UII', 'UNIVERSITAS GADJAH MADA', 'UGM',
+                            'UNIVERSITAS INDONESIA', 'UI', 'INSTITUT TEKNOLOGI BANDUNG', 'ITB',
+                            'INSTITUT PERTANIAN BOGOR', 'IPB'],
+    'template_faculty': ['FAKULTAS TEKNIK', 'FAKULTAS MIPA', 'FAKULTAS EKONOMI',
+                         'FAKULTAS KEDOKTERAN', 'FAKULTAS HUKUM', 'FAKULTAS SASTRA'],
+    'template_program': ['PROGRAM STUDI INFORMATIKA', 'TEKNIK INFORMATIKA', 'PROGRAM STUDI TEKNIK',
+                         'SISTEM INFORMASI', 'PROGRAM STUDI EKONOMI', 'PROGRAM STUDI MANAJEMEN'],
+    'template_department': ['JURUSAN', 'DEPARTEMEN', 'DEPARTMENT'],
+    'template_city': ['YOGYAKARTA', 'JAKARTA', 'BANDUNG', 'SURABAYA', 'SEMARANG', 'MALANG'],
+    'template_degree': ['SARJANA KOMPUTER', 'SARJANA TEKNIK', 'SARJANA SAINS',
+                        'MAGISTER', 'DOKTOR', 'S.KOM', 'S.T.', 'M.KOM', 'M.T.'],
+    'degree_context': ['gelar', 'sarjana'],
+    # Metadata placeholders to replace with user data
+    'title_instruction': ['tuliskan judul', 'tulis judul', 'judul skripsi', 'judul tesis',
+                          'bagian ini adalah bagian judul', 'tuliskan judul dengan pola'],
+    'chapter_header': ['BAB I', 'BAB II', 'BAB III', 'BAB IV', 'BAB V', 'BAB VI', 'CHAPTER'],
+    'title_excluded': ['HALAMAN', 'LEMBAR', 'KATA', 'DAFTAR', 'TABEL', 'GAMBAR', 'FAKULTAS',
+                       'UNIVERSITAS', 'PROGRAM', 'PENGESAHAN', 'PENGANTAR'],
+    'name_placeholder': ['nama mahasiswa', 'nama lengkap mahasiswa', 'student name',
+                         'author name', 'john doe', 'jane smith'],
+    'student': ['mahasiswa'],
+    'university': ['universitas', 'university', 'institut', 'institute', 'sekolah tinggi'],
+    'faculty': ['fakultas', 'faculty', 'jurusan', 'department'],
+    'program': ['program studi', 'prodi', 'study program', 'program pendidikan'],
+    'supervisor': ['pembimbing', 'supervisor'],
+    'examiner': ['penguji', 'anggota', 'examiner'],
+    'month': ['januari', 'februari', 'maret', 'april', 'mei', 'juni', 'juli', 'agustus',
+              'september', 'oktober', 'november', 'desember', 'january', 'february', 'march'],
+    # Placeholders inside table cells
+    'cell_title': ['tuliskan judul', 'tulis judul'],
+    'cell_author': ['nama mahasiswa', 'nama penulis', 'n a m a'],
+    'cell_nim': ['nim', 'nomor induk', 'n i m'],
+    'cell_program': ['program studi', 'prodi'],
+    'cell_faculty': ['fakultas'],
+}
+
+# Student ID placeholders: the template's sample NIM or any 8-10 digit number
+NIM_PATTERN = re.compile(r'\b(94523999|\d{8,10})\b')
+YEAR_PATTERN = re.compile(r'\b(20\d{2})\b')
+SUPERVISOR_NAME_PATTERNS = [
+    re.compile(r'\(\s*([^,]+),\s*S\.T[^)]*\)', re.I),  # (Name, S.T.)
+    re.compile(r'Pembimbing\s*:\s*([^,\n]+)', re.I),     # Pembimbing: Name
+]
+SUPERVISOR_SIGNATURE_PATTERN = re.compile(r'(\(\s*(?:Nama|NAMA|Dr\.|DR\.)[^)]*\)|:\s*(?:Nama|NAMA|Dr\.|DR\.)[^\n,]+)', re.I)
+EXAMINER_SIGNATURE_PATTERN = re.compile(r'(\(\s*(?:Nama|NAMA|Dr\.|DR\.|Anggota|Penguji)[^)]*\)|:\s*(?:Nama|NAMA|Dr\.|DR\.|Anggota|Penguji)[^\n,]+)', re.I)
+DUMMY_TOC_SUBBAB_PATTERN = re.compile(r'^\d\.\d\s+.*Subbab', re.I)
+DUMMY_TOC_ANAK_SUBBAB_PATTERN = re.compile(r'^\d\.\d\.\d\s+.*Anak Subbab', re.I)
+
+
+def instructional_phrases(language: Optional[str]) -> List[str]:
+    """Return the instruction phrases removed for a template language."""
+    return INSTRUCTIONAL_PHRASES_ID if language == 'id' else INSTRUCTIONAL_PHRASES_DEFAULT
+
+
+@lru_cache(maxsize=None)
+def template_keyword_matcher(language: Optional[str] = 'id') -> KeywordMatcher:
+    """
+    Return the shared keyword matcher for a template language.
+
+    The language selects the instruction-phrase table; every other category is
+    common to all university configs, so configs sharing a language share one
+    automaton.
+
+    Args:
+        language: Template language from the university config ('id', 'en', ...)
+
+    Returns:
+        KeywordMatcher over TEMPLATE_KEYWORD_CATEGORIES plus 'instruction'
+    """
+    categories = dict(TEMPLATE_KEYWORD_CATEGORIES)
+    categories['instruction'] = instructional_phrases(language)
+    return KeywordMatcher(categories)
+
+
+def iter_instruction_paragraphs(paragraphs: Iterable, language: Optional[str],
+                                style_name: Callable[[object], str]) -> Iterator[Tuple[int, object, str]]:
+    """
+    Yield the paragraphs the builder removes as template instructions.
+
+    Args:
+        paragraphs: Body paragraphs in document order
+        language: Template language from the university config ('id', 'en', ...)
+        style_name: Returns a paragraph's style name ('' when unstyled)
+
+    Yields:
+        (index, paragraph, kind) with kind 'dummy_toc' or 'instruction'
+    """
+    matcher = template_keyword_matcher(language)
+
+    # Track if we are in the Table of Contents section
+    in_toc_section = False
+
+    for index, para in enumerate(paragraphs):
+        text = para.text
+        text_strip = text.strip()
+        text_upper = text_strip.upper()
+        matched = matcher.scan(text)
+
+        # Detect TOC section
+        if 'toc_section' in matched:
+            in_toc_section = True
+        elif text_upper.startswith(('BAB I', 'CHAPTER 1')):
+            in_toc_section = False
+
+        # PROTECT: Do not delete structural elements or headings
+        # But allow cleaning if they are clearly dummy TOC entries or instructions
+        is_landmark = text_upper in ANCHOR_KEYWORDS or (text_upper.startswith('BAB') and len(text_strip) < 50)
+        if is_landmark:
+            continue
+
+        if (not in_toc_section) and 'Heading' in style_name(para):
+            # Protect real headings in the body
+            continue
+
+        kind = instruction_kind(text, matched, in_toc_section)
+        if kind is not None:
+            yield index, para, kind
+
+
+def instruction_kind(text: str, matched: Iterable[str], in_toc_section: bool) -> Optional[str]:
+    """
+    Classify a paragraph that passed the landmark and heading guards.
+
+    Args:
+        text: Paragraph text
+        matched: Keyword categories the matcher found in the text
+        in_toc_section: Whether the paragraph sits in the table of contents
+
+    Returns:
+        'dummy_toc', 'instruction' or None
+    """
+    text_strip = text.strip()
+
+    # Additional dummy entries check (especially for TOC)
+    is_dummy_toc = in_toc_section and (
+        DUMMY_TOC_SUBBAB_PATTERN.search(text_strip) or
+        DUMMY_TOC_ANAK_SUBBAB_PATTERN.search(text_strip) or
+        'dummy_toc' in matched
+    )
+    if is_dummy_toc:
+        return 'dummy_toc'
+
+    # Only short paragraphs are instructions; longer ones merely quote a phrase
+    if len(text) < 500 and 'instruction' in matched:
+        return 'instruction'
+    return None
@@ -8,6 +8,8 @@ from docx import Document
 from docx.oxml.ns import qn
 from typing import List, Dict, Optional, Tuple
 
+from ..analyzer.paragraph_index import paragraph_index
+
 
 class AnchorDescriptor:
     """Describes an anchor block location in the template."""
@@ -34,13 +36,20 @@ class AnchorDiscovery:
     
     def __init__(self, doc: Document):
         self.doc = doc
-        self.paragraphs = doc.paragraphs
         self.sections = doc.sections
+
+    @property
+    def paragraphs(self):
+        """Live view of the body paragraphs, including blocks cloned in after construction."""
+        return paragraph_index(self.doc)
+
+    def _style_name(self, para) -> str:
+        return self.paragraphs.style_name(para)
     
     def find_paragraph_by_style(self, style_name: str) -> Optional[int]:
         """Find first paragraph with exact style name."""
         for idx, para in enumerate(self.paragraphs):
-            if para.style.name == style_name:
+            if self._style_name(para) == style_name:
                 return idx
         return None
     
@@ -48,7 +57,7 @@ class AnchorDiscovery:
         """Find all paragraphs with exact style name."""
         indices = []
         for idx, para in enumerate(self.paragraphs):
-            if para.style.name == style_name:
+            if self._style_name(para) == style_name:
                 indices.append(idx)
         return indices
     
@@ -91,7 +100,7 @@ class AnchorDiscovery:
     ) -> Optional[int]:
         """Find paragraph matching both style and outline level."""
         for idx, para in enumerate(self.paragraphs):
-            if (para.style.name == style_name and 
+            if (self._style_name(para) == style_name and 
                 self._get_outline_level(para) == outline_level):
                 return idx
         return None
@@ -106,7 +115,7 @@ class AnchorDiscovery:
         consecutive = []
         
         for idx, para in enumerate(self.paragraphs):
-            if para.style.name == style_name and self._is_numbered(para):
+            if self._style_name(para) == style_name and self._is_numbered(para):
                 if not consecutive or consecutive[-1] == idx - 1:
                     consecutive.append(idx)
                     if len(consecutive) == count:
@@ -150,7 +159,7 @@ class AnchorDiscovery:
         
         return AnchorDescriptor(
             para_index=para_index,
-            style_name=para.style.name,
+            style_name=self._style_name(para),
             outline_level=self._get_outline_level(para),
             numbering_pattern=self._detect_numbering_pattern(para),
             section_index=self.get_section_for_paragraph(para_index),
@@ -6,8 +6,14 @@ No modification of styles, numbering, or section properties.
 
 from docx import Document
 from docx.oxml import parse_xml
+from docx.text.paragraph import Paragraph
 from copy import deepcopy
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+from ..analyzer.paragraph_index import paragraph_index
+
+# A paragraph reference: body index, python-docx Paragraph or <w:p> element
+ParagraphRef = Union[int, Paragraph, Any]
 
 
 class BlockCloner:
@@ -17,13 +23,18 @@ class BlockCloner:
         self.doc = doc
         self.body = doc._element.body
     
+    def resolve(self, para_ref: ParagraphRef):
+        """Return the <w:p> element for a paragraph index, Paragraph or element."""
+        if isinstance(para_ref, int):
+            paragraphs = paragraph_index(self.doc)
+            if para_ref >= len(paragraphs):
+                raise IndexError(f"Paragraph index {para_ref} out of range")
+            return paragraphs[para_ref]._element
+        return getattr(para_ref, '_element', para_ref)
+
     def clone_paragraph(self, para_index: int) -> object:
         """Clone a paragraph element preserving all formatting."""
-        if para_index >= len(self.doc.paragraphs):
-            raise IndexError(f"Paragraph index {para_index} out of range")
-        
-        source_para = self.doc.paragraphs[para_index]
-        source_elem = source_para._element
+        source_elem = self.resolve(para_index)
         
         # Deep copy the XML element
         cloned_elem = deepcopy(source_elem)
@@ -43,14 +54,7 @@ class BlockCloner:
         insert_after_para_index: int
     ) -> None:
         """Insert cloned paragraph after specified paragraph."""
-        if insert_after_para_index >= len(self.doc.paragraphs):
-            raise IndexError(f"Paragraph index {insert_after_para_index} out of range")
-        
-        anchor_para = self.doc.paragraphs[insert_after_para_index]
-        anchor_elem = anchor_para._element
-        
-        # Insert after anchor
-        anchor_elem.addnext(cloned_elem)
+        self.splice_after([cloned_elem], insert_after_para_index)
     
     def insert_cloned_paragraphs(
         self,
@@ -58,12 +62,76 @@ class BlockCloner:
         insert_after_para_index: int
     ) -> None:
         """Insert multiple cloned paragraphs after specified paragraph."""
-        anchor_para = self.doc.paragraphs[insert_after_para_index]
-        anchor_elem = anchor_para._element
-        
-        # Insert in reverse order so they appear in correct order
-        for cloned_elem in reversed(cloned_elems):
-            anchor_elem.addnext(cloned_elem)
+        self.splice_after(cloned_elems, insert_after_para_index)
+
+    def stamp_clones(
+        self,
+        source: ParagraphRef,
+        texts: Sequence[Optional[str]],
+        stamp: Optional[Callable[[Paragraph, str], None]] = None
+    ) -> List[object]:
+        """
+        Clone a source paragraph once per text and fill each copy in memory.
+
+        Args:
+            source: Paragraph to copy (index, Paragraph or <w:p> element)
+            texts: Text for each copy; None keeps the source text
+            stamp: Writes a text into a paragraph (e.g. TextReplacer.replace_paragraph_text)
+
+        Returns:
+            Detached <w:p> elements, one per text
+        """
+        source_elem = self.resolve(source)
+        parent = self.doc._body
+        clones = []
+        for text in texts:
+            cloned_elem = deepcopy(source_elem)
+            if text is not None and stamp is not None:
+                stamp(Paragraph(cloned_elem, parent), text)
+            clones.append(cloned_elem)
+        return clones
+
+    def splice_after(self, elements: List[object], anchor: ParagraphRef) -> List[object]:
+        """
+        Insert elements after an anchor paragraph with a single lxml slice assignment.
+
+        Returns:
+            The inserted elements; they stay valid handles as the document changes
+        """
+        anchor_elem = self.resolve(anchor)
+        if not elements:
+            return []
+        parent = anchor_elem.getparent()
+        position = parent.index(anchor_elem) + 1
+        parent[position:position] = elements
+
+        # Keep the shared paragraph index in sync without rescanning the body
+        paragraphs = paragraph_index(self.doc)
+        paragraphs.note_inserted_block(elements, after=Paragraph(anchor_elem, self.doc._body))
+        return list(elements)
+
+    def clone_and_insert(
+        self,
+        source: ParagraphRef,
+        texts: Sequence[Optional[str]],
+        after: Optional[ParagraphRef] = None,
+        stamp: Optional[Callable[[Paragraph, str], None]] = None
+    ) -> List[object]:
+        """
+        Clone a paragraph for each text and splice the copies in as one block.
+
+        Args:
+            source: Paragraph to copy
+            texts: Text for each copy, in document order; None keeps the source text
+            after: Paragraph to insert after (defaults to the source)
+            stamp: Writes a text into a paragraph
+
+        Returns:
+            The inserted <w:p> elements in document order
+        """
+        anchor_elem = self.resolve(source if after is None else after)
+        clones = self.stamp_clones(source, texts, stamp)
+        return self.splice_after(clones, anchor_elem)
     
     def clone_and_replace_at(
         self,
@@ -71,16 +139,17 @@ class BlockCloner:
         target_para_index: int
     ) -> None:
         """Clone source paragraph and replace target paragraph."""
-        if (source_para_index >= len(self.doc.paragraphs) or 
-            target_para_index >= len(self.doc.paragraphs)):
+        paragraphs = paragraph_index(self.doc)
+        if (source_para_index >= len(paragraphs) or 
+            target_para_index >= len(paragraphs)):
             raise IndexError("Paragraph index out of range")
         
         cloned_elem = self.clone_paragraph(source_para_index)
-        target_para = self.doc.paragraphs[target_para_index]
-        target_elem = target_para._element
+        target_elem = paragraphs[target_para_index]._element
         
         # Replace
         target_elem.getparent().replace(target_elem, cloned_elem)
+        paragraphs.refresh()
     
     def clone_section(
         self,
@@ -95,8 +164,4 @@ class BlockCloner:
     
     def get_paragraph_runs(self, para_index: int) -> List[object]:
         """Get all run elements from a paragraph."""
-        if para_index >= len(self.doc.paragraphs):
-            raise IndexError(f"Paragraph index {para_index} out of range")
-        
-        para = self.doc.paragraphs[para_index]
-        return para._element.findall('.//w:r', namespaces={'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'})
+        return self.resolve(para_index).findall('.//w:r', namespaces={'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'})
@@ -8,6 +8,7 @@ from docx import Document
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from ..analyzer.paragraph_index import paragraph_index
 from .anchor_discovery import AnchorDiscovery, AnchorDescriptor
 from .block_cloner import BlockCloner
 from .text_replacer import TextReplacer
@@ -123,50 +124,45 @@ class TemplateExecutor:
         
         elif anchor_type == 'index':
             idx = rule.get('index')
-            if idx < len(self.doc.paragraphs):
+            if idx < len(paragraph_index(self.doc)):
                 return idx
         
         return None
     
     def _inject_text(self, anchor_idx: int, text: str) -> None:
         """Inject plain text at anchor."""
-        if anchor_idx >= len(self.doc.paragraphs):
+        paragraphs = paragraph_index(self.doc)
+        if anchor_idx >= len(paragraphs):
             return
         
-        para = self.doc.paragraphs[anchor_idx]
+        para = paragraphs[anchor_idx]
         self.text_replacer.replace_paragraph_text(para, text)
     
     def _inject_list(self, anchor_idx: int, items: List[str]) -> None:
         """Inject list of items cloning paragraph for each."""
-        if anchor_idx >= len(self.doc.paragraphs):
+        paragraphs = paragraph_index(self.doc)
+        if anchor_idx >= len(paragraphs):
             return
         
         # Set first item at anchor
         if items:
-            self.text_replacer.replace_paragraph_text(
-                self.doc.paragraphs[anchor_idx],
-                items[0]
-            )
+            anchor = paragraphs[anchor_idx]
+            self.text_replacer.replace_paragraph_text(anchor, items[0])
             
-            # Clone paragraph for remaining items
-            for item in items[1:]:
-                cloned = self.block_cloner.clone_paragraph(anchor_idx)
-                self.block_cloner.insert_cloned_paragraph(cloned, anchor_idx)
-                
-                # Update text in cloned paragraph
-                # Refresh paragraph reference after insertion
-                anchor_idx += 1
-                self.text_replacer.replace_paragraph_text(
-                    self.doc.paragraphs[anchor_idx],
-                    item
-                )
+            # Clone the filled anchor for remaining items and splice them in as one block
+            self.block_cloner.clone_and_insert(
+                anchor,
+                items[1:],
+                stamp=self.text_replacer.replace_paragraph_text
+            )
     
     def _inject_dict(self, anchor_idx: int, data: Dict[str, str]) -> None:
         """Inject structured data (placeholders in template)."""
-        if anchor_idx >= len(self.doc.paragraphs):
+        paragraphs = paragraph_index(self.doc)
+        if anchor_idx >= len(paragraphs):
             return
         
-        para = self.doc.paragraphs[anchor_idx]
+        para = paragraphs[anchor_idx]
         
         for key, value in data.items():
             placeholder = "{" + key + "}"
@@ -179,16 +175,12 @@ class TemplateExecutor:
         insert_after_idx: int
     ) -> List[int]:
         """Clone a paragraph block multiple times."""
-        cloned_indices = []
-        current_insert_idx = insert_after_idx
-        
-        for i in range(num_clones):
-            cloned = self.block_cloner.clone_paragraph(source_para_idx)
-            self.block_cloner.insert_cloned_paragraph(cloned, current_insert_idx)
-            current_insert_idx += 1
-            cloned_indices.append(current_insert_idx)
-        
-        return cloned_indices
+        self.block_cloner.clone_and_insert(
+            source_para_idx,
+            [None] * num_clones,
+            after=insert_after_idx
+        )
+        return list(range(insert_after_idx + 1, insert_after_idx + num_clones + 1))
     
     def find_anchors_by_rule(self, rule: Dict[str, Any]) -> List[int]:
         """Find all paragraphs matching a rule."""
@@ -214,8 +206,8 @@ class TemplateExecutor:
     def get_template_metadata(self) -> Dict[str, Any]:
         """Get template metadata for rule compilation."""
         return {
-            'paragraph_count': len(self.doc.paragraphs),
+            'paragraph_count': len(paragraph_index(self.doc)),
             'section_count': len(self.doc.sections),
-            'style_names': [p.style.name for p in self.doc.paragraphs if p.style],
+            'style_names': [p.style.name for p in paragraph_index(self.doc) if p.style],
             'anchors': self.anchor_discovery.discover_all_anchors(),
         }
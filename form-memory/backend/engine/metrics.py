@@ -0,0 +1,284 @@
+"""
+Metrics
+Process-wide counters, histograms and timing spans, exported in the
+Prometheus text format by the /metrics endpoint.
+
+Build stages are timed with `span`:
+
+    with span("zone_mapping"):
+        zones = document_zones(doc)
+
+    @span("create_complete_thesis")
+    def create_complete_thesis(...): ...
+
+Each finished span observes `folio_stage_duration_seconds{stage=...}`; a span
+left by an exception also counts `folio_stage_errors_total`. Values owned by
+other components (queue depth, cache hit counters) are read at scrape time by
+collectors registered with `REGISTRY.register_collector`.
+"""
+
+import functools
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Covers everything from a zone map (milliseconds) to a full AI build (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricFamily:
+    """
+    A metric and its samples, as produced by a collector at scrape time.
+
+    Args:
+        name: Metric name (e.g. folio_job_queue_jobs)
+        kind: Prometheus type: counter, gauge or histogram
+        help_text: One-line description
+        label_names: Names of the labels carried by every sample
+    """
+
+    def __init__(self, name: str, kind: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.samples: List[Tuple[str, LabelValues, float]] = []
+
+    def add(self, value: float, *label_values: str, suffix: str = "") -> "MetricFamily":
+        """Add a sample; `suffix` is appended to the name (_bucket, _sum, ...)."""
+        self.samples.append((suffix, tuple(str(v) for v in label_values), value))
+        return self
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, value in self.samples:
+            names = self.label_names
+            if suffix == "_bucket":
+                names = names + ("le",)
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels (name it ..._total)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.help_text, self.label_names)
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                family.add(value, *key)
+        return family
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Bucketed distribution of observed values, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def snapshot(self, **labels: str) -> Dict[str, float]:
+        """Count and sum of the observations with these labels."""
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": int(sum(counts[:-1])), "sum": counts[-1]}
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.help_text, self.label_names)
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        for key, counts in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), counts[:-1]):
+                cumulative += count
+                family.add(cumulative, *key, _format_value(bound), suffix="_bucket")
+            family.add(counts[-1], *key, suffix="_sum")
+            family.add(cumulative, *key, suffix="_count")
+        return family
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Owns the process's metrics and renders them for a scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Add a callable producing metric families from live state at each scrape."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                # A broken collector must not take the whole scrape down
+                print(f"[WARNING] Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        lines: List[str] = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset every counter and histogram (collectors are kept)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "folio_stage_duration_seconds", "Duration of document pipeline stages", ["stage"]
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "folio_stage_errors_total", "Pipeline stages left by an exception", ["stage"]
+)
+
+
+class span:
+    """
+    Time a pipeline stage, as a context manager or a decorator.
+
+    Use start()/finish() for a stage that is not a single block, such as a
+    phase inside a long method.
+
+    Args:
+        stage: Stage name, used as the `stage` label
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._start: Optional[float] = None
+        self.seconds = 0.0
+
+    def start(self) -> "span":
+        self._start = time.perf_counter()
+        return self
+
+    def finish(self, error: bool = False) -> float:
+        """Record the stage and return its duration (0 if never started or already finished)."""
+        if self._start is None:
+            return 0.0
+        self.seconds = time.perf_counter() - self._start
+        self._start = None
+        STAGE_SECONDS.observe(self.seconds, stage=self.stage)
+        if error:
+            STAGE_ERRORS.inc(stage=self.stage)
+        return self.seconds
+
+    def __enter__(self) -> "span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.finish(error=exc_type is not None)
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        stage = self.stage
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # A fresh span per call keeps concurrent calls apart
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return REGISTRY
@@ -0,0 +1,210 @@
+"""
+Tracing
+Leveled debug tracing for the build pipeline's inner loops.
+
+Messages use %-style arguments that are only formatted when the event is
+actually emitted or captured, and every call starts with a level check, so a
+disabled trace.debug(...) in a per-paragraph loop costs one comparison:
+
+    trace = get_tracer("builder")
+    trace.debug("Landmark found: chapter %s at paragraph %s", chapter, index)
+
+TRACE_LEVEL (debug, info, warning, error, off; default info) sets what is
+written to stdout. A TraceCapture records a single request's events at its
+own level, whatever TRACE_LEVEL is, so one build can be traced in full
+without turning on debug output for every other request:
+
+    with capture_trace() as capture:
+        build()
+    capture.to_ndjson()
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_LEVELS_BY_NAME = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+
+DEFAULT_CAPTURE_MAX_EVENTS = int(os.getenv("TRACE_CAPTURE_MAX_EVENTS", "20000"))
+
+
+def parse_level(value: Any, default: int = INFO) -> int:
+    """Return the numeric level for a name (case-insensitive) or number."""
+    if isinstance(value, int):
+        return value
+    return _LEVELS_BY_NAME.get(str(value or "").strip().lower(), default)
+
+
+# Module state read by every trace call; kept as plain globals so the guard is cheap
+_emit_level = parse_level(os.getenv("TRACE_LEVEL"), INFO)
+_active_captures = 0
+_captures_lock = threading.Lock()
+_current_capture: contextvars.ContextVar[Optional["TraceCapture"]] = contextvars.ContextVar(
+    "trace_capture", default=None
+)
+
+
+def set_level(level: Any) -> None:
+    """Change the level written to stdout."""
+    global _emit_level
+    _emit_level = parse_level(level, _emit_level)
+
+
+def get_level() -> int:
+    return _emit_level
+
+
+class TraceCapture:
+    """
+    Events of one request, kept in memory for download.
+
+    Args:
+        level: Lowest level recorded
+        max_events: Events beyond this are counted but dropped
+    """
+
+    def __init__(self, level: int = DEBUG, max_events: int = DEFAULT_CAPTURE_MAX_EVENTS):
+        self.level = level
+        self.max_events = max_events
+        self.started_at = time.time()
+        self.dropped = 0
+        self._start = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, level: int, component: str, message: str, fields: Dict[str, Any]) -> None:
+        event = {
+            "t": round(time.perf_counter() - self._start, 6),
+            "level": LEVEL_NAMES.get(level, str(level)),
+            "component": component,
+            "thread": threading.current_thread().name,
+            "message": message,
+        }
+        if fields:
+            event["fields"] = fields
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def iter_ndjson(self) -> Iterator[str]:
+        """One JSON object per line; a final summary line reports dropped events."""
+        for event in self.events():
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        yield json.dumps({"summary": True, "events": len(self), "dropped": self.dropped,
+                          "started_at": self.started_at}) + "\n"
+
+    def to_ndjson(self) -> str:
+        return "".join(self.iter_ndjson())
+
+
+@contextmanager
+def capture_trace(capture: Optional[TraceCapture] = None, level: int = DEBUG) -> Iterator[TraceCapture]:
+    """
+    Record the trace events of the current context (thread or task) into a capture.
+
+    Threads started inside the block only join the capture when run through
+    contextvars.copy_context().run.
+    """
+    global _active_captures
+    capture = capture if capture is not None else TraceCapture(level)
+    token = _current_capture.set(capture)
+    with _captures_lock:
+        _active_captures += 1
+    try:
+        yield capture
+    finally:
+        _current_capture.reset(token)
+        with _captures_lock:
+            _active_captures -= 1
+
+
+def _emit(level: int, component: str, message: str) -> None:
+    line = f"[{LEVEL_NAMES.get(level, level)}] [{component}] {message}"
+    try:
+        print(line)
+    except UnicodeEncodeError:
+        # Consoles without UTF-8 (e.g. Windows cp1252)
+        print(line.encode("ascii", "replace").decode("ascii"))
+
+
+class Tracer:
+    """Leveled trace events for one component (builder, ai_extractor, ...)."""
+
+    __slots__ = ("component",)
+
+    def __init__(self, component: str):
+        self.component = component
+
+    def enabled(self, level: int = DEBUG) -> bool:
+        """Whether an event at this level would go anywhere; use it to skip costly argument building."""
+        if level >= _emit_level:
+            return True
+        if not _active_captures:
+            return False
+        capture = _current_capture.get()
+        return capture is not None and level >= capture.level
+
+    def debug(self, message: str, *args: Any, **fields: Any) -> None:
+        if DEBUG >= _emit_level or _active_captures:
+            self._log(DEBUG, message, args, fields)
+
+    def info(self, message: str, *args: Any, **fields: Any) -> None:
+        if INFO >= _emit_level or _active_captures:
+            self._log(INFO, message, args, fields)
+
+    def warning(self, message: str, *args: Any, **fields: Any) -> None:
+        if WARNING >= _emit_level or _active_captures:
+            self._log(WARNING, message, args, fields)
+
+    def error(self, message: str, *args: Any, **fields: Any) -> None:
+        if ERROR >= _emit_level or _active_captures:
+            self._log(ERROR, message, args, fields)
+
+    def _log(self, level: int, message: str, args: tuple, fields: Dict[str, Any]) -> None:
+        capture = _current_capture.get() if _active_captures else None
+        captured = capture is not None and level >= capture.level
+        if not captured and level < _emit_level:
+            return
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
+        if captured:
+            capture.record(level, self.component, message, fields)
+        if level >= _emit_level:
+            if fields:
+                message = f"{message} " + " ".join(f"{k}={v}" for k, v in fields.items())
+            _emit(level, self.component, message)
+
+
+_tracers: Dict[str, Tracer] = {}
+
+
+def get_tracer(component: str) -> Tracer:
+    """Return the tracer for a component."""
+    tracer = _tracers.get(component)
+    if tracer is None:
+        tracer = _tracers.setdefault(component, Tracer(component))
+    return tracer
@@ -8,6 +8,7 @@ from docx import Document
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import xml.etree.ElementTree as ET
+from ..analyzer.template_cache import TEMPLATE_STORE
 
 
 class FidelityValidator:
@@ -18,7 +19,8 @@ class FidelityValidator:
         self.template_path = Path(template_path)
         self.output_path = Path(output_path)
         
-        self.template_doc = Document(str(self.template_path))
+        # Template is only read, so the shared cached snapshot is enough
+        self.template_doc = TEMPLATE_STORE.borrow(self.template_path)
         self.output_doc = Document(str(self.output_path))
     
     def validate(self) -> Dict[str, Any]:
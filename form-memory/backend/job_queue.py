@@ -0,0 +1,153 @@
+"""
+Job Queue
+Runs long thesis builds on a bounded worker pool so request handlers return
+immediately and the event loop stays free for other endpoints.
+"""
+
+import asyncio
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs."""
+
+
+class Job:
+    """A single queued unit of work and its observable state."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = self.QUEUED
+        self.stage = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        # TraceCapture of a build run with tracing requested
+        self.trace: Optional[Any] = None
+
+    def set_stage(self, stage: str) -> None:
+        """Record the current build stage for progress polling."""
+        self.stage = stage
+
+    @property
+    def done(self) -> bool:
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public, JSON-serialisable view of the job."""
+        result = self.result if isinstance(self.result, dict) else None
+        elapsed_end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": round(elapsed_end - (self.started_at or self.created_at), 3),
+            "filename": result.get("filename") if result else None,
+            "result": result,
+            "error": self.error,
+            "trace_events": len(self.trace) if self.trace is not None else None,
+        }
+
+
+class JobQueue:
+    """
+    Bounded worker pool for thesis generation jobs.
+
+    Args:
+        max_workers: Number of builds allowed to run concurrently
+        max_pending: Number of jobs allowed to wait for a free worker
+        max_history: Number of finished jobs kept for status polling
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, max_history: int = 200):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(0, max_pending)
+        self.max_history = max_history
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="thesis-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """
+        Queue `fn(job, *args, **kwargs)` and return its Job immediately.
+
+        Raises:
+            JobQueueFull: If all workers are busy and the pending queue is full
+        """
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if not job.done)
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({active} active jobs)")
+            job = Job(kind)
+            self._jobs[job.id] = job
+            self._prune()
+
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        print(f"[INFO] Job {job.id} ({kind}) queued")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if unknown or already pruned."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def wait(self, job: Job) -> Any:
+        """Await a job's result without blocking the event loop."""
+        return await asyncio.wrap_future(job.future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counts of jobs by status."""
+        with self._lock:
+            counts = {Job.QUEUED: 0, Job.RUNNING: 0, Job.SUCCEEDED: 0, Job.FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return {"workers": self.max_workers, "max_pending": self.max_pending, **counts}
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs) -> Any:
+        """Worker entry point; records status transitions around `fn`."""
+        job.status = Job.RUNNING
+        job.stage = "started"
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = Job.SUCCEEDED
+            job.stage = "done"
+            return job.result
+        except Exception as e:
+            job.error = str(e)
+            job.status = Job.FAILED
+            print(f"[ERROR] Job {job.id} ({job.kind}) failed: {e}\n{traceback.format_exc()}")
+            raise
+        finally:
+            job.finished_at = time.time()
+            print(f"[INFO] Job {job.id} ({job.kind}) {job.status} in "
+                  f"{job.finished_at - job.started_at:.1f}s")
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the history limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
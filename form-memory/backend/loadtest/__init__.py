@@ -0,0 +1,8 @@
+"""
+Offline load testing against a local stand-in for OpenRouter.
+
+`python -m loadtest.fake_openrouter` serves the chat-completions API with
+canned, schema-valid answers and configurable latency, token rate and error
+injection; `python -m loadtest.driver` starts it next to the backend under
+uvicorn and pushes concurrent /generate requests through both.
+"""
@@ -0,0 +1,234 @@
+"""
+Canned Responses
+Deterministic, schema-valid answers for each prompt family the pipeline sends
+to OpenRouter. The family is recognised from the system and user messages;
+structured prompts that embed a JSON template (chapter1..chapter6, front
+matter, references, template intelligence) get that template filled in.
+"""
+
+import hashlib
+import json
+import random
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_WORDS = (
+    "penelitian ini membahas penerapan sistem informasi berbasis web untuk meningkatkan efisiensi "
+    "pengelolaan data pada organisasi metode yang digunakan adalah pendekatan kuantitatif dengan "
+    "pengumpulan data melalui observasi wawancara dan kuesioner hasil pengujian menunjukkan bahwa "
+    "sistem mampu mempercepat proses pelaporan serta mengurangi kesalahan pencatatan secara signifikan"
+).split()
+_ENGLISH = (
+    "this research discusses the application of a web based information system to improve the "
+    "efficiency of data management in organizations using a quantitative approach with observation "
+    "interviews and questionnaires the results show faster reporting and fewer recording errors"
+).split()
+
+_CHAPTER_LINE = re.compile(r'^(BAB|CHAPTER)\s+([IVXLC]+|\d+)\b', re.I)
+_SUBCHAPTER_LINE = re.compile(r'^(\d+\.\d+)(\.\d+)?\s+\S')
+_PARAGRAPH_COUNT = re.compile(r'(\d+)(?:\s*-\s*(\d+))?\s+paragraph', re.I)
+_JSON_MARKER = re.compile(r'(return only valid json|json format|output format|respond (?:only )?(?:with|in) json)', re.I)
+
+
+def _rng_for(seed: int, *parts: str) -> random.Random:
+    """Random stream fixed by the seed and the prompt, so equal prompts get equal answers."""
+    digest = hashlib.sha256("\x00".join((str(seed),) + parts).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _sentence(rng: random.Random, words: List[str] = _WORDS, length: int = 16) -> str:
+    text = " ".join(rng.choice(words) for _ in range(length))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraphs(rng: random.Random, count: int, words: List[str] = _WORDS) -> str:
+    return "\n\n".join(
+        " ".join(_sentence(rng, words) for _ in range(rng.randint(3, 5))) for _ in range(count)
+    )
+
+
+def _paragraph_count(instruction: str, rng: random.Random) -> int:
+    match = _PARAGRAPH_COUNT.search(instruction)
+    if not match:
+        return 1
+    low = int(match.group(1))
+    high = int(match.group(2) or low)
+    return rng.randint(low, max(low, high))
+
+
+def fill_schema(template: Any, rng: random.Random, key: str = "") -> Any:
+    """
+    Replace every leaf of a JSON template with plausible content of the same type.
+
+    String leaves become Indonesian academic paragraphs (as many as the
+    instruction asks for); keyword, reference and English fields get the
+    matching shape. Lists keep at least three items.
+    """
+    name = key.lower()
+    if isinstance(template, dict):
+        return {k: fill_schema(v, rng, k) for k, v in template.items()}
+    if isinstance(template, list):
+        sample = template[0] if template else ""
+        return [fill_schema(sample, rng, key) for _ in range(max(3, len(template)))]
+    if isinstance(template, bool):
+        return template
+    if isinstance(template, (int, float)):
+        return round(rng.uniform(0.75, 0.98), 2) if "confidence" in name or "score" in name else template
+    if template is None:
+        return None
+
+    instruction = str(template)
+    if "keyword" in name:
+        return rng.choice(_ENGLISH if name.endswith("_en") else _WORDS)
+    if "reference" in name or "APA" in instruction:
+        return f"Penulis, A., & Rekan, B. ({rng.randint(2015, 2024)}). {_sentence(rng, length=8)} Jurnal Informatika, {rng.randint(1, 20)}(2), 10-25."
+    if name in ("title", "judul"):
+        return _sentence(rng, length=10).rstrip(".").upper()
+    if name in ("author", "nim", "name", "nama"):
+        return "Mahasiswa Uji Beban" if name != "nim" else str(rng.randint(10 ** 9, 10 ** 10 - 1))
+    if "english" in name or name.endswith("_en"):
+        return _paragraphs(rng, _paragraph_count(instruction, rng), _ENGLISH)
+    if "|" in instruction and len(instruction) < 200:
+        # Enumerated choice such as "chapter|subchapter|..."
+        return instruction.split("|")[0].strip()
+    return _paragraphs(rng, _paragraph_count(instruction, rng))
+
+
+def embedded_schema(text: str) -> Optional[Dict[str, Any]]:
+    """Return the first JSON object embedded in a prompt, preferring one after a 'return JSON' marker."""
+    decoder = json.JSONDecoder()
+    marker = _JSON_MARKER.search(text)
+    starts = [marker.end()] if marker else []
+    starts.append(0)
+    for start in starts:
+        position = text.find("{", start)
+        while position != -1:
+            try:
+                value, _ = decoder.raw_decode(text, position)
+                if isinstance(value, dict) and value:
+                    return value
+            except json.JSONDecodeError:
+                pass
+            position = text.find("{", position + 1)
+    return None
+
+
+def _semantic_parse(user: str, rng: random.Random) -> Dict[str, Any]:
+    text = user.split("\n\n", 1)[1] if user.startswith("Parse this thesis text") and "\n\n" in user else user
+    elements = []
+    for line in (l.strip() for l in text.splitlines()):
+        if not line:
+            continue
+        chapter = _CHAPTER_LINE.match(line)
+        sub = _SUBCHAPTER_LINE.match(line)
+        if chapter:
+            kind, number, title = "chapter", chapter.group(2), line[chapter.end():].strip() or None
+        elif sub:
+            kind = "subsubchapter" if sub.group(2) else "subchapter"
+            number, title = sub.group(1) + (sub.group(2) or ""), line[sub.end() - 1:].strip()
+        elif line.upper().startswith(("DAFTAR PUSTAKA", "REFERENCES")):
+            kind, number, title = "bibliography_entry", None, None
+        else:
+            kind, number, title = "paragraph", None, None
+        elements.append({
+            "type": kind,
+            "text": line,
+            "confidence": round(rng.uniform(0.85, 0.99), 2),
+            "metadata": {"detected_number": number, "detected_title": title, "is_list": False, "list_items": None},
+        })
+    return {"elements": elements, "warnings": [], "overall_confidence": 0.92}
+
+
+_FRONT_MATTER_HINTS = [
+    ("title_page", ("skripsi", "diajukan", "judul")),
+    ("approval_page", ("pengesahan", "persetujuan")),
+    ("originality_statement", ("pernyataan", "keaslian", "orisinalitas")),
+    ("dedication", ("persembahan",)),
+    ("motto", ("motto",)),
+    ("preface", ("kata pengantar",)),
+    ("abstract_id", ("abstrak",)),
+    ("abstract_en", ("abstract",)),
+    ("glossary", ("daftar istilah",)),
+    ("table_of_contents", ("daftar isi",)),
+    ("list_of_tables", ("daftar tabel",)),
+    ("list_of_figures", ("daftar gambar",)),
+]
+
+
+def _classify_front_matter(user: str) -> Dict[str, Any]:
+    blocks = re.split(r'\n---\n', user)
+    classifications = []
+    for block in blocks:
+        lowered = block.lower()
+        category = next((name for name, hints in _FRONT_MATTER_HINTS if any(h in lowered for h in hints)), "unknown")
+        classifications.append({
+            "category": category,
+            "confidence": 0.9 if category != "unknown" else 0.3,
+            "reason": "Matched heading keywords" if category != "unknown" else "No distinctive heading",
+        })
+    return {"classifications": classifications}
+
+
+def _style_intent(user: str) -> Dict[str, Any]:
+    lowered = user.lower()
+    if "heading 1" in lowered or "bab" in lowered:
+        role = "chapter_title"
+    elif "heading" in lowered:
+        role = "subchapter_title"
+    elif "caption" in lowered:
+        role = "caption"
+    else:
+        role = "body_paragraph"
+    return {"semantic_role": role, "confidence": 0.85, "reasoning": "Inferred from style name and outline level",
+            "recommendations": []}
+
+
+def _message(messages: List[Dict[str, Any]], role: str) -> str:
+    parts = [m.get("content") for m in messages if m.get("role") == role]
+    return "\n".join(p if isinstance(p, str) else json.dumps(p) for p in parts if p)
+
+
+def canned_response(request: Dict[str, Any], seed: int = 0) -> Tuple[str, str]:
+    """
+    Build the answer to a chat-completions request.
+
+    Args:
+        request: Decoded request body (model, messages, ...)
+        seed: Fixes the generated text together with the prompt
+
+    Returns:
+        Tuple of (prompt family, response content)
+    """
+    messages = request.get("messages") or []
+    system = _message(messages, "system")
+    user = _message(messages, "user")
+    rng = _rng_for(seed, system, user)
+    lowered_system = system.lower()
+
+    if "semantic text parser" in lowered_system:
+        return "semantic_parse", json.dumps(_semantic_parse(user, rng), ensure_ascii=False)
+    if "front matter classifier" in lowered_system:
+        return "front_matter_classification", json.dumps(_classify_front_matter(user), ensure_ascii=False)
+    if "word style analyzer" in lowered_system:
+        return "style_intent", json.dumps(_style_intent(user), ensure_ascii=False)
+    if user.startswith("Buat abstrak"):
+        return "abstract_id", " ".join(_sentence(rng) for _ in range(7))
+    if user.startswith("Create an abstract"):
+        return "abstract_en", " ".join(_sentence(rng, _ENGLISH) for _ in range(7))
+    if "kata pengantar" in lowered_system or "preface" in lowered_system:
+        return "preface", _paragraphs(rng, 3)
+
+    schema = embedded_schema(user) or (embedded_schema(system) if _JSON_MARKER.search(system) else None)
+    if schema is not None:
+        keys = list(schema)
+        if len(keys) == 1 and re.fullmatch(r'chapter\d', keys[0]):
+            family = keys[0]
+        elif "metadata" in schema or "abstract" in schema:
+            family = "front_matter"
+        elif keys == ["references"]:
+            family = "references"
+        else:
+            family = "structured"
+        return family, json.dumps(fill_schema(schema, rng), ensure_ascii=False)
+
+    return "text", _paragraphs(rng, 2)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+"""
+Load-test the backend against the fake OpenRouter.
+
+Starts the fake server and the backend under uvicorn (unless URLs of running
+instances are given), pushes concurrent /generate requests built from
+synthetic fixtures, and reports throughput, latency percentiles, failures,
+the fake server's per-family counts and the gateway's retry/hedge metrics.
+
+Usage (from backend/):
+    python -m loadtest.driver --requests 40 --concurrency 8
+    python -m loadtest.driver --latency-ms 2000 --tokens-per-second 40 --error-429 0.1 --truncate 0.05
+    python -m loadtest.driver --fail-models openai/gpt-oss-20b:free   # exercise model fallback
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .fake_openrouter import FakeConfig
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(url: str, method: str = "GET", body: Optional[bytes] = None,
+             headers: Optional[Dict[str, str]] = None, timeout: float = 30) -> Tuple[int, bytes]:
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.netloc, timeout=timeout)
+    try:
+        conn.request(method, parsed.path or "/", body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def _get_json(url: str) -> Any:
+    status, data = _request(url)
+    if status != 200:
+        raise RuntimeError(f"GET {url} returned {status}")
+    return json.loads(data)
+
+
+def _multipart(fields: Dict[str, str], files: Dict[str, Tuple[str, bytes]]) -> Tuple[bytes, str]:
+    """Encode form fields and files as multipart/form-data."""
+    boundary = f"----folio{uuid.uuid4().hex}"
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8"))
+    for name, (filename, data) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode("utf-8") + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _wait_ready(url: str, process: Optional[subprocess.Popen], timeout: float = 60) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Process for {url} exited with code {process.returncode}")
+        try:
+            if _request(url, timeout=2)[0] < 500:
+                return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def _spawn(args: List[str], env: Dict[str, str], log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "wb")
+    return subprocess.Popen(args, cwd=str(BACKEND_DIR), env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(fraction * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+class LoadTest:
+    """Fires /generate requests at a backend and records the outcome of each."""
+
+    def __init__(self, app_url: str, template: Path, draft: Path, timeout: float, use_ai: bool = True,
+                 simple_builder: bool = False):
+        self.app_url = app_url.rstrip("/")
+        self.template_bytes = template.read_bytes()
+        self.draft_bytes = draft.read_bytes()
+        self.timeout = timeout
+        self.use_ai = use_ai
+        self.simple_builder = simple_builder
+        self.results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def one(self, index: int) -> None:
+        body, content_type = _multipart(
+            {
+                "judul": f"Uji Beban Sistem Informasi {index}",
+                "penulis": f"Mahasiswa Uji {index}",
+                "nim": f"{1000000000 + index}",
+                "use_ai_analysis": "true" if self.use_ai else "false",
+                "simple_builder": "true" if self.simple_builder else "false",
+                "include_frontmatter": "true",
+            },
+            {
+                "template_file": ("template.docx", self.template_bytes),
+                "content_file": ("draft.txt", self.draft_bytes),
+            },
+        )
+        start = time.perf_counter()
+        try:
+            status, data = _request(f"{self.app_url}/generate", "POST", body,
+                                    {"Content-Type": content_type}, timeout=self.timeout)
+            error = None if status == 200 else data[:200].decode("utf-8", "replace")
+        except OSError as e:
+            status, error = 0, f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.results.append({"index": index, "status": status, "seconds": round(elapsed, 3), "error": error})
+        print(f"  request {index:>4}: {status or 'ERR'} in {elapsed:7.2f}s")
+
+    def run(self, requests: int, concurrency: int) -> Dict[str, Any]:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as executor:
+            list(executor.map(self.one, range(requests)))
+        wall = time.perf_counter() - start
+
+        ok = [r["seconds"] for r in self.results if r["status"] == 200]
+        statuses: Dict[str, int] = {}
+        for result in self.results:
+            statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+        return {
+            "requests": requests,
+            "concurrency": concurrency,
+            "wall_seconds": round(wall, 3),
+            "throughput_per_minute": round(len(ok) / wall * 60, 2) if wall else 0.0,
+            "succeeded": len(ok),
+            "statuses": statuses,
+            "latency_seconds": {
+                "p50": percentile(ok, 0.50),
+                "p90": percentile(ok, 0.90),
+                "p95": percentile(ok, 0.95),
+                "p99": percentile(ok, 0.99),
+                "max": max(ok) if ok else 0.0,
+            },
+            "errors": [r for r in self.results if r["status"] != 200][:20],
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--paragraphs", type=int, default=300, help="Size of the synthetic template and draft")
+    parser.add_argument("--app-url", default=None, help="Use a running backend instead of starting one")
+    parser.add_argument("--fake-url", default=None, help="Use a running fake OpenRouter (base URL without /api/v1)")
+    parser.add_argument("--job-workers", type=int, default=None, help="JOB_WORKERS for the started backend")
+    parser.add_argument("--no-ai", action="store_true", help="Send use_ai_analysis=false (no LLM traffic)")
+    parser.add_argument("--simple-builder", action="store_true")
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds allowed per /generate request")
+    parser.add_argument("--output", default=None, help="Write the report JSON here")
+    defaults = FakeConfig()
+    for name, kind in FakeConfig.FIELDS.items():
+        default = getattr(defaults, name)
+        if kind is list:
+            parser.add_argument(f"--{name.replace('_', '-')}", default=",".join(default), help="Comma-separated model names")
+        else:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=kind, default=default)
+    args = parser.parse_args(argv)
+
+    config = FakeConfig()
+    config.update({name: getattr(args, name) for name in FakeConfig.FIELDS})
+
+    workdir = Path(tempfile.mkdtemp(prefix="folio-load-"))
+    processes: List[subprocess.Popen] = []
+    try:
+        sys.path.insert(0, str(BACKEND_DIR))
+        from benchmarks.synthetic import make_draft, make_template
+        template = make_template(workdir / "template.docx", args.paragraphs)
+        draft = make_draft(workdir / "draft.txt", args.paragraphs)
+
+        fake_url = args.fake_url
+        if fake_url is None:
+            port = _free_port()
+            fake_url = f"http://127.0.0.1:{port}"
+            processes.append(_spawn(
+                [sys.executable, "-m", "loadtest.fake_openrouter", "--port", str(port)],
+                config.to_env(), workdir / "fake_openrouter.log",
+            ))
+            _wait_ready(f"{fake_url}/__stats", processes[-1])
+        else:
+            # Apply this run's settings to the running fake and clear its counters
+            _request(f"{fake_url}/__config", "POST", json.dumps({**config.to_dict(), "reset": True}).encode("utf-8"),
+                     {"Content-Type": "application/json"})
+
+        app_url = args.app_url
+        if app_url is None:
+            port = _free_port()
+            app_url = f"http://127.0.0.1:{port}"
+            env = {
+                "OPENROUTER_BASE_URL": f"{fake_url}/api/v1",
+                "OPENROUTER_API_KEY": "fake-openrouter-key",
+                "LLM_CACHE_DISABLED": "true",
+            }
+            if args.job_workers:
+                env["JOB_WORKERS"] = str(args.job_workers)
+            processes.append(_spawn(
+                [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+                 "--log-level", "warning"],
+                env, workdir / "backend.log",
+            ))
+            _wait_ready(f"{app_url}/test-connection", processes[-1], timeout=120)
+
+        print(f"[INFO] {args.requests} requests, concurrency {args.concurrency}, backend {app_url}, LLM {fake_url}")
+        load = LoadTest(app_url, template, draft, args.timeout, use_ai=not args.no_ai,
+                        simple_builder=args.simple_builder)
+        report = load.run(args.requests, args.concurrency)
+        report["fake_openrouter"] = _get_json(f"{fake_url}/__stats")
+        try:
+            report["llm_gateway"] = _get_json(f"{app_url}/ai-analysis-status").get("llm_gateway")
+        except (OSError, RuntimeError, ValueError):
+            report["llm_gateway"] = None
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if processes:
+            print(f"[INFO] Server logs kept in {workdir}")
+
+    latency = report["latency_seconds"]
+    totals = report["fake_openrouter"]["totals"]
+    print(f"[INFO] {report['succeeded']}/{report['requests']} succeeded in {report['wall_seconds']}s "
+          f"({report['throughput_per_minute']} theses/min); statuses {report['statuses']}")
+    print(f"       latency p50 {latency['p50']}s  p90 {latency['p90']}s  p99 {latency['p99']}s  max {latency['max']}s")
+    print(f"       LLM requests {totals.get('requests', 0)}: {totals.get('rate_limited', 0)} rate limited, "
+          f"{totals.get('server_errors', 0)} server errors, {totals.get('truncated', 0)} truncated")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[INFO] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+"""
+Fake OpenRouter
+Local stand-in for the OpenRouter chat-completions API, for deterministic
+offline load tests. Answers come from loadtest.canned; latency, token rate
+and failures (429, 5xx, truncated JSON, always-failing or slow models) are
+configurable at startup and at runtime through POST /__config.
+
+Usage (from backend/):
+    python -m loadtest.fake_openrouter --port 8900 --latency-ms 800 --tokens-per-second 80 \\
+        --error-429 0.05 --error-5xx 0.02 --truncate 0.02
+    OPENROUTER_BASE_URL=http://127.0.0.1:8900/api/v1 uvicorn app:app
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .canned import canned_response
+
+# Characters per streamed token; close enough to real tokenizers for pacing
+CHARS_PER_TOKEN = 4
+
+
+class FakeConfig:
+    """Latency, throughput and fault-injection settings of the fake server."""
+
+    FIELDS = {
+        "latency_ms": float,         # Time to first token
+        "jitter": float,             # Latency varies by +/- this fraction
+        "tokens_per_second": float,  # Generation speed after the first token (0 = instant)
+        "error_429": float,          # Probability of a rate-limit response
+        "error_5xx": float,          # Probability of a 500/502/503 response
+        "truncate": float,           # Probability the answer is cut off mid-JSON
+        "seed": int,                 # Fixes answers and injected faults
+        "fail_models": list,         # Models that always answer 503
+        "slow_models": list,         # Models whose latency is multiplied by slow_factor
+        "slow_factor": float,
+    }
+
+    def __init__(self, latency_ms: float = 500.0, jitter: float = 0.3, tokens_per_second: float = 0.0,
+                 error_429: float = 0.0, error_5xx: float = 0.0, truncate: float = 0.0, seed: int = 0,
+                 fail_models: Optional[List[str]] = None, slow_models: Optional[List[str]] = None,
+                 slow_factor: float = 5.0):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.truncate = truncate
+        self.seed = seed
+        self.fail_models = list(fail_models or [])
+        self.slow_models = list(slow_models or [])
+        self.slow_factor = slow_factor
+
+    @classmethod
+    def from_env(cls) -> "FakeConfig":
+        """Read FAKE_OPENROUTER_<FIELD> variables (lists are comma-separated)."""
+        config = cls()
+        config.update({
+            name: os.environ[f"FAKE_OPENROUTER_{name.upper()}"]
+            for name in cls.FIELDS if f"FAKE_OPENROUTER_{name.upper()}" in os.environ
+        })
+        return config
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for name, value in values.items():
+            kind = self.FIELDS.get(name)
+            if kind is None:
+                raise ValueError(f"Unknown setting: {name}")
+            if kind is list:
+                value = [v.strip() for v in value.split(",") if v.strip()] if isinstance(value, str) else list(value)
+            else:
+                value = kind(value)
+            setattr(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def to_env(self) -> Dict[str, str]:
+        """Environment that reproduces this config in another process."""
+        return {
+            f"FAKE_OPENROUTER_{name.upper()}": ",".join(value) if isinstance(value, list) else str(value)
+            for name, value in self.to_dict().items()
+        }
+
+
+class FaultPlan:
+    """What happens to one request: an error status, a truncation point, and its latency."""
+
+    def __init__(self, status: int = 200, truncate_at: Optional[float] = None, latency: float = 0.0):
+        self.status = status
+        self.truncate_at = truncate_at
+        self.latency = latency
+
+
+class FakeOpenRouter:
+    """Request handling and accounting, independent of the web framework."""
+
+    def __init__(self, config: Optional[FakeConfig] = None):
+        self.config = config or FakeConfig()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.started_at = time.time()
+
+    def plan(self, model: str) -> FaultPlan:
+        """Draw the outcome of the next request to `model`."""
+        config = self.config
+        with self._lock:
+            draw = self._rng.random()
+            jitter = 1 + config.jitter * (self._rng.random() * 2 - 1)
+            cut = self._rng.uniform(0.2, 0.8)
+            server_error = self._rng.choice((500, 502, 503))
+        latency = max(0.0, config.latency_ms / 1000 * jitter)
+        if model in config.slow_models:
+            latency *= config.slow_factor
+
+        if model in config.fail_models:
+            return FaultPlan(503, latency=latency)
+        if draw < config.error_429:
+            return FaultPlan(429, latency=latency * 0.1)
+        draw -= config.error_429
+        if draw < config.error_5xx:
+            return FaultPlan(server_error, latency=latency)
+        draw -= config.error_5xx
+        if draw < config.truncate:
+            return FaultPlan(200, truncate_at=cut, latency=latency)
+        return FaultPlan(latency=latency)
+
+    def answer(self, request: Dict[str, Any]) -> Tuple[str, str]:
+        return canned_response(request, seed=self.config.seed)
+
+    def record(self, family: str, status: int, truncated: bool, completion_tokens: int) -> None:
+        with self._lock:
+            counts = self._stats.setdefault(family, {
+                "requests": 0, "ok": 0, "rate_limited": 0, "server_errors": 0, "truncated": 0,
+                "completion_tokens": 0,
+            })
+            counts["requests"] += 1
+            if status == 429:
+                counts["rate_limited"] += 1
+            elif status >= 500:
+                counts["server_errors"] += 1
+            else:
+                counts["ok"] += 1
+                counts["truncated"] += int(truncated)
+                counts["completion_tokens"] += completion_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            families = {name: dict(counts) for name, counts in self._stats.items()}
+        totals: Dict[str, int] = {}
+        for counts in families.values():
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+        return {"uptime_seconds": round(time.time() - self.started_at, 1), "totals": totals,
+                "families": families, "config": self.config.to_dict()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._rng = random.Random(self.config.seed)
+
+
+def _tokens(text: str) -> List[str]:
+    return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+
+def _error_body(status: int) -> Dict[str, Any]:
+    message = "Rate limit exceeded: free-models-per-min" if status == 429 else "Upstream provider error"
+    return {"error": {"message": message, "code": status}}
+
+
+def create_app(config: Optional[FakeConfig] = None) -> FastAPI:
+    """Build the fake OpenRouter application."""
+    fake = FakeOpenRouter(config or FakeConfig.from_env())
+    app = FastAPI(title="Fake OpenRouter")
+    app.state.fake = fake
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake/model")
+        family, content = fake.answer(body)
+        plan = fake.plan(model)
+
+        if plan.status != 200:
+            await asyncio.sleep(plan.latency)
+            fake.record(family, plan.status, False, 0)
+            headers = {"Retry-After": "1"} if plan.status == 429 else {}
+            return JSONResponse(_error_body(plan.status), status_code=plan.status, headers=headers)
+
+        if plan.truncate_at is not None:
+            content = content[:int(len(content) * plan.truncate_at)]
+        tokens = _tokens(content)
+        rate = fake.config.tokens_per_second
+        completion_id = f"gen-{uuid.uuid4().hex[:24]}"
+        usage = {
+            "prompt_tokens": sum(len(str(m.get("content", ""))) for m in body.get("messages") or []) // CHARS_PER_TOKEN,
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        finish_reason = "length" if plan.truncate_at is not None else "stop"
+        fake.record(family, 200, plan.truncate_at is not None, len(tokens))
+
+        if not body.get("stream"):
+            await asyncio.sleep(plan.latency + (len(tokens) / rate if rate > 0 else 0))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": finish_reason,
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": usage,
+            }
+
+        async def events():
+            await asyncio.sleep(plan.latency)
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            # Send several tokens per event so pacing stays accurate at high rates
+            step = max(1, int(rate / 20)) if rate > 0 else max(1, len(tokens) // 20)
+            for i in range(0, len(tokens), step):
+                delta = "".join(tokens[i:i + step])
+                chunk = {**base, "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                if rate > 0:
+                    await asyncio.sleep(step / rate)
+            final = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}], "usage": usage}
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/api/v1/models")
+    async def models():
+        return {"data": [{"id": "openai/gpt-oss-20b:free"}, {"id": "fake/model"}]}
+
+    @app.get("/__stats")
+    async def stats():
+        return fake.stats()
+
+    @app.post("/__config")
+    async def update_config(request: Request):
+        """Change settings at runtime; pass {"reset": true} to clear the counters."""
+        values = await request.json()
+        reset = values.pop("reset", False)
+        try:
+            fake.config.update(values)
+        except (ValueError, TypeError) as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        if reset:
+            fake.reset()
+        return fake.config.to_dict()
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    defaults = FakeConfig.from_env()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for name, kind in FakeConfig.FIELDS.items():
+        default = getattr(defaults, name)
+        if kind is list:
+            parser.add_argument(f"--{name.replace('_', '-')}", default=",".join(default),
+                                help="Comma-separated model names")
+        else:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=kind, default=default)
+    args = parser.parse_args(argv)
+
+    config = FakeConfig()
+    config.update({name: getattr(args, name) for name in FakeConfig.FIELDS})
+    print(f"[INFO] Fake OpenRouter on http://{args.host}:{args.port}/api/v1 with {config.to_dict()}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Output Manifest
+Index of finished builds: job ID and output filename map to the stored file's
+path, size, SHA-256 and creation time. Written once when a build completes,
+so downloads resolve with a single indexed lookup instead of scanning
+storage/outputs.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+_COLUMNS = "job_id, filename, path, size, sha256, created_at, mtime_ns"
+
+
+class OutputRecord:
+    """One finished output as recorded in the manifest."""
+
+    def __init__(self, job_id: str, filename: str, path: str, size: int, sha256: str,
+                 created_at: float, mtime_ns: int):
+        self.job_id = job_id
+        self.filename = filename
+        self.path = Path(path)
+        self.size = size
+        self.sha256 = sha256
+        self.created_at = created_at
+        self.mtime_ns = mtime_ns
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256}"'
+
+    def current_stat(self) -> Optional[os.stat_result]:
+        """
+        Stat the output, or None if it was removed or rewritten since it was recorded.
+
+        A rebuild under the same name releases the old alias first, so a
+        different size or mtime means the record no longer describes the file.
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        if stat.st_size != self.size or stat.st_mtime_ns != self.mtime_ns:
+            return None
+        return stat
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "size": self.size,
+            "sha256": self.sha256,
+            "created_at": self.created_at,
+        }
+
+
+class OutputManifest:
+    """
+    Persistent SQLite manifest of generated outputs.
+
+    Lookups by job ID use the primary key and lookups by filename use an
+    index, so resolving a download costs the same however many outputs exist.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outputs ("
+                " job_id TEXT PRIMARY KEY,"
+                " filename TEXT NOT NULL,"
+                " path TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " sha256 TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " mtime_ns INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS outputs_filename ON outputs (filename, created_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, job_id: str, output_path: Union[str, Path], sha256: str) -> OutputRecord:
+        """
+        Record a finished output.
+
+        Args:
+            job_id: Job that produced the output
+            output_path: Final path of the output (an alias in storage/outputs)
+            sha256: Digest returned by the blob store
+
+        Returns:
+            The stored OutputRecord
+        """
+        path = Path(output_path)
+        stat = path.stat()
+        record = OutputRecord(job_id, path.name, str(path), stat.st_size, sha256, time.time(), stat.st_mtime_ns)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO outputs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record.job_id, record.filename, str(record.path), record.size, record.sha256,
+                 record.created_at, record.mtime_ns),
+            )
+            conn.commit()
+        return record
+
+    def by_job(self, job_id: str) -> Optional[OutputRecord]:
+        """Return the output of a job, or None if unknown or no longer on disk."""
+        return self._fetch(f"SELECT {_COLUMNS} FROM outputs WHERE job_id = ?", (job_id,))
+
+    def by_filename(self, filename: str) -> Optional[OutputRecord]:
+        """Return the most recent output with this filename, or None."""
+        return self._fetch(
+            f"SELECT {_COLUMNS} FROM outputs WHERE filename = ? ORDER BY created_at DESC LIMIT 1", (filename,)
+        )
+
+    def _fetch(self, query: str, params: tuple) -> Optional[OutputRecord]:
+        with self._lock:
+            row = self._connect().execute(query, params).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        record = OutputRecord(*row)
+        if record.current_stat() is None:
+            # Evicted or rebuilt under the same name since it was recorded
+            self.stale += 1
+            self.forget(record.job_id)
+            return None
+        self.hits += 1
+        return record
+
+    def forget(self, job_id: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM outputs WHERE job_id = ?", (job_id,))
+            conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM outputs").fetchone()
+        return {"outputs": count, "hits": self.hits, "misses": self.misses, "stale": self.stale}
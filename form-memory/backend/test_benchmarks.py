@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Test the offline benchmark suite's fixtures and baseline comparison."""
+import pytest
+from docx import Document
+
+from benchmarks.run import CASES, build_fixtures, compare, run_isolated
+from benchmarks.synthetic import make_draft, make_output, make_template
+
+
+def test_synthetic_fixtures(tmp_path):
+    """Fixtures scale with the requested size and are deterministic."""
+    small = len(Document(str(make_template(tmp_path / "small.docx", 100))).paragraphs)
+    large = len(Document(str(make_template(tmp_path / "large.docx", 1000))).paragraphs)
+    assert 80 <= small <= 200
+    assert 900 <= large <= 1200
+
+    output = Document(str(make_output(tmp_path / "output.docx", 100)))
+    assert any(p.text.startswith("BAB I") for p in output.paragraphs)
+
+    first = make_draft(tmp_path / "a.txt", 100).read_text(encoding="utf-8")
+    second = make_draft(tmp_path / "b.txt", 100).read_text(encoding="utf-8")
+    assert first == second
+    assert "BAB V KESIMPULAN DAN SARAN" in first
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_case_runs(case, tmp_path):
+    """Every case completes on the smallest fixtures without an error result."""
+    if case == "preview":
+        pytest.importorskip("mammoth")
+    fixtures = build_fixtures(tmp_path / "fixtures", [100])[100]
+    result = run_isolated(case, fixtures, repeat=1, scratch=tmp_path / "scratch", timeout=600)
+    assert "error" not in result, result["error"]
+    if case == "complete_thesis_builder":
+        assert result["llm_calls"] > 0
+
+
+def test_baseline_comparison():
+    """Cases slower than the threshold are flagged; errored or new cases are skipped."""
+    baseline = {"cases": {
+        "preview[100]": {"min_seconds": 1.0, "peak_rss_mb": 100.0},
+        "template_analyzer[100]": {"min_seconds": 2.0, "peak_rss_mb": 100.0},
+    }}
+    results = {"cases": {
+        "preview[100]": {"min_seconds": 1.5, "peak_rss_mb": 120.0},
+        "template_analyzer[100]": {"min_seconds": 1.0, "peak_rss_mb": 90.0},
+        "fidelity_validator[100]": {"min_seconds": 3.0, "peak_rss_mb": 50.0},
+    }}
+    rows = {row["case"]: row for row in compare(results, baseline, threshold=1.25)}
+    assert set(rows) == {"preview[100]", "template_analyzer[100]"}
+    assert rows["preview[100]"]["regression"]
+    assert rows["preview[100]"]["rss_ratio"] == 1.2
+    assert not rows["template_analyzer[100]"]["regression"]
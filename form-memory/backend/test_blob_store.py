@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""Test the content-addressed blob store: dedup, aliases and garbage collection."""
+import hashlib
+import os
+import time
+
+from blob_store import BlobStore
+
+
+def _stage(store, data):
+    path = store.staging_path()
+    path.write_bytes(data)
+    return path, hashlib.sha256(data).hexdigest()
+
+
+def test_blob_store(tmp_path):
+    """Same content is written once, names are links, and GC respects references and quota."""
+    uploads, references, outputs = tmp_path / "uploads", tmp_path / "references", tmp_path / "outputs"
+    store = BlobStore(tmp_path / "blobs", evictable=(uploads, outputs), quota_bytes=100_000, grace_seconds=60)
+
+    template = b"template" * 1000
+    for name in ("a.docx", "b.docx"):
+        staged, digest = _stage(store, template)
+        store.commit(staged, digest)
+        store.link(digest, references / name)
+    store.link(digest, references / "a.docx")
+    assert store.writes == 1 and store.dedup_hits == 1
+    assert os.path.samefile(references / "a.docx", references / "b.docx")
+    assert os.stat(store.blob_path(digest)).st_nlink == 3
+    assert not list(store.staging_dir.iterdir())
+
+    # Outputs written in place become aliases; release() keeps rewrites off the blob
+    output = outputs / "Skripsi.docx"
+    output.parent.mkdir()
+    output.write_bytes(b"output-v1" * 1000)
+    first = store.put_file(output)
+    store.release(output)
+    output.write_bytes(b"output-v2" * 1000)
+    second = store.put_file(output)
+    assert store.blob_path(first).read_bytes() == b"output-v1" * 1000
+    assert os.path.samefile(output, store.blob_path(second))
+
+    staged, upload = _stage(store, b"upload" * 1000)
+    store.link(store.commit(staged, upload).name, uploads / "content.txt")
+
+    # Within the grace period nothing goes; afterwards the orphaned v1 output is collected
+    assert store.collect()["removed"] == 0
+    later = time.time() + 120
+    result = store.collect(now=later)
+    assert result["removed"] == 1 and not store.contains(first)
+
+    # Over quota: evictable aliases go oldest first, references stay
+    store.quota_bytes = 9_000
+    result = store.collect(now=later)
+    assert result["evicted"] == 2 and not output.exists() and not (uploads / "content.txt").exists()
+    assert store.contains(digest) and (references / "a.docx").read_bytes() == template
+    assert store.stats()["blobs"] == 1
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_blob_store(Path(tmp))
+    print("[OK] Blob store test passed")
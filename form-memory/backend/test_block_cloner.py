@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Test bulk clone-and-insert in the template executor."""
+from docx import Document
+
+from engine.executor import TemplateExecutor
+from engine.executor.block_cloner import BlockCloner
+from engine.executor.text_replacer import TextReplacer
+
+
+def test_block_cloner(tmp_path):
+    """Clones are spliced in one block, keep formatting and are seen by anchor discovery."""
+    doc = Document()
+    doc.add_paragraph("DAFTAR PUSTAKA", style="Heading 1")
+    doc.add_paragraph().add_run("[referensi]").bold = True
+    doc.add_paragraph("LAMPIRAN", style="Heading 1")
+    path = tmp_path / "template.docx"
+    doc.save(str(path))
+
+    rules = {
+        "references": {"anchor_type": "text_contains", "text": "[referensi]"},
+        "appendix": {"anchor_type": "text_contains", "text": "LAMPIRAN"},
+    }
+    executor = TemplateExecutor(str(path), rules)
+    items = [f"Author {i}. Title {i}." for i in range(300)]
+    executor._inject_section("references", items)
+    executor._inject_section("appendix", "LAMPIRAN A")
+
+    texts = [p.text for p in executor.doc.paragraphs]
+    assert texts == ["DAFTAR PUSTAKA"] + items + ["LAMPIRAN A"]
+    assert all(p.runs[0].bold for p in executor.doc.paragraphs[1:301])
+    assert [p.text for p in executor.anchor_discovery.paragraphs] == texts
+
+    # Handles are elements, so they stay valid when paragraphs are inserted before them
+    cloner = BlockCloner(executor.doc)
+    handles = cloner.clone_and_insert(0, ["x", "y"], stamp=TextReplacer.replace_paragraph_text)
+    executor.clone_block(0, 3, 0)
+    assert [h.getparent() is executor.doc.element.body for h in handles] == [True, True]
+    assert [p.text for p in executor.doc.paragraphs][4:6] == ["x", "y"]
+    assert executor.clone_block(0, 2, 5) == [6, 7]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_block_cloner(Path(tmp))
+    print("[OK] Block cloner test passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Test compiled template artifacts against live template analysis."""
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Length
+
+from engine.analyzer.compiled_template import ANALYZER_VERSION, CompiledTemplateStore
+from engine.analyzer.complete_thesis_builder import CompleteThesisBuilder
+from engine.analyzer.intelligent_template_adapter import IntelligentTemplateAdapter
+from engine.analyzer.template_cache import TEMPLATE_STORE
+
+TEMPLATE = Path(__file__).resolve().parent.parent / "storage" / "references" / "Template-skripsi-final-versi2020.docx"
+
+
+def test_compiled_template(tmp_path):
+    """Compiled artifacts persist by hash/version and reproduce the adaptive analysis."""
+    store = CompiledTemplateStore(tmp_path)
+    compiled = store.get(TEMPLATE)
+    artifact = store.artifact_path(compiled.template_hash)
+    assert artifact.exists() and artifact.name.endswith(f".v{ANALYZER_VERSION}.json")
+
+    # A fresh process (store) loads the artifact instead of re-analyzing
+    reloaded = CompiledTemplateStore(tmp_path)
+    loaded = reloaded.get(TEMPLATE)
+    assert reloaded.stats()["compiles"] == 0 and reloaded.stats()["disk_loads"] == 1
+
+    live = IntelligentTemplateAdapter(str(TEMPLATE))
+    structure = live.analyze_template()
+    adapter = loaded.adapter()
+    assert adapter._document_zones == live._document_zones
+    assert adapter.structure.chapter_patterns == structure.chapter_patterns
+    assert adapter.structure.subsection_patterns == structure.subsection_patterns
+    for chapter_num in range(1, 7):
+        assert adapter.get_content_insertion_points(chapter_num) == live.get_content_insertion_points(chapter_num)
+
+    styles_info, font_info = loaded.style_info()
+    if "Isi Paragraf" in styles_info:
+        indent = styles_info["Isi Paragraf"]["first_line_indent"]
+        assert indent is None or isinstance(indent, Length)
+    assert loaded.analyzer().get_summary() == compiled.summary
+
+
+def test_compiled_instruction_markers(tmp_path):
+    """Builds remove the compiled instruction paragraphs instead of rescanning, re-checking rewritten text."""
+    compiled = CompiledTemplateStore(tmp_path).get(TEMPLATE)
+    assert compiled.instruction_markers
+    builder = CompleteThesisBuilder.__new__(CompleteThesisBuilder)
+    builder.config = CompleteThesisBuilder.UNIVERSITY_CONFIGS['indonesian_standard']
+    builder.compiled_template = None
+
+    scanned = TEMPLATE_STORE.copy_document(TEMPLATE)
+    builder._locate_instructions(scanned)
+    assert builder._instruction_marks is None
+    builder._remove_instructional_text(scanned, builder.config)
+
+    builder.compiled_template = compiled
+    marked = TEMPLATE_STORE.copy_document(TEMPLATE)
+    builder._locate_instructions(marked)
+    assert builder._instruction_marks[0] is marked
+    # An earlier phase turned one instruction into ordinary text: it is kept
+    rewritten = next(para for para, kind in builder._instruction_marks[1] if kind == 'instruction')
+    rewritten.text = "Penelitian ini membahas sistem informasi akademik."
+    builder._remove_instructional_text(marked, builder.config)
+
+    kept = [p.text for p in marked.paragraphs]
+    kept.remove(rewritten.text)
+    assert kept == [p.text for p in scanned.paragraphs]
+
+    # Markers compiled for another language are not used
+    builder.config = dict(builder.config, language='en')
+    builder._locate_instructions(TEMPLATE_STORE.copy_document(TEMPLATE))
+    assert builder._instruction_marks is None
+
+
+def test_compiled_template_store_is_bounded(tmp_path):
+    """Only the most recently used artifacts stay in memory; compile locks are not kept."""
+    templates = []
+    for i in range(3):
+        doc = Document()
+        doc.add_paragraph(f"BAB {i + 1} PENDAHULUAN", style="Heading 1")
+        doc.add_paragraph("Isi bab.")
+        templates.append(tmp_path / f"template{i}.docx")
+        doc.save(str(templates[-1]))
+
+    store = CompiledTemplateStore(tmp_path / "compiled", max_entries=2)
+    for template in templates:
+        store.get(template)
+    store.get(templates[2])
+    stats = store.stats()
+    assert stats["in_memory"] == 2 and stats["evictions"] == 1 and stats["compiles"] == 3
+    assert store._compile_locks == {}
+
+    # The evicted artifact is reloaded from disk, not recompiled
+    store.get(templates[0])
+    assert store.stats()["disk_loads"] == 1 and store.stats()["compiles"] == 3
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_compiled_template(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_compiled_instruction_markers(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_compiled_template_store_is_bounded(Path(tmp))
+    print("[OK] Compiled template test passed")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Test that content is read once and builders do no I/O on construction."""
+from concurrent.futures import ThreadPoolExecutor
+
+from docx import Document
+
+from engine.analyzer.ai_enhanced_extractor import AIEnhancedContentExtractor
+from engine.analyzer.complete_thesis_builder import CompleteThesisBuilder
+from engine.analyzer.content_source import ContentSource
+
+
+def test_content_source(tmp_path, monkeypatch):
+    """Every view is lazy and computed at most once, including the AI analysis."""
+    # Nothing is touched on construction, not even a missing file
+    builder = CompleteThesisBuilder(str(tmp_path / "missing.docx"), str(tmp_path / "missing.txt"),
+                                    str(tmp_path / "out.docx"), use_ai=True, api_key="test-key")
+    assert builder.content.reads == 0 and builder.compiled_template is None
+
+    doc = Document()
+    doc.add_heading("BAB I PENDAHULUAN", 1)
+    doc.add_paragraph("Latar belakang penelitian.")
+    doc.add_table(rows=1, cols=2).cell(0, 0).text = "sel"
+    path = tmp_path / "content.docx"
+    doc.save(str(path))
+
+    generated = []
+
+    def fake_generate(self, raw_text):
+        generated.append(raw_text)
+        self.analyzed_data = {"chapter1": {"latar_belakang": raw_text}}
+        return self.analyzed_data
+
+    monkeypatch.setattr(AIEnhancedContentExtractor, "_generate_comprehensive_thesis_content", fake_generate)
+
+    source = ContentSource(str(path), use_ai=True, api_key="test-key")
+    assert source.reads == 0
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        analyses = list(pool.map(lambda _: source.analysis, range(4)))
+    assert all(a is analyses[0] for a in analyses) and len(generated) == 1
+    assert source.analysis.analyzed_data["chapter1"]["latar_belakang"] == source.raw_text
+
+    assert source.extractor.get_sections()[0]["title"] == "BAB I PENDAHULUAN"
+    assert source.extractor.get_tables()[0]["content"] == [["sel", ""]]
+    assert source.ai_extractor._content_extractor is source.extractor
+    assert source.reads == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
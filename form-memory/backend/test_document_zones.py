@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Test the document zone map labels and its validity across insertions."""
+from docx import Document
+
+from engine.analyzer.document_zones import (
+    BACK_MATTER, FRONT_MATTER, MAIN_CONTENT, TOC_ENTRY, Zone, document_zones, invalidate_document_zones
+)
+from engine.analyzer.paragraph_index import paragraph_index
+
+
+# Short "BAB ..." lines are taken for TOC entries, so the heading carries its full title
+CHAPTER_ONE = ("BAB I\nPENDAHULUAN: RANCANG BANGUN SISTEM INFORMASI AKADEMIK BERBASIS WEB "
+               "PADA PROGRAM STUDI TEKNIK INFORMATIKA")
+
+
+def _thesis(chapter_one=CHAPTER_ONE, filler=6):
+    doc = Document()
+    doc.add_paragraph("KATA PENGANTAR")
+    doc.add_heading("DAFTAR ISI", 1)
+    doc.add_paragraph("BAB I PENDAHULUAN\t1")
+    doc.add_paragraph("1.1 Latar Belakang\t1")
+    for n in range(filler):
+        doc.add_paragraph(f"Pengantar bagian {n} selesai.")
+    doc.add_heading(chapter_one, 1)
+    doc.add_paragraph("Isi bab satu")
+    doc.add_heading("BAB II\nTINJAUAN PUSTAKA", 1)
+    doc.add_paragraph("Isi bab dua")
+    doc.add_heading("DAFTAR PUSTAKA", 1)
+    doc.add_paragraph("Author (2020)")
+    return doc
+
+
+def test_document_zones():
+    """Every paragraph gets a zone; inserted paragraphs inherit it and the start tracks shifts."""
+    doc = _thesis()
+    paragraphs = paragraph_index(doc)
+    zones = document_zones(doc)
+    assert document_zones(doc) is zones
+
+    # The BAB I heading itself is found, past the TOC entry naming it
+    assert zones.main_content_start == 10
+    assert paragraphs[10].text == CHAPTER_ONE
+    assert zones.zone_at(0) == Zone(FRONT_MATTER)
+    assert zones.zone_at(2) == Zone(TOC_ENTRY)
+    assert zones.zone_at(9) == Zone(FRONT_MATTER)
+    assert zones.zone_at(11) == Zone(MAIN_CONTENT, 1)
+    assert zones.zone_at(13) == Zone(MAIN_CONTENT, 2)
+    assert zones.zone_at(15) == Zone(BACK_MATTER)
+
+    # Insert before the start and inside chapter 2
+    paragraphs.insert_after(paragraphs[0], "Kata sambutan")
+    added = paragraphs.insert_after(paragraphs[14], "Isi tambahan bab dua")
+    assert zones.main_content_start == 11
+    assert zones.zone_of(added) == Zone(MAIN_CONTENT, 2)
+    assert zones.zone_at(1) == Zone(FRONT_MATTER)
+    assert zones.zone_at(17) == Zone(BACK_MATTER)
+
+    invalidate_document_zones(doc)
+    assert document_zones(doc) is not zones
+
+
+def test_estimated_start():
+    """Without a qualifying BAB I heading the start is estimated 50 past the last front matter list."""
+    zones = document_zones(_thesis("BAB I\nPENDAHULUAN", filler=48))
+    assert zones.main_content_start == 51
+    assert zones.zone_at(52) == Zone(MAIN_CONTENT, 1)
+
+
+if __name__ == "__main__":
+    test_document_zones()
+    test_estimated_start()
+    print("[OK] Document zones test passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Test that the streaming DOCX scanner agrees with python-docx."""
+import zipfile
+from collections import Counter
+
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Cm
+
+from docx_inspector import detect_style_usage, extract_docx_styles
+from docx_scanner import DocxScanError, read_margins, scan_docx
+
+BODY = ("Penelitian ini membahas penerapan sistem informasi akademik pada perguruan tinggi "
+        "dengan pendekatan kualitatif.")
+
+
+def _make_thesis(path):
+    doc = Document()
+    doc.styles.add_style("Isi Paragraf", WD_STYLE_TYPE.PARAGRAPH)
+    doc.styles.add_style("JUDUL BAB", WD_STYLE_TYPE.PARAGRAPH)
+    doc.sections[0].left_margin = Cm(4)
+
+    doc.add_paragraph("HALAMAN JUDUL", style="Title")
+    doc.add_paragraph("BAB I PENDAHULUAN", style="JUDUL BAB")
+    for _ in range(3):
+        doc.add_paragraph(BODY, style="Isi Paragraf")
+    doc.add_paragraph(BODY)
+    # Table paragraphs are not body paragraphs, even when they look like chapters
+    doc.add_table(rows=1, cols=1).cell(0, 0).paragraphs[0].text = "BAB 9 TABEL"
+    doc.add_paragraph("")
+
+    # A second section with other margins; the first section's are reported
+    doc.add_section(WD_SECTION.NEW_PAGE).left_margin = Cm(2)
+    doc.add_paragraph("BAB II TINJAUAN PUSTAKA", style="Heading 1")
+    doc.add_paragraph(BODY.upper(), style="Isi Paragraf")
+    doc.save(str(path))
+    return path
+
+
+def test_scan_matches_python_docx(tmp_path):
+    path = _make_thesis(tmp_path / "thesis.docx")
+    doc = Document(str(path))
+    scan = scan_docx(path)
+
+    assert scan["chapter_style"] == "Heading 1"
+    assert scan["body_style"] == "Isi Paragraf"
+    assert detect_style_usage(path) == {"chapter_style": "Heading 1", "body_style": "Isi Paragraf"}
+
+    stats = scan["paragraph_stats"]
+    assert stats["paragraphs"] == len(doc.paragraphs)
+    assert stats["empty_paragraphs"] == sum(1 for p in doc.paragraphs if not p.text.strip())
+    assert stats["tables"] == 1 and stats["sections"] == 2
+    assert stats["styles_used"] == dict(Counter(p.style.name for p in doc.paragraphs))
+
+    assert scan["margins"]["left"] == str(Cm(4).twips)
+    assert read_margins(path) == scan["margins"]
+    assert scan["styles"]["Heading1"]["based_on"] == "Normal"
+
+    # Only the leading paragraphs are sampled for the style guesses
+    assert scan_docx(path, sample_paragraphs=4)["chapter_style"] == "JUDUL BAB"
+
+
+def test_extract_docx_styles(tmp_path):
+    path = _make_thesis(tmp_path / "thesis.docx")
+    extracted = extract_docx_styles(path)
+    assert extracted["margins"] == scan_docx(path)["margins"]
+    assert "IsiParagraf" in extracted["styles"]
+
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(b"not a zip")
+    assert "error" in extract_docx_styles(broken)["margins"]
+
+    incomplete = tmp_path / "incomplete.docx"
+    with zipfile.ZipFile(incomplete, "w") as archive:
+        archive.writestr("word/document.xml", "<x/>")
+    assert extract_docx_styles(incomplete)["margins"] == {"warning": "Incomplete DOCX structure"}
+    try:
+        scan_docx(incomplete)
+    except DocxScanError:
+        pass
+    else:
+        raise AssertionError("incomplete package was scanned")
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
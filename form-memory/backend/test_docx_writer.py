@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Test that save_document reuses unchanged template parts and matches Document.save()."""
+import io
+import os
+import struct
+import zipfile
+import zlib
+
+from docx import Document
+from docx.shared import Inches
+
+from engine.analyzer.docx_writer import iter_document_bytes, save_document
+
+
+def _png(path, size=64):
+    """Write a PNG of random (incompressible) pixels."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\0" + os.urandom(size * 3) for _ in range(size))
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+    return path
+
+
+def _template(tmp_path):
+    doc = Document()
+    doc.add_paragraph("BAB I PENDAHULUAN", style="Heading 1")
+    doc.add_picture(str(_png(tmp_path / "logo.png")), width=Inches(1))
+    path = tmp_path / "template.docx"
+    doc.save(str(path))
+    return path
+
+
+def _members(data):
+    with zipfile.ZipFile(data) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_save_reuses_unchanged_parts(tmp_path):
+    template = _template(tmp_path)
+    doc = Document(str(template))
+    doc.add_paragraph("Latar belakang penelitian.")
+
+    doc.save(str(tmp_path / "expected.docx"))
+    stats = save_document(doc, tmp_path / "fast.docx", source=template)
+
+    # Same package as python-docx writes; only document.xml had to be deflated again
+    assert _members(tmp_path / "fast.docx") == _members(tmp_path / "expected.docx")
+    assert stats["written"] == 1 and stats["reused"] > 1
+    with zipfile.ZipFile(template) as source, zipfile.ZipFile(tmp_path / "fast.docx") as fast:
+        image = next(name for name in source.namelist() if name.startswith("word/media/"))
+        assert fast.getinfo(image).compress_size == source.getinfo(image).compress_size
+    assert Document(str(tmp_path / "fast.docx")).paragraphs[-1].text == "Latar belakang penelitian."
+
+
+def test_save_without_matching_source(tmp_path):
+    template = _template(tmp_path)
+    doc = Document(str(template))
+
+    # A different file under the source path: only parts with identical bytes are reused
+    other = tmp_path / "other.docx"
+    Document().save(str(other))
+    stats = save_document(doc, tmp_path / "out.docx", source=other)
+    assert stats["written"] >= 2  # document.xml and the image
+    assert _members(tmp_path / "out.docx") == _members(template)
+
+    stats = save_document(doc, tmp_path / "plain.docx", source=tmp_path / "missing.docx")
+    assert stats["reused"] == 0
+    assert _members(tmp_path / "plain.docx") == _members(template)
+
+
+def test_streamed_package(tmp_path):
+    template = _template(tmp_path)
+    doc = Document(str(template))
+    doc.add_paragraph("Streamed.")
+
+    chunks = list(iter_document_bytes(doc, source=template))
+    assert len(chunks) > 1
+    save_document(doc, tmp_path / "saved.docx", source=template)
+    assert _members(io.BytesIO(b"".join(chunks))) == _members(tmp_path / "saved.docx")
+
+
+def test_streamed_package_round_trips(tmp_path):
+    template = _template(tmp_path)
+    doc = Document(str(template))
+    doc.add_paragraph("Streamed.")
+
+    data = b"".join(iter_document_bytes(doc, source=template))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        infos = {info.filename: info for info in archive.infolist()}
+
+    # Rewritten parts end with a data descriptor; reused ones carry CRC and sizes up front
+    image = next(name for name in infos if name.startswith("word/media/"))
+    assert infos["word/document.xml"].flag_bits & 0x08
+    assert not infos[image].flag_bits & 0x08
+    reused = [name for name, info in infos.items() if not info.flag_bits & 0x08]
+    assert len(reused) > 1
+    with zipfile.ZipFile(template) as source:
+        for name in reused:
+            assert infos[name].CRC == source.getinfo(name).CRC
+            assert infos[name].compress_size == source.getinfo(name).compress_size
+    assert Document(io.BytesIO(data)).paragraphs[-1].text == "Streamed."
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
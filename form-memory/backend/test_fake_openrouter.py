@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Test the fake OpenRouter used for offline load tests."""
+import json
+
+from fastapi.testclient import TestClient
+
+from engine.analyzer.generation_planner import SYSTEM_PROMPT, GenerationPlanner
+from loadtest.canned import canned_response
+from loadtest.fake_openrouter import FakeConfig, create_app
+
+DRAFT = "BAB I PENDAHULUAN\n1.1 Latar Belakang\nSistem informasi akademik masih manual.\n\nBAB II TINJAUAN PUSTAKA"
+
+
+def _chat(system, user, **extra):
+    return {"model": "fake/model", "messages": [{"role": "system", "content": system},
+                                                {"role": "user", "content": user}], **extra}
+
+
+def test_canned_responses():
+    # Every generation chunk gets an answer its own validator accepts
+    for chunk in GenerationPlanner(client=None, models=["fake/model"]).plan():
+        family, content = canned_response(_chat(SYSTEM_PROMPT, chunk.prompt(DRAFT)))
+        assert family == chunk.name, (family, chunk.name)
+        assert chunk.is_valid(content), chunk.name
+
+    # Same prompt and seed give the same answer; another seed does not
+    request = _chat(SYSTEM_PROMPT, "Buat abstrak dalam bahasa Indonesia")
+    assert canned_response(request) == canned_response(request)
+    assert canned_response(request, seed=1) != canned_response(request)
+
+    family, content = canned_response(_chat("You are a semantic text parser for thesis drafts.",
+                                            f"Parse this thesis text:\n\n{DRAFT}"))
+    types = [element["type"] for element in json.loads(content)["elements"]]
+    assert family == "semantic_parse"
+    assert types == ["chapter", "subchapter", "paragraph", "chapter"]
+
+    family, content = canned_response(_chat("You are a front matter classifier.",
+                                            "KATA PENGANTAR\nPuji syukur\n---\nABSTRAK\nPenelitian ini"))
+    categories = [c["category"] for c in json.loads(content)["classifications"]]
+    assert family == "front_matter_classification" and categories == ["preface", "abstract_id"]
+
+
+def test_fake_openrouter_server():
+    config = FakeConfig(latency_ms=0, jitter=0, fail_models=["broken/model"])
+    client = TestClient(create_app(config))
+    request = _chat(SYSTEM_PROMPT, "Create an abstract in English")
+
+    response = client.post("/api/v1/chat/completions", json=request)
+    body = response.json()
+    assert response.status_code == 200
+    assert body["choices"][0]["finish_reason"] == "stop"
+    assert body["choices"][0]["message"]["content"] == canned_response(request)[1]
+
+    # Streaming sends the same content as SSE chunks
+    with client.stream("POST", "/api/v1/chat/completions", json={**request, "stream": True}) as response:
+        events = [line[len("data: "):] for line in response.iter_lines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    streamed = "".join(json.loads(e)["choices"][0]["delta"].get("content", "") for e in events[:-1])
+    assert streamed == canned_response(request)[1]
+
+    assert client.post("/api/v1/chat/completions", json={**request, "model": "broken/model"}).status_code == 503
+
+    # Runtime reconfiguration: every request is rate limited
+    assert client.post("/__config", json={"error_429": 1.0, "reset": True}).status_code == 200
+    response = client.post("/api/v1/chat/completions", json=request)
+    assert response.status_code == 429 and response.headers["Retry-After"] == "1"
+    assert client.get("/__stats").json()["totals"] == {
+        "requests": 1, "ok": 0, "rate_limited": 1, "server_errors": 0, "truncated": 0, "completion_tokens": 0,
+    }
+
+    # Truncated answers are cut mid-JSON and marked with finish_reason "length"
+    client.post("/__config", json={"error_429": 0.0, "truncate": 1.0})
+    chunk = GenerationPlanner(client=None, models=["fake/model"]).plan()[1]
+    body = client.post("/api/v1/chat/completions", json=_chat(SYSTEM_PROMPT, chunk.prompt(DRAFT))).json()
+    assert body["choices"][0]["finish_reason"] == "length"
+    assert not chunk.is_valid(body["choices"][0]["message"]["content"])
+
+
+if __name__ == "__main__":
+    test_canned_responses()
+    test_fake_openrouter_server()
+    print("[OK] Fake OpenRouter test passed")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Test the bounded job queue used for thesis builds."""
+import asyncio
+import threading
+
+from job_queue import Job, JobQueue, JobQueueFull
+
+
+def test_job_queue():
+    """Jobs run on the pool, report stages, and the queue rejects overflow."""
+    queue = JobQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    def slow_build(job, value):
+        job.set_stage("building")
+        release.wait(5)
+        return {"filename": f"out_{value}.docx"}
+
+    def failing_build(job):
+        raise RuntimeError("boom")
+
+    first = queue.submit("generate", slow_build, 1)
+    second = queue.submit("generate", slow_build, 2)
+    try:
+        queue.submit("generate", slow_build, 3)
+        assert False, "queue should be full"
+    except JobQueueFull:
+        pass
+
+    release.set()
+    result = asyncio.run(queue.wait(second))
+    assert result == {"filename": "out_2.docx"}
+    assert first.future.result(5) == {"filename": "out_1.docx"}
+    assert queue.get(first.id).to_dict()["status"] == Job.SUCCEEDED
+    assert queue.get(first.id).to_dict()["filename"] == "out_1.docx"
+
+    failed = queue.submit("generate", failing_build)
+    try:
+        failed.future.result(5)
+    except RuntimeError:
+        pass
+    assert failed.to_dict()["status"] == Job.FAILED
+    assert failed.to_dict()["error"] == "boom"
+
+    print(f"Job queue stats: {queue.stats()}")
+    queue.shutdown()
+
+
+if __name__ == '__main__':
+    test_job_queue()
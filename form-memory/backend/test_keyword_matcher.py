@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""Test the keyword automaton against per-phrase substring checks."""
+import random
+
+from engine.analyzer.keyword_matcher import KeywordMatcher
+from engine.analyzer.template_instructions import TEMPLATE_KEYWORD_CATEGORIES, template_keyword_matcher
+
+
+def _naive(categories, text):
+    lower = text.lower()
+    return {name for name, keywords in categories.items() if any(k.lower() in lower for k in keywords)}
+
+
+def test_keyword_matcher():
+    """Every category found by `any(phrase in text)` is found in one scan, overlaps included."""
+    categories = {"she": ["she"], "he": ["he"], "hers": ["hers"], "his": ["his"], "nim": ["nim", "n i m"]}
+    matcher = KeywordMatcher(categories)
+    assert matcher.scan("uSHErs") == {"she", "he", "hers"}
+    assert matcher.scan("") == set()
+
+    rng = random.Random(7)
+    alphabet = "hersinm "
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert matcher.scan(text) == _naive(categories, text)
+
+    template = dict(TEMPLATE_KEYWORD_CATEGORIES)
+    template["instruction"] = ["Tuliskan judul skripsi di sini", "Cucu Subbab"]
+    words = [k for keywords in template.values() for k in keywords] + ["lorem", "ipsum", "2020"]
+    big = KeywordMatcher(template)
+    for _ in range(300):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        assert big.scan(text) == _naive(template, text)
+
+    shared = template_keyword_matcher("id")
+    assert shared is template_keyword_matcher("id")
+    assert {"instruction", "chapter_one"} <= shared.scan("BAB I: Tuliskan isi bab")
+
+
+if __name__ == "__main__":
+    test_keyword_matcher()
+    print("[OK] Keyword matcher test passed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Test the persistent LLM response cache."""
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from engine.ai import llm_cache
+from engine.ai.llm_cache import LLMResponseCache, cached_completion
+
+
+class FakeClient:
+    """Minimal stand-in for the OpenAI client that counts network calls."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        self.calls += 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_llm_cache():
+    """Hits skip the client, keys normalize whitespace, TTL and budget evict."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(path=Path(tmp) / "cache.sqlite3", ttl_seconds=60, max_bytes=1000)
+        previous, llm_cache._cache = llm_cache._cache, cache
+        try:
+            client = FakeClient('{"ok": true}')
+            request = {
+                "model": "m",
+                "messages": [{"role": "user", "content": "Hello   world"}],
+                "temperature": 0.1,
+            }
+            assert cached_completion(client, "site", **request) == '{"ok": true}'
+            request["messages"] = [{"role": "user", "content": "Hello world\n"}]
+            assert cached_completion(client, "site", **request) == '{"ok": true}'
+            assert client.calls == 1
+            assert cache.stats()["call_sites"]["site"]["hit_rate"] == 0.5
+
+            cached_completion(client, "site", use_cache=False, **request)
+            assert client.calls == 2
+
+            # Responses failing validation are returned but never stored
+            rejected = FakeClient("not json")
+            assert cached_completion(rejected, "other", validate=lambda c: c.startswith("{"),
+                                     model="m", messages=[{"role": "user", "content": "x"}]) == "not json"
+            cached_completion(rejected, "other", validate=lambda c: c.startswith("{"),
+                              model="m", messages=[{"role": "user", "content": "x"}])
+            assert rejected.calls == 2
+
+            # Expired entries are treated as misses
+            key = cache.make_key("m", [{"role": "user", "content": "old"}])
+            cache.put(key, "stale")
+            cache.ttl_seconds = -1
+            assert cache.get(key) is None
+            cache.ttl_seconds = 60
+
+            # Least recently used entries go once the byte budget is exceeded
+            keys = [cache.make_key("m", [{"role": "user", "content": str(i)}]) for i in range(5)]
+            for key in keys:
+                cache.put(key, "x" * 300)
+                time.sleep(0.01)
+            assert cache.stats()["bytes"] <= 1000
+            assert cache.get(keys[0]) is None
+            assert cache.get(keys[-1]) == "x" * 300
+        finally:
+            llm_cache._cache = previous
+            cache._conn.close()
+
+
+if __name__ == "__main__":
+    test_llm_cache()
+    print("[OK] LLM cache test passed")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""Test the shared LLM gateway against a local OpenAI-compatible server."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from engine.ai import llm_gateway
+from engine.ai.llm_gateway import LLMConfigurationError, LLMGateway, LLMGatewayError, _to_namespace
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures_left = 0
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _Handler.requests.append(body)
+        if body["model"] == "stalled":
+            time.sleep(3)
+        if _Handler.failures_left:
+            _Handler.failures_left -= 1
+            payload, status = {"error": {"message": "rate limited"}}, 429
+        else:
+            payload, status = {
+                "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "halo"}}],
+                "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+            }, 200
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _run(use_openai):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous = llm_gateway.OPENAI_AVAILABLE
+    llm_gateway.OPENAI_AVAILABLE = use_openai and previous
+    try:
+        gateway = LLMGateway(base_url=f"http://127.0.0.1:{server.server_port}/v1", timeout=5, max_retries=2)
+        gateway._backoff = lambda attempt: 0.0
+        _Handler.failures_left = 1
+        _Handler.requests = []
+
+        client = gateway.client("key", "demo")
+        response = client.chat.completions.create(
+            model="m", messages=[{"role": "user", "content": "hi"}],
+            extra_body={"reasoning": {"enabled": True}},
+        )
+        assert response.choices[0].message.content == "halo"
+        client.chat.completions.create(model="m", messages=[{"role": "user", "content": "again"}])
+
+        stats = gateway.stats()
+        demo = stats["call_sites"]["demo"]
+        assert demo["calls"] == 2 and demo["retries"] == 1 and demo["errors"] == 0
+        assert demo["prompt_tokens"] == 14 and demo["completion_tokens"] == 6
+        assert stats["clients"] == 1
+        assert _Handler.requests[0]["reasoning"] == {"enabled": True}
+
+        # Client errors are not retried
+        _Handler.failures_left = 0
+        assert not gateway._is_retryable(llm_gateway.LLMGatewayError("bad", 400))
+    finally:
+        llm_gateway.OPENAI_AVAILABLE = previous
+        server.shutdown()
+        server.server_close()
+
+
+def test_llm_gateway():
+    """Retries rate limits, reuses one client and records usage."""
+    _run(use_openai=True)
+    _run(use_openai=False)
+
+
+class _RacingGateway(LLMGateway):
+    """Gateway whose models fail fast, stall or answer, without a network."""
+
+    def _send(self, api_key, base_url, timeout, request):
+        model = request["model"]
+        if model == "limited":
+            raise LLMGatewayError("rate limited", 429)
+        if model == "slow":
+            time.sleep(1.0)
+        content = "not json" if model == "invalid" else '{"model": "%s"}' % model
+        return _to_namespace({"choices": [{"message": {"content": content}}]})
+
+
+def test_llm_gateway_requires_api_key(monkeypatch):
+    """Without a key the call fails with a configuration error instead of an upstream 401."""
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+    gateway = _RacingGateway()
+    for call in (lambda: gateway.complete("nokey", model="good", messages=[]),
+                 lambda: gateway.race("nokey", ["good"], messages=[])):
+        try:
+            call()
+        except LLMConfigurationError as e:
+            assert "OPENROUTER_API_KEY" in str(e)
+        else:
+            raise AssertionError("call without an API key was sent")
+    assert "nokey" not in gateway.stats()["call_sites"]
+
+
+def test_llm_gateway_race():
+    """A rate-limited and a stalled model do not delay the first valid answer."""
+    gateway = _RacingGateway(max_retries=2)
+    start = time.perf_counter()
+    model, content = gateway.race(
+        "race", ["limited", "slow", "invalid", "good"], api_key="key", hedge_delay=0.1, max_parallel=3,
+        validate=lambda c: c.startswith("{"), messages=[{"role": "user", "content": "hi"}],
+    )
+    assert model == "good" and json.loads(content) == {"model": "good"}
+    assert time.perf_counter() - start < 0.8
+    assert gateway.stats()["call_sites"]["race"]["hedges"] == 3
+    assert gateway.stats()["call_sites"]["race"]["retries"] == 0
+
+    # The stalled attempt keeps its concurrency slot until its call returns, then gives it back
+    time.sleep(1.0)
+    slots = [gateway._semaphore.acquire(blocking=False) for _ in range(gateway.max_concurrency)]
+    assert all(slots)
+
+
+class _CountingGateway(LLMGateway):
+    """Uninterruptible calls (like the openai client's) that record how many are in flight."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = self.peak = 0
+        self._count_lock = threading.Lock()
+
+    def _send(self, api_key, base_url, timeout, request):
+        with self._count_lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(0.4 if request["model"] == "slow" else 0.05)
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
+        return _to_namespace({"choices": [{"message": {"content": "halo"}}]})
+
+
+def test_llm_gateway_race_respects_concurrency():
+    """Cancelled attempts that cannot be interrupted still count against max_concurrency."""
+    gateway = _CountingGateway(max_concurrency=2, max_retries=0)
+    winners = []
+
+    def race():
+        winners.append(gateway.race("bounded", ["slow", "fast"], api_key="key", hedge_delay=0.02,
+                                    max_parallel=2, messages=[{"role": "user", "content": "hi"}])[0])
+
+    threads = [threading.Thread(target=race) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(winners) == 4
+    assert gateway.peak <= 2
+
+
+def test_llm_gateway_race_cancels_losers():
+    """A losing request still on the wire is cut off and its slot released."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous, llm_gateway.OPENAI_AVAILABLE = llm_gateway.OPENAI_AVAILABLE, False
+    try:
+        gateway = LLMGateway(base_url=f"http://127.0.0.1:{server.server_port}/v1",
+                             timeout=10, max_concurrency=2)
+        _Handler.failures_left = 0
+        start = time.perf_counter()
+        model, content = gateway.race(
+            "cancel", ["stalled", "m"], api_key="key", hedge_delay=0.1, max_parallel=2,
+            messages=[{"role": "user", "content": "hi"}],
+        )
+        assert model == "m" and content == "halo"
+
+        # The stalled request returns as soon as its connection is shut down, long before the server answers
+        deadline = time.monotonic() + 2
+        while gateway.stats()["call_sites"]["cancel"]["cancelled"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        stats = gateway.stats()["call_sites"]["cancel"]
+        assert stats["cancelled"] == 1 and stats["errors"] == 0
+        assert time.perf_counter() - start < 2
+        assert gateway._semaphore.acquire(blocking=False) and gateway._semaphore.acquire(blocking=False)
+    finally:
+        llm_gateway.OPENAI_AVAILABLE = previous
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_llm_gateway()
+    test_llm_gateway_race()
+    test_llm_gateway_race_respects_concurrency()
+    test_llm_gateway_race_cancels_losers()
+    print("[OK] LLM gateway test passed")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Test stage spans and the Prometheus text rendering behind /metrics."""
+import threading
+
+from engine.metrics import STAGE_ERRORS, STAGE_SECONDS, MetricFamily, MetricsRegistry, span
+
+
+def test_spans():
+    before = STAGE_SECONDS.snapshot(stage="test_stage")["count"]
+
+    with span("test_stage") as timed:
+        pass
+    assert timed.seconds >= 0
+
+    @span("test_stage")
+    def work(value):
+        return value * 2
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert work(21) == 42
+
+    try:
+        with span("test_stage"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    # Manual spans for phases inside a long method; finishing twice records once
+    phase = span("test_stage").start()
+    phase.finish()
+    assert phase.finish() == 0.0
+
+    assert STAGE_SECONDS.snapshot(stage="test_stage")["count"] == before + 12
+    assert STAGE_ERRORS.value(stage="test_stage") >= 1
+
+
+def test_registry_render():
+    registry = MetricsRegistry()
+    seconds = registry.histogram("demo_seconds", "Demo latency", ["stage"], buckets=(0.1, 1.0))
+    calls = registry.counter("demo_calls_total", "Demo calls", ["model"])
+    assert registry.counter("demo_calls_total", "Demo calls", ["model"]) is calls
+
+    seconds.observe(0.05, stage="save")
+    seconds.observe(0.5, stage="save")
+    seconds.observe(5, stage="save")
+    calls.inc(model='quote"model')
+    calls.inc(2, model='quote"model')
+
+    def queue_depth():
+        yield MetricFamily("demo_queue_jobs", "gauge", "Jobs", ["status"]).add(3, "queued")
+
+    def broken():
+        raise RuntimeError("collector failure")
+
+    registry.register_collector(queue_depth)
+    registry.register_collector(broken)
+    lines = registry.render().splitlines()
+
+    assert "# TYPE demo_seconds histogram" in lines
+    assert 'demo_seconds_bucket{stage="save",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="save",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="save",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{stage="save"} 3' in lines
+    assert 'demo_seconds_sum{stage="save"} 5.55' in lines
+    assert 'demo_calls_total{model="quote\\"model"} 3' in lines
+    assert 'demo_queue_jobs{status="queued"} 3' in lines
+
+    registry.clear()
+    assert 'demo_seconds_count{stage="save"} 3' not in registry.render()
+
+
+if __name__ == "__main__":
+    test_spans()
+    test_registry_render()
+    print("[OK] Metrics test passed")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Test the output manifest used to resolve downloads."""
+import os
+
+from output_manifest import OutputManifest
+
+
+def test_output_manifest(tmp_path):
+    """Record outputs, resolve them by job and filename, and drop stale records."""
+    manifest = OutputManifest(tmp_path / "outputs.sqlite3")
+    output = tmp_path / "Skripsi_Budi.docx"
+    output.write_bytes(b"first build")
+
+    first = manifest.record("job-1", output, "a" * 64)
+    assert manifest.by_job("job-1").sha256 == "a" * 64
+    assert manifest.by_filename("Skripsi_Budi.docx").job_id == "job-1"
+    assert first.etag == f'"{"a" * 64}"'
+    assert manifest.by_job("unknown") is None
+
+    # A rebuild under the same name replaces the file and wins filename lookups
+    output.unlink()
+    output.write_bytes(b"second, longer build")
+    manifest.record("job-2", output, "b" * 64)
+    assert manifest.by_filename("Skripsi_Budi.docx").job_id == "job-2"
+    assert manifest.by_job("job-1") is None
+    assert manifest.stats()["stale"] == 1
+
+    # Records survive a restart
+    reopened = OutputManifest(tmp_path / "outputs.sqlite3")
+    assert reopened.by_job("job-2").size == os.path.getsize(output)
+
+    output.unlink()
+    assert reopened.by_filename("Skripsi_Budi.docx") is None
+    assert reopened.stats()["outputs"] == 0
+
+
+
+if __name__ == '__main__':
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_output_manifest(Path(tmp))
+    print("[OK] Output manifest test passed")
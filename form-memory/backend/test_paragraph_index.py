@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Test that ParagraphIndex stays in sync with doc.paragraphs across edits."""
+import time
+
+from docx import Document
+
+from engine.analyzer.paragraph_index import paragraph_index, find_paragraph_index
+
+
+def _texts(seq):
+    return [p.text for p in seq]
+
+
+def test_paragraph_index():
+    """Inserts, appends and removals through the index match python-docx's view."""
+    doc = Document()
+    for i in range(20):
+        doc.add_paragraph(f"para {i}")
+    doc.add_table(rows=1, cols=1)
+    doc.add_paragraph("after table")
+
+    index = paragraph_index(doc)
+    assert _texts(index) == _texts(doc.paragraphs)
+    assert index.index(index[7]) == 7
+
+    index.insert_after(index[3], "inserted after 3")
+    index.insert_after(index[-1], "inserted at end")
+    index.add_paragraph("appended")
+    index.remove(index[0])
+    assert _texts(index) == _texts(doc.paragraphs)
+    assert index.index(index[15]) == 15
+    assert find_paragraph_index(index[2]) is index
+
+    # Edits made behind the index's back are picked up on the next lookup
+    doc.add_paragraph("untracked")
+    assert paragraph_index(doc) is index
+    assert _texts(index) == _texts(doc.paragraphs)
+
+    print(f"ParagraphIndex in sync: {len(index)} paragraphs")
+
+
+def test_outside_edit_keeping_child_count():
+    """Swapping the last body element behind the index's back is still detected."""
+    doc = Document()
+    for i in range(3):
+        doc.add_paragraph(f"para {i}")
+    body = doc.element.body
+    if body[-1].tag.endswith('sectPr'):
+        body.remove(body[-1])
+
+    index = paragraph_index(doc)
+    index.add_paragraph("through the index")
+    assert index.is_current(doc)
+
+    body.remove(body[-1])
+    doc.add_paragraph("behind the index")
+    assert not index.is_current(doc)
+    assert _texts(paragraph_index(doc)) == _texts(doc.paragraphs)
+
+
+def test_chapter_placeholder_expansion():
+    """Long AI sections are split into paragraphs appended through the index."""
+    from engine.analyzer.complete_thesis_builder import CompleteThesisBuilder
+
+    doc = Document()
+    doc.add_paragraph("BAB I PENDAHULUAN DAN LATAR BELAKANG PENELITIAN SISTEM")
+    doc.add_paragraph("Isi bab satu")
+    sentences = " ".join(f"Kalimat {i} menjelaskan latar belakang penelitian ini." for i in range(40))
+
+    builder = CompleteThesisBuilder.__new__(CompleteThesisBuilder)
+    inserted = builder._replace_chapter_placeholders(doc, [{"title": "BAB I PENDAHULUAN", "content": [sentences]}])
+
+    assert inserted > 1
+    assert len(doc.paragraphs) == 1 + inserted
+    assert _texts(paragraph_index(doc)) == _texts(doc.paragraphs)
+
+
+def _insert_half(size):
+    """Seconds to insert size/2 paragraphs, chained and in a forward sweep, into a size-paragraph body."""
+    doc = Document()
+    for i in range(size):
+        doc.add_paragraph(f"para {i}")
+    index = paragraph_index(doc)
+    originals = list(index)
+
+    start = time.perf_counter()
+    current = index[size // 4]
+    for _ in range(size // 4):
+        current = index.insert_after(current, "chained")
+    for paragraph in originals[::4]:
+        index.insert_after(paragraph, "swept")
+    elapsed = time.perf_counter() - start
+
+    assert _texts(index) == _texts(doc.paragraphs)
+    return elapsed
+
+
+def test_sequential_inserts_scale_linearly():
+    """Inserting n/2 paragraphs grows ~8x from 1k to 8k paragraphs, not ~64x."""
+    small = min(_insert_half(1000) for _ in range(3))
+    large = min(_insert_half(8000) for _ in range(3))
+    assert large / small < 24, f"1k: {small:.4f}s, 8k: {large:.4f}s"
+
+
+if __name__ == '__main__':
+    test_paragraph_index()
+    test_outside_edit_keeping_child_count()
+    test_chapter_placeholder_expansion()
+    test_sequential_inserts_scale_linearly()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""Test that TemplateAnalyzer's single paragraph pass matches direct python-docx reads."""
+from pathlib import Path
+
+from docx import Document
+from docx.shared import Pt
+
+from engine.analyzer.template_analyzer import TemplateAnalyzer
+
+
+def _analyzer(path):
+    analyzer = TemplateAnalyzer.__new__(TemplateAnalyzer)
+    analyzer.template_path = Path(path)
+    analyzer.doc = Document(str(path))
+    analyzer._scan = None
+    return analyzer
+
+
+def test_paragraph_visitor(tmp_path):
+    """Style usage, headings, placeholders and fonts come from one traversal."""
+    doc = Document()
+    doc.add_heading("BAB I PENDAHULUAN", 1)
+    doc.add_paragraph("Kata Pengantar")
+    doc.add_paragraph("Menurut (Smith, 2020) [isi] TULIS JUDUL DI SINI")
+    doc.add_paragraph("Gambar 1.1 Arsitektur")
+    run = doc.add_paragraph().add_run("teks")
+    run.font.name, run.font.size = "Arial", Pt(11)
+    doc.add_paragraph("Abstrak", style="List Paragraph")
+    path = tmp_path / "template.docx"
+    doc.save(str(path))
+
+    analyzer = _analyzer(path)
+    analysis = analyzer._analyze()
+    paragraphs = Document(str(path)).paragraphs
+
+    for name, style in analysis["styles"].items():
+        assert style["usage_count"] == sum(1 for p in paragraphs if p.style.name == name)
+    assert [h["text"] for h in analysis["structure"]["headings"]] == ["BAB I PENDAHULUAN"]
+    assert analysis["structure"]["headings"] == analysis["structure"]["hierarchy"]
+    assert analysis["heading_hierarchy"]["numbering_pattern"] == "roman_uppercase"
+    assert "[isi]" in analysis["placeholders"]["text_placeholders"]
+    assert analysis["front_matter"]["sections"] == ["preface", "cover", "abstract_id"]
+    assert analysis["special_elements"]["figures"] == ["Gambar 1.1 Arsitektur"]
+    assert analysis["formatting_rules"]["common_font_size"] == 11.0
+    assert analyzer._detect_citation_style() == "APA"
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_paragraph_visitor(Path(tmp))
+    print("[OK] Paragraph visitor test passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Test the ETag-aware preview cache."""
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from engine.analyzer.preview_cache import PreviewCache, PreviewEntry, etag_matches
+
+
+def test_preview_cache():
+    """Render once per output version, serve compressed bytes, and retire stale previews."""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        output = workdir / "thesis.docx"
+        output.write_bytes(b"version one")
+        cache = PreviewCache(workdir / "previews", memory_entries=2)
+
+        renders = []
+        render = lambda path: renders.append(path) or {"html_content": path.read_text()}
+
+        first = cache.get(output, render)
+        again = cache.get(output, render)
+        assert again is first
+        assert len(renders) == 1
+        assert json.loads(gzip.decompress(first.gzip_body)) == {"html_content": "version one"}
+        assert first.body(None) == gzip.decompress(first.gzip_body)
+        assert cache.etag_for(output) == first.etag
+
+        # A fresh cache picks the preview up from disk without rendering
+        reloaded = PreviewCache(workdir / "previews").get(output, render)
+        assert reloaded.etag == first.etag
+        assert len(renders) == 1
+
+        output.write_bytes(b"version two, rewritten")
+        second = cache.get(output, render)
+        assert second.etag != first.etag
+        assert len(renders) == 2
+        assert not any(cache._paths(first.key)[0].parent.glob(f"{first.key}.*"))
+
+        cache.forget(output)
+        assert cache.stats()["in_memory"] == 0
+        assert not cache._paths(second.key)[0].exists()
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_preview_parts():
+    """Chunked previews cache each part, stream them in order and serve one part alone."""
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        output = workdir / "thesis.docx"
+        output.write_bytes(b"chapters")
+        cache = PreviewCache(workdir / "previews")
+
+        renders = []
+
+        def render_parts(path):
+            renders.append(path)
+            yield "outline", {"sections": ["chapter-1", "chapter-2"]}
+            yield "chapter-1", {"html_content": "<p>one</p>"}
+            yield "chapter-2", {"html_content": "<p>two</p>"}
+
+        streamed = [name for name, _ in cache.iter_parts(output, render_parts, "sections")]
+        assert streamed == ["outline", "chapter-1", "chapter-2"]
+        assert len(renders) == 1
+
+        chapter = cache.get_part(output, "chapter-2", render_parts, "sections")
+        assert json.loads(chapter.body(None)) == {"html_content": "<p>two</p>"}
+        # Unknown part names are refused without leaving a key behind
+        known = len(cache._current)
+        assert cache.get_part(output, "chapter-9", render_parts, "sections") is None
+        assert cache.part_etag_for(output, "chapter-9", render_parts, "sections") is None
+        assert len(cache._current) == known
+        assert [name for name, _ in cache.iter_parts(output, render_parts, "sections")] == streamed
+        assert len(renders) == 1
+
+        # Each part has its own ETag, distinct from the full preview's
+        assert chapter.etag == cache.etag_for(output, "sections#chapter-2")
+        assert chapter.etag == cache.part_etag_for(output, "chapter-2", render_parts, "sections")
+        assert chapter.etag != cache.etag_for(output, "sections#chapter-1")
+
+        # A cold cache rebuilds from disk without rendering again
+        fresh = PreviewCache(workdir / "previews")
+        assert [name for name, _ in fresh.iter_parts(output, render_parts, "sections")] == streamed
+        assert len(renders) == 1
+    finally:
+        shutil.rmtree(workdir)
+
+
+def test_etag_negotiation():
+    """If-None-Match uses weak comparison and Accept-Encoding honours q=0."""
+    assert etag_matches('W/"abc.v1", "other"', '"abc.v1"')
+    assert etag_matches("*", '"abc.v1"')
+    assert not etag_matches(None, '"abc.v1"')
+    assert not etag_matches('"abc.v2"', '"abc.v1"')
+
+    entry = PreviewEntry("abc", b"gz", b"br")
+    assert entry.choose_encoding("gzip, br") == "br"
+    assert entry.choose_encoding("gzip, br;q=0") == "gzip"
+    assert entry.choose_encoding("identity") is None
+    assert PreviewEntry("abc", b"gz").choose_encoding("br, gzip") == "gzip"
+
+
+if __name__ == '__main__':
+    test_preview_cache()
+    test_preview_parts()
+    test_etag_negotiation()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Test the shared parsed-template cache."""
+from pathlib import Path
+
+from docx import Document
+
+from engine.analyzer.template_cache import TemplateStore
+
+TEMPLATE = Path(__file__).resolve().parent.parent / "storage" / "references" / "Template-skripsi-final-versi2020.docx"
+
+
+def test_template_cache():
+    """Parse once, borrow the shared snapshot, and hand out independent copies."""
+    store = TemplateStore()
+
+    shared = store.borrow(TEMPLATE)
+    assert store.borrow(TEMPLATE) is shared
+    assert store.stats()["misses"] == 1
+    assert store.stats()["hits"] == 1
+
+    copy_doc = store.copy_document(TEMPLATE)
+    original_count = len(shared.paragraphs)
+    copy_doc.add_paragraph("builder-only paragraph")
+    assert len(shared.paragraphs) == original_count
+    assert len(copy_doc.paragraphs) == original_count + 1
+
+    # Copies made after the shared document cached its body still edit their own tree
+    copy_doc = store.copy_document(TEMPLATE)
+    copy_doc.add_paragraph("added to the copy")
+    assert copy_doc.paragraphs[-1]._p.getparent() is copy_doc.element.body
+    assert len(copy_doc.element.body.findall(copy_doc.paragraphs[0]._p.tag)) == original_count + 1
+
+    calls = []
+    first = store.get_analysis(TEMPLATE, "demo", lambda: calls.append(1) or {"items": [1]})
+    first["items"].append(2)
+    second = store.get_analysis(TEMPLATE, "demo", lambda: calls.append(1) or {"items": [1]})
+    assert calls == [1]
+    assert second == {"items": [1]}
+
+    print(f"Template cache stats: {store.stats()}")
+
+
+def test_template_cache_eviction():
+    """Byte budget evicts least recently used entries but keeps the newest one."""
+    store = TemplateStore(max_bytes=1)
+    store.borrow(TEMPLATE)
+    assert store.stats()["entries"] == 1
+    assert store.stats()["evictions"] == 0
+
+
+def test_template_cache_lru_eviction(tmp_path):
+    """A byte budget below two templates evicts the older one, which is re-parsed on its next load."""
+    paths = []
+    for name in ("first", "second"):
+        doc = Document()
+        doc.add_paragraph(f"BAB I PENDAHULUAN ({name})")
+        paths.append(tmp_path / f"{name}.docx")
+        doc.save(str(paths[-1]))
+    first, second = paths
+    budget = max(TemplateStore._estimate_size(p) for p in paths) * 3 // 2
+    store = TemplateStore(max_bytes=budget)
+
+    old = store.borrow(first)
+    store.borrow(second)
+    stats = store.stats()
+    assert stats["entries"] == 1 and stats["evictions"] == 1
+    assert stats["bytes"] <= budget
+
+    # The most recent template is still cached; the evicted one is parsed again
+    store.borrow(second)
+    assert store.stats()["hits"] == 1
+    assert store.borrow(first) is not old
+    stats = store.stats()
+    assert stats["misses"] == 3 and stats["evictions"] == 2
+
+
+if __name__ == '__main__':
+    test_template_cache()
+    test_template_cache_eviction()
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_template_cache_lru_eviction(Path(tmp))
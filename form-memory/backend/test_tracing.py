@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Test leveled tracing and per-request trace capture."""
+import contextvars
+import json
+import threading
+
+from engine import tracing
+from engine.tracing import DEBUG, INFO, TraceCapture, capture_trace, get_tracer
+
+
+class CountingArg:
+    """Counts how often a trace argument is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+def test_disabled_levels_are_not_formatted(capsys):
+    tracing.set_level(INFO)
+    trace = get_tracer("test")
+    arg = CountingArg()
+
+    for _ in range(1000):
+        trace.debug("paragraph %s", arg)
+    assert arg.formatted == 0
+    assert not trace.enabled(DEBUG)
+    assert capsys.readouterr().out == ""
+
+    trace.info("Inserted %s chapters", 5, template="ugm.docx")
+    assert capsys.readouterr().out == "[INFO] [test] Inserted 5 chapters template=ugm.docx\n"
+
+
+def test_capture_records_debug_events(capsys):
+    tracing.set_level(INFO)
+    trace = get_tracer("test")
+    arg = CountingArg()
+
+    with capture_trace() as capture:
+        assert trace.enabled(DEBUG)
+        trace.debug("paragraph %s", arg, index=3)
+        # Threads only join the capture when run in a copy of the context
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(trace.debug, "from worker"))
+        worker.start()
+        worker.join()
+        stray = threading.Thread(target=trace.debug, args=("not captured",))
+        stray.start()
+        stray.join()
+    trace.debug("after capture")
+
+    assert arg.formatted == 1
+    assert capsys.readouterr().out == ""
+    messages = [event["message"] for event in capture.events()]
+    assert messages == ["paragraph arg", "from worker"]
+    assert capture.events()[0]["fields"] == {"index": 3}
+    assert capture.events()[0]["level"] == "DEBUG"
+
+
+def test_ndjson_and_event_limit():
+    trace = get_tracer("test")
+    capture = TraceCapture(max_events=2)
+    with capture_trace(capture):
+        for i in range(5):
+            trace.debug("event %d", i)
+
+    lines = [json.loads(line) for line in capture.to_ndjson().splitlines()]
+    assert [line["message"] for line in lines[:-1]] == ["event 0", "event 1"]
+    assert lines[-1]["summary"] is True
+    assert lines[-1]["events"] == 2 and lines[-1]["dropped"] == 3
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Test streaming upload ingestion: hashing, size limits and package validation."""
+import asyncio
+import hashlib
+import io
+import zipfile
+
+from docx import Document
+from starlette.datastructures import UploadFile
+
+from engine.analyzer.template_cache import TemplateStore
+from upload_ingest import DOCX, TEXT, UploadRejected, ingest_upload, safe_filename
+
+
+class _RecordingStream(io.BytesIO):
+    """BytesIO that remembers the largest single read."""
+
+    largest = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.largest = max(self.largest, len(data))
+        return data
+
+
+def _ingest(data, destination, filename="upload.docx", **kwargs):
+    stream = _RecordingStream(data)
+    upload = UploadFile(stream, filename=filename)
+    return asyncio.run(ingest_upload(upload, destination, chunk_size=4096, **kwargs)), stream
+
+
+def _rejected(data, destination, **kwargs):
+    try:
+        _ingest(data, destination, **kwargs)
+    except UploadRejected as e:
+        assert not destination.exists() and not list(destination.parent.glob(".upload-*"))
+        return e
+    raise AssertionError("upload should have been rejected")
+
+
+def test_upload_ingest(tmp_path):
+    """Uploads are streamed in chunks, hashed on the fly and rejected before they land."""
+    doc = Document()
+    for n in range(200):
+        doc.add_paragraph(f"Paragraf {n} " * 20)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    data = buffer.getvalue()
+
+    stored, stream = _ingest(data, tmp_path / "template.docx", kind=DOCX, min_bytes=1000)
+    assert stored.path.read_bytes() == data and stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert stored.zip_entries > 0 and stream.largest <= 4096
+
+    store = TemplateStore()
+    store.remember_digest(stored.path, stored.sha256)
+    assert store.digest_for(stored.path) == stored.sha256
+
+    assert _rejected(data, tmp_path / "big.docx", kind=DOCX, max_bytes=len(data) - 1).status_code == 413
+    assert "valid DOCX" in str(_rejected(b"x" * 2000, tmp_path / "junk.docx", kind=DOCX))
+    assert "too small" in str(_rejected(data[:500], tmp_path / "tiny.docx", kind=DOCX, min_bytes=1000))
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("[Content_Types].xml", "<Types/>")
+    assert "word/document.xml" in str(_rejected(archive.getvalue(), tmp_path / "empty.docx", kind=DOCX))
+
+    # UTF-8 is validated incrementally, including characters split across chunks
+    text = ("Latar belakang – é " * 1000).encode("utf-8")
+    stored, _ = _ingest(text, tmp_path / "content.txt", filename="content.txt", kind=TEXT)
+    assert stored.path.read_bytes() == text
+    assert "UTF-8" in str(_rejected(text + b"\xff", tmp_path / "bad.txt", kind=TEXT))
+
+    # A rejected upload never replaces an existing file
+    try:
+        _ingest(b"x" * 2000, stored.path, kind=DOCX)
+    except UploadRejected:
+        pass
+    assert stored.path.read_bytes() == text
+    assert safe_filename("..\\..\\evil.docx") == "evil.docx" and safe_filename("/etc/") == "etc"
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_upload_ingest(Path(tmp))
+    print("[OK] Upload ingestion test passed")
@@ -0,0 +1,160 @@
+"""
+Upload Ingestion
+Streams uploaded files to disk in fixed-size chunks, hashing and size-checking
+them as the bytes arrive, so peak memory per upload stays flat whatever the
+file size. DOCX uploads are checked against the ZIP central directory without
+inflating any entry; text uploads are UTF-8 validated incrementally.
+"""
+
+import codecs
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Optional, Union
+
+
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_MAX_ZIP_ENTRIES = int(os.getenv("UPLOAD_MAX_ZIP_ENTRIES", "5000"))
+UPLOAD_MAX_UNCOMPRESSED_BYTES = int(os.getenv("UPLOAD_MAX_UNCOMPRESSED_BYTES", str(512 * 1024 * 1024)))
+
+DOCX = "docx"
+TEXT = "text"
+DOCX_REQUIRED_PARTS = ("[Content_Types].xml", "word/document.xml")
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails a size, encoding or format check."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class IngestedUpload:
+    """An upload that has been written to disk, with its size and content hash."""
+
+    def __init__(self, path: Path, filename: str, size: int, sha256: str, kind: Optional[str] = None,
+                 zip_entries: int = 0):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.kind = kind
+        self.zip_entries = zip_entries
+
+    def to_dict(self) -> dict:
+        return {
+            "filename": self.filename,
+            "file_size": self.size,
+            "sha256": self.sha256,
+        }
+
+
+def safe_filename(filename: Optional[str], default: str = "upload") -> str:
+    """Strip directory components from a client-supplied filename."""
+    name = Path((filename or "").replace("\\", "/")).name
+    return name or default
+
+
+def upload_kind(filename: Optional[str]) -> str:
+    """Infer the validation kind from a filename: DOCX by suffix, text otherwise."""
+    return DOCX if (filename or "").lower().endswith(".docx") else TEXT
+
+
+def validate_docx_archive(path: Union[str, Path], max_entries: int = UPLOAD_MAX_ZIP_ENTRIES,
+                          max_uncompressed: int = UPLOAD_MAX_UNCOMPRESSED_BYTES) -> int:
+    """
+    Check that a file is a plausible DOCX package from its central directory alone.
+
+    No entry is decompressed: the entry count and the declared uncompressed sizes
+    guard against archive bombs, and the required WordprocessingML parts must exist.
+
+    Args:
+        path: Path to the uploaded file
+        max_entries: Maximum number of archive entries
+        max_uncompressed: Maximum total declared uncompressed size in bytes
+
+    Returns:
+        Number of entries in the archive
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            entries = archive.infolist()
+    except (zipfile.BadZipFile, OSError) as e:
+        raise UploadRejected(f"Not a valid DOCX file: {e}")
+
+    if len(entries) > max_entries:
+        raise UploadRejected(f"DOCX has too many parts ({len(entries)} > {max_entries})")
+    uncompressed = sum(info.file_size for info in entries)
+    if uncompressed > max_uncompressed:
+        raise UploadRejected(f"DOCX expands to {uncompressed} bytes (max {max_uncompressed})", status_code=413)
+
+    names = {info.filename for info in entries}
+    missing = [part for part in DOCX_REQUIRED_PARTS if part not in names]
+    if missing:
+        raise UploadRejected(f"Not a valid DOCX file: missing {', '.join(missing)}")
+    return len(entries)
+
+
+async def ingest_upload(upload, destination: Union[str, Path], kind: Optional[str] = None,
+                        max_bytes: int = UPLOAD_MAX_BYTES, min_bytes: int = 0,
+                        chunk_size: int = UPLOAD_CHUNK_BYTES) -> IngestedUpload:
+    """
+    Stream an upload to `destination`, hashing and validating it on the way.
+
+    The file is written to a temporary sibling and renamed into place only once
+    every check has passed, so a rejected upload never replaces an existing file.
+
+    Args:
+        upload: FastAPI/Starlette UploadFile (anything with an async read(size))
+        destination: Final path of the stored file
+        kind: DOCX to validate the ZIP package, TEXT to validate UTF-8, None to skip
+        max_bytes: Upload size limit, enforced while reading
+        min_bytes: Minimum accepted size
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        IngestedUpload with the stored path, size and SHA-256
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    filename = safe_filename(getattr(upload, "filename", None), destination.name)
+
+    sha = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")() if kind == TEXT else None
+    size = 0
+
+    handle = tempfile.NamedTemporaryFile(dir=destination.parent, prefix=".upload-", delete=False)
+    temp_path = Path(handle.name)
+    try:
+        with handle:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(f"File too large (max {max_bytes // (1024 * 1024)}MB)", status_code=413)
+                sha.update(chunk)
+                if decoder is not None:
+                    decoder.decode(chunk)
+                handle.write(chunk)
+            if decoder is not None:
+                decoder.decode(b"", final=True)
+
+        if size < min_bytes:
+            raise UploadRejected("File too small - not a valid DOCX" if kind == DOCX else "File too small")
+
+        zip_entries = validate_docx_archive(temp_path) if kind == DOCX else 0
+        os.replace(temp_path, destination)
+    except UnicodeDecodeError as e:
+        temp_path.unlink(missing_ok=True)
+        raise UploadRejected(f"Content is not valid UTF-8 text ({e.reason})")
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return IngestedUpload(destination, filename, size, sha.hexdigest(), kind, zip_entries)
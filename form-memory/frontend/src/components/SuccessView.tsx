@@ -2,6 +2,7 @@ import { Check, Eye, Download, FileText, Edit } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { useState } from 'react'
 import { WordStylePreview } from './WordStylePreview'
+import type { PreviewOutline } from '@/lib/api'
 
 interface SuccessViewProps {
   fileName: string
@@ -9,6 +10,9 @@ interface SuccessViewProps {
   onFormatAnother: () => void
   onPreview?: () => void
   previewContent?: string | null
+  // Chunked preview: outline loaded up front, section HTML fetched as it is viewed
+  previewOutline?: PreviewOutline | null
+  loadPreviewSection?: (sectionId: string) => Promise<string>
   onEdit?: () => void
 }
 
@@ -18,8 +22,11 @@ export function SuccessView({
   onFormatAnother,
   onPreview,
   previewContent,
+  previewOutline,
+  loadPreviewSection,
   onEdit,
 }: SuccessViewProps) {
+  const hasPreview = !!previewContent || (!!previewOutline && !!loadPreviewSection)
   const [showPreview, setShowPreview] = useState(false)
 
   const handlePreview = () => {
@@ -76,9 +83,11 @@ export function SuccessView({
       </div>
 
        {/* Preview Modal */}
-       {showPreview && previewContent && (
+       {showPreview && hasPreview && (
          <WordStylePreview
-           content={previewContent}
+           content={previewContent ?? undefined}
+           outline={previewOutline}
+           loadSection={loadPreviewSection}
            title="Generated Document Preview"
            onClose={() => setShowPreview(false)}
            onEdit={onEdit}
@@ -86,7 +95,7 @@ export function SuccessView({
          />
        )}
 
-       {showPreview && !previewContent && (
+       {showPreview && !hasPreview && (
          <div className="fixed inset-0 bg-black/50 flex items-center justify-center z-50 p-4">
            <div className="bg-white rounded-lg max-w-4xl w-full max-h-[90vh] overflow-hidden">
              <div className="flex items-center justify-between p-4 border-b">
@@ -6,7 +6,7 @@ import { ProcessingView } from '@/components/ProcessingView'
 import { SuccessView } from '@/components/SuccessView'
 import { ContentStructureVisualizer } from '@/components/ContentStructureVisualizer'
 
-import { generateFromTemplate, downloadFile, validateTemplate, previewGeneratedDocument, downloadGeneratedDocument, type ApiError } from '@/lib/api'
+import { generateFromTemplate, downloadFile, validateTemplate, getPreviewOutline, getPreviewSection, downloadGeneratedDocument, type ApiError, type PreviewOutline } from '@/lib/api'
 import { Upload, Eye, FileText } from 'lucide-react'
 
 export function TemplateGenerator() {
@@ -66,8 +66,8 @@ export function TemplateGenerator() {
   const [useAI, setUseAI] = useState(true)
   const [includeFrontmatter, setIncludeFrontmatter] = useState(true)
 
-  // Preview State
-  const [previewContent, setPreviewContent] = useState<string>('')
+  // Preview State: the outline is loaded first, section HTML is fetched lazily by the preview
+  const [previewOutline, setPreviewOutline] = useState<PreviewOutline | null>(null)
 
   // Content Analysis State
   const [contentAnalysis, setContentAnalysis] = useState<{
@@ -280,6 +280,7 @@ export function TemplateGenerator() {
       kata_kunci: ''
     })
     setShowPreview(false)
+    setPreviewOutline(null)
     setProcessing(false)
     setSuccess(false)
     setError(null)
@@ -303,14 +304,16 @@ export function TemplateGenerator() {
           onFormatAnother={handleReset}
           onPreview={async () => {
             try {
-              const result = await previewGeneratedDocument(results?.filename || 'thesis.docx')
-              setPreviewContent(result.html_content)
+              setPreviewOutline(await getPreviewOutline(results?.filename || 'thesis.docx'))
             } catch (error) {
               console.error('Preview failed:', error)
               alert('Preview not available')
             }
           }}
-          previewContent={previewContent}
+          previewOutline={previewOutline}
+          loadPreviewSection={async (sectionId) =>
+            (await getPreviewSection(results?.filename || 'thesis.docx', sectionId)).html_content
+          }
         />
       </div>
     )
@@ -1,9 +1,13 @@
 import { useState, useEffect, useRef } from 'react'
 import { Button } from '@/components/ui/button'
 import { ChevronLeft, ChevronRight, ZoomIn, ZoomOut, Edit, X, FileText } from 'lucide-react'
+import type { PreviewOutline } from '@/lib/api'
 
 interface WordStylePreviewProps {
-  content: string
+  content?: string
+  // Chunked preview: sections are listed from the outline and their HTML is loaded on demand
+  outline?: PreviewOutline | null
+  loadSection?: (sectionId: string) => Promise<string>
   title?: string
   onClose: () => void
   onEdit?: () => void
@@ -11,7 +15,9 @@ interface WordStylePreviewProps {
 }
 
 export function WordStylePreview({
-  content,
+  content: fullContent = '',
+  outline,
+  loadSection,
   title = 'Document Preview',
   onClose,
   onEdit,
@@ -24,13 +30,62 @@ export function WordStylePreview({
   const [showProperties, setShowProperties] = useState(false)
   const contentRef = useRef<HTMLDivElement>(null)
 
+  // Chunked preview state: the section on screen and the fragments fetched so far
+  const sections = outline?.sections ?? []
+  const chunked = sections.length > 0 && !!loadSection
+  const [activeSection, setActiveSection] = useState<string | null>(null)
+  const [sectionHtml, setSectionHtml] = useState<Record<string, string>>({})
+  const [sectionError, setSectionError] = useState<string | null>(null)
+  const requested = useRef(new Set<string>())
+
+  useEffect(() => {
+    if (chunked && activeSection === null) {
+      setActiveSection(sections[0].id)
+    }
+  }, [chunked, activeSection, sections])
+
+  // Fetch the visible section, then prefetch the next one so paging onward does not wait
+  useEffect(() => {
+    if (!chunked || activeSection === null) return
+    const index = sections.findIndex(section => section.id === activeSection)
+    const wanted = [activeSection, sections[index + 1]?.id].filter((id): id is string => !!id)
+    for (const id of wanted) {
+      if (requested.current.has(id)) continue
+      requested.current.add(id)
+      loadSection!(id)
+        .then(html => setSectionHtml(prev => ({ ...prev, [id]: html })))
+        .catch(() => {
+          requested.current.delete(id)
+          if (id === activeSection) setSectionError('Failed to load this section')
+        })
+    }
+  }, [chunked, activeSection, sections, loadSection])
+
+  const sectionContent = activeSection !== null ? sectionHtml[activeSection] : undefined
+  const content = chunked
+    ? (sectionContent !== undefined ? `<style>${outline?.css_styles ?? ''}</style>${sectionContent}` : '')
+    : fullContent
+  const activeIndex = sections.findIndex(section => section.id === activeSection)
+
+  const goToSection = (index: number) => {
+    if (index >= 0 && index < sections.length) {
+      setSectionError(null)
+      setActiveSection(sections[index].id)
+    }
+  }
+
   // Calculate document statistics
-  const wordCount = content ? content.replace(/<[^>]*>/g, '').split(/\s+/).length : 0
+  const wordCount = chunked
+    ? sections.reduce((total, section) => total + section.word_count, 0)
+    : content ? content.replace(/<[^>]*>/g, '').split(/\s+/).length : 0
   const charCount = content ? content.replace(/<[^>]*>/g, '').length : 0
 
   // Split content into pages based on estimated content height
   useEffect(() => {
-    if (!content) return
+    if (!content) {
+      setPages([])
+      return
+    }
 
     const tempDiv = document.createElement('div')
     tempDiv.innerHTML = content
@@ -143,9 +198,15 @@ export function WordStylePreview({
             <h4 className="font-semibold mb-4 text-gray-800">Document Properties</h4>
             <div className="space-y-3">
               <div>
-                <label className="text-sm font-medium text-gray-600">Pages</label>
+                <label className="text-sm font-medium text-gray-600">{chunked ? 'Pages in section' : 'Pages'}</label>
                 <p className="text-sm text-gray-800">{totalPages}</p>
               </div>
+              {chunked && (
+                <div>
+                  <label className="text-sm font-medium text-gray-600">Sections</label>
+                  <p className="text-sm text-gray-800">{sections.length}</p>
+                </div>
+              )}
               <div>
                 <label className="text-sm font-medium text-gray-600">Words</label>
                 <p className="text-sm text-gray-800">{wordCount.toLocaleString()}</p>
@@ -176,6 +237,33 @@ export function WordStylePreview({
               <FileText className="w-4 h-4" />
               <span>Page {currentPage} of {totalPages}</span>
             </div>
+            {chunked && (
+              <div className="flex items-center gap-1 text-sm">
+                <button
+                  onClick={() => goToSection(activeIndex - 1)}
+                  disabled={activeIndex <= 0}
+                  className="p-1 hover:bg-gray-200 rounded disabled:opacity-50 disabled:cursor-not-allowed"
+                >
+                  <ChevronLeft className="w-4 h-4" />
+                </button>
+                <select
+                  value={activeSection ?? ''}
+                  onChange={event => goToSection(sections.findIndex(section => section.id === event.target.value))}
+                  className="border rounded px-2 py-1 max-w-[16rem]"
+                >
+                  {sections.map(section => (
+                    <option key={section.id} value={section.id}>{section.title}</option>
+                  ))}
+                </select>
+                <button
+                  onClick={() => goToSection(activeIndex + 1)}
+                  disabled={activeIndex >= sections.length - 1}
+                  className="p-1 hover:bg-gray-200 rounded disabled:opacity-50 disabled:cursor-not-allowed"
+                >
+                  <ChevronRight className="w-4 h-4" />
+                </button>
+              </div>
+            )}
           </div>
 
           <div className="flex items-center gap-2">
@@ -392,7 +480,7 @@ export function WordStylePreview({
         {/* Status Bar */}
         <div className="flex items-center justify-between px-4 py-2 border-t bg-gray-50 text-sm text-gray-600">
           <div>Zoom: {zoom}% | Layout: {layoutMode}</div>
-          <div>Ready</div>
+          <div>{sectionError ?? (chunked && sectionContent === undefined ? 'Loading section...' : 'Ready')}</div>
         </div>
         </div>
       </div>
@@ -806,6 +806,59 @@ export async function previewGeneratedDocument(filename: string): Promise<{ html
   }
 }
 
+export interface PreviewSectionSummary {
+  id: string
+  title: string
+  kind: string
+  chapter: number | null
+  paragraph_count: number
+  table_count: number
+  word_count: number
+}
+
+export interface PreviewOutline {
+  sections: PreviewSectionSummary[]
+  metadata: Record<string, unknown>
+  css_styles: string
+}
+
+/**
+ * Get the section outline of a generated document's chunked preview
+ */
+export async function getPreviewOutline(filename: string): Promise<PreviewOutline> {
+  try {
+    const response = await apiClient.get(`/preview-generated/${filename}/outline`)
+    return response.data
+  } catch (error) {
+    const axiosError = error as AxiosError
+    throw {
+      status: axiosError.response?.status || 500,
+      message: 'Failed to load document outline',
+      detail: axiosError.message,
+    } as ApiError
+  }
+}
+
+/**
+ * Get the HTML fragment of one preview section (fetched lazily as it scrolls into view)
+ */
+export async function getPreviewSection(
+  filename: string,
+  sectionId: string
+): Promise<{ id: string; title: string; html_content: string }> {
+  try {
+    const response = await apiClient.get(`/preview-generated/${filename}/sections/${sectionId}`)
+    return response.data
+  } catch (error) {
+    const axiosError = error as AxiosError
+    throw {
+      status: axiosError.response?.status || 500,
+      message: 'Failed to load document section',
+      detail: axiosError.message,
+    } as ApiError
+  }
+}
+
 /**
  * Save edited HTML content
  */